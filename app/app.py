@@ -5,15 +5,104 @@ Servidor web para formulário de avaliação diária.
 
 import sys
 import os
+import json
+import hashlib
+import math
 
 # Adiciona o diretório raiz ao path para importar os módulos
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for
-from datetime import datetime
+from flask import (
+    Flask, render_template, request, jsonify, redirect, url_for, make_response, stream_with_context
+)
+from functools import wraps
+from werkzeug.exceptions import HTTPException
+from datetime import datetime, date, timedelta
 from src.models.review import Review
-from src.services.database_service import DatabaseService
-from src.services.confirmation_service import ConfirmationService
+from src.models.validation import (
+    SUBMISSION_VALIDATOR, BATCH_SUBMISSION_VALIDATOR, parse_review_date
+)
+from src.services.container import ServiceContainer
+from src.services.export_service import EXPORT_FORMATS
+from src.services.idempotency_service import IdempotencyService
+from src.services.rate_limit_service import RateLimitService
+from src.services.health_service import HealthService
+from src.config.settings import settings
+
+
+def _build_review(data, require_date=False):
+    """
+    Valida os dados de uma avaliação enviada pela API.
+    
+    Returns:
+        tuple: (Review, None) se válido ou (None, lista de ValidationError)
+    """
+    validator = BATCH_SUBMISSION_VALIDATOR if require_date else SUBMISSION_VALIDATOR
+    result = validator.validate(data)
+    
+    if not result.valid:
+        return None, result.errors
+    
+    # Dados já validados: o modelo não repete a validação
+    return Review.from_validated(result.data), None
+
+
+def _validation_error_body(errors):
+    """Corpo de erro da API: primeira mensagem (compatível) e erros estruturados."""
+    return {
+        'success': False,
+        'error': errors[0].message,
+        'errors': [error.to_dict() for error in errors]
+    }
+
+
+def _parse_batch_body():
+    """
+    Lê o corpo de uma requisição de lote (JSON ou NDJSON).
+    
+    Returns:
+        tuple: (lista de itens, None) ou (None, mensagem de erro)
+    """
+    content_type = request.mimetype or ''
+    
+    if content_type in ('application/x-ndjson', 'application/jsonl', 'application/x-jsonlines'):
+        items = []
+        for line_number, line in enumerate(request.get_data(as_text=True).splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                return None, f'Linha {line_number} não é um JSON válido'
+    else:
+        body = request.get_json(silent=True)
+        if isinstance(body, dict) and isinstance(body.get('reviews'), list):
+            # Email comum a todas as avaliações do lote
+            default_email = body.get('email')
+            items = [
+                {'email': default_email, **item} if isinstance(item, dict) and default_email else item
+                for item in body['reviews']
+            ]
+        elif isinstance(body, list):
+            items = body
+        else:
+            return None, 'Envie um array JSON de avaliações ou NDJSON'
+    
+    if not items:
+        return None, 'Nenhuma avaliação enviada'
+    
+    return items, None
+
+
+def _parse_period_args():
+    """Lê os parâmetros start/end da query string no formato YYYY-MM-DD."""
+    start = request.args.get('start')
+    end = request.args.get('end')
+    
+    return (
+        parse_review_date(start) if start else None,
+        parse_review_date(end) if end else None
+    )
 
 
 def create_app():
@@ -21,10 +110,107 @@ def create_app():
     
     app = Flask(__name__)
     app.config['SECRET_KEY'] = 'dev-secret-key-change-in-production'
+    app.config['MAX_CONTENT_LENGTH'] = settings.MAX_CONTENT_LENGTH
+    
+    # Inicializa os serviços (um contêiner por aplicação)
+    services = ServiceContainer()
+    db_service = services.database
+    db_service.create_tables()
+    confirmation_service = services.confirmation
+    idempotency_service = IdempotencyService(db_service)
+    idempotency_service.create_tables()
+    ip_limiter = RateLimitService(settings.RATE_LIMIT_IP_PER_MINUTE / 60, settings.RATE_LIMIT_IP_BURST)
+    read_limiter = RateLimitService(settings.RATE_LIMIT_READ_PER_MINUTE / 60, settings.RATE_LIMIT_READ_BURST)
+    health_service = HealthService(db_service, confirmation_service.email_service)
+    email_limiter = RateLimitService(settings.RATE_LIMIT_EMAIL_PER_HOUR / 3600, settings.RATE_LIMIT_EMAIL_BURST)
     
-    # Inicializa os serviços
-    db_service = DatabaseService()
-    confirmation_service = ConfirmationService()
+    def too_many_requests(retry_after: float):
+        """Resposta 429 com Retry-After (em segundos)."""
+        response = jsonify({
+            'success': False,
+            'error': 'Muitas requisições. Tente novamente mais tarde.'
+        })
+        response.status_code = 429
+        response.headers['Retry-After'] = str(max(1, math.ceil(min(retry_after, 3600))))
+        return response
+    
+    def limited_by_ip(limiter):
+        """Cria um decorator que limita as requisições por IP antes de qualquer trabalho na rota."""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if settings.RATE_LIMIT_ENABLED:
+                    retry_after = limiter.try_acquire(request.remote_addr or 'unknown')
+                    if retry_after:
+                        return too_many_requests(retry_after)
+                
+                return view(*args, **kwargs)
+            
+            return wrapper
+        
+        return decorator
+    
+    # Envios (gravação + emails) e leituras (consultas e exportação) têm baldes separados
+    rate_limited = limited_by_ip(ip_limiter)
+    read_rate_limited = limited_by_ip(read_limiter)
+    
+    def check_email_limit(emails):
+        """Consome o limite por email (cada email recebe uma confirmação); retorna 429 ou None."""
+        if not settings.RATE_LIMIT_ENABLED:
+            return None
+        
+        retry_after = email_limiter.try_acquire_all(email.strip().lower() for email in emails)
+        return too_many_requests(retry_after) if retry_after else None
+    
+    @app.errorhandler(413)
+    def request_too_large(error):
+        """Corpo da requisição maior que MAX_CONTENT_LENGTH."""
+        return jsonify({
+            'success': False,
+            'error': f'Requisição muito grande (máximo de {settings.MAX_CONTENT_LENGTH} bytes)'
+        }), 413
+    
+    def idempotent(view):
+        """
+        Reaproveita a resposta original quando o cliente repete o Idempotency-Key.
+        
+        A retentativa não grava no banco nem envia emails de novo. Reusar a
+        mesma chave com outro corpo de requisição retorna 422. Só respostas
+        de sucesso são guardadas: depois de um erro o cliente pode corrigir
+        os dados e reenviar com a mesma chave.
+        """
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = request.headers.get('Idempotency-Key', '').strip()
+            if not key:
+                return view(*args, **kwargs)
+            
+            request_hash = idempotency_service.hash_request(request.path, request.get_data())
+            stored = idempotency_service.get(key)
+            
+            if stored is not None:
+                if stored.request_hash != request_hash:
+                    return jsonify({
+                        'success': False,
+                        'error': 'Idempotency-Key já usada com outra requisição'
+                    }), 422
+                
+                replay = app.response_class(stored.body, status=stored.status_code,
+                                            mimetype='application/json')
+                replay.headers['Idempotent-Replayed'] = 'true'
+                return replay
+            
+            response = make_response(view(*args, **kwargs))
+            
+            # Erros (validação, limites, falhas internas) não são guardados
+            # para que a retentativa ou a correção possa funcionar
+            if 200 <= response.status_code < 300:
+                idempotency_service.save(key, request_hash, response.status_code,
+                                         response.get_data(as_text=True))
+            
+            return response
+        
+        return wrapper
     
     @app.route('/')
     def index():
@@ -40,49 +226,25 @@ def create_app():
         return render_template('formulario.html', email=email, date=date)
     
     @app.route('/api/submit', methods=['POST'])
+    @rate_limited
+    @idempotent
     def submit_form():
         """API para receber os dados do formulário."""
         try:
-            data = request.get_json()
+            # silent=True: corpo que não é JSON cai no erro estruturado do validador
+            data = request.get_json(silent=True)
             
-            # Valida os dados
-            required_fields = ['work', 'training', 'studies', 'mind', 
-                             'positive_points', 'negative_points', 'email']
+            # Valida os dados e cria o objeto Review
+            review, errors = _build_review(data)
+            if errors:
+                return jsonify(_validation_error_body(errors)), 400
             
-            for field in required_fields:
-                if field not in data or data[field] == '':
-                    return jsonify({
-                        'success': False,
-                        'error': f'Campo {field} é obrigatório'
-                    }), 400
-            
-            # Valida notas (0-10)
-            for field in ['work', 'training', 'studies', 'mind']:
-                try:
-                    value = int(data[field])
-                    if value < 0 or value > 10:
-                        return jsonify({
-                            'success': False,
-                            'error': f'Campo {field} deve ser entre 0 e 10'
-                        }), 400
-                except ValueError:
-                    return jsonify({
-                        'success': False,
-                        'error': f'Campo {field} deve ser um número'
-                    }), 400
-            
-            # Cria o objeto Review
-            review = Review(
-                work=int(data['work']),
-                training=int(data['training']),
-                studies=int(data['studies']),
-                mind=int(data['mind']),
-                positive_points=data['positive_points'],
-                negative_points=data['negative_points']
-            )
-            
-            # Salva no banco de dados
-            result = db_service.insert_review(review)
+            limited = check_email_limit([review.user_email])
+            if limited:
+                return limited
+            
+            # Salva no banco de dados (uma avaliação por usuário por dia)
+            result = db_service.insert_review_once(review)
             
             if not result.success:
                 return jsonify({
@@ -90,20 +252,32 @@ def create_app():
                     'error': 'Erro ao salvar avaliação no banco de dados'
                 }), 500
             
-            # Envia confirmação para o usuário
-            user_email = data['email']
-            confirmation_service.send_evaluation_confirmation(review, user_email)
+            review = result.data['review']
             
-            # Envia notificação para admin
-            confirmation_service.send_admin_notification(review, user_email)
+            if result.data['created']:
+                # Envia confirmação para o usuário
+                user_email = review.user_email
+                confirmation_service.send_evaluation_confirmation(review, user_email)
+                
+                # Envia notificação para admin
+                confirmation_service.send_admin_notification(review, user_email)
             
-            return jsonify({
+            response = jsonify({
                 'success': True,
                 'message': 'Avaliação enviada com sucesso!',
                 'review_id': review.id,
                 'average_score': review.get_average_score()
-            }), 200
+            })
+            
+            if not result.data['created']:
+                # Mesmo usuário e mesmo dia: devolve a avaliação original
+                response.headers['Idempotent-Replayed'] = 'true'
             
+            return response, 200
+            
+        except HTTPException:
+            # Ex.: 413 quando o corpo excede MAX_CONTENT_LENGTH
+            raise
         except Exception as e:
             print(f"Erro ao processar formulário: {str(e)}")
             return jsonify({
@@ -111,19 +285,335 @@ def create_app():
                 'error': 'Erro interno do servidor'
             }), 500
     
+    @app.route('/api/submit/batch', methods=['POST'])
+    @rate_limited
+    @idempotent
+    def submit_batch():
+        """
+        API para receber várias avaliações de uma vez (clientes offline, migrações).
+        
+        Aceita um array JSON, um objeto {"email": ..., "reviews": [...]} ou
+        NDJSON (uma avaliação por linha). Cada avaliação precisa de uma data
+        explícita. Itens válidos são gravados em uma única transação e cada
+        usuário recebe uma única confirmação. Avaliações já registradas para
+        o mesmo usuário e dia são marcadas como duplicadas e não são regravadas.
+        """
+        try:
+            items, error = _parse_batch_body()
+            if error:
+                return jsonify({
+                    'success': False,
+                    'error': error
+                }), 400
+            
+            if len(items) > settings.BATCH_MAX_ITEMS:
+                return jsonify({
+                    'success': False,
+                    'error': f'O lote pode ter no máximo {settings.BATCH_MAX_ITEMS} avaliações'
+                }), 413
+            
+            # Valida todos os itens antes de gravar qualquer um
+            results = []
+            valid_reviews = []
+            for index, item in enumerate(items):
+                review, errors = _build_review(item, require_date=True)
+                if errors:
+                    results.append({'index': index, **_validation_error_body(errors)})
+                else:
+                    results.append({'index': index, 'success': True})
+                    valid_reviews.append((index, review))
+            
+            if valid_reviews:
+                limited = check_email_limit({review.user_email for _, review in valid_reviews})
+                if limited:
+                    return limited
+            
+            stored_reviews = []
+            created_flags = []
+            if valid_reviews:
+                insert_result = db_service.insert_reviews([review for _, review in valid_reviews])
+                if not insert_result.success:
+                    return jsonify({
+                        'success': False,
+                        'error': 'Erro ao salvar avaliações no banco de dados'
+                    }), 500
+                stored_reviews = insert_result.data['reviews']
+                created_flags = insert_result.data['created']
+            
+            reviews_by_user = {}
+            for (index, _), review, created in zip(valid_reviews, stored_reviews, created_flags):
+                results[index].update({
+                    'review_id': review.id,
+                    'review_date': review.review_date,
+                    'average_score': review.get_average_score(),
+                    'duplicate': not created
+                })
+                if created:
+                    reviews_by_user.setdefault(review.user_email, []).append(review)
+            
+            # Uma confirmação por usuário e uma notificação para o admin
+            for user_email, reviews in reviews_by_user.items():
+                confirmation_service.send_batch_confirmation(reviews, user_email)
+            if reviews_by_user:
+                confirmation_service.send_admin_batch_notification(reviews_by_user)
+            
+            accepted = len(valid_reviews)
+            saved = created_flags.count(True)
+            return jsonify({
+                'success': accepted == len(items),
+                'message': f'{saved} de {len(items)} avaliações salvas',
+                'saved': saved,
+                'duplicates': accepted - saved,
+                'rejected': len(items) - accepted,
+                'results': results
+            }), 200 if accepted else 400
+            
+        except HTTPException:
+            # Ex.: 413 quando o corpo excede MAX_CONTENT_LENGTH
+            raise
+        except Exception as e:
+            print(f"Erro ao processar lote: {str(e)}")
+            return jsonify({
+                'success': False,
+                'error': 'Erro interno do servidor'
+            }), 500
+    
+    def cached_json(compute, vary=''):
+        """
+        Responde JSON com ETag derivado do último ID de avaliação.
+        
+        Se o cliente já tem a versão atual (If-None-Match), retorna 304 sem
+        executar a consulta. Como avaliações só são inseridas, o maior ID muda
+        sempre que os dados mudam.
+        
+        Args:
+            compute: Função sem argumentos que retorna um Result com os dados
+            vary: Texto extra que também muda o ETag (ex.: data de hoje)
+        """
+        latest_result = db_service.get_latest_review_id()
+        if not latest_result.success:
+            return jsonify({
+                'success': False,
+                'error': 'Erro ao consultar banco de dados'
+            }), 500
+        
+        query_hash = hashlib.sha1(f"{request.full_path}|{vary}".encode('utf-8')).hexdigest()[:16]
+        etag = f"{latest_result.data}-{query_hash}"
+        
+        if request.if_none_match.contains_weak(etag):
+            response = app.response_class(status=304)
+        else:
+            result = compute()
+            if not result.success:
+                return jsonify({
+                    'success': False,
+                    'error': result.get_first_error()
+                }), 400
+            response = jsonify({'success': True, **result.data})
+        
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    
+    @app.route('/api/reviews')
+    @read_rate_limited
+    def list_reviews():
+        """
+        Lista avaliações com paginação por cursor.
+        
+        Parâmetros: limit, cursor, start, end (YYYY-MM-DD ou DD/MM/YYYY),
+        email e fields (lista separada por vírgulas).
+        """
+        try:
+            limit = min(int(request.args.get('limit', settings.API_PAGE_DEFAULT_LIMIT)),
+                        settings.API_PAGE_MAX_LIMIT)
+            cursor_id = request.args.get('cursor', type=int)
+            start_date, end_date = _parse_period_args()
+            fields_arg = request.args.get('fields', '')
+            fields = [f.strip() for f in fields_arg.split(',') if f.strip()] or None
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': f'Parâmetro inválido: {str(e)}'
+            }), 400
+        
+        if limit < 1:
+            return jsonify({
+                'success': False,
+                'error': 'Parâmetro limit deve ser maior que zero'
+            }), 400
+        
+        return cached_json(lambda: db_service.get_reviews_page(
+            limit, cursor_id, start_date, end_date, request.args.get('email'), fields
+        ))
+    
+    @app.route('/api/stats/weekly')
+    @read_rate_limited
+    def weekly_stats():
+        """Médias dos últimos 7 dias (opcionalmente de um usuário)."""
+        today = date.today()
+        start_date = (today - timedelta(days=6)).isoformat()
+        
+        return cached_json(lambda: db_service.get_stats_by_date_range(
+            start_date, today.isoformat(), request.args.get('email')
+        ), vary=today.isoformat())
+    
+    @app.route('/api/stats/range')
+    @read_rate_limited
+    def range_stats():
+        """Médias de um período (start/end) e opcionalmente de um usuário."""
+        try:
+            start_date, end_date = _parse_period_args()
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': f'Parâmetro inválido: {str(e)}'
+            }), 400
+        
+        return cached_json(lambda: db_service.get_stats_by_date_range(
+            start_date, end_date, request.args.get('email')
+        ))
+    
+    @app.route('/api/stats/themes')
+    @read_rate_limited
+    def themes_stats():
+        """Temas mais citados nos comentários dos últimos N meses (months, email, limit)."""
+        months = request.args.get('months', 3, type=int)
+        limit = min(request.args.get('limit', 10, type=int), settings.API_PAGE_MAX_LIMIT)
+        
+        if months < 1 or limit < 1:
+            return jsonify({
+                'success': False,
+                'error': 'Parâmetros months e limit devem ser maiores que zero'
+            }), 400
+        
+        today = date.today()
+        start_date = (today - timedelta(days=30 * months)).isoformat()
+        
+        return cached_json(lambda: db_service.get_top_terms(
+            start_date, today.isoformat(), request.args.get('email'), limit
+        ), vary=today.isoformat())
+    
+    @app.route('/api/stats/correlations')
+    @read_rate_limited
+    def correlations_stats():
+        """
+        Matriz de correlação entre as áreas (start, end e email); sem start,
+        usa as últimas REPORT_CORRELATION_WEEKS semanas até end.
+        """
+        try:
+            start_date, end_date = _parse_period_args()
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': f'Parâmetro inválido: {str(e)}'
+            }), 400
+        
+        today = date.today()
+        end_date = end_date or today.isoformat()
+        if not start_date:
+            weeks_back = timedelta(weeks=settings.REPORT_CORRELATION_WEEKS - 1)
+            start_date = (date.fromisoformat(end_date) - weeks_back).isoformat()
+        
+        return cached_json(lambda: db_service.get_area_correlations(
+            start_date, end_date, request.args.get('email')
+        ), vary=today.isoformat())
+    
+    @app.route('/api/export')
+    @read_rate_limited
+    def export_reviews():
+        """
+        Exporta avaliações em streaming (sem carregar o histórico em memória).
+        
+        Parâmetros: format (csv ou ndjson), gzip (1/true), start, end e email.
+        """
+        export_format = request.args.get('format', 'csv').lower()
+        compress = request.args.get('gzip', '').lower() in ('1', 'true', 'yes')
+        
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({
+                'success': False,
+                'error': 'Parâmetro format deve ser csv ou ndjson'
+            }), 400
+        
+        try:
+            start_date, end_date = _parse_period_args()
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': f'Parâmetro inválido: {str(e)}'
+            }), 400
+        
+        filename = f"avaliacoes.{export_format}{'.gz' if compress else ''}"
+        chunks = services.export.iter_export(
+            export_format, compress, start_date, end_date, request.args.get('email')
+        )
+        
+        return app.response_class(
+            stream_with_context(chunks),
+            mimetype='application/gzip' if compress else EXPORT_FORMATS[export_format],
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+    
+    @app.route('/api/reports/weekly')
+    @read_rate_limited
+    def weekly_reports():
+        """Relatórios semanais já calculados (weekly_report.py --backfill)."""
+        try:
+            start_date, end_date = _parse_period_args()
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': f'Parâmetro inválido: {str(e)}'
+            }), 400
+        
+        result = db_service.get_weekly_reports(start_date, end_date, request.args.get('email'))
+        if not result.success:
+            return jsonify({
+                'success': False,
+                'error': result.get_first_error()
+            }), 500
+        
+        return jsonify({'success': True, 'reports': result.data})
+    
     @app.route('/sucesso')
     def sucesso():
         """Página de confirmação após envio."""
         return render_template('sucesso.html')
     
+    @app.before_request
+    def track_request_started():
+        """Conta as requisições em andamento (usado pela sonda de prontidão)."""
+        health_service.request_started()
+    
+    @app.teardown_request
+    def track_request_finished(error=None):
+        """Desconta a requisição ao terminar, com ou sem erro."""
+        health_service.request_finished()
+    
     @app.route('/health')
+    @app.route('/health/live')
     def health():
-        """Endpoint de health check."""
+        """Endpoint de liveness: o processo está de pé (não consulta dependências)."""
         return jsonify({
             'status': 'ok',
             'timestamp': datetime.now().isoformat()
         })
     
+    @app.route('/health/ready')
+    def health_ready():
+        """
+        Endpoint de readiness: mede banco, SMTP (com cache) e trabalho pendente.
+        
+        Retorna 503 quando alguma verificação falha ou passa do limite.
+        """
+        readiness = health_service.get_readiness()
+        
+        return jsonify({
+            'status': 'ok' if readiness['ready'] else 'unavailable',
+            **readiness
+        }), 200 if readiness['ready'] else 503
+    
     return app
 
 
@@ -11,6 +11,13 @@ const selections = {
     mind: null
 };
 
+// Chave de idempotência do envio: a mesma em todas as retentativas
+let idempotencyKey = newIdempotencyKey();
+
+// Tempo máximo de espera por resposta e número de retentativas
+const REQUEST_TIMEOUT_MS = 15000;
+const MAX_RETRIES = 2;
+
 // Inicializa quando o DOM estiver carregado
 document.addEventListener('DOMContentLoaded', function() {
     console.log('✅ Formulário carregado');
@@ -168,20 +175,15 @@ async function handleFormSubmit(event) {
         mind: parseInt(selections.mind),
         positive_points: document.getElementById('positive_points').value.trim(),
         negative_points: document.getElementById('negative_points').value.trim(),
-        email: document.getElementById('userEmail').value.trim()
+        email: document.getElementById('userEmail').value.trim(),
+        date: document.getElementById('reviewDate').value.trim()
     };
     
     console.log('📊 Dados:', data);
     
     try {
         // Envia os dados para o servidor
-        const response = await fetch('/api/submit', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify(data)
-        });
+        const response = await postWithRetry('/api/submit', data);
         
         const result = await response.json();
         
@@ -200,6 +202,9 @@ async function handleFormSubmit(event) {
             console.error('❌ Erro:', result);
             showError(result.error || 'Erro ao enviar avaliação');
             
+            // O servidor recusou este envio: a correção é um envio novo
+            idempotencyKey = newIdempotencyKey();
+            
             // Reabilita o botão
             submitBtn.disabled = false;
             submitBtn.textContent = '📤 Enviar Avaliação';
@@ -215,6 +220,54 @@ async function handleFormSubmit(event) {
     }
 }
 
+/**
+ * Gera uma nova chave de idempotência
+ */
+function newIdempotencyKey() {
+    return (window.crypto && crypto.randomUUID)
+        ? crypto.randomUUID()
+        : `${Date.now()}-${Math.random().toString(16).slice(2)}`;
+}
+
+/**
+ * Envia JSON com Idempotency-Key, repetindo em caso de timeout, erro de rede ou 5xx.
+ * O servidor devolve a resposta original se a mesma chave chegar de novo.
+ */
+async function postWithRetry(url, data) {
+    let lastError = null;
+    
+    for (let attempt = 0; attempt <= MAX_RETRIES; attempt++) {
+        const controller = new AbortController();
+        const timer = setTimeout(() => controller.abort(), REQUEST_TIMEOUT_MS);
+        
+        try {
+            const response = await fetch(url, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'Idempotency-Key': idempotencyKey
+                },
+                body: JSON.stringify(data),
+                signal: controller.signal
+            });
+            
+            if (response.status < 500 || attempt === MAX_RETRIES) {
+                return response;
+            }
+        } catch (error) {
+            lastError = error;
+            console.warn(`⚠️ Tentativa ${attempt + 1} falhou:`, error);
+        } finally {
+            clearTimeout(timer);
+        }
+        
+        // Espera um pouco antes de tentar de novo
+        await new Promise(resolve => setTimeout(resolve, 1000 * (attempt + 1)));
+    }
+    
+    throw lastError || new Error('Falha ao enviar');
+}
+
 /**
  * Utilitário para debug
  */
@@ -0,0 +1,464 @@
+"""
+Benchmarks do Diário Inteligente.
+Mede o desempenho das partes críticas sem precisar do servidor web nem de SMTP.
+
+Uso:
+    python benchmark.py validation
+    python benchmark.py all --n 200000
+    python benchmark.py importtime --n 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def _report(name: str, count: int, elapsed: float, unit: str = 'ops'):
+    """Imprime a vazão de um benchmark."""
+    rate = count / elapsed if elapsed > 0 else float('inf')
+    print(f"  {name:<45} {rate:>14,.0f} {unit}/s  ({count:,} em {elapsed:.3f}s)")
+
+
+def _timed(function, count: int) -> float:
+    """Executa a função `count` vezes e retorna o tempo total em segundos."""
+    start = time.perf_counter()
+    for _ in range(count):
+        function()
+    return time.perf_counter() - start
+
+
+def bench_validation(n: int):
+    """Validações por segundo do validador compilado (válidas e inválidas)."""
+    from src.models.review import Review
+    from src.models.validation import SUBMISSION_VALIDATOR
+    
+    print("📏 Validação de avaliações")
+    
+    valid = {
+        'work': 8, 'training': '7', 'studies': 9, 'mind': 6,
+        'positive_points': 'Dia produtivo', 'negative_points': 'Dormi pouco',
+        'email': 'Usuario@Exemplo.com', 'date': '2025-10-06'
+    }
+    invalid = {
+        'work': 11, 'training': 'x', 'studies': 9,
+        'positive_points': '  ', 'negative_points': 'Dormi pouco', 'email': 'sem-arroba'
+    }
+    
+    _report('validar envio válido', n, _timed(lambda: SUBMISSION_VALIDATOR.validate(valid), n))
+    _report('validar envio inválido (sem mensagens)', n,
+            _timed(lambda: SUBMISSION_VALIDATOR.validate(invalid), n))
+    _report('validar envio inválido (com mensagens)', n,
+            _timed(lambda: SUBMISSION_VALIDATOR.validate(invalid).messages(), n))
+    
+    data = SUBMISSION_VALIDATOR.validate(valid).data
+    _report('Review.from_validated (sem revalidar)', n, _timed(lambda: Review.from_validated(data), n))
+    _report('Review(...) (valida no modelo)', n, _timed(lambda: Review(
+        work=8, training=7, studies=9, mind=6,
+        positive_points='Dia produtivo', negative_points='Dormi pouco'
+    ), n))
+
+
+def bench_analytics(n: int):
+    """Motor de análise em Python puro e com NumPy sobre n avaliações."""
+    import random
+    from src.services.analytics_engine import get_analytics_engine
+    
+    print(f"📈 Motor de análise ({n:,} avaliações)")
+    
+    generator = random.Random(42)
+    rows = [tuple(generator.randint(0, 10) for _ in range(4)) for _ in range(n)]
+    
+    results = {}
+    for name in ('python', 'numpy'):
+        try:
+            engine = get_analytics_engine(name)
+        except ImportError:
+            print(f"  {name:<45} (NumPy não instalado)")
+            continue
+        
+        start = time.perf_counter()
+        scores = engine.load(rows)
+        _report(f'{name}: carregar', n, time.perf_counter() - start, 'avaliações')
+        
+        start = time.perf_counter()
+        summary = engine.summarize(scores)
+        _report(f'{name}: médias, variâncias, tendências, correlações', n,
+                time.perf_counter() - start, 'avaliações')
+        
+        start = time.perf_counter()
+        rolling = engine.rolling_averages(scores, 28)
+        _report(f'{name}: médias móveis (28)', n, time.perf_counter() - start, 'avaliações')
+        
+        results[name] = (summary, rolling)
+    
+    if len(results) == 2:
+        identical = results['python'] == results['numpy']
+        print(f"  {'✅' if identical else '❌'} resultados idênticos entre os backends")
+        return identical
+
+
+def bench_sentiment(n: int):
+    """Notas de sentimento por segundo (léxico local, em lote) sobre n comentários."""
+    import random
+    from src.models.sentiment import LEXICON, SentimentScorer
+    
+    print(f"💬 Sentimento dos comentários ({n:,} comentários)")
+    
+    generator = random.Random(42)
+    vocabulary = list(LEXICON) + ['não', 'muito', 'pouco', 'dia', 'trabalho', 'treino', 'estudos',
+                                  'reunião', 'dormi', 'cedo', 'projeto', 'hoje', 'semana']
+    comments = [' '.join(generator.choices(vocabulary, k=generator.randint(3, 15))) for _ in range(n)]
+    
+    start = time.perf_counter()
+    SentimentScorer().score_many(comments)
+    _report('score_many (tabelas frias)', n, time.perf_counter() - start, 'comentários')
+    
+    scorer = SentimentScorer()
+    scorer.score_many(comments[:1000])
+    start = time.perf_counter()
+    scores = scorer.score_many(comments)
+    _report('score_many', n, time.perf_counter() - start, 'comentários')
+    
+    positive = sum(score > 0 for score in scores)
+    print(f"  {positive:,} positivos, {sum(score < 0 for score in scores):,} negativos")
+
+
+# Crescimento máximo da memória (MB) durante a exportação do benchmark export
+EXPORT_MEMORY_BUDGET_MB = 50
+
+
+def bench_export(n: int):
+    """Exportação em streaming (CSV, NDJSON e gzip) de n avaliações sintéticas."""
+    import random
+    import resource
+    import tempfile
+    from datetime import date, timedelta
+    from src.services.database_service import DatabaseService
+    from src.services.export_service import ExportService
+    
+    print(f"📦 Exportação em streaming ({n:,} avaliações)")
+    
+    def max_rss_mb() -> float:
+        # ru_maxrss é o pico de memória do processo (KB no Linux)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    
+    with tempfile.TemporaryDirectory() as directory:
+        db = DatabaseService()
+        db.db_path = os.path.join(directory, 'benchmark.db')
+        db.create_tables()
+        
+        # Carga sintética gravada direto na tabela (sem acumuladores)
+        generator = random.Random(42)
+        first_day = date(2000, 1, 1)
+        conn = db._get_connection().data
+        with conn:
+            conn.executemany('''
+                INSERT INTO reviews (work, training, studies, mind, positive_points, negative_points,
+                                     user_email, review_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                (generator.randint(0, 10), generator.randint(0, 10), generator.randint(0, 10),
+                 generator.randint(0, 10), 'Dia produtivo, treino "pesado"', 'Dormi pouco',
+                 f'usuario{index % 1000}@exemplo.com',
+                 (first_day + timedelta(days=index // 1000)).isoformat())
+                for index in range(n)
+            ))
+        conn.close()
+        
+        exporter = ExportService(db)
+        within_budget = True
+        for name in ('avaliacoes.csv', 'avaliacoes.ndjson', 'avaliacoes.csv.gz'):
+            path = os.path.join(directory, name)
+            memory_before = max_rss_mb()
+            result = exporter.export_to_file(path)
+            growth = max_rss_mb() - memory_before
+            
+            data = result.data
+            ok = result.success and data['rows'] == n and growth <= EXPORT_MEMORY_BUDGET_MB
+            within_budget = within_budget and ok
+            _report(f"{'✅' if ok else '❌'} {name} ({data['bytes'] / 1_000_000:.0f} MB, "
+                    f"+{growth:.0f} MB de memória)", data['rows'], data['seconds'], 'avaliações')
+            os.remove(path)
+    
+    return within_budget
+
+
+def bench_import(n: int):
+    """Importação em lotes de n avaliações históricas de um arquivo NDJSON."""
+    import json
+    import random
+    import tempfile
+    from datetime import date, timedelta
+    from src.services.database_service import DatabaseService
+    from src.services.import_service import ImportService
+    
+    print(f"📥 Importação de histórico ({n:,} linhas NDJSON, 1% inválidas)")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        db = DatabaseService()
+        db.db_path = os.path.join(directory, 'benchmark.db')
+        db.create_tables()
+        
+        generator = random.Random(42)
+        first_day = date(2000, 1, 1)
+        path = os.path.join(directory, 'historico.ndjson')
+        with open(path, 'w', encoding='utf-8') as output:
+            for index in range(n):
+                day = first_day + timedelta(days=index // 1000)
+                output.write(json.dumps({
+                    'user_email': f'usuario{index % 1000}@exemplo.com',
+                    'review_date': day.isoformat(),
+                    'created_at': f'{day.isoformat()}T21:30:00',
+                    'work': generator.randint(0, 10) if index % 100 else 11,
+                    'training': generator.randint(0, 10),
+                    'studies': generator.randint(0, 10),
+                    'mind': generator.randint(0, 10),
+                    'positive_points': 'Dia produtivo, treino pesado',
+                    'negative_points': 'Dormi pouco e fiquei cansado',
+                }, ensure_ascii=False) + '\n')
+        
+        result = ImportService(db).import_file(path)
+        if not result.success:
+            print(f"  ❌ {result.get_first_error()}")
+            return False
+        
+        data = result.data
+        _report(f"gravadas {data['created']:,}, rejeitadas {data['rejected']:,}",
+                data['rows'], data['seconds'], 'linhas')
+        return data['created'] + data['rejected'] == n
+
+
+# Tempo máximo (ms) para extrair os campos de 1 MB de corpo de email
+EMAIL_PARSE_BUDGET_MS_PER_MB = 100
+
+
+def bench_email(n: int):
+    """Extração dos campos de respostas por email: típicas, grandes e adversariais."""
+    from src.services.email_processor_service import parse_email_body
+    
+    print(f"📨 Extração de respostas por email ({n:,} respostas típicas)")
+    
+    typical = (
+        "work: 8\ntraining: 6\nstudies: 7\nmind: 9\n"
+        "positive_points: Treino pesado e estudei bastante\n"
+        "negative_points: Dormi pouco\n\n"
+        "Em seg., 1 de jan. de 2024 às 20:00, Diário <diario@exemplo.com> escreveu:\n"
+        + "> work: ___\n> training: ___\n> studies: ___\n> mind: ___\n" * 5
+    )
+    large = (
+        "work: 8\ntraining: 6\nstudies: 7\nmind: 9\npositive_points: Dia longo\n"
+        + "continuei escrevendo sobre o dia, positive points e negative points\n" * 15000
+        + "negative_points: Nada\n"
+    )
+    adversarial = {
+        'campo repetido sem fim': "positive_points: " * 60000,
+        'linha única de 1 MB': "work: 8 " + "x" * 1_000_000,
+        'citações aninhadas': "> > > positive_points: x\n" * 40000,
+        'cabeçalho sem fim': "On " + "a" * 1_000_000,
+    }
+    
+    ok = parse_email_body(typical) is not None and parse_email_body(large) is not None
+    _report("típicas", n, _timed(lambda: parse_email_body(typical), n), 'respostas')
+    
+    within_budget = ok
+    for name, body in [('grande (1 MB, 15 mil linhas)', large)] + list(adversarial.items()):
+        elapsed = _timed(lambda: parse_email_body(body), 5) / 5
+        megabytes = len(body) / 1_000_000
+        budget_ok = elapsed * 1000 <= EMAIL_PARSE_BUDGET_MS_PER_MB * max(megabytes, 1)
+        within_budget = within_budget and budget_ok
+        print(f"  {'✅' if budget_ok else '❌'} {name:<43} {elapsed * 1000:>8.1f} ms  ({megabytes:.1f} MB)")
+    
+    return within_budget
+
+
+def bench_ingest(n: int):
+    """Ingestão de n respostas por email de um mbox e nova execução sem mensagens novas."""
+    import mailbox
+    import random
+    import tempfile
+    from datetime import date, timedelta
+    from email.message import EmailMessage
+    from src.services.database_service import DatabaseService
+    from src.services.mailbox_ingest_service import MailboxIngestService
+    
+    print(f"📬 Ingestão de respostas por email ({n:,} mensagens mbox, sem confirmações)")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        db = DatabaseService()
+        db.db_path = os.path.join(directory, 'benchmark.db')
+        db.create_tables()
+        
+        generator = random.Random(42)
+        first_day = date(2000, 1, 1)
+        path = os.path.join(directory, 'respostas.mbox')
+        box = mailbox.mbox(path)
+        for index in range(n):
+            message = EmailMessage()
+            message['From'] = f'Usuário {index % 1000} <usuario{index % 1000}@exemplo.com>'
+            message['Date'] = (first_day + timedelta(days=index // 1000)).strftime('%a, %d %b %Y 21:30:00 -0300')
+            message['Message-ID'] = f'<resposta{index}@exemplo.com>'
+            message['Subject'] = 'Re: Avaliação diária'
+            message.set_content(
+                f"work: {generator.randint(0, 10)}\ntraining: {generator.randint(0, 10)}\n"
+                f"studies: {generator.randint(0, 10)}\nmind: {generator.randint(0, 10)}\n"
+                "positive_points: Dia produtivo, treino pesado\n"
+                "negative_points: Dormi pouco e fiquei cansado\n\n"
+                "Em seg., Diário <diario@exemplo.com> escreveu:\n> work: ___\n"
+            )
+            box.add(message)
+        box.close()
+        
+        service = MailboxIngestService(db)
+        result = service.ingest(path, send_confirmations=False)
+        if not result.success:
+            print(f"  ❌ {result.get_first_error()}")
+            return False
+        data = result.data
+        _report(f"gravadas {data['created']:,}", data['messages'], data['seconds'], 'mensagens')
+        
+        rerun = service.ingest(path, send_confirmations=False)
+        if not rerun.success:
+            print(f"  ❌ {rerun.get_first_error()}")
+            return False
+        print(f"  nova execução: {rerun.data['messages']} mensagens lidas em {rerun.data['seconds'] * 1000:.1f} ms")
+        return data['created'] == n and rerun.data['messages'] == 0
+
+
+# Tempo máximo (ms) da consulta de tendências sobre o histórico do benchmark trends
+TRENDS_BUDGET_MS = 50
+
+
+def bench_trends(n: int):
+    """Tendências semanais (funções de janela) sobre n anos de avaliações diárias."""
+    import random
+    import tempfile
+    from datetime import date, timedelta
+    from src.models.review import Review
+    from src.services.ai_analysis_service import AIAnalysisService
+    from src.services.database_service import DatabaseService
+    
+    days = 365 * n
+    print(f"📈 Tendências semanais ({n} anos, {days:,} avaliações diárias)")
+    
+    generator = random.Random(42)
+    first_day = date.today() - timedelta(days=days - 1)
+    reviews = [
+        Review(
+            work=generator.randint(0, 10), training=generator.randint(0, 10),
+            studies=generator.randint(0, 10), mind=generator.randint(0, 10),
+            positive_points='Dia produtivo', negative_points='Dormi pouco',
+            user_email='usuario@exemplo.com',
+            review_date=(first_day + timedelta(days=offset)).isoformat()
+        )
+        for offset in range(days)
+    ]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        db = DatabaseService()
+        db.db_path = os.path.join(directory, 'benchmark.db')
+        db.create_tables()
+        
+        start = time.perf_counter()
+        db.insert_reviews(reviews)
+        _report('inserir com acumuladores', days, time.perf_counter() - start, 'avaliações')
+        
+        repeat = 20
+        result = db.get_weekly_trends('usuario@exemplo.com')
+        trends_ms = _timed(lambda: db.get_weekly_trends('usuario@exemplo.com'), repeat) / repeat * 1000
+        trends = result.data
+        within_budget = result.success and trends_ms <= TRENDS_BUDGET_MS
+        print(f"  {'✅' if within_budget else '❌'} {'consulta de tendências':<43} {trends_ms:>8.1f} ms  "
+              f"({len(trends['history']):,} semanas, orçamento {TRENDS_BUDGET_MS} ms)")
+        
+        summary = AIAnalysisService().analyze_trends(trends)
+        print(f"  média de 4 semanas: {summary['moving_averages']['Geral']}, "
+              f"variação: {summary['deltas']['Geral']}, sequência: {summary['current_streak']}")
+        
+        elapsed = _timed(lambda: db.get_summary_stats(), repeat) / repeat
+        print(f"  {'resumo (quantidade, último ID, média)':<45} {elapsed * 1000:>8.1f} ms")
+        
+        elapsed = _timed(lambda: db.get_all_reviews(), 1)
+        print(f"  {'(comparação) ler todas as avaliações':<45} {elapsed * 1000:>8.1f} ms")
+    
+    return within_budget
+
+
+# Tempo máximo de importação (ms) de cada ponto de entrada; acima disso o
+# benchmark importtime falha (saída 1)
+IMPORT_BUDGETS_MS = {
+    'weekly_report': 50,
+    'daily_form': 50,
+    'scheduler': 50,
+    'src.main': 80,
+}
+
+
+def _import_time_ms(module: str) -> float:
+    """Tempo cumulativo de importação do módulo (ms) medido por -X importtime."""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True
+    )
+    
+    # Formato: "import time: self [us] | cumulative | imported package"
+    for line in reversed(completed.stderr.splitlines()):
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module and not parts[2][1:].startswith(' '):
+            return int(parts[1]) / 1000
+    
+    raise RuntimeError(f"Tempo de importação de {module} não encontrado")
+
+
+def bench_importtime(n: int):
+    """Tempo de inicialização dos pontos de entrada comparado ao orçamento."""
+    print("⏱️  Tempo de importação dos pontos de entrada (melhor de %d)" % n)
+    
+    within_budget = True
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        elapsed = min(_import_time_ms(module) for _ in range(n))
+        ok = elapsed <= budget
+        within_budget = within_budget and ok
+        print(f"  {'✅' if ok else '❌'} {module:<43} {elapsed:>8.1f} ms  (orçamento {budget} ms)")
+    
+    return within_budget
+
+
+BENCHMARKS = {
+    'validation': (bench_validation, 200000),
+    'importtime': (bench_importtime, 5),
+    'analytics': (bench_analytics, 1000000),
+    'trends': (bench_trends, 10),
+    'sentiment': (bench_sentiment, 200000),
+    'export': (bench_export, 1000000),
+    'import': (bench_import, 200000),
+    'email': (bench_email, 100000),
+    'ingest': (bench_ingest, 20000),
+}
+
+
+def main():
+    """Função principal: executa um ou todos os benchmarks."""
+    parser = argparse.ArgumentParser(description='Benchmarks do Diário Inteligente')
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS) + ['all'])
+    parser.add_argument('--n', type=int, default=None, help='Tamanho da carga (padrão por benchmark)')
+    args = parser.parse_args()
+    
+    names = sorted(BENCHMARKS) if args.benchmark == 'all' else [args.benchmark]
+    for name in names:
+        function, default_n = BENCHMARKS[name]
+        result = function(args.n or default_n)
+        if result is False:
+            return 1
+        print()
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,7 +10,7 @@ from datetime import datetime
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from src.services.daily_form_sender import DailyFormService
+from src.services.container import get_services
 from src.config.settings import settings
 
 
@@ -28,8 +28,8 @@ def main():
     
     print(f"📧 Enviando formulário para: {target_email}")
     
-    # Inicializa o serviço
-    form_service = DailyFormService()
+    # Obtém o serviço (criado sob demanda pelo contêiner)
+    form_service = get_services().daily_form
     
     # Verifica se hoje é dia de formulário
     schedule_info = form_service.get_form_schedule_info()
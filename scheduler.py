@@ -0,0 +1,92 @@
+"""
+Agendador contínuo das tarefas automáticas (formulário diário e relatório semanal).
+Alternativa ao GitHub Actions: um único processo que fica no ar e executa as
+tarefas nos horários configurados, sem reinstalar dependências a cada execução.
+
+Uso:
+    python scheduler.py           # fica no ar executando as tarefas
+    python scheduler.py --once    # executa as tarefas com horário pendente e sai
+    python scheduler.py --status  # mostra a última execução de cada tarefa
+"""
+
+import argparse
+import os
+import signal
+import sys
+from datetime import datetime
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.services.container import get_services
+from src.config.settings import settings
+
+
+def show_status(scheduler) -> int:
+    """Mostra a última execução e o próximo horário de cada tarefa."""
+    result = scheduler.get_status()
+    if not result.success:
+        print(f"❌ {result.get_first_error()}")
+        return 1
+    
+    for job in result.data:
+        print(f"\n📋 {job['job']} ({job['schedule']})")
+        if job['slot']:
+            print(f"   Último horário: {job['slot']} - {job['status']}"
+                  f"{' em ' + job['finished_at'] if job['finished_at'] else ''}")
+            if job['error']:
+                print(f"   ⚠️ {job['error']}")
+        else:
+            print("   Ainda não executada")
+        print(f"   Próximo horário: {job['next_slot']}")
+    
+    return 0
+
+
+def main():
+    """Função principal do agendador."""
+    parser = argparse.ArgumentParser(description='Agendador do Diário Inteligente')
+    parser.add_argument('--once', action='store_true',
+                        help='Executa as tarefas com horário pendente e sai')
+    parser.add_argument('--status', action='store_true',
+                        help='Mostra a última execução de cada tarefa')
+    args = parser.parse_args()
+    
+    print(f"🤖 Iniciando agendador - {datetime.now()}")
+    print(f"📱 {settings.APP_NAME} v{settings.APP_VERSION}")
+    
+    # Os serviços são criados uma vez e reaproveitados por todas as execuções
+    services = get_services()
+    try:
+        scheduler = services.scheduler
+    except ValueError as e:
+        print(f"❌ Configuração do agendador inválida: {str(e)}")
+        return 1
+    
+    for tables_result in (services.database.create_tables(), scheduler.create_tables()):
+        if not tables_result.success:
+            print(f"❌ {tables_result.get_first_error()}")
+            return 1
+    
+    if args.status:
+        return show_status(scheduler)
+    
+    if args.once:
+        results = scheduler.run_due()
+        return 1 if any(result is not None and not result.success for result in results.values()) else 0
+    
+    # Encerra de forma limpa com SIGTERM (systemd, docker stop)
+    signal.signal(signal.SIGTERM, lambda signum, frame: scheduler.stop())
+    
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        pass
+    
+    print("👋 Agendador encerrado")
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -4,10 +4,28 @@ Todas as configurações ficam em um lugar só, facilitando a manutenção.
 """
 
 import os
-from dotenv import load_dotenv
 
-# Carrega as variáveis de ambiente do arquivo .env
-load_dotenv()
+
+def _find_env_file():
+    """Procura um arquivo .env a partir deste diretório, subindo até a raiz."""
+    path = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        candidate = os.path.join(path, '.env')
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+# Carrega as variáveis de ambiente do arquivo .env. O python-dotenv só é
+# importado quando existe um .env (no GitHub Actions as variáveis já vêm do
+# ambiente e a importação só atrasaria a inicialização).
+_env_file = _find_env_file()
+if _env_file:
+    from dotenv import load_dotenv
+    load_dotenv(_env_file)
 
 
 class Settings:
@@ -22,6 +40,63 @@ class Settings:
     EMAIL_SMTP_SERVER = os.getenv('EMAIL_SMTP_SERVER', 'smtp.gmail.com')
     EMAIL_SMTP_PORT = int(os.getenv('EMAIL_SMTP_PORT', '587'))
     
+    # Configurações da API web
+    BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', '500'))
+    IDEMPOTENCY_CACHE_SIZE = int(os.getenv('IDEMPOTENCY_CACHE_SIZE', '1000'))
+    IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv('IDEMPOTENCY_KEY_TTL_HOURS', '24'))
+    API_PAGE_DEFAULT_LIMIT = int(os.getenv('API_PAGE_DEFAULT_LIMIT', '50'))
+    API_PAGE_MAX_LIMIT = int(os.getenv('API_PAGE_MAX_LIMIT', '200'))
+    MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', str(1024 * 1024)))  # bytes
+    
+    # Limites de requisições (token bucket por IP e por email)
+    RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMIT_IP_PER_MINUTE = float(os.getenv('RATE_LIMIT_IP_PER_MINUTE', '30'))
+    RATE_LIMIT_IP_BURST = float(os.getenv('RATE_LIMIT_IP_BURST', '10'))
+    RATE_LIMIT_EMAIL_PER_HOUR = float(os.getenv('RATE_LIMIT_EMAIL_PER_HOUR', '20'))
+    RATE_LIMIT_EMAIL_BURST = float(os.getenv('RATE_LIMIT_EMAIL_BURST', '5'))
+    RATE_LIMIT_READ_PER_MINUTE = float(os.getenv('RATE_LIMIT_READ_PER_MINUTE', '120'))
+    RATE_LIMIT_READ_BURST = float(os.getenv('RATE_LIMIT_READ_BURST', '30'))
+    
+    # Verificações de saúde (/health/ready)
+    HEALTH_DB_TIMEOUT_SECONDS = float(os.getenv('HEALTH_DB_TIMEOUT_SECONDS', '1'))
+    HEALTH_DB_MAX_LATENCY_MS = float(os.getenv('HEALTH_DB_MAX_LATENCY_MS', '250'))
+    HEALTH_DB_CHECK_WRITE = os.getenv('HEALTH_DB_CHECK_WRITE', 'false').lower() == 'true'
+    HEALTH_SMTP_CACHE_SECONDS = int(os.getenv('HEALTH_SMTP_CACHE_SECONDS', '300'))
+    HEALTH_SMTP_TIMEOUT_SECONDS = float(os.getenv('HEALTH_SMTP_TIMEOUT_SECONDS', '5'))
+    HEALTH_REQUIRE_SMTP = os.getenv('HEALTH_REQUIRE_SMTP', 'true').lower() == 'true'
+    HEALTH_MAX_IN_FLIGHT = int(os.getenv('HEALTH_MAX_IN_FLIGHT', '50'))
+    
+    # Relatório semanal para todos os usuários (weekly_report.py --all-users)
+    WEEKLY_REPORT_WORKERS = int(os.getenv('WEEKLY_REPORT_WORKERS', '4'))
+    WEEKLY_REPORT_EMAIL_BATCH = int(os.getenv('WEEKLY_REPORT_EMAIL_BATCH', '50'))
+    REPORT_BACKFILL_WORKERS = int(os.getenv('REPORT_BACKFILL_WORKERS', str(os.cpu_count() or 1)))
+    REPORT_CORRELATION_WEEKS = int(os.getenv('REPORT_CORRELATION_WEEKS', '12'))
+    
+    # Ingestão de respostas por email (run.py ingest)
+    MAIL_INGEST_WORKERS = int(os.getenv('MAIL_INGEST_WORKERS', str(os.cpu_count() or 1)))
+    
+    # Destinatários das tarefas automáticas (daily_form.py, weekly_report.py e scheduler.py)
+    DAILY_FORM_EMAIL = os.getenv('DAILY_FORM_EMAIL')
+    WEEKLY_REPORT_EMAIL = os.getenv('WEEKLY_REPORT_EMAIL')
+    
+    # Agendador em processo (scheduler.py): dias (monday ... sunday, separados
+    # por vírgula) e horário local (HH:MM) de cada tarefa
+    SCHEDULER_DAILY_FORM_DAYS = os.getenv('SCHEDULER_DAILY_FORM_DAYS', 'monday,wednesday,friday')
+    SCHEDULER_DAILY_FORM_TIME = os.getenv('SCHEDULER_DAILY_FORM_TIME', '20:00')
+    SCHEDULER_WEEKLY_REPORT_DAYS = os.getenv('SCHEDULER_WEEKLY_REPORT_DAYS', 'saturday')
+    SCHEDULER_WEEKLY_REPORT_TIME = os.getenv('SCHEDULER_WEEKLY_REPORT_TIME', '09:00')
+    SCHEDULER_WEEKLY_ALL_USERS = os.getenv('SCHEDULER_WEEKLY_ALL_USERS', 'false').lower() == 'true'
+    SCHEDULER_CATCHUP_HOURS = int(os.getenv('SCHEDULER_CATCHUP_HOURS', '12'))
+    
+    # Alerta de quedas bruscas nas notas (detector EWMA / z-score na gravação)
+    ANOMALY_ALERTS_ENABLED = os.getenv('ANOMALY_ALERTS_ENABLED', 'false').lower() == 'true'
+    ANOMALY_EWMA_ALPHA = float(os.getenv('ANOMALY_EWMA_ALPHA', '0.2'))
+    ANOMALY_Z_THRESHOLD = float(os.getenv('ANOMALY_Z_THRESHOLD', '2.5'))
+    ANOMALY_MIN_HISTORY = int(os.getenv('ANOMALY_MIN_HISTORY', '7'))
+    
+    # Motor de análise: 'auto' usa NumPy se estiver instalado, ou 'numpy'/'python'
+    ANALYTICS_BACKEND = os.getenv('ANALYTICS_BACKEND', 'auto')
+    
     # Configurações da aplicação
     APP_NAME = "Diário Inteligente"
     APP_VERSION = "2.0.0"
@@ -1,13 +1,20 @@
 """
 Diário Inteligente - Aplicação Principal
 Sistema para registrar e avaliar aspectos do dia a dia.
+
+Uso:
+    python run.py                                  # menu interativo
+    python run.py export avaliacoes.csv.gz         # exporta as avaliações
+    python run.py import historico.ndjson          # importa avaliações antigas
+    python run.py ingest ~/Mail/respostas.mbox     # ingere respostas por email (mbox/Maildir)
 """
 
+import argparse
+from typing import List, Optional
 from src.models.review import Review
 from src.models.result import Result
-from src.services.database_service import DatabaseService
-from src.services.email_service import EmailService
-from src.services.weekly_report_service import WeeklyReportService
+from src.models.validation import REVIEW_INPUT_VALIDATOR
+from src.services.container import get_services
 from src.config.settings import settings
 
 
@@ -16,9 +23,10 @@ class DiarioInteligente:
     
     def __init__(self):
         """Inicializa a aplicação."""
-        self.db_service = DatabaseService()
-        self.email_service = EmailService()
-        self.report_service = WeeklyReportService()
+        services = get_services()
+        self.db_service = services.database
+        self.email_service = services.email
+        self.report_service = services.weekly_report
     
     def initialize(self) -> Result:
         """Inicializa o banco de dados."""
@@ -51,15 +59,22 @@ class DiarioInteligente:
             positive_points = input("Pontos positivos do dia: ").strip()
             negative_points = input("Pontos negativos do dia: ").strip()
             
-            # Cria o objeto Review
-            review = Review(
-                work=work,
-                training=training,
-                studies=studies,
-                mind=mind,
-                positive_points=positive_points,
-                negative_points=negative_points
-            )
+            # Valida uma única vez e cria o objeto Review
+            validation = REVIEW_INPUT_VALIDATOR.validate({
+                'work': work,
+                'training': training,
+                'studies': studies,
+                'mind': mind,
+                'positive_points': positive_points,
+                'negative_points': negative_points
+            })
+            
+            if not validation.valid:
+                error_msg = f"Dados inválidos: {'; '.join(validation.messages())}"
+                print(f"\n❌ {error_msg}")
+                return Result.error_result_multiple(validation.messages())
+            
+            review = Review.from_validated(validation.data)
             
             # Salva no banco
             result = self.db_service.insert_review(review)
@@ -153,6 +168,71 @@ class DiarioInteligente:
         
         return result
     
+    def export_reviews(self, path: str, export_format: Optional[str] = None,
+                       start_date: Optional[str] = None, end_date: Optional[str] = None,
+                       user_email: Optional[str] = None) -> Result:
+        """Exporta as avaliações para um arquivo CSV ou NDJSON (gzip se terminar em .gz)."""
+        print(f"\n📦 EXPORTANDO AVALIAÇÕES PARA: {path}")
+        
+        result = get_services().export.export_to_file(
+            path, export_format, start_date=start_date, end_date=end_date, user_email=user_email
+        )
+        
+        if result.success:
+            data = result.data
+            rate = data['rows'] / data['seconds'] if data['seconds'] else 0
+            print(f"✅ {data['rows']:,} avaliações exportadas em {data['seconds']:.1f}s "
+                  f"({rate:,.0f}/s, {data['bytes'] / 1_000_000:.1f} MB, {data['format']}"
+                  f"{' + gzip' if data['compressed'] else ''})")
+        else:
+            print(f"❌ {result.get_first_error()}")
+        
+        return result
+    
+    def import_reviews(self, path: str, import_format: Optional[str] = None,
+                       batch_size: Optional[int] = None) -> Result:
+        """Importa avaliações históricas de um arquivo CSV ou NDJSON (gzip se terminar em .gz)."""
+        print(f"\n📥 IMPORTANDO AVALIAÇÕES DE: {path}")
+        
+        result = get_services().importer.import_file(path, import_format, batch_size)
+        
+        if result.success:
+            data = result.data
+            print(f"✅ {data['rows']:,} linhas lidas em {data['seconds']:.1f}s "
+                  f"({data['rows_per_second']:,.0f}/s)")
+            print(f"   Gravadas: {data['created']:,} | Já existentes: {data['duplicates']:,} "
+                  f"| Rejeitadas: {data['rejected']:,}")
+            for error in data['errors'][:10]:
+                print(f"   ⚠️ Linha {error['line']}: {'; '.join(error['messages'])}")
+            if data['rejected'] > 10:
+                print(f"   ... e mais {data['rejected'] - 10:,} linhas rejeitadas")
+        else:
+            print(f"❌ {result.get_first_error()}")
+        
+        return result
+    
+    def ingest_emails(self, path: str, workers: Optional[int] = None,
+                      batch_size: Optional[int] = None, send_confirmations: bool = True) -> Result:
+        """Ingere as respostas por email novas de um arquivo mbox ou diretório Maildir."""
+        print(f"\n📬 INGERINDO RESPOSTAS POR EMAIL DE: {path}")
+        
+        result = get_services().mailbox_ingest.ingest(path, workers, batch_size, send_confirmations)
+        
+        if result.success:
+            data = result.data
+            print(f"✅ {data['messages']:,} mensagens novas lidas em {data['seconds']:.1f}s "
+                  f"({data['messages_per_second']:,.0f}/s)")
+            print(f"   Gravadas: {data['created']:,} | Já processadas: {data['skipped']:,} "
+                  f"| Dia já avaliado: {data['existing']:,} | Rejeitadas: {data['rejected']:,}")
+            for error in data['errors'][:10]:
+                print(f"   ⚠️ {error['message_id']}: {'; '.join(error['messages'])}")
+            if data['rejected'] > 10:
+                print(f"   ... e mais {data['rejected'] - 10:,} mensagens rejeitadas")
+        else:
+            print(f"❌ {result.get_first_error()}")
+        
+        return result
+    
     def run(self):
         """Executa o menu principal da aplicação."""
         print(f"\n🎯 {settings.APP_NAME} v{settings.APP_VERSION}")
@@ -164,10 +244,12 @@ class DiarioInteligente:
             print("2. Ver relatório semanal")
             print("3. Ver todas as avaliações")
             print("4. Enviar relatório completo com IA")
-            print("5. Sair")
+            print("5. Exportar avaliações (CSV/NDJSON)")
+            print("6. Importar avaliações (CSV/NDJSON)")
+            print("7. Sair")
             
             try:
-                choice = input("\nEscolha uma opção (1-5): ").strip()
+                choice = input("\nEscolha uma opção (1-7): ").strip()
                 
                 if choice == "1":
                     self.register_daily_review()
@@ -182,10 +264,19 @@ class DiarioInteligente:
                     else:
                         print("❌ Email não pode ser vazio")
                 elif choice == "5":
+                    path = input("Arquivo (.csv, .ndjson, com .gz para comprimir) [avaliacoes.csv]: ").strip()
+                    self.export_reviews(path or "avaliacoes.csv")
+                elif choice == "6":
+                    path = input("Arquivo a importar (.csv, .ndjson, com ou sem .gz): ").strip()
+                    if path:
+                        self.import_reviews(path)
+                    else:
+                        print("❌ Arquivo não pode ser vazio")
+                elif choice == "7":
                     print("\n👋 Obrigado por usar o Diário Inteligente!")
                     break
                 else:
-                    print("❌ Opção inválida. Escolha entre 1 e 5.")
+                    print("❌ Opção inválida. Escolha entre 1 e 7.")
                     
             except KeyboardInterrupt:
                 print("\n\n👋 Saindo...")
@@ -194,8 +285,36 @@ class DiarioInteligente:
                 print(f"\n❌ Erro inesperado: {str(e)}")
 
 
-def main():
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Lê os argumentos da linha de comando (sem comando: menu interativo)."""
+    parser = argparse.ArgumentParser(description=settings.APP_NAME)
+    commands = parser.add_subparsers(dest='command')
+    
+    export_parser = commands.add_parser('export', help='Exporta as avaliações para CSV ou NDJSON')
+    export_parser.add_argument('path', help='Arquivo de saída (.csv, .ndjson ou .jsonl; .gz comprime)')
+    export_parser.add_argument('--format', choices=['csv', 'ndjson'], help='Formato (padrão: pela extensão)')
+    export_parser.add_argument('--start', help='Data inicial (YYYY-MM-DD)')
+    export_parser.add_argument('--end', help='Data final (YYYY-MM-DD)')
+    export_parser.add_argument('--email', help='Exporta só as avaliações deste usuário')
+    
+    import_parser = commands.add_parser('import', help='Importa avaliações históricas de CSV ou NDJSON')
+    import_parser.add_argument('path', help='Arquivo de entrada (.csv, .ndjson ou .jsonl; .gz descomprime)')
+    import_parser.add_argument('--format', choices=['csv', 'ndjson'], help='Formato (padrão: pela extensão)')
+    import_parser.add_argument('--batch-size', type=int, help='Linhas por transação (padrão: 10000)')
+    
+    ingest_parser = commands.add_parser('ingest', help='Ingere respostas por email de um mbox ou Maildir')
+    ingest_parser.add_argument('path', help='Arquivo mbox ou diretório Maildir')
+    ingest_parser.add_argument('--workers', type=int, help='Processos de leitura (padrão: MAIL_INGEST_WORKERS)')
+    ingest_parser.add_argument('--batch-size', type=int, help='Mensagens por transação (padrão: 1000)')
+    ingest_parser.add_argument('--no-confirm', action='store_true',
+                               help='Não envia as confirmações por email no final')
+    
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
     """Função principal."""
+    args = _parse_args(argv)
     app = DiarioInteligente()
     
     # Inicializa o banco de dados
@@ -204,6 +323,16 @@ def main():
         print("❌ Falha ao inicializar aplicação")
         return
     
+    if args.command == 'export':
+        app.export_reviews(args.path, args.format, args.start, args.end, args.email)
+        return
+    if args.command == 'import':
+        app.import_reviews(args.path, args.format, args.batch_size)
+        return
+    if args.command == 'ingest':
+        app.ingest_emails(args.path, args.workers, args.batch_size, not args.no_confirm)
+        return
+    
     # Executa o menu principal
     app.run()
 
@@ -0,0 +1,132 @@
+"""
+Detecção online de dias fora do padrão nas notas de cada usuário.
+Cada usuário tem um estado pequeno (média e variância com média móvel
+exponencial, EWMA, de cada área) atualizado a cada avaliação em tempo
+constante; uma nota muito distante da média recente (z-score) vira uma
+anomalia, sem reler o histórico.
+"""
+
+import math
+from typing import Iterable, List, Optional, Tuple
+from .running_stats import AREAS
+
+
+# Desvio padrão mínimo usado no z-score: com notas sempre iguais a variância
+# tende a zero e qualquer mudança de 1 ponto viraria anomalia
+ANOMALY_MIN_STD = 1.0
+
+
+class Anomaly:
+    """Nota de uma área muito distante da média recente do usuário."""
+    
+    __slots__ = ('review_id', 'user_email', 'review_date', 'field', 'area',
+                 'value', 'expected', 'z_score')
+    
+    def __init__(self, review_id: int, user_email: str, review_date: str, field: str,
+                 area: str, value: int, expected: float, z_score: float):
+        self.review_id = review_id
+        self.user_email = user_email
+        self.review_date = review_date
+        self.field = field
+        self.area = area
+        self.value = value
+        self.expected = expected
+        self.z_score = z_score
+    
+    @property
+    def is_drop(self) -> bool:
+        """Se a nota ficou abaixo do esperado."""
+        return self.z_score < 0
+    
+    def to_row(self) -> Tuple:
+        """Valores das colunas de review_anomalies."""
+        return (self.review_id, self.field, self.user_email, self.review_date,
+                self.value, self.expected, self.z_score)
+
+
+class AnomalyState:
+    """
+    Estado do detector de um usuário: avaliações vistas, último dia avaliado
+    e média/variância EWMA de cada área (na ordem de AREAS).
+    """
+    
+    __slots__ = ('count', 'last_date', 'means', 'variances')
+    
+    def __init__(self, count: int = 0, last_date: Optional[str] = None,
+                 means: Optional[List[float]] = None, variances: Optional[List[float]] = None):
+        self.count = count
+        self.last_date = last_date
+        self.means = means or [0.0] * len(AREAS)
+        self.variances = variances or [0.0] * len(AREAS)
+    
+    def to_row(self) -> Tuple:
+        """Valores das colunas de review_anomaly_state (sem o usuário)."""
+        row = [self.count, self.last_date]
+        for mean, variance in zip(self.means, self.variances):
+            row.extend((mean, variance))
+        return tuple(row)
+    
+    @classmethod
+    def from_row(cls, row: Iterable) -> 'AnomalyState':
+        """Cria o estado a partir das colunas de review_anomaly_state (ver to_row)."""
+        values = list(row)
+        return cls(values[0], values[1], values[2::2], values[3::2])
+
+
+class AnomalyDetector:
+    """
+    Detector EWMA / z-score.
+    
+    Args:
+        alpha: Peso da avaliação mais recente na média móvel (0 a 1)
+        threshold: |z| a partir do qual a nota é anômala
+        min_history: Avaliações anteriores necessárias antes de sinalizar
+    """
+    
+    def __init__(self, alpha: float, threshold: float, min_history: int):
+        self.alpha = alpha
+        self.threshold = threshold
+        self.min_history = min_history
+    
+    def observe(self, state: AnomalyState, review_id: int, user_email: str, review_date: str,
+                values: Tuple[int, ...]) -> List[Anomaly]:
+        """
+        Compara as notas de uma avaliação com o estado e atualiza o estado.
+        
+        Avaliações de dias anteriores ao último já visto (histórico importado
+        fora de ordem) não são comparadas nem alteram o estado.
+        
+        Returns:
+            list: Anomalias da avaliação (vazia na maioria dos dias)
+        """
+        if state.last_date is not None and review_date <= state.last_date:
+            return []
+        
+        alpha = self.alpha
+        anomalies = []
+        ready = state.count >= self.min_history
+        
+        for index, value in enumerate(values):
+            mean = state.means[index]
+            variance = state.variances[index]
+            
+            if not state.count:
+                state.means[index] = float(value)
+                continue
+            
+            if ready:
+                z_score = (value - mean) / max(math.sqrt(variance), ANOMALY_MIN_STD)
+                if abs(z_score) >= self.threshold:
+                    field, area = AREAS[index]
+                    anomalies.append(Anomaly(review_id, user_email, review_date, field, area,
+                                             value, round(mean, 2), round(z_score, 2)))
+            
+            # Atualização incremental da média e variância exponenciais
+            difference = value - mean
+            increment = alpha * difference
+            state.means[index] = mean + increment
+            state.variances[index] = (1 - alpha) * (variance + difference * increment)
+        
+        state.count += 1
+        state.last_date = review_date
+        return anomalies
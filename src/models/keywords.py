@@ -0,0 +1,105 @@
+"""
+Extração de termos dos comentários das avaliações.
+Quebra o texto em palavras, remove acentos e palavras comuns do português e
+reduz cada palavra a um radical simples, para que "produtivo", "produtiva" e
+"produtivos" contem como o mesmo tema.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Iterator, Optional, Tuple
+
+
+# Palavras com pelo menos 3 letras (inclui letras acentuadas)
+WORD_RE = re.compile(r'[^\W\d_]{3,}')
+
+# Tabela de remoção de acentos (aplicada com str.translate, sem unicodedata)
+_ACCENT_FOLDING = str.maketrans(
+    'áàâãäéèêëíìîïóòôõöúùûüçñ',
+    'aaaaaeeeeiiiiooooouuuucn'
+)
+
+# Palavras comuns do português ignoradas (já sem acentos)
+STOPWORDS = frozenset('''
+    ainda algo algum alguma aos aquela aquelas aquele aqueles aquilo ate bastante bem
+    cada coisa coisas com como consegui das dela delas dele deles demais depois dia
+    dias dos ela elas ele eles entao era essa essas esse esses esta estao estas estava ja
+    este estes estive estou eram fiquei foi fomos foram fosse fui hoje lhe lhes mais
+    mas meu meus minha minhas mesmo muita muitas muito muitos nada nao nas nem nos
+    nossa nossas nosso nossos num numa ontem para pela pelas pelo pelos pois porque
+    pouco pra pro qual quando que quem sao seja sem sempre ser sera seu seus sim
+    sobre sua suas tambem tem temos tenho ter teu teus tinha tive toda todas todo
+    todos tua tuas uma umas uns vai vou voce voces
+'''.split())
+
+# Terminações de plural: (sufixo, substituição)
+_PLURAL_SUFFIXES = (
+    ('oes', 'ao'), ('aes', 'ao'), ('ais', 'al'), ('eis', 'el'), ('ois', 'ol'),
+    ('ns', 'm'), ('res', 'r'), ('s', ''),
+)
+
+# Sufixos derivacionais e verbais (os mais longos primeiro)
+_SUFFIXES = (
+    'amentos', 'imentos', 'amento', 'imento', 'mente', 'idade', 'acao', 'icao',
+    'ancia', 'encia', 'aram', 'eram', 'iram', 'amos', 'ismo', 'ista', 'avel', 'ivel',
+    'ador', 'ante', 'ando', 'endo', 'indo', 'ava', 'cao', 'oso', 'osa', 'ado', 'ada',
+    'ido', 'ida', 'ar', 'er', 'ir', 'ei', 'ou',
+)
+
+# Tamanho mínimo do radical depois de remover um sufixo
+_MIN_STEM = 3
+
+
+def fold_accents(text: str) -> str:
+    """Remove os acentos de um texto em minúsculas."""
+    return text.translate(_ACCENT_FOLDING)
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """
+    Radical simplificado de uma palavra em minúsculas e sem acentos.
+    
+    Remove o plural, depois um sufixo derivacional ou verbal e por fim a
+    vogal final, sempre deixando pelo menos 3 letras.
+    """
+    for suffix, replacement in _PLURAL_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= _MIN_STEM and not word.endswith('ss'):
+            word = word[:-len(suffix)] + replacement
+            break
+    
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= _MIN_STEM:
+            word = word[:-len(suffix)]
+            break
+    
+    if word[-1] in 'aeio' and len(word) > _MIN_STEM:
+        word = word[:-1]
+    
+    return word
+
+
+def iter_terms(text: Optional[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Percorre os termos de um comentário.
+    
+    Yields:
+        (radical, palavra): O radical usado na contagem e a palavra como
+        apareceu (em minúsculas), usada para exibir o tema
+    """
+    if not text:
+        return
+    
+    for word in WORD_RE.findall(text.lower()):
+        folded = fold_accents(word)
+        if folded not in STOPWORDS:
+            yield stem(folded), word
+
+
+def count_terms(text: Optional[str]) -> Dict[str, Tuple[int, str]]:
+    """Conta os termos de um comentário: radical -> (ocorrências, primeira palavra vista)."""
+    counts: Dict[str, Tuple[int, str]] = {}
+    for term, word in iter_terms(text):
+        count, first_word = counts.get(term, (0, word))
+        counts[term] = (count + 1, first_word)
+    return counts
@@ -5,6 +5,8 @@ Contém as notas e comentários sobre diferentes aspectos do dia.
 
 from dataclasses import dataclass
 from typing import Optional
+# parse_review_date também é importado daqui por outros módulos
+from .validation import REVIEW_VALIDATOR, parse_review_date
 
 
 @dataclass
@@ -20,6 +22,8 @@ class Review:
         positive_points (str): Pontos positivos do dia
         negative_points (str): Pontos negativos do dia
         id (Optional[int]): ID único no banco de dados
+        user_email (Optional[str]): Email do usuário que enviou a avaliação
+        review_date (Optional[str]): Dia avaliado no formato YYYY-MM-DD
     """
     work: int
     training: int
@@ -28,36 +32,19 @@ class Review:
     positive_points: str
     negative_points: str
     id: Optional[int] = None
+    user_email: Optional[str] = None
+    review_date: Optional[str] = None
     
     def __post_init__(self):
         """Valida os dados após a inicialização."""
         self._validate()
     
     def _validate(self):
-        """Valida se os dados estão corretos."""
-        errors = []
+        """Valida se os dados estão corretos (esquema em validation.py)."""
+        result = REVIEW_VALIDATOR.validate(self.__dict__)
         
-        # Validação das notas (devem ser números entre 0 e 10)
-        for field_name, value in [
-            ("work", self.work),
-            ("training", self.training),
-            ("studies", self.studies),
-            ("mind", self.mind)
-        ]:
-            if not isinstance(value, (int, float)):
-                errors.append(f"O campo {field_name} deve ser um número.")
-            elif value < 0 or value > 10:
-                errors.append(f"O campo {field_name} deve estar entre 0 e 10.")
-        
-        # Validação dos comentários
-        if not isinstance(self.positive_points, str) or not self.positive_points.strip():
-            errors.append("O campo 'positive_points' deve ser uma string não vazia.")
-        
-        if not isinstance(self.negative_points, str) or not self.negative_points.strip():
-            errors.append("O campo 'negative_points' deve ser uma string não vazia.")
-        
-        if errors:
-            raise ValueError("; ".join(errors))
+        if not result.valid:
+            raise ValueError("; ".join(result.messages()))
     
     def get_average_score(self) -> float:
         """Calcula a média das notas."""
@@ -72,9 +59,30 @@ class Review:
             'studies': self.studies,
             'mind': self.mind,
             'positive_points': self.positive_points,
-            'negative_points': self.negative_points
+            'negative_points': self.negative_points,
+            'user_email': self.user_email,
+            'review_date': self.review_date
         }
     
+    @classmethod
+    def from_validated(cls, data: dict, id: Optional[int] = None) -> 'Review':
+        """
+        Cria um Review a partir de dados já validados por um CompiledValidator.
+        
+        Não executa a validação de novo (evita checar as mesmas regras duas vezes).
+        """
+        review = cls.__new__(cls)
+        review.work = data['work']
+        review.training = data['training']
+        review.studies = data['studies']
+        review.mind = data['mind']
+        review.positive_points = data['positive_points']
+        review.negative_points = data['negative_points']
+        review.id = id
+        review.user_email = data.get('email', data.get('user_email'))
+        review.review_date = data.get('date', data.get('review_date'))
+        return review
+    
     @classmethod
     def from_dict(cls, data: dict) -> 'Review':
         """Cria um objeto Review a partir de um dicionário."""
@@ -85,5 +93,7 @@ class Review:
             studies=data['studies'],
             mind=data['mind'],
             positive_points=data['positive_points'],
-            negative_points=data['negative_points']
+            negative_points=data['negative_points'],
+            user_email=data.get('user_email'),
+            review_date=data.get('review_date')
         )
@@ -0,0 +1,389 @@
+"""
+Estatísticas incrementais (algoritmo de Welford) das avaliações.
+Cada acumulador guarda contagem, média e M2 (soma dos quadrados dos desvios),
+pode ser atualizado a cada avaliação e combinado com outros acumuladores
+(dias, semanas, usuários) sem reler as avaliações.
+"""
+
+import math
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+# Áreas avaliadas: (campo no banco, nome exibido no relatório)
+AREAS: Tuple[Tuple[str, str], ...] = (
+    ('work', 'Trabalho'),
+    ('training', 'Treino'),
+    ('studies', 'Estudos'),
+    ('mind', 'Mente'),
+)
+
+# Séries das tendências semanais: as áreas mais a média geral
+TREND_FIELDS: Tuple[Tuple[str, str], ...] = AREAS + (('overall', 'Geral'),)
+
+
+class RunningStats:
+    """Contagem, média e M2 de uma série de valores."""
+    
+    __slots__ = ('count', 'mean', 'm2')
+    
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+    
+    def add(self, value: float):
+        """Acumula um valor (atualização de Welford)."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+    
+    def merge(self, other: 'RunningStats'):
+        """Combina outro acumulador neste (fórmula de Chan para partições)."""
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return
+        
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+    
+    @property
+    def variance(self) -> float:
+        """Variância populacional (0 se vazio)."""
+        return self.m2 / self.count if self.count else 0.0
+    
+    @property
+    def integer_mean(self) -> float:
+        """
+        Média recalculada a partir da soma arredondada para inteiro.
+        
+        As notas são inteiras, então a soma real é o inteiro mais próximo de
+        média × contagem; dividir essa soma dá exatamente o mesmo valor que
+        soma / contagem, sem o ruído de ponto flutuante das combinações (que
+        mudaria o arredondamento para 2 casas e os empates entre áreas).
+        """
+        return round(self.mean * self.count) / self.count if self.count else 0.0
+
+
+class ReviewAccumulator:
+    """
+    Acumulador das notas de um conjunto de avaliações: um RunningStats por área
+    e um geral (com as quatro notas de cada avaliação).
+    
+    É o resumo das notas de um período usado em todo o projeto: acumuladores
+    de review_rollups, estatísticas de um período ou de cada usuário na
+    semana e análises em lote.
+    """
+    
+    __slots__ = ('areas', 'overall')
+    
+    def __init__(self):
+        self.areas = tuple(RunningStats() for _ in AREAS)
+        self.overall = RunningStats()
+    
+    def add(self, work: int, training: int, studies: int, mind: int):
+        """Acumula as notas de uma avaliação."""
+        overall = self.overall
+        for stats, value in zip(self.areas, (work, training, studies, mind)):
+            stats.add(value)
+            overall.add(value)
+    
+    def add_review(self, review: Any):
+        """Acumula um objeto Review."""
+        self.add(review.work, review.training, review.studies, review.mind)
+    
+    def merge(self, other: 'ReviewAccumulator'):
+        """Combina outro acumulador neste."""
+        for stats, other_stats in zip(self.areas, other.areas):
+            stats.merge(other_stats)
+        self.overall.merge(other.overall)
+    
+    @classmethod
+    def from_sums(cls, count: int, sums: Iterable[int], sum_squares: Iterable[int]) -> 'ReviewAccumulator':
+        """
+        Cria o acumulador a partir de agregados já calculados (ex.: GROUP BY).
+        
+        Args:
+            count: Quantidade de avaliações
+            sums: Soma das notas de cada área (na ordem de AREAS)
+            sum_squares: Soma dos quadrados das notas de cada área
+        """
+        accumulator = cls()
+        if not count:
+            return accumulator
+        
+        sums, sum_squares = list(sums), list(sum_squares)
+        for stats, total, squares in zip(accumulator.areas, sums, sum_squares):
+            stats.count = count
+            stats.mean = total / count
+            stats.m2 = squares - total * total / count
+        
+        total, n = sum(sums), 4 * count
+        accumulator.overall.count = n
+        accumulator.overall.mean = total / n
+        accumulator.overall.m2 = sum(sum_squares) - total * total / n
+        return accumulator
+    
+    @classmethod
+    def merged(cls, accumulators: Iterable['ReviewAccumulator']) -> 'ReviewAccumulator':
+        """Combina vários acumuladores em um novo."""
+        result = cls()
+        for accumulator in accumulators:
+            result.merge(accumulator)
+        return result
+    
+    @property
+    def count(self) -> int:
+        """Quantidade de avaliações."""
+        return self.areas[0].count
+    
+    def area_averages(self) -> Dict[str, float]:
+        """Média de cada área pelo nome exibido (vazio se não houver avaliações)."""
+        if not self.count:
+            return {}
+        return {label: stats.integer_mean for (_, label), stats in zip(AREAS, self.areas)}
+    
+    @property
+    def overall_average(self) -> Optional[float]:
+        """Média de todas as notas."""
+        return self.overall.integer_mean if self.count else None
+    
+    @property
+    def consistency_score(self) -> float:
+        """
+        Consistência de 0 a 10: 10 menos o desvio padrão de todas as notas.
+        
+        Vem de M2 (Welford ou somas), não da soma dos desvios nota a nota:
+        pode diferir desse cálculo nos últimos bits do float.
+        """
+        if not self.count:
+            return 0
+        return max(0, 10 - (max(self.overall.variance, 0.0) ** 0.5))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte para o formato de get_weekly_average (médias arredondadas)."""
+        if not self.count:
+            data = {f'avg_{field}': None for field, _ in AREAS}
+            data.update({'total_reviews': 0, 'overall_average': None})
+            return data
+        
+        data = {f'avg_{field}': round(stats.integer_mean, 2) for (field, _), stats in zip(AREAS, self.areas)}
+        data.update({'total_reviews': self.count, 'overall_average': round(self.overall_average, 2)})
+        return data
+    
+    def to_row(self) -> Tuple:
+        """Valores das colunas de review_rollups (count, média e M2 de cada área e geral)."""
+        row = [self.count]
+        for stats in self.areas + (self.overall,):
+            row.extend((stats.mean, stats.m2))
+        return tuple(row)
+    
+    @classmethod
+    def from_row(cls, row: Iterable) -> 'ReviewAccumulator':
+        """Cria o acumulador a partir das colunas de review_rollups (ver to_row)."""
+        values = list(row)
+        count = values[0]
+        accumulator = cls()
+        for index, stats in enumerate(accumulator.areas):
+            stats.count = count
+            stats.mean, stats.m2 = values[1 + 2 * index], values[2 + 2 * index]
+        accumulator.overall.count = 4 * count
+        accumulator.overall.mean, accumulator.overall.m2 = values[-2], values[-1]
+        return accumulator
+
+
+# Pares de áreas (i <= j) cujos produtos CoMomentAccumulator soma, na ordem das colunas
+AREA_PAIRS = tuple((i, j) for i in range(len(AREAS)) for j in range(i, len(AREAS)))
+
+
+class CoMomentAccumulator:
+    """
+    Co-momentos das quatro áreas: contagem, soma de cada área e soma dos
+    produtos de cada par (incluindo os quadrados).
+    
+    As notas são inteiras, então todas as somas são inteiros exatos: combinar
+    acumuladores é só somar, e a correlação de qualquer período sai das somas
+    das semanas sem reler as avaliações.
+    """
+    
+    __slots__ = ('count', 'sums', 'products')
+    
+    def __init__(self):
+        self.count = 0
+        self.sums = [0] * len(AREAS)
+        self.products = [0] * len(AREA_PAIRS)
+    
+    def add(self, work: int, training: int, studies: int, mind: int):
+        """Acumula as notas de uma avaliação."""
+        values = (work, training, studies, mind)
+        self.count += 1
+        sums = self.sums
+        for index, value in enumerate(values):
+            sums[index] += value
+        products = self.products
+        for index, (i, j) in enumerate(AREA_PAIRS):
+            products[index] += values[i] * values[j]
+    
+    def merge(self, other: 'CoMomentAccumulator'):
+        """Combina outro acumulador neste."""
+        self.count += other.count
+        self.sums = [a + b for a, b in zip(self.sums, other.sums)]
+        self.products = [a + b for a, b in zip(self.products, other.products)]
+    
+    @classmethod
+    def merged(cls, accumulators: Iterable['CoMomentAccumulator']) -> 'CoMomentAccumulator':
+        """Combina vários acumuladores em um novo."""
+        result = cls()
+        for accumulator in accumulators:
+            result.merge(accumulator)
+        return result
+    
+    def _product(self, i: int, j: int) -> int:
+        """Soma dos produtos das áreas i e j."""
+        return self.products[AREA_PAIRS.index((min(i, j), max(i, j)))]
+    
+    def correlation(self, i: int, j: int) -> Optional[float]:
+        """
+        Correlação de Pearson entre as áreas i e j (None com menos de 2
+        avaliações ou se uma das áreas não variou).
+        """
+        count = self.count
+        if count < 2:
+            return None
+        
+        sums = self.sums
+        covariance = count * self._product(i, j) - sums[i] * sums[j]
+        variance_i = count * self._product(i, i) - sums[i] * sums[i]
+        variance_j = count * self._product(j, j) - sums[j] * sums[j]
+        if variance_i <= 0 or variance_j <= 0:
+            return None
+        return covariance / math.sqrt(variance_i * variance_j)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Matriz de correlação pelo nome exibido das áreas e os pares de áreas
+        diferentes ordenados da correlação mais forte para a mais fraca.
+        """
+        labels = [label for _, label in AREAS]
+        matrix = {label: {} for label in labels}
+        for i, j in AREA_PAIRS:
+            correlation = self.correlation(i, j)
+            if correlation is not None:
+                correlation = round(correlation, 3)
+            matrix[labels[i]][labels[j]] = matrix[labels[j]][labels[i]] = correlation
+        matrix = {label: {other: row[other] for other in labels} for label, row in matrix.items()}
+        pairs = [
+            {'areas': [labels[i], labels[j]], 'correlation': matrix[labels[i]][labels[j]]}
+            for i, j in AREA_PAIRS
+            if i != j and matrix[labels[i]][labels[j]] is not None
+        ]
+        pairs.sort(key=lambda pair: -abs(pair['correlation']))
+        return {'count': self.count, 'matrix': matrix, 'pairs': pairs}
+    
+    def to_row(self) -> Tuple:
+        """Valores das colunas de review_comoments (count, somas e produtos)."""
+        return (self.count,) + tuple(self.sums) + tuple(self.products)
+    
+    @classmethod
+    def from_row(cls, row: Iterable) -> 'CoMomentAccumulator':
+        """Cria o acumulador a partir das colunas de review_comoments (ver to_row)."""
+        values = list(row)
+        accumulator = cls()
+        accumulator.count = values[0]
+        accumulator.sums = values[1:1 + len(AREAS)]
+        accumulator.products = values[1 + len(AREAS):]
+        return accumulator
+
+
+# Notas possíveis (0 a 10): um contador por nota em ScoreHistogram
+SCORE_VALUES = tuple(range(11))
+
+# Nota a partir da qual o dia conta como bom (share_at_least do relatório)
+GOOD_DAY_SCORE = 8
+
+
+class ScoreHistogram:
+    """
+    Distribuição das notas de uma área: quantos dias tiveram cada nota de 0 a 10.
+    
+    Com só 11 contadores, mediana, percentis e proporções de qualquer período
+    saem da soma dos histogramas das semanas, sem ler as avaliações.
+    """
+    
+    __slots__ = ('counts',)
+    
+    def __init__(self, counts: Optional[Iterable[int]] = None):
+        self.counts = list(counts) if counts is not None else [0] * len(SCORE_VALUES)
+    
+    def add(self, score: int):
+        """Conta uma nota."""
+        self.counts[score] += 1
+    
+    def merge(self, other: 'ScoreHistogram'):
+        """Combina outro histograma neste."""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+    
+    @property
+    def count(self) -> int:
+        """Quantidade de notas."""
+        return sum(self.counts)
+    
+    def _value_at(self, rank: int) -> int:
+        """Nota na posição rank (0 = menor) da lista ordenada de notas."""
+        seen = 0
+        for score, count in enumerate(self.counts):
+            seen += count
+            if rank < seen:
+                return score
+        raise IndexError(rank)
+    
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Percentil (fraction de 0 a 1) com interpolação linear entre as
+        posições vizinhas, como statistics.quantiles(method='inclusive').
+        """
+        count = self.count
+        if not count:
+            return None
+        position = fraction * (count - 1)
+        lower = int(position)
+        low_value = self._value_at(lower)
+        if lower == position:
+            return float(low_value)
+        high_value = self._value_at(lower + 1)
+        return low_value + (high_value - low_value) * (position - lower)
+    
+    @property
+    def median(self) -> Optional[float]:
+        """Mediana das notas."""
+        return self.percentile(0.5)
+    
+    def share_at_least(self, score: int) -> Optional[float]:
+        """Proporção (0 a 1) das notas maiores ou iguais a score."""
+        count = self.count
+        return sum(self.counts[score:]) / count if count else None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Mediana, quartis, percentil 90, proporção de dias bons e os contadores."""
+        share = self.share_at_least(GOOD_DAY_SCORE)
+        return {
+            'count': self.count,
+            'median': self.median,
+            'p25': self.percentile(0.25),
+            'p75': self.percentile(0.75),
+            'p90': self.percentile(0.9),
+            'share_good_days': round(share, 4) if share is not None else None,
+            'histogram': list(self.counts)
+        }
+
+
+def week_start(review_date: str) -> str:
+    """Segunda-feira da semana ISO de uma data (YYYY-MM-DD)."""
+    day = date.fromisoformat(review_date)
+    return (day - timedelta(days=day.weekday())).isoformat()
@@ -0,0 +1,152 @@
+"""
+Análise de sentimento dos comentários das avaliações.
+Usa um léxico de palavras em português com polaridade, trata negações
+("não", "nunca", "sem") e intensificadores ("muito", "pouco") e roda offline,
+sem dependências. As tabelas de consulta são compiladas uma vez na importação.
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+from .keywords import STOPWORDS, WORD_RE, fold_accents, stem
+
+
+# Muda quando o léxico ou as regras mudam, invalidando as notas já calculadas
+LEXICON_VERSION = 2
+
+# Polaridade das palavras (-3 muito negativa ... +3 muito positiva)
+LEXICON = {
+    # Positivas
+    'adorei': 3, 'alegre': 2, 'alegria': 2, 'amei': 3, 'animado': 2, 'aprendi': 1,
+    'aprendizado': 1, 'bom': 1, 'boa': 1, 'calmo': 1, 'completei': 1, 'concentrado': 1,
+    'concluí': 1, 'conquista': 2, 'descansado': 2, 'disposição': 1,
+    'disposto': 1, 'divertido': 2, 'eficiente': 2, 'energia': 1, 'equilibrado': 1,
+    'evolução': 2, 'excelente': 3, 'feliz': 2, 'felicidade': 2, 'focado': 1, 'foco': 1,
+    'gostei': 2, 'grato': 2, 'gratidão': 2, 'incrível': 3, 'legal': 1, 'leve': 1,
+    'melhor': 1, 'melhorei': 2, 'motivado': 2, 'motivação': 2, 'organizado': 1,
+    'orgulho': 2, 'ótimo': 2, 'ótima': 2, 'paz': 2, 'positivo': 1, 'produtivo': 2,
+    'produtividade': 2, 'progresso': 2, 'relaxado': 1, 'satisfeito': 2, 'saudável': 1,
+    'sucesso': 2, 'terminei': 1, 'tranquilo': 1, 'vitória': 2,
+    # Negativas
+    'ansiedade': -2, 'ansioso': -2, 'atrasado': -1, 'atraso': -1, 'bagunçado': -1,
+    'briga': -2, 'cansaço': -2, 'cansado': -2, 'confuso': -1, 'desanimado': -2,
+    'desânimo': -2, 'desmotivado': -2, 'difícil': -1, 'discussão': -1, 'distraído': -1,
+    'distração': -1, 'doente': -2, 'dor': -2, 'erro': -1, 'errei': -1, 'esgotado': -3,
+    'estressado': -2, 'estresse': -2, 'exausto': -3, 'falhei': -2, 'fracasso': -2,
+    'frustrado': -2, 'frustração': -2, 'horrível': -3, 'insônia': -2, 'irritado': -2,
+    'mal': -2, 'medo': -2, 'nervoso': -2, 'perdi': -1, 'péssimo': -3, 'pior': -2,
+    'preguiça': -2, 'preocupado': -1, 'preocupação': -1, 'pressão': -1, 'problema': -1,
+    'procrastinação': -2, 'procrastinei': -2, 'raiva': -2, 'ruim': -2,
+    'sobrecarregado': -2, 'solidão': -2, 'sozinho': -1, 'tenso': -1, 'terrível': -3,
+    'triste': -2, 'tristeza': -2,
+}
+
+# Palavras que invertem a polaridade das próximas palavras
+NEGATIONS = frozenset(('nao', 'nunca', 'nem', 'jamais', 'sem', 'nenhum', 'nenhuma'))
+
+# Palavras que multiplicam a polaridade da palavra seguinte
+INTENSIFIERS = {
+    'muito': 1.5, 'muita': 1.5, 'bastante': 1.5, 'super': 1.5, 'demais': 1.5,
+    'extremamente': 2.0, 'totalmente': 1.5, 'pouco': 0.5, 'meio': 0.5,
+}
+
+# Quantas palavras depois de uma negação continuam negadas
+NEGATION_WINDOW = 3
+
+# Peso de uma palavra negada ("não foi ruim" é menos positivo que "foi bom")
+NEGATION_WEIGHT = -0.75
+
+# Tipos de palavra na tabela de consulta do SentimentScorer
+_POLARITY, _NEGATION, _INTENSIFIER = 0, 1, 2
+
+# Palavra fora do léxico
+_NEUTRAL = (_POLARITY, 0)
+
+# Máximo de palavras fora do léxico memorizadas pelo SentimentScorer
+NEUTRAL_CACHE_SIZE = 20000
+
+# Constante da normalização soma / sqrt(soma² + alfa) para o intervalo (-1, 1)
+NORMALIZATION_ALPHA = 15
+
+
+class SentimentScorer:
+    """
+    Calcula a nota de sentimento de textos, de -1 (negativo) a +1 (positivo).
+    
+    O léxico é compilado por radical (ver keywords.stem), então as flexões
+    ("cansado", "cansada", "cansados") têm a mesma polaridade. As palavras já
+    vistas ficam memorizadas em uma tabela, então o texto é percorrido com
+    uma única consulta de dicionário por palavra; as de fora do léxico só
+    até NEUTRAL_CACHE_SIZE, para que a tabela não cresça com cada palavra
+    nova dos comentários em processos de longa duração.
+    """
+    
+    def __init__(self, lexicon: Dict[str, int] = LEXICON):
+        self._polarity_by_stem = {stem(fold_accents(word)): value for word, value in lexicon.items()}
+        
+        # Palavra -> (tipo, valor), preenchido sob demanda: negações e
+        # intensificadores já entram aqui; as demais palavras na primeira vez
+        # que aparecem (polaridade do radical, 0 se não estiver no léxico)
+        self._tokens: Dict[str, Tuple[int, float]] = {word: (_NEGATION, 0) for word in NEGATIONS}
+        self._tokens.update((word, (_INTENSIFIER, value)) for word, value in INTENSIFIERS.items())
+        self._neutral_count = 0
+    
+    def _classify(self, word: str) -> Tuple[int, float]:
+        """Classifica uma palavra fora da tabela e memoriza o resultado (se couber)."""
+        polarity = None if word in STOPWORDS else self._polarity_by_stem.get(stem(word))
+        if polarity is not None:
+            token = self._tokens[word] = (_POLARITY, polarity)
+            return token
+        
+        if self._neutral_count < NEUTRAL_CACHE_SIZE:
+            self._neutral_count += 1
+            self._tokens[word] = _NEUTRAL
+        return _NEUTRAL
+    
+    def score(self, text: Optional[str]) -> float:
+        """Nota de sentimento de um texto (0.0 se não houver palavras do léxico)."""
+        if not text:
+            return 0.0
+        
+        total = 0.0
+        negated = 0
+        boost = 1.0
+        tokens = self._tokens
+        classify = self._classify
+        
+        for word in WORD_RE.findall(fold_accents(text.lower())):
+            kind, value = tokens.get(word) or classify(word)
+            
+            if kind == _NEGATION:
+                negated = NEGATION_WINDOW
+                continue
+            if kind == _INTENSIFIER:
+                boost = value
+                continue
+            
+            if value:
+                value *= boost
+                total += value * NEGATION_WEIGHT if negated else value
+            
+            boost = 1.0
+            if negated:
+                negated -= 1
+        
+        if not total:
+            return 0.0
+        return round(total / math.sqrt(total * total + NORMALIZATION_ALPHA), 4)
+    
+    def score_many(self, texts: Iterable[Optional[str]]) -> List[float]:
+        """Notas de vários textos de uma vez (mesma ordem)."""
+        score = self.score
+        return [score(text) for text in texts]
+    
+    def score_review(self, positive_points: Optional[str],
+                     negative_points: Optional[str]) -> Tuple[float, float, float]:
+        """Notas dos pontos positivos, dos negativos e a média das duas."""
+        positive = self.score(positive_points)
+        negative = self.score(negative_points)
+        return positive, negative, round((positive + negative) / 2, 4)
+
+
+# Instância compartilhada (tabelas compiladas uma vez por processo)
+SENTIMENT_SCORER = SentimentScorer()
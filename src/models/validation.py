@@ -0,0 +1,352 @@
+"""
+Validação declarativa das avaliações.
+Um único esquema descreve as regras de cada campo; ele é compilado uma vez em
+um validador rápido usado pela API web, pela CLI, pelo processamento de
+emails e pelo próprio modelo Review.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+
+# Formatos aceitos para a data da avaliação (ISO e o formato brasileiro do formulário)
+DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y')
+
+# Mensagens por código de erro (formatadas só quando alguém pede a mensagem)
+ERROR_MESSAGES = {
+    'not_an_object': 'Avaliação deve ser um objeto JSON',
+    'required': 'Campo {field} é obrigatório',
+    'not_a_number': 'Campo {field} deve ser um número',
+    'out_of_range': 'Campo {field} deve ser entre {min} e {max}',
+    'not_a_string': 'Campo {field} deve ser um texto',
+    'empty': 'Campo {field} não pode estar vazio',
+    'invalid_date': 'Campo {field} deve ser uma data (YYYY-MM-DD ou DD/MM/YYYY)',
+    'invalid_datetime': 'Campo {field} deve ser uma data e hora (YYYY-MM-DD HH:MM:SS)',
+    'invalid_email': 'Campo {field} deve ser um email válido',
+}
+
+
+def parse_review_date(value: Union[str, date, None]) -> str:
+    """
+    Normaliza a data de uma avaliação para o formato ISO (YYYY-MM-DD).
+    
+    Args:
+        value: Data como string (YYYY-MM-DD ou DD/MM/YYYY), date ou None (hoje)
+    
+    Returns:
+        str: Data no formato YYYY-MM-DD
+    
+    Raises:
+        ValueError: Se a data não estiver em um formato reconhecido
+    """
+    if value is None or value == '':
+        return date.today().isoformat()
+    
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    
+    if isinstance(value, date):
+        return value.isoformat()
+    
+    if isinstance(value, str):
+        text = value.strip()
+        
+        # Caminho rápido para os dois formatos com 10 caracteres (sem strptime)
+        if len(text) == 10:
+            try:
+                if text[4] == '-':
+                    return date.fromisoformat(text).isoformat()
+                if text[2] == '/' and text[5] == '/':
+                    return date(int(text[6:]), int(text[3:5]), int(text[:2])).isoformat()
+            except ValueError:
+                pass
+        
+        for date_format in DATE_FORMATS:
+            try:
+                return datetime.strptime(text, date_format).date().isoformat()
+            except ValueError:
+                continue
+    
+    raise ValueError(f"Data inválida: {value}. Use YYYY-MM-DD ou DD/MM/YYYY.")
+
+
+class ValidationError:
+    """Erro de validação estruturado (campo + código), com mensagem sob demanda."""
+    
+    __slots__ = ('field', 'code', 'params')
+    
+    def __init__(self, field: Optional[str], code: str, params: Optional[Dict[str, Any]] = None):
+        self.field = field
+        self.code = code
+        self.params = params
+    
+    @property
+    def message(self) -> str:
+        """Mensagem legível do erro."""
+        return ERROR_MESSAGES[self.code].format(field=self.field, **(self.params or {}))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte o erro para dicionário (resposta da API)."""
+        return {'field': self.field, 'code': self.code, 'message': self.message}
+    
+    def __repr__(self) -> str:
+        return f"ValidationError({self.field!r}, {self.code!r})"
+
+
+class ValidationResult:
+    """Resultado da validação: dados normalizados ou lista de erros."""
+    
+    __slots__ = ('data', 'errors')
+    
+    def __init__(self, data: Optional[Dict[str, Any]], errors: Optional[List[ValidationError]] = None):
+        self.data = data
+        self.errors = errors or []
+    
+    @property
+    def valid(self) -> bool:
+        """Indica se os dados são válidos."""
+        return not self.errors
+    
+    def __bool__(self) -> bool:
+        return not self.errors
+    
+    def messages(self) -> List[str]:
+        """Mensagens de todos os erros."""
+        return [error.message for error in self.errors]
+    
+    def first_message(self) -> Optional[str]:
+        """Mensagem do primeiro erro, se houver."""
+        return self.errors[0].message if self.errors else None
+
+
+class _Invalid:
+    """Marcador retornado pelas checagens compiladas quando o valor é inválido."""
+    
+    __slots__ = ('code', 'params')
+    
+    def __init__(self, code: str, params: Optional[Dict[str, Any]] = None):
+        self.code = code
+        self.params = params
+
+
+_MISSING = object()
+_NOT_A_NUMBER = _Invalid('not_a_number')
+_NOT_A_STRING = _Invalid('not_a_string')
+_EMPTY = _Invalid('empty')
+_INVALID_DATE = _Invalid('invalid_date')
+_INVALID_DATETIME = _Invalid('invalid_datetime')
+_INVALID_EMAIL = _Invalid('invalid_email')
+
+
+class Field:
+    """
+    Regra declarativa de um campo.
+    
+    Atributos:
+        name (str): Nome do campo
+        kind (str): Tipo ('score', 'text', 'email', 'date' ou 'datetime')
+        required (bool): Se o campo é obrigatório
+        min_value, max_value (int): Limites para campos 'score'
+        coerce (bool): Se notas em texto ("7") são convertidas para int
+    """
+    
+    def __init__(self, name: str, kind: str, required: bool = True,
+                 min_value: int = 0, max_value: int = 10, coerce: bool = True):
+        self.name = name
+        self.kind = kind
+        self.required = required
+        self.min_value = min_value
+        self.max_value = max_value
+        self.coerce = coerce
+    
+    def replace(self, **changes) -> 'Field':
+        """Cria uma cópia do campo com alguns atributos alterados."""
+        values = {
+            'name': self.name,
+            'kind': self.kind,
+            'required': self.required,
+            'min_value': self.min_value,
+            'max_value': self.max_value,
+            'coerce': self.coerce
+        }
+        values.update(changes)
+        return Field(**values)
+
+
+# Esquema único das avaliações
+SCORE_FIELDS = ('work', 'training', 'studies', 'mind')
+TEXT_FIELDS = ('positive_points', 'negative_points')
+
+REVIEW_SCHEMA = tuple(
+    [Field(name, 'score') for name in SCORE_FIELDS] +
+    [Field(name, 'text') for name in TEXT_FIELDS]
+)
+
+# O modelo não converte valores: notas precisam já ser números
+MODEL_SCHEMA = tuple(
+    field.replace(coerce=False) if field.kind == 'score' else field
+    for field in REVIEW_SCHEMA
+)
+
+# Envio pela API/emails: inclui o email do usuário e a data (opcional = hoje)
+SUBMISSION_SCHEMA = REVIEW_SCHEMA + (
+    Field('email', 'email'),
+    Field('date', 'date', required=False),
+)
+
+# Importação de histórico (mesmas colunas da exportação): usuário e dia
+# obrigatórios; data/hora original do registro opcional
+IMPORT_SCHEMA = REVIEW_SCHEMA + (
+    Field('user_email', 'email'),
+    Field('review_date', 'date'),
+    Field('created_at', 'datetime', required=False),
+)
+
+
+def _compile_score(field: Field) -> Callable[[Any], Any]:
+    """Compila a checagem de uma nota inteira dentro dos limites."""
+    low = field.min_value
+    high = field.max_value
+    coerce = field.coerce
+    out_of_range = _Invalid('out_of_range', {'min': low, 'max': high})
+    
+    def check(value):
+        value_type = type(value)
+        if value_type is int:
+            pass
+        elif value_type is str and coerce:
+            try:
+                value = int(value.strip())
+            except ValueError:
+                return _NOT_A_NUMBER
+        elif value_type is float:
+            # Como o int() da versão anterior: 7.0 vira 7 e 7.5 é truncado para 7
+            try:
+                value = int(value)
+            except (ValueError, OverflowError):
+                return _NOT_A_NUMBER
+        else:
+            return _NOT_A_NUMBER
+        
+        if value < low or value > high:
+            return out_of_range
+        return value
+    
+    return check
+
+
+def _check_text(value):
+    """Texto não vazio (normalizado sem espaços nas pontas)."""
+    if type(value) is not str:
+        return _NOT_A_STRING
+    value = value.strip()
+    return value if value else _EMPTY
+
+
+def _check_email(value):
+    """Email com formato básico válido (normalizado em minúsculas)."""
+    if type(value) is not str:
+        return _NOT_A_STRING
+    value = value.strip().lower()
+    at = value.find('@')
+    if at <= 0 or at == len(value) - 1 or ' ' in value:
+        return _INVALID_EMAIL
+    return value
+
+
+def _check_date(value):
+    """Data em YYYY-MM-DD ou DD/MM/YYYY (normalizada para YYYY-MM-DD)."""
+    try:
+        return parse_review_date(value)
+    except (TypeError, ValueError):
+        return _INVALID_DATE
+
+
+def _check_datetime(value):
+    """Data e hora ISO (ou só a data) normalizada para YYYY-MM-DD HH:MM:SS (UTC se tiver fuso)."""
+    if type(value) is not str:
+        return _INVALID_DATETIME
+    
+    text = value.strip()
+    try:
+        moment = datetime.fromisoformat(text)
+    except ValueError:
+        day = _check_date(text)
+        return _INVALID_DATETIME if type(day) is _Invalid else f"{day} 00:00:00"
+    
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+
+_CHECK_FACTORIES = {
+    'score': _compile_score,
+    'text': lambda field: _check_text,
+    'email': lambda field: _check_email,
+    'date': lambda field: _check_date,
+    'datetime': lambda field: _check_datetime,
+}
+
+
+class CompiledValidator:
+    """Validador gerado a partir de um esquema; reutilize a mesma instância."""
+    
+    def __init__(self, schema: Tuple[Field, ...]):
+        """Compila o esquema em uma lista de checagens (uma por campo)."""
+        self.schema = schema
+        self._checks = tuple(
+            (field.name, _CHECK_FACTORIES[field.kind](field), field.required)
+            for field in schema
+        )
+    
+    def validate(self, data: Any) -> ValidationResult:
+        """
+        Valida e normaliza um dicionário de uma vez, coletando todos os erros.
+        
+        Returns:
+            ValidationResult: Dados normalizados (notas como int, textos sem
+            espaços nas pontas, email em minúsculas, data em YYYY-MM-DD) ou erros
+        """
+        if not isinstance(data, dict):
+            return ValidationResult(None, [ValidationError(None, 'not_an_object')])
+        
+        normalized = {}
+        errors = None
+        
+        for name, check, required in self._checks:
+            value = data.get(name, _MISSING)
+            
+            if value is _MISSING or value is None or value == '':
+                if required:
+                    if errors is None:
+                        errors = []
+                    errors.append(ValidationError(name, 'required'))
+                continue
+            
+            value = check(value)
+            if type(value) is _Invalid:
+                if errors is None:
+                    errors = []
+                errors.append(ValidationError(name, value.code, value.params))
+            else:
+                normalized[name] = value
+        
+        if errors:
+            return ValidationResult(None, errors)
+        return ValidationResult(normalized)
+
+
+def compile_validator(schema: Tuple[Field, ...]) -> CompiledValidator:
+    """Compila um esquema de campos em um validador."""
+    return CompiledValidator(schema)
+
+
+# Validadores compilados uma única vez na importação
+REVIEW_VALIDATOR = compile_validator(MODEL_SCHEMA)
+REVIEW_INPUT_VALIDATOR = compile_validator(REVIEW_SCHEMA)
+SUBMISSION_VALIDATOR = compile_validator(SUBMISSION_SCHEMA)
+BATCH_SUBMISSION_VALIDATOR = compile_validator(tuple(
+    field.replace(required=True) if field.name == 'date' else field
+    for field in SUBMISSION_SCHEMA
+))
+IMPORT_VALIDATOR = compile_validator(IMPORT_SCHEMA)
@@ -3,14 +3,27 @@ Serviço de IA para análise das avaliações semanais.
 Gera insights e recomendações baseadas nas notas e comentários.
 """
 
-from typing import Dict, List, Any
+import zlib
+from typing import Dict, List, Any, Optional
 from ..models.result import Result
 from ..models.review import Review
+from ..models.running_stats import TREND_FIELDS, ReviewAccumulator, week_start
+from ..models.sentiment import SENTIMENT_SCORER
+from .analytics_engine import AnalyticsEngine, get_analytics_engine
 
 
 class AIAnalysisService:
     """Serviço para análise inteligente das avaliações."""
     
+    # Média de sentimento (-1 a 1) a partir da qual o tom é positivo ou negativo
+    SENTIMENT_THRESHOLD = 0.15
+    
+    # Correlação (em módulo) a partir da qual a relação entre duas áreas é citada
+    CORRELATION_THRESHOLD = 0.3
+    
+    # Avaliações mínimas no período para comentar correlações
+    CORRELATION_MIN_REVIEWS = 10
+    
     def __init__(self):
         """Inicializa o serviço de análise."""
         self.analysis_templates = {
@@ -48,25 +61,110 @@ class AIAnalysisService:
             }
         }
     
+    @property
+    def analytics(self) -> AnalyticsEngine:
+        """Motor de análise em lote (NumPy quando disponível)."""
+        return get_analytics_engine()
+    
     def analyze_weekly_data(self, weekly_data: Dict[str, Any], reviews: List[Review]) -> Result:
         """
         Analisa os dados semanais e gera insights personalizados.
         
+        A mensagem motivacional é escolhida pelo usuário e pela semana ISO das
+        avaliações, como no relatório semanal.
+        
         Args:
             weekly_data: Dados estatísticos da semana
             reviews: Lista de avaliações da semana
             
+        Returns:
+            Result: Análise completa com insights e recomendações
+        """
+        scores = self.analytics.load([(r.work, r.training, r.studies, r.mind) for r in reviews])
+        return self.analyze_weekly_stats(self.analytics.weekly_stats(scores), weekly_data,
+                                         seed=self._reviews_seed(reviews))
+    
+    @staticmethod
+    def _reviews_seed(reviews: List[Review]) -> str:
+        """Semente usuário|semana ISO das avaliações (usuário vazio se forem de vários)."""
+        emails = {review.user_email for review in reviews if review.user_email}
+        dates = [review.review_date for review in reviews if review.review_date]
+        user = emails.pop() if len(emails) == 1 else ''
+        return f"{user}|{week_start(min(dates)) if dates else ''}"
+    
+    def analyze_history(self, reviews: List[Review], window: int = 7) -> Result:
+        """
+        Analisa um histórico longo de avaliações (meses, anos, vários usuários).
+        
+        Args:
+            reviews: Avaliações em ordem de data
+            window: Tamanho da janela das médias móveis (em avaliações)
+            
+        Returns:
+            Result: Médias, variâncias, consistência, tendências e correlações
+            por área, mais as médias móveis ('rolling_averages')
+        """
+        try:
+            scores = self.analytics.load([(r.work, r.training, r.studies, r.mind) for r in reviews])
+            
+            history = self.analytics.summarize(scores)
+            history['rolling_averages'] = self.analytics.rolling_averages(scores, window)
+            history['backend'] = self.analytics.name
+            
+            return Result.success_result(history)
+            
+        except Exception as e:
+            return Result.error_result(f"Erro na análise do histórico: {str(e)}")
+    
+    def score_comments(self, texts: List[Optional[str]]) -> List[float]:
+        """
+        Notas de sentimento (-1 a 1) de vários comentários em uma chamada.
+        
+        Usa o léxico local com tabelas pré-compiladas; as notas das avaliações
+        gravadas já ficam em cache no banco (review_sentiment).
+        """
+        return SENTIMENT_SCORER.score_many(texts)
+    
+    def analyze_weekly_stats(self, stats: ReviewAccumulator, weekly_data: Optional[Dict[str, Any]] = None,
+                             *, seed: str, trends: Optional[Dict[str, Any]] = None,
+                             themes: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                             sentiment: Optional[Dict[str, Any]] = None,
+                             correlations: Optional[Dict[str, Any]] = None,
+                             distribution: Optional[Dict[str, Any]] = None) -> Result:
+        """
+        Analisa as estatísticas já acumuladas da semana (sem reler as avaliações).
+        
+        Args:
+            stats: Estatísticas da semana
+            weekly_data: Médias arredondadas (padrão: stats.to_dict())
+            seed: Texto que escolhe a mensagem motivacional (usuário|semana);
+                a mesma semente sempre gera a mesma análise
+            trends: Tendências das semanas anteriores (ver
+                DatabaseService.get_weekly_trends); se informadas, a análise
+                ganha a chave 'trends'
+            themes: Termos mais citados nos comentários da semana (ver
+                DatabaseService.get_top_terms)
+            sentiment: Resumo do sentimento dos comentários da semana (ver
+                DatabaseService.get_sentiment_stats)
+            correlations: Correlações entre as áreas nas últimas semanas (ver
+                DatabaseService.get_area_correlations); se informadas, a
+                análise ganha a chave 'correlations'
+            distribution: Distribuição das notas da semana (ver
+                DatabaseService.get_score_distribution); se informada, a
+                análise ganha a chave 'distribution'
+            
         Returns:
             Result: Análise completa com insights e recomendações
         """
         try:
+            weekly_data = weekly_data or stats.to_dict()
             overall_average = weekly_data['overall_average']
             
             # Determina o nível de performance
             performance_level = self._get_performance_level(overall_average)
             
             # Analisa padrões nas avaliações
-            patterns = self._analyze_patterns(reviews)
+            patterns = self._analyze_patterns(stats, themes, sentiment)
             
             # Gera insights específicos
             insights = self._generate_insights(weekly_data, patterns)
@@ -81,15 +179,194 @@ class AIAnalysisService:
                 'patterns': patterns,
                 'insights': insights,
                 'recommendations': recommendations,
-                'motivational_message': self._get_motivational_message(performance_level),
+                'motivational_message': self._get_motivational_message(performance_level, seed),
                 'weekly_summary': self._create_weekly_summary(weekly_data, patterns)
             }
             
+            if trends:
+                analysis['trends'] = self.analyze_trends(trends)
+            
+            if correlations:
+                analysis['correlations'] = self.analyze_correlations(correlations)
+            
+            if distribution:
+                analysis['distribution'] = self.analyze_distribution(distribution)
+            
             return Result.success_result(analysis)
             
         except Exception as e:
             return Result.error_result(f"Erro na análise: {str(e)}")
     
+    def analyze_trends(self, trends: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Resume as tendências de longo prazo calculadas pelo banco.
+        
+        Args:
+            trends: Resultado de DatabaseService.get_weekly_trends
+            
+        Returns:
+            Dict: Variações sobre a semana anterior e médias móveis de 4 semanas
+            (por área e 'Geral'), sequências, melhor e pior semana e insights
+        """
+        if not trends:
+            return {}
+        
+        latest = trends['latest']
+        deltas = {
+            label: round(latest[f'{field}_delta'], 2) if latest[f'{field}_delta'] is not None else None
+            for field, label in TREND_FIELDS
+        }
+        
+        summary = {
+            'week_start': latest['week_start'],
+            'weeks': len(trends['history']),
+            'deltas': deltas,
+            'moving_averages': {
+                label: round(latest[f'{field}_ma4'], 2) for field, label in TREND_FIELDS
+            },
+            'current_streak': trends['current_streak'],
+            'longest_streak': trends['longest_streak'],
+            'best_week': {
+                'week_start': trends['best_week']['week_start'],
+                'overall_average': round(trends['best_week']['overall'], 2)
+            },
+            'worst_week': {
+                'week_start': trends['worst_week']['week_start'],
+                'overall_average': round(trends['worst_week']['overall'], 2)
+            }
+        }
+        summary['insights'] = self._generate_trend_insights(summary)
+        return summary
+    
+    def _generate_trend_insights(self, summary: Dict[str, Any]) -> List[str]:
+        """Gera insights sobre a evolução das últimas semanas."""
+        insights = []
+        
+        # Variação da média geral e das áreas que mais mudaram
+        overall_delta = summary['deltas']['Geral']
+        if overall_delta is None:
+            insights.append("🆕 Sem avaliações na semana anterior para comparar")
+        elif overall_delta > 0:
+            insights.append(f"📈 Sua média geral subiu {overall_delta:.2f} em relação à semana anterior")
+        elif overall_delta < 0:
+            insights.append(f"📉 Sua média geral caiu {-overall_delta:.2f} em relação à semana anterior")
+        else:
+            insights.append("➡️ Sua média geral ficou igual à da semana anterior")
+        
+        area_deltas = {
+            label: delta for label, delta in summary['deltas'].items()
+            if label != 'Geral' and delta is not None
+        }
+        if area_deltas:
+            rising = max(area_deltas, key=area_deltas.get)
+            falling = min(area_deltas, key=area_deltas.get)
+            if area_deltas[rising] > 0:
+                insights.append(f"🚀 Maior avanço: {rising} (+{area_deltas[rising]:.2f})")
+            if area_deltas[falling] < 0:
+                insights.append(f"⚠️ Maior queda: {falling} ({area_deltas[falling]:.2f})")
+        
+        # Sequência de semanas com avaliações
+        streak = summary['current_streak']
+        if streak > 1:
+            record = " (seu recorde!)" if streak >= summary['longest_streak'] else ""
+            insights.append(f"🔥 {streak} semanas seguidas com avaliações{record}")
+        
+        # Semana atual entre as melhores/piores do histórico
+        if summary['weeks'] > 1:
+            if summary['best_week']['week_start'] == summary['week_start']:
+                insights.append("🏆 Esta foi a sua melhor semana de todo o histórico!")
+            elif summary['worst_week']['week_start'] == summary['week_start']:
+                insights.append("🌱 Esta foi a semana mais difícil do histórico; a próxima pode ser melhor")
+        
+        return insights
+    
+    def analyze_correlations(self, correlations: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Resume as correlações entre as áreas calculadas pelo banco.
+        
+        Args:
+            correlations: Resultado de DatabaseService.get_area_correlations
+            
+        Returns:
+            Dict: Semanas e avaliações consideradas, pares de áreas com
+            correlação forte e insights (vazio se houver poucas avaliações)
+        """
+        if not correlations or correlations['count'] < self.CORRELATION_MIN_REVIEWS:
+            return {}
+        
+        strong_pairs = [
+            pair for pair in correlations['pairs']
+            if abs(pair['correlation']) >= self.CORRELATION_THRESHOLD
+        ]
+        
+        insights = []
+        for pair in strong_pairs[:3]:
+            first, second = pair['areas']
+            correlation = pair['correlation']
+            if correlation > 0:
+                insights.append(
+                    f"🔗 Nos dias com {first} melhor, {second} também costuma ser melhor (r = {correlation:+.2f})"
+                )
+            else:
+                insights.append(
+                    f"⚖️ Quando {first} sobe, {second} costuma cair (r = {correlation:+.2f})"
+                )
+        if not insights:
+            insights.append("➖ Nenhuma relação forte entre as áreas neste período")
+        
+        return {
+            'weeks': correlations['weeks'],
+            'count': correlations['count'],
+            'pairs': strong_pairs,
+            'insights': insights
+        }
+    
+    def analyze_distribution(self, distribution: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Resume a distribuição das notas de cada área calculada pelo banco.
+        
+        Args:
+            distribution: Resultado de DatabaseService.get_score_distribution
+            
+        Returns:
+            Dict: Mediana, quartis e proporção de dias bons (nota ≥ 8) por
+            área e insights (vazio se não houver avaliações)
+        """
+        if not distribution or not distribution['count']:
+            return {}
+        
+        areas = {
+            label: {
+                'median': stats['median'],
+                'p25': stats['p25'],
+                'p75': stats['p75'],
+                'share_good_days': stats['share_good_days']
+            }
+            for label, stats in distribution['areas'].items()
+        }
+        
+        insights = []
+        best = max(areas, key=lambda label: areas[label]['share_good_days'])
+        if areas[best]['share_good_days'] > 0:
+            insights.append(
+                f"🌟 {best}: nota 8 ou mais em {areas[best]['share_good_days']:.0%} dos dias"
+            )
+        
+        lowest = min(areas, key=lambda label: areas[label]['median'])
+        if areas[lowest]['median'] < 5:
+            insights.append(
+                f"🔻 Metade dos dias de {lowest} ficou com nota {areas[lowest]['median']:g} ou menos"
+            )
+        
+        spread = max(areas, key=lambda label: areas[label]['p75'] - areas[label]['p25'])
+        if areas[spread]['p75'] - areas[spread]['p25'] >= 4:
+            insights.append(
+                f"🎢 {spread} oscilou bastante: metade dos dias entre "
+                f"{areas[spread]['p25']:g} e {areas[spread]['p75']:g}"
+            )
+        
+        return {'count': distribution['count'], 'areas': areas, 'insights': insights}
+    
     def _get_performance_level(self, average: float) -> str:
         """Determina o nível de performance baseado na média."""
         if average >= self.analysis_templates['excellent']['threshold']:
@@ -101,9 +378,11 @@ class AIAnalysisService:
         else:
             return 'needs_improvement'
     
-    def _analyze_patterns(self, reviews: List[Review]) -> Dict[str, Any]:
-        """Analisa padrões nas avaliações."""
-        if not reviews:
+    def _analyze_patterns(self, stats: ReviewAccumulator,
+                          themes: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                          sentiment: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Analisa padrões a partir das estatísticas acumuladas, dos temas e do sentimento da semana."""
+        if not stats.count:
             return {}
         
         patterns = {
@@ -114,28 +393,25 @@ class AIAnalysisService:
             'consistency_score': 0
         }
         
-        # Calcula médias por área
-        work_scores = [r.work for r in reviews]
-        training_scores = [r.training for r in reviews]
-        studies_scores = [r.studies for r in reviews]
-        mind_scores = [r.mind for r in reviews]
-        
-        area_averages = {
-            'Trabalho': sum(work_scores) / len(work_scores),
-            'Treino': sum(training_scores) / len(training_scores),
-            'Estudos': sum(studies_scores) / len(studies_scores),
-            'Mente': sum(mind_scores) / len(mind_scores)
-        }
+        # Médias por área (já somadas na leitura)
+        area_averages = stats.area_averages()
         
         patterns['strongest_area'] = max(area_averages, key=area_averages.get)
         patterns['weakest_area'] = min(area_averages, key=area_averages.get)
         
-        # Analisa consistência (quanto menor o desvio padrão, mais consistente)
-        all_scores = work_scores + training_scores + studies_scores + mind_scores
-        if all_scores:
-            mean_score = sum(all_scores) / len(all_scores)
-            variance = sum((score - mean_score) ** 2 for score in all_scores) / len(all_scores)
-            patterns['consistency_score'] = max(0, 10 - (variance ** 0.5))
+        # Consistência (quanto menor o desvio padrão, mais consistente)
+        patterns['consistency_score'] = stats.consistency_score
+        
+        # Temas mais citados (contados na gravação das avaliações)
+        if themes:
+            if themes.get('positive'):
+                patterns['most_mentioned_positive'] = themes['positive'][0]['word']
+            if themes.get('negative'):
+                patterns['most_mentioned_negative'] = themes['negative'][0]['word']
+        
+        # Tom dos comentários (-1 a 1), das notas de sentimento em cache
+        if sentiment and sentiment.get('count'):
+            patterns['sentiment_score'] = sentiment['average']
         
         return patterns
     
@@ -151,6 +427,22 @@ class AIAnalysisService:
         if patterns.get('weakest_area'):
             insights.append(f"📈 Área para focar: {patterns['weakest_area']}")
         
+        # Insights sobre os temas dos comentários
+        if patterns.get('most_mentioned_positive'):
+            insights.append(f"💬 Tema mais citado nos pontos positivos: {patterns['most_mentioned_positive']}")
+        if patterns.get('most_mentioned_negative'):
+            insights.append(f"🔍 Tema mais citado nos pontos negativos: {patterns['most_mentioned_negative']}")
+        
+        # Insight sobre o tom dos comentários
+        sentiment = patterns.get('sentiment_score')
+        if sentiment is not None:
+            if sentiment >= self.SENTIMENT_THRESHOLD:
+                insights.append("😊 Seus comentários da semana tiveram um tom positivo")
+            elif sentiment <= -self.SENTIMENT_THRESHOLD:
+                insights.append("😟 Seus comentários indicam uma semana pesada")
+            else:
+                insights.append("😐 Seus comentários da semana tiveram um tom neutro")
+        
         # Insight sobre consistência
         consistency = patterns.get('consistency_score', 0)
         if consistency > 7:
@@ -189,6 +481,11 @@ class AIAnalysisService:
             elif weakest == 'Mente':
                 recommendations.append("🧘‍♀️ Pratique meditação ou atividades relaxantes.")
         
+        # Recomendação baseada no tom dos comentários
+        sentiment = patterns.get('sentiment_score')
+        if sentiment is not None and sentiment <= -self.SENTIMENT_THRESHOLD:
+            recommendations.append("🛌 Reserve um tempo para descansar e recarregar as energias.")
+        
         # Recomendação baseada na consistência
         consistency = patterns.get('consistency_score', 0)
         if consistency < 5:
@@ -203,12 +500,10 @@ class AIAnalysisService:
         
         return recommendations
     
-    def _get_motivational_message(self, performance_level: str) -> str:
-        """Retorna uma mensagem motivacional baseada no nível de performance."""
-        import random
-        
+    def _get_motivational_message(self, performance_level: str, seed: str) -> str:
+        """Retorna uma mensagem motivacional baseada no nível de performance (determinística pela semente)."""
         messages = self.analysis_templates[performance_level]['messages']
-        return random.choice(messages)
+        return messages[zlib.crc32(seed.encode('utf-8')) % len(messages)]
     
     def _create_weekly_summary(self, weekly_data: Dict[str, Any], patterns: Dict[str, Any]) -> str:
         """Cria um resumo semanal personalizado."""
@@ -0,0 +1,257 @@
+"""
+Motor de análise das notas em lote.
+Carrega as notas como uma matriz (avaliações × 4 áreas) e calcula médias,
+variâncias, médias móveis, tendências e correlações. Usa NumPy quando está
+instalado e um laço em Python puro caso contrário, com resultados idênticos
+entre os dois.
+"""
+
+import math
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from ..models.running_stats import AREAS, ReviewAccumulator
+from ..config.settings import settings
+
+
+class ScoreMoments:
+    """
+    Somas inteiras que resumem uma sequência de avaliações.
+    
+    Atributos:
+        count (int): Quantidade de avaliações
+        sums (list): Soma de cada área
+        cross (list): Matriz 4×4 com a soma dos produtos entre áreas
+        index_sums (list): Soma de posição × nota de cada área (para tendências)
+    """
+    
+    __slots__ = ('count', 'sums', 'cross', 'index_sums')
+    
+    def __init__(self, count: int, sums: List[int], cross: List[List[int]], index_sums: List[int]):
+        self.count = count
+        self.sums = sums
+        self.cross = cross
+        self.index_sums = index_sums
+
+
+class _PythonBackend:
+    """Cálculos em Python puro (sem dependências)."""
+    
+    name = 'python'
+    
+    def load(self, rows: Iterable[Sequence[int]]) -> List[tuple]:
+        """Converte as linhas (work, training, studies, mind) em uma lista de tuplas."""
+        return [tuple(row[:4]) for row in rows]
+    
+    def moments(self, scores: List[tuple]) -> ScoreMoments:
+        sw = st = ss = sm = 0
+        ww = wt = ws = wm = tt = ts = tm = sss = ssm = mm = 0
+        xw = xt = xs = xm = 0
+        
+        for x, (w, t, s, m) in enumerate(scores):
+            sw += w
+            st += t
+            ss += s
+            sm += m
+            ww += w * w
+            wt += w * t
+            ws += w * s
+            wm += w * m
+            tt += t * t
+            ts += t * s
+            tm += t * m
+            sss += s * s
+            ssm += s * m
+            mm += m * m
+            xw += x * w
+            xt += x * t
+            xs += x * s
+            xm += x * m
+        
+        cross = [
+            [ww, wt, ws, wm],
+            [wt, tt, ts, tm],
+            [ws, ts, sss, ssm],
+            [wm, tm, ssm, mm],
+        ]
+        return ScoreMoments(len(scores), [sw, st, ss, sm], cross, [xw, xt, xs, xm])
+    
+    def rolling_averages(self, scores: List[tuple], window: int) -> List[List[float]]:
+        if len(scores) < window:
+            return []
+        
+        w, t, s, m = (sum(row[i] for row in scores[:window]) for i in range(4))
+        result = [[w / window, t / window, s / window, m / window]]
+        for leaving, entering in zip(scores, scores[window:]):
+            w += entering[0] - leaving[0]
+            t += entering[1] - leaving[1]
+            s += entering[2] - leaving[2]
+            m += entering[3] - leaving[3]
+            result.append([w / window, t / window, s / window, m / window])
+        return result
+
+
+class _NumpyBackend:
+    """Cálculos vetorizados com NumPy (notas guardadas como int8)."""
+    
+    name = 'numpy'
+    
+    def __init__(self, numpy):
+        self.np = numpy
+    
+    def load(self, rows: Iterable[Sequence[int]]):
+        """Converte as linhas em uma matriz compacta (n × 4, int8)."""
+        np = self.np
+        if isinstance(rows, np.ndarray):
+            return rows[:, :4].astype(np.int8, copy=False)
+        values = chain.from_iterable(row[:4] for row in rows)
+        return np.fromiter(values, dtype=np.int8).reshape(-1, 4)
+    
+    def moments(self, scores) -> ScoreMoments:
+        np = self.np
+        wide = scores.astype(np.int64)
+        positions = np.arange(wide.shape[0], dtype=np.int64)
+        
+        return ScoreMoments(
+            int(wide.shape[0]),
+            [int(value) for value in wide.sum(axis=0)],
+            [[int(value) for value in row] for row in wide.T @ wide],
+            [int(value) for value in positions @ wide]
+        )
+    
+    def rolling_averages(self, scores, window: int) -> List[List[float]]:
+        np = self.np
+        if scores.shape[0] < window:
+            return []
+        
+        # Somas inteiras exatas divididas uma vez (mesmo arredondamento do Python)
+        cumulative = np.zeros((scores.shape[0] + 1, 4), dtype=np.int64)
+        np.cumsum(scores, axis=0, dtype=np.int64, out=cumulative[1:])
+        return ((cumulative[window:] - cumulative[:-window]) / window).tolist()
+
+
+class AnalyticsEngine:
+    """
+    Estatísticas de muitas avaliações de uma vez.
+    
+    Os backends só produzem somas inteiras (ScoreMoments); as médias,
+    variâncias, tendências e correlações são calculadas sempre pelo mesmo
+    código a partir dessas somas, por isso os dois backends dão resultados
+    idênticos.
+    
+    A igualdade bit a bit vale entre os backends, não com o cálculo antigo
+    de _analyze_patterns (média e depois soma dos desvios, nota a nota): o
+    consistency_score sai das somas e pode diferir dele nos últimos bits
+    (da ordem de 1e-14), muito abaixo da casa decimal exibida no relatório.
+    """
+    
+    def __init__(self, backend):
+        self.backend = backend
+    
+    @property
+    def name(self) -> str:
+        """Nome do backend em uso ('numpy' ou 'python')."""
+        return self.backend.name
+    
+    def load(self, rows: Iterable[Sequence[int]]):
+        """Carrega linhas (work, training, studies, mind, ...) no formato do backend."""
+        return self.backend.load(rows)
+    
+    def weekly_stats(self, scores) -> ReviewAccumulator:
+        """Resume as notas carregadas em um ReviewAccumulator (médias e consistência)."""
+        moments = self.backend.moments(scores)
+        return ReviewAccumulator.from_sums(
+            moments.count, moments.sums, [moments.cross[i][i] for i in range(4)]
+        )
+    
+    def summarize(self, scores) -> Dict[str, Any]:
+        """
+        Calcula as estatísticas de uma sequência de avaliações (em ordem de data).
+        
+        Returns:
+            Dict: count, area_averages, area_variances, consistency_score,
+            trend_slopes (variação da nota por avaliação) e correlations
+            (Pearson entre cada par de áreas; None se uma área não variou)
+        """
+        moments = self.backend.moments(scores)
+        n = moments.count
+        sums = moments.sums
+        cross = moments.cross
+        labels = [label for _, label in AREAS]
+        
+        if not n:
+            return {
+                'count': 0,
+                'area_averages': {},
+                'area_variances': {},
+                'consistency_score': 0,
+                'trend_slopes': {},
+                'correlations': {}
+            }
+        
+        # n² × variância de cada área (inteiro exato)
+        scaled_variances = [n * cross[i][i] - sums[i] * sums[i] for i in range(4)]
+        
+        # Mínimos quadrados da nota contra a posição 0..n-1
+        sum_x = n * (n - 1) // 2
+        sum_x2 = (n - 1) * n * (2 * n - 1) // 6
+        slope_denominator = n * sum_x2 - sum_x * sum_x
+        
+        correlations = {label: {} for label in labels}
+        for i in range(4):
+            for j in range(i + 1, 4):
+                denominator = scaled_variances[i] * scaled_variances[j]
+                covariance = n * cross[i][j] - sums[i] * sums[j]
+                value = covariance / math.sqrt(denominator) if denominator else None
+                correlations[labels[i]][labels[j]] = value
+                correlations[labels[j]][labels[i]] = value
+        
+        stats = ReviewAccumulator.from_sums(n, sums, [cross[i][i] for i in range(4)])
+        
+        return {
+            'count': n,
+            'area_averages': stats.area_averages(),
+            'area_variances': {labels[i]: scaled_variances[i] / (n * n) for i in range(4)},
+            'consistency_score': stats.consistency_score,
+            'trend_slopes': {
+                labels[i]: ((n * moments.index_sums[i] - sum_x * sums[i]) / slope_denominator
+                            if slope_denominator else 0.0)
+                for i in range(4)
+            },
+            'correlations': correlations
+        }
+    
+    def rolling_averages(self, scores, window: int) -> List[List[float]]:
+        """Médias móveis de cada área em janelas de `window` avaliações consecutivas."""
+        return self.backend.rolling_averages(scores, window)
+
+
+_engines: Dict[str, AnalyticsEngine] = {}
+
+
+def get_analytics_engine(backend: Optional[str] = None) -> AnalyticsEngine:
+    """
+    Retorna o motor de análise.
+    
+    Args:
+        backend: 'numpy', 'python' ou 'auto' (padrão: ANALYTICS_BACKEND).
+            Em 'auto', usa NumPy se estiver instalado.
+    
+    Raises:
+        ImportError: Se 'numpy' for pedido e o NumPy não estiver instalado
+    """
+    backend = (backend or settings.ANALYTICS_BACKEND).lower()
+    
+    if backend not in _engines:
+        if backend == 'python':
+            engine = AnalyticsEngine(_PythonBackend())
+        else:
+            try:
+                import numpy
+                engine = AnalyticsEngine(_NumpyBackend(numpy))
+            except ImportError:
+                if backend == 'numpy':
+                    raise
+                engine = AnalyticsEngine(_PythonBackend())
+        _engines[backend] = engine
+    
+    return _engines[backend]
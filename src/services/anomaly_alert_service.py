@@ -0,0 +1,157 @@
+"""
+Serviço de alerta de quedas bruscas nas notas.
+Recebe as anomalias encontradas pelo detector na gravação das avaliações e
+avisa o usuário por email logo em seguida, sem esperar o relatório semanal.
+O envio roda em uma thread de fundo, então a gravação não espera o SMTP.
+"""
+
+import atexit
+import queue
+import threading
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+from ..models.anomaly import Anomaly
+from ..models.result import Result
+from .email_service import EmailService
+from ..config.settings import settings
+
+
+class AnomalyAlertService:
+    """Serviço para enviar alertas de dias fora do padrão."""
+    
+    # Só alerta sobre dias recentes (históricos importados não geram email)
+    MAX_AGE_DAYS = 1
+    
+    # Segundos que o processo espera, ao encerrar, pelos alertas ainda na fila
+    EXIT_TIMEOUT_SECONDS = 30
+    
+    def __init__(self, email_service: Optional[EmailService] = None):
+        """Inicializa o serviço de alertas."""
+        self._email_service = email_service
+        self._queue: queue.Queue = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+    
+    @property
+    def email_service(self) -> EmailService:
+        """Serviço de email (criado no primeiro uso)."""
+        if self._email_service is None:
+            self._email_service = EmailService()
+        return self._email_service
+    
+    def enqueue(self, anomalies: List[Anomaly]):
+        """
+        Agenda o envio dos alertas e retorna na hora (ouvinte de
+        DatabaseService.anomaly_listeners).
+        
+        Os emails são enviados por uma thread de fundo, na ordem das
+        gravações; ao encerrar, o processo espera até EXIT_TIMEOUT_SECONDS
+        pelos alertas que ainda estão na fila.
+        """
+        if not self._drops_by_user(anomalies):
+            return
+        
+        self._queue.put(list(anomalies))
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name='anomaly-alerts', daemon=True)
+                self._worker.start()
+                atexit.register(self.wait, self.EXIT_TIMEOUT_SECONDS)
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Espera a fila de alertas esvaziar.
+        
+        Returns:
+            bool: False se o tempo acabou antes de todos os alertas serem enviados
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+    
+    def _run(self):
+        """Envia os alertas da fila, um lote de anomalias por vez (thread de fundo)."""
+        while True:
+            anomalies = self._queue.get()
+            try:
+                result = self.notify(anomalies)
+                if not result.success:
+                    print(f"❌ {result.get_first_error()}")
+            finally:
+                self._queue.task_done()
+    
+    def _drops_by_user(self, anomalies: List[Anomaly]) -> Dict[str, List[Anomaly]]:
+        """Quedas de nota dos dias recentes agrupadas por usuário."""
+        oldest = (date.today() - timedelta(days=self.MAX_AGE_DAYS)).isoformat()
+        drops_by_user: Dict[str, List[Anomaly]] = {}
+        for anomaly in anomalies:
+            if anomaly.is_drop and anomaly.review_date >= oldest:
+                drops_by_user.setdefault(anomaly.user_email, []).append(anomaly)
+        return drops_by_user
+    
+    def notify(self, anomalies: List[Anomaly]) -> Result:
+        """
+        Envia um email por usuário com as quedas de nota dos dias recentes.
+        
+        Executado na thread de fundo (ver enqueue); pode ser chamado direto
+        quando o chamador quer esperar o envio.
+        
+        Args:
+            anomalies: Anomalias de uma gravação (ver DatabaseService.anomaly_listeners)
+        
+        Returns:
+            Result: Dicionário usuário -> None (enviado) ou mensagem de erro
+        """
+        try:
+            drops_by_user = self._drops_by_user(anomalies)
+            
+            if not drops_by_user:
+                return Result.success_result({})
+            
+            result = self.email_service.send_bulk_emails(
+                (user_email, *self._build_alert(drops))
+                for user_email, drops in drops_by_user.items()
+            )
+            
+            if result.success:
+                for user_email, error in result.data.items():
+                    if error is None:
+                        print(f"⚠️ Alerta de queda enviado para: {user_email}")
+                    else:
+                        print(f"❌ Erro ao enviar alerta para {user_email}: {error}")
+            
+            return result
+        
+        except Exception as e:
+            return Result.error_result(f"Erro ao enviar alerta: {str(e)}")
+    
+    def _build_alert(self, drops: List[Anomaly]) -> tuple:
+        """Assunto e corpo do alerta das quedas de um usuário."""
+        day = date.fromisoformat(drops[0].review_date).strftime('%d/%m/%Y')
+        subject = f"⚠️ {settings.APP_NAME} - Queda nas notas ({day})"
+        
+        lines = "\n".join(
+            f"• {drop.area}: {drop.value}/10 (sua média recente é {drop.expected:.1f})"
+            for drop in drops
+        )
+        body = f"""
+Olá!
+
+Sua avaliação de {day} ficou bem abaixo do seu padrão recente:
+
+{lines}
+
+Dias difíceis acontecem. Que tal separar um momento para descansar e
+pensar no que pesou hoje? Amanhã é uma nova oportunidade.
+
+---
+📱 {settings.APP_NAME} v{settings.APP_VERSION}
+        """.strip()
+        
+        return subject, body
@@ -4,7 +4,7 @@ Envia email de confirmação quando uma avaliação é recebida.
 """
 
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from ..models.result import Result
 from ..models.review import Review
 from .email_service import EmailService
@@ -14,9 +14,16 @@ from ..config.settings import settings
 class ConfirmationService:
     """Serviço para envio de confirmações de avaliação."""
     
-    def __init__(self):
+    def __init__(self, email_service: Optional[EmailService] = None):
         """Inicializa o serviço de confirmação."""
-        self.email_service = EmailService()
+        self._email_service = email_service
+    
+    @property
+    def email_service(self) -> EmailService:
+        """Serviço de email (criado no primeiro uso)."""
+        if self._email_service is None:
+            self._email_service = EmailService()
+        return self._email_service
     
     def send_evaluation_confirmation(self, review: Review, user_email: str) -> Result:
         """
@@ -182,3 +189,173 @@ Continue registrando suas avaliações diárias para ter insights mais precisos!
         """.strip()
         
         return body
+    
+    def send_batch_confirmation(self, reviews: List[Review], user_email: str) -> Result:
+        """
+        Envia uma única confirmação para várias avaliações do mesmo usuário.
+        
+        Args:
+            reviews: Avaliações recebidas no lote
+            user_email: Email do usuário que enviou
+            
+        Returns:
+            Result: Resultado da operação
+        """
+        try:
+            date_str = datetime.now().strftime('%d/%m/%Y')
+            subject = f"✅ Confirmação - {len(reviews)} Avaliações Recebidas ({date_str})"
+            
+            body = self._create_batch_confirmation_body(reviews, date_str)
+            
+            result = self.email_service.send_email(user_email, subject, body)
+            
+            if result.success:
+                print(f"✅ Confirmação de lote enviada para: {user_email}")
+            else:
+                print(f"❌ Erro ao enviar confirmação de lote: {result.get_first_error()}")
+            
+            return result
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao enviar confirmação de lote: {str(e)}")
+    
+    def _create_batch_confirmation_body(self, reviews: List[Review], date_str: str) -> str:
+        """Cria o corpo do email de confirmação de um lote de avaliações."""
+        
+        lines = []
+        for review in sorted(reviews, key=lambda r: r.review_date or ''):
+            lines.append(
+                f"• {self._format_review_date(review)}: "
+                f"💼 {review.work} | 🏃‍♂️ {review.training} | 📚 {review.studies} | 🧠 {review.mind} "
+                f"→ média {review.get_average_score():.1f}/10"
+            )
+        
+        average = sum(r.get_average_score() for r in reviews) / len(reviews)
+        reviews_lines = "\n".join(lines)
+        
+        body = f"""
+🎯 {settings.APP_NAME} - CONFIRMAÇÃO DE AVALIAÇÕES
+{'=' * 50}
+
+🎉 {len(reviews)} avaliações foram recebidas com sucesso!
+
+📅 Data do envio: {date_str}
+🕒 Horário: {datetime.now().strftime('%H:%M')}
+
+📊 AVALIAÇÕES REGISTRADAS:
+{reviews_lines}
+
+🎯 MÉDIA DO LOTE: {average:.1f}/10
+
+🤖 PRÓXIMOS PASSOS:
+• Suas avaliações foram salvas no sistema
+• Elas serão consideradas nos relatórios das semanas correspondentes
+
+---
+📱 Gerado automaticamente pelo {settings.APP_NAME} v{settings.APP_VERSION}
+🕒 {datetime.now().strftime('%d/%m/%Y às %H:%M')}
+        """.strip()
+        
+        return body
+    
+    def send_batch_confirmations(self, reviews_by_user: Dict[str, List[Review]],
+                                 notify_admin: bool = True) -> Result:
+        """
+        Envia as confirmações de lote de vários usuários (e, opcionalmente, a
+        notificação do administrador) em uma única conexão SMTP.
+        
+        Args:
+            reviews_by_user: Avaliações recebidas agrupadas por email do usuário
+            notify_admin: Se True, inclui a notificação de lote ao administrador
+            
+        Returns:
+            Result: Dicionário destinatário -> None (enviado) ou mensagem de erro
+        """
+        try:
+            date_str = datetime.now().strftime('%d/%m/%Y')
+            messages = [
+                (user_email,
+                 f"✅ Confirmação - {len(reviews)} Avaliações Recebidas ({date_str})",
+                 self._create_batch_confirmation_body(reviews, date_str))
+                for user_email, reviews in reviews_by_user.items()
+            ]
+            if notify_admin and settings.EMAIL_USER:
+                messages.append((settings.EMAIL_USER, *self._create_admin_batch_message(reviews_by_user)))
+            
+            result = self.email_service.send_bulk_emails(messages)
+            
+            if result.success:
+                sent = sum(1 for error in result.data.values() if error is None)
+                print(f"✅ {sent}/{len(messages)} confirmações de lote enviadas")
+                for to_email, error in result.data.items():
+                    if error is not None:
+                        print(f"❌ Erro ao enviar confirmação de lote para {to_email}: {error}")
+            else:
+                print(f"❌ Erro ao enviar confirmações de lote: {result.get_first_error()}")
+            
+            return result
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao enviar confirmações de lote: {str(e)}")
+    
+    def send_admin_batch_notification(self, reviews_by_user: Dict[str, List[Review]]) -> Result:
+        """
+        Envia uma única notificação ao administrador sobre um lote de avaliações.
+        
+        Args:
+            reviews_by_user: Avaliações recebidas agrupadas por email do usuário
+            
+        Returns:
+            Result: Resultado da operação
+        """
+        try:
+            admin_email = settings.EMAIL_USER
+            subject, body = self._create_admin_batch_message(reviews_by_user)
+            
+            result = self.email_service.send_email(admin_email, subject, body)
+            
+            if result.success:
+                print(f"📧 Notificação de lote enviada para admin: {admin_email}")
+            else:
+                print(f"❌ Erro ao enviar notificação de lote: {result.get_first_error()}")
+            
+            return result
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao enviar notificação de lote: {str(e)}")
+    
+    def _create_admin_batch_message(self, reviews_by_user: Dict[str, List[Review]]) -> tuple:
+        """Assunto e corpo da notificação de lote para o administrador."""
+        total = sum(len(reviews) for reviews in reviews_by_user.values())
+        date_str = datetime.now().strftime('%d/%m/%Y')
+        subject = f"📊 Lote de {total} Avaliações Recebido ({date_str})"
+        
+        lines = []
+        for user_email, reviews in reviews_by_user.items():
+            dates = sorted(self._format_review_date(r) for r in reviews)
+            lines.append(f"• {user_email}: {len(reviews)} avaliações ({', '.join(dates)})")
+        users_lines = "\n".join(lines)
+        
+        body = f"""
+📊 {settings.APP_NAME} - NOTIFICAÇÃO DE LOTE DE AVALIAÇÕES
+{'=' * 55}
+
+📅 Data: {date_str}
+🕒 Horário: {datetime.now().strftime('%H:%M')}
+📦 Total de avaliações: {total}
+
+👤 USUÁRIOS:
+{users_lines}
+
+---
+📱 Sistema: {settings.APP_NAME} v{settings.APP_VERSION}
+🕒 {datetime.now().strftime('%d/%m/%Y às %H:%M')}
+        """.strip()
+        
+        return subject, body
+    
+    def _format_review_date(self, review: Review) -> str:
+        """Formata a data da avaliação como DD/MM/YYYY."""
+        if not review.review_date:
+            return datetime.now().strftime('%d/%m/%Y')
+        return datetime.strptime(review.review_date, '%Y-%m-%d').strftime('%d/%m/%Y')
@@ -0,0 +1,113 @@
+"""
+Contêiner de serviços compartilhados.
+Cada serviço é importado e construído só no primeiro uso e depois reaproveitado,
+para que os scripts agendados iniciem rápido e não criem serviços repetidos.
+"""
+
+from functools import cached_property
+
+
+class ServiceContainer:
+    """Cria os serviços sob demanda e compartilha uma instância de cada."""
+    
+    @cached_property
+    def database(self):
+        """Serviço de banco de dados."""
+        from .database_service import DatabaseService
+        from ..config.settings import settings
+        database = DatabaseService()
+        if settings.ANOMALY_ALERTS_ENABLED:
+            # Os alertas vão para uma fila enviada em segundo plano (a gravação não espera o SMTP)
+            database.anomaly_listeners.append(lambda anomalies: self.anomaly_alerts.enqueue(anomalies))
+        return database
+    
+    @cached_property
+    def email(self):
+        """Serviço de envio de emails."""
+        from .email_service import EmailService
+        return EmailService()
+    
+    @cached_property
+    def anomaly_alerts(self):
+        """Serviço de alerta de quedas bruscas nas notas."""
+        from .anomaly_alert_service import AnomalyAlertService
+        return AnomalyAlertService(email_service=self.email)
+    
+    @cached_property
+    def ai_analysis(self):
+        """Serviço de análise das avaliações."""
+        from .ai_analysis_service import AIAnalysisService
+        return AIAnalysisService()
+    
+    @cached_property
+    def confirmation(self):
+        """Serviço de confirmações por email."""
+        from .confirmation_service import ConfirmationService
+        return ConfirmationService(email_service=self.email)
+    
+    @cached_property
+    def weekly_report(self):
+        """Serviço de relatório semanal."""
+        from .weekly_report_service import WeeklyReportService
+        return WeeklyReportService(
+            db_service=self.database,
+            email_service=self.email,
+            ai_service=self.ai_analysis
+        )
+    
+    @cached_property
+    def daily_form(self):
+        """Serviço de envio dos formulários diários."""
+        from .daily_form_sender import DailyFormService
+        return DailyFormService(email_service=self.email)
+    
+    @cached_property
+    def export(self):
+        """Serviço de exportação das avaliações."""
+        from .export_service import ExportService
+        return ExportService(db_service=self.database)
+    
+    @cached_property
+    def importer(self):
+        """Serviço de importação de histórico de avaliações."""
+        from .import_service import ImportService
+        return ImportService(db_service=self.database)
+    
+    @cached_property
+    def mailbox_ingest(self):
+        """Serviço de ingestão em lote de respostas por email (mbox/Maildir)."""
+        from .mailbox_ingest_service import MailboxIngestService
+        return MailboxIngestService(
+            db_service=self.database,
+            confirmation_service=self.confirmation
+        )
+    
+    @cached_property
+    def scheduler(self):
+        """Agendador em processo das tarefas automáticas."""
+        from .scheduler_service import SchedulerService
+        return SchedulerService(
+            db_service=self.database,
+            daily_form_service=self.daily_form,
+            weekly_report_service=self.weekly_report
+        )
+    
+    @cached_property
+    def email_processor(self):
+        """Serviço de processamento das respostas por email."""
+        from .email_processor_service import EmailProcessorService
+        return EmailProcessorService(
+            db_service=self.database,
+            confirmation_service=self.confirmation
+        )
+
+
+_services = None
+
+
+def get_services() -> ServiceContainer:
+    """Retorna o contêiner de serviços do processo (criado no primeiro uso)."""
+    global _services
+    if _services is None:
+        _services = ServiceContainer()
+    return _services
@@ -4,7 +4,7 @@ Envia emails com formulários HTML nas segundas, quartas e sextas.
 """
 
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional
 from ..models.result import Result
 from .email_service import EmailService
 from .daily_form_service import format_daily_form_email
@@ -14,11 +14,18 @@ from ..config.settings import settings
 class DailyFormService:
     """Serviço para envio de formulários diários."""
     
-    def __init__(self):
+    def __init__(self, email_service: Optional[EmailService] = None):
         """Inicializa o serviço de formulários diários."""
-        self.email_service = EmailService()
+        self._email_service = email_service
         self.target_email = None
     
+    @property
+    def email_service(self) -> EmailService:
+        """Serviço de email (criado no primeiro uso)."""
+        if self._email_service is None:
+            self._email_service = EmailService()
+        return self._email_service
+    
     def send_daily_form(self, target_email: str) -> Result:
         """
         Envia o formulário de avaliação diária.
@@ -3,21 +3,240 @@ Serviço para operações de banco de dados.
 Centraliza todas as operações relacionadas ao banco de dados.
 """
 
+import json
 import sqlite3
 import os
-from typing import List, Optional
-from ..models.review import Review
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from ..models.review import Review, parse_review_date
+from ..models.anomaly import Anomaly, AnomalyDetector, AnomalyState
+from ..models.keywords import count_terms
+from ..models.sentiment import LEXICON_VERSION, SENTIMENT_SCORER
 from ..models.result import Result
+from ..models.running_stats import (
+    AREAS, AREA_PAIRS, SCORE_VALUES, TREND_FIELDS, CoMomentAccumulator, ReviewAccumulator,
+    ScoreHistogram, week_start
+)
 from ..config.settings import settings
 
 
+# Colunas lidas nas consultas de avaliações (ordem usada por _row_to_review)
+REVIEW_COLUMNS = (
+    'id, work, training, studies, mind, positive_points, negative_points, '
+    'user_email, review_date'
+)
+
+# Campos que podem ser selecionados na API de leitura
+REVIEW_FIELDS = (
+    'id', 'work', 'training', 'studies', 'mind', 'positive_points', 'negative_points',
+    'user_email', 'review_date', 'created_at'
+)
+
+# Inserção que ignora uma segunda avaliação do mesmo usuário no mesmo dia
+INSERT_REVIEW_ONCE_SQL = '''
+    INSERT INTO reviews (work, training, studies, mind, positive_points, negative_points,
+                         user_email, review_date)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(user_email, review_date) DO NOTHING
+'''
+
+# Importação de histórico: como INSERT_REVIEW_ONCE_SQL, mas mantém a data/hora original
+IMPORT_REVIEW_SQL = '''
+    INSERT INTO reviews (work, training, studies, mind, positive_points, negative_points,
+                         user_email, review_date, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(user_email, review_date) DO NOTHING
+'''
+
+# Colunas dos acumuladores de review_rollups (ordem de ReviewAccumulator.to_row)
+ROLLUP_COLUMNS = (
+    'count, work_mean, work_m2, training_mean, training_m2, studies_mean, studies_m2, '
+    'mind_mean, mind_m2, overall_mean, overall_m2'
+)
+
+# Usuário das linhas de review_rollups que somam todos os usuários
+ALL_USERS = ''
+
+# Colunas do estado do detector de anomalias (ordem de AnomalyState.to_row)
+ANOMALY_STATE_COLUMNS = ', '.join(
+    ['count', 'last_date'] +
+    [f'{field}_{moment}' for field, _ in AREAS for moment in ('mean', 'variance')]
+)
+
+# Colunas dos contadores de review_histograms (uma por nota possível)
+HISTOGRAM_COLUMNS = ', '.join(f'score_{score}' for score in SCORE_VALUES)
+
+# Colunas dos co-momentos de review_comoments (ordem de CoMomentAccumulator.to_row)
+COMOMENT_COLUMNS = ', '.join(
+    ['count'] +
+    [f'sum_{field}' for field, _ in AREAS] +
+    [f'{AREAS[i][0]}_{AREAS[j][0]}' for i, j in AREA_PAIRS]
+)
+
+# Tabelas calculadas a partir das avaliações (recriadas por create_tables se ausentes)
+DERIVED_TABLES = (
+    'review_rollups', 'review_comoments', 'review_histograms', 'review_anomaly_state',
+    'review_anomalies', 'review_terms', 'review_sentiment'
+)
+
+# Cópia das avaliações duplicadas por usuário/dia removidas pela migração
+DUPLICATES_BACKUP_TABLE = 'reviews_duplicates_removed'
+
+
+def _trend_columns(field: str) -> str:
+    """Média, variação sobre a semana anterior e média móvel de 4 semanas de uma série."""
+    return f'''
+        {field},
+        CASE WHEN day - LAG(day) OVER w = 7 THEN {field} - LAG({field}) OVER w END AS {field}_delta,
+        AVG({field}) OVER (
+            PARTITION BY user_email ORDER BY day RANGE BETWEEN 21 PRECEDING AND CURRENT ROW
+        ) AS {field}_ma4'''
+
+
+# Médias exatas de cada área na semana (soma inteira / contagem, ver RunningStats.integer_mean)
+_WEEK_AVERAGES = ',\n            '.join(
+    f'ROUND({field}_mean * count) / count AS {field}' for field, _ in AREAS
+)
+
+
+# Tendências das semanas ISO a partir dos acumuladores semanais, calculadas
+# pelo SQLite com funções de janela (uma linha por semana, sem ler avaliações):
+# - variação sobre a semana anterior (só se ela tiver avaliações);
+# - média móvel das últimas 4 semanas do calendário;
+# - sequências de semanas seguidas com avaliações (gaps and islands: semanas
+#   consecutivas têm o mesmo número da semana menos a posição);
+# - posição da semana entre as melhores e as piores pela média geral.
+# As janelas são separadas por usuário; {user_filter} escolhe os usuários
+# (ver DatabaseService._user_filter).
+WEEKLY_TRENDS_SQL = f'''
+    WITH weeks AS (
+        SELECT
+            user_email,
+            period_start AS week_start,
+            julianday(period_start) AS day,
+            count,
+            {_WEEK_AVERAGES},
+            ROUND(overall_mean * 4 * count) / (4 * count) AS overall
+        FROM review_rollups
+        WHERE {{user_filter}} AND period = 'week' AND period_start <= ?
+    ),
+    islands AS (
+        SELECT *, CAST(day / 7 AS INTEGER) - ROW_NUMBER() OVER (PARTITION BY user_email ORDER BY day) AS island
+        FROM weeks
+    )
+    SELECT
+        user_email,
+        week_start,
+        count,{','.join(_trend_columns(field) for field, _ in TREND_FIELDS)},
+        ROW_NUMBER() OVER (PARTITION BY user_email, island ORDER BY day) AS streak,
+        RANK() OVER (PARTITION BY user_email ORDER BY overall DESC) AS best_rank,
+        RANK() OVER (PARTITION BY user_email ORDER BY overall ASC) AS worst_rank
+    FROM islands
+    WINDOW w AS (PARTITION BY user_email ORDER BY day)
+    ORDER BY user_email, day
+'''
+
+
+# Temas mais citados de cada tipo por usuário a partir do índice de termos;
+# {user_filter} escolhe os usuários (ver DatabaseService._user_filter)
+TOP_TERMS_SQL = '''
+    SELECT user_email, kind, term, word, total FROM (
+        SELECT
+            user_email, kind, term, MIN(word) AS word, SUM(count) AS total,
+            ROW_NUMBER() OVER (
+                PARTITION BY user_email, kind ORDER BY SUM(count) DESC, term
+            ) AS position
+        FROM review_terms
+        WHERE {user_filter} AND week_start >= ? AND week_start <= ?
+        GROUP BY user_email, kind, term
+    )
+    WHERE position <= ?
+    ORDER BY user_email, kind, position
+'''
+
+
+def _group_by_user(rows: Iterable[tuple]) -> Dict[str, List[tuple]]:
+    """Agrupa linhas cuja primeira coluna é o usuário: usuário -> demais colunas."""
+    grouped: Dict[str, List[tuple]] = {}
+    for row in rows:
+        grouped.setdefault(row[0], []).append(tuple(row[1:]))
+    return grouped
+
+
+def _correlations_summary(rows: List[tuple]) -> Dict[str, Any]:
+    """Correlações a partir das linhas de co-momentos semanais (ver get_area_correlations)."""
+    correlations = CoMomentAccumulator.merged(CoMomentAccumulator.from_row(row) for row in rows).to_dict()
+    correlations['weeks'] = len(rows)
+    return correlations
+
+
+def _distribution_summary(rows: List[tuple]) -> Dict[str, Any]:
+    """Distribuição a partir das linhas (semana, área, contadores) dos histogramas (ver get_score_distribution)."""
+    histograms = {field: ScoreHistogram() for field, _ in AREAS}
+    for row in rows:
+        histograms[row[1]].merge(ScoreHistogram(row[2:]))
+    
+    return {
+        'count': histograms[AREAS[0][0]].count,
+        'weeks': len({row[0] for row in rows}),
+        'areas': {label: histograms[field].to_dict() for field, label in AREAS}
+    }
+
+
+def _sentiment_summary(row: Optional[tuple]) -> Dict[str, Any]:
+    """Resumo do sentimento a partir da linha agregada (ver get_sentiment_stats)."""
+    count = row[0] if row else 0
+    return {
+        'count': count,
+        'average': round(row[1], 4) if count else None,
+        'positive_average': round(row[2], 4) if count else None,
+        'negative_average': round(row[3], 4) if count else None,
+        'positive_days': (row[4] or 0) if count else 0,
+        'negative_days': (row[5] or 0) if count else 0
+    }
+
+
+def _terms_summary(rows: List[tuple]) -> Dict[str, List[Dict[str, Any]]]:
+    """Termos a partir das linhas (tipo, termo, palavra, total) de TOP_TERMS_SQL (ver get_top_terms)."""
+    terms = {'positive': [], 'negative': []}
+    for kind, term, word, total in rows:
+        terms[kind].append({'term': term, 'word': word, 'count': total})
+    return terms
+
+
+def _trends_summary(history: List[Dict[str, Any]], end_date: str) -> Dict[str, Any]:
+    """Tendências a partir das semanas de WEEKLY_TRENDS_SQL de um usuário (ver get_weekly_trends)."""
+    if not history:
+        return {}
+    
+    latest = history[-1]
+    previous_week = (date.fromisoformat(week_start(end_date)) - timedelta(days=7)).isoformat()
+    
+    return {
+        'history': history,
+        'latest': latest,
+        'best_week': next(week for week in history if week['best_rank'] == 1),
+        'worst_week': next(week for week in history if week['worst_rank'] == 1),
+        # A sequência continua enquanto a semana atual ou a anterior tiver avaliações
+        'current_streak': latest['streak'] if latest['week_start'] >= previous_week else 0,
+        'longest_streak': max(week['streak'] for week in history)
+    }
+
+
 class DatabaseService:
     """Classe para gerenciar operações de banco de dados."""
     
     def __init__(self):
         """Inicializa o serviço de banco de dados."""
         self.db_path = settings.DATABASE_PATH
-        self._ensure_database_directory()
+        self._directory_ready = False
+        self.anomaly_detector = AnomalyDetector(
+            settings.ANOMALY_EWMA_ALPHA, settings.ANOMALY_Z_THRESHOLD, settings.ANOMALY_MIN_HISTORY
+        )
+        
+        # Funções chamadas com a lista de anomalias depois de cada gravação confirmada
+        # (rodam no caminho da gravação: devem só agendar o trabalho demorado)
+        self.anomaly_listeners: List[Callable[[List[Anomaly]], Any]] = []
     
     def _ensure_database_directory(self):
         """Garante que o diretório do banco de dados existe."""
@@ -28,6 +247,10 @@ class DatabaseService:
     def _get_connection(self) -> Result:
         """Estabelece conexão com o banco de dados."""
         try:
+            # O diretório só é criado na primeira conexão, não ao construir o serviço
+            if not self._directory_ready:
+                self._ensure_database_directory()
+                self._directory_ready = True
             conn = sqlite3.connect(self.db_path)
             return Result.success_result(conn)
         except Exception as e:
@@ -52,7 +275,183 @@ class DatabaseService:
                     mind INTEGER NOT NULL CHECK (mind >= 0 AND mind <= 10),
                     positive_points TEXT NOT NULL,
                     negative_points TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    user_email TEXT,
+                    review_date TEXT
+                )
+            ''')
+            
+            self._migrate_reviews_table(cursor)
+            
+            # Acumuladores (Welford) por usuário e por dia/semana ISO
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS review_rollups (
+                    user_email TEXT NOT NULL,
+                    period TEXT NOT NULL,
+                    period_start TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    work_mean REAL NOT NULL, work_m2 REAL NOT NULL,
+                    training_mean REAL NOT NULL, training_m2 REAL NOT NULL,
+                    studies_mean REAL NOT NULL, studies_m2 REAL NOT NULL,
+                    mind_mean REAL NOT NULL, mind_m2 REAL NOT NULL,
+                    overall_mean REAL NOT NULL, overall_m2 REAL NOT NULL,
+                    PRIMARY KEY (user_email, period, period_start)
+                )
+            ''')
+            
+            # Bancos anteriores aos acumuladores: calcula a partir das avaliações
+            cursor.execute('SELECT 1 FROM review_rollups LIMIT 1')
+            if cursor.fetchone() is None:
+                self._rebuild_rollups(cursor)
+            
+            # Co-momentos das áreas por usuário e semana ISO (correlações)
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'review_comoments'")
+            comoments_table_exists = cursor.fetchone() is not None
+            column_definitions = ', '.join(
+                f'{column} INTEGER NOT NULL' for column in COMOMENT_COLUMNS.split(', ')
+            )
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS review_comoments (
+                    user_email TEXT NOT NULL,
+                    week_start TEXT NOT NULL,
+                    {column_definitions},
+                    PRIMARY KEY (user_email, week_start)
+                )
+            ''')
+            
+            # Bancos anteriores aos co-momentos: calcula a partir das avaliações
+            if not comoments_table_exists:
+                self._rebuild_comoments(cursor)
+            
+            # Histograma das notas de cada área por usuário e semana ISO (percentis)
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'review_histograms'")
+            histograms_table_exists = cursor.fetchone() is not None
+            bucket_definitions = ', '.join(
+                f'{column} INTEGER NOT NULL' for column in HISTOGRAM_COLUMNS.split(', ')
+            )
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS review_histograms (
+                    user_email TEXT NOT NULL,
+                    week_start TEXT NOT NULL,
+                    area TEXT NOT NULL,
+                    {bucket_definitions},
+                    PRIMARY KEY (user_email, week_start, area)
+                )
+            ''')
+            
+            # Bancos anteriores aos histogramas: calcula a partir das avaliações
+            if not histograms_table_exists:
+                self._rebuild_histograms(cursor)
+            
+            # Estado do detector de anomalias por usuário e dias sinalizados
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'review_anomaly_state'")
+            anomaly_table_exists = cursor.fetchone() is not None
+            column_types = {'count': 'INTEGER NOT NULL', 'last_date': 'TEXT'}
+            state_definitions = ', '.join(
+                f"{column} {column_types.get(column, 'REAL NOT NULL')}"
+                for column in ANOMALY_STATE_COLUMNS.split(', ')
+            )
+            
+            if anomaly_table_exists:
+                self._migrate_anomaly_state_table(cursor, state_definitions)
+            
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS review_anomaly_state (
+                    user_email TEXT PRIMARY KEY,
+                    {state_definitions}
+                )
+            ''')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS review_anomalies (
+                    review_id INTEGER NOT NULL,
+                    area TEXT NOT NULL,
+                    user_email TEXT NOT NULL,
+                    review_date TEXT NOT NULL,
+                    value INTEGER NOT NULL,
+                    expected REAL NOT NULL,
+                    z_score REAL NOT NULL,
+                    PRIMARY KEY (review_id, area)
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_review_anomalies_user_date
+                ON review_anomalies (user_email, review_date)
+            ''')
+            
+            # Bancos anteriores ao detector: percorre o histórico em ordem de data
+            if not anomaly_table_exists:
+                self._rebuild_anomalies(cursor)
+            
+            # Termos dos comentários por usuário e semana ISO (temas mais citados)
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'review_terms'")
+            terms_table_exists = cursor.fetchone() is not None
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS review_terms (
+                    user_email TEXT NOT NULL,
+                    week_start TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    term TEXT NOT NULL,
+                    word TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (user_email, week_start, kind, term)
+                )
+            ''')
+            
+            # Bancos anteriores ao índice de termos: indexa os comentários existentes
+            if not terms_table_exists:
+                self._rebuild_terms(cursor)
+            
+            # Notas de sentimento dos comentários (cache por avaliação)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS review_sentiment (
+                    review_id INTEGER PRIMARY KEY,
+                    positive_score REAL NOT NULL,
+                    negative_score REAL NOT NULL,
+                    score REAL NOT NULL,
+                    lexicon_version INTEGER NOT NULL
+                )
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_review_sentiment_version
+                ON review_sentiment(lexicon_version)
+            ''')
+            
+            # Avaliações sem nota ou com nota de um léxico antigo: calcula em lote
+            cursor.execute('SELECT 1 FROM review_sentiment WHERE lexicon_version != ? LIMIT 1',
+                           (LEXICON_VERSION,))
+            outdated = cursor.fetchone() is not None
+            cursor.execute('SELECT 1 FROM review_sentiment LIMIT 1')
+            if outdated or cursor.fetchone() is None:
+                self._score_missing_sentiment(cursor)
+            
+            # Relatórios de semanas passadas (preenchidos por weekly_report.py --backfill)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS weekly_reports (
+                    user_email TEXT NOT NULL,
+                    week_start TEXT NOT NULL,
+                    total_reviews INTEGER NOT NULL,
+                    avg_work REAL,
+                    avg_training REAL,
+                    avg_studies REAL,
+                    avg_mind REAL,
+                    overall_average REAL,
+                    consistency_score REAL,
+                    performance_level TEXT,
+                    strongest_area TEXT,
+                    weakest_area TEXT,
+                    analysis TEXT,
+                    generated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (user_email, week_start)
+                )
+            ''')
+            
+            # Relatórios semanais já entregues (permite retomar o envio em lote)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS weekly_report_deliveries (
+                    week_start TEXT NOT NULL,
+                    user_email TEXT NOT NULL,
+                    sent_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (week_start, user_email)
                 )
             ''')
             
@@ -64,6 +463,105 @@ class DatabaseService:
         except Exception as e:
             return Result.error_result(f"Erro ao criar tabelas: {str(e)}")
     
+    def _migrate_reviews_table(self, cursor):
+        """Adiciona as colunas novas em bancos criados por versões anteriores."""
+        cursor.execute("PRAGMA table_info(reviews)")
+        columns = [column[1] for column in cursor.fetchall()]
+        
+        if 'user_email' not in columns:
+            cursor.execute('ALTER TABLE reviews ADD COLUMN user_email TEXT')
+        
+        if 'review_date' not in columns:
+            cursor.execute('ALTER TABLE reviews ADD COLUMN review_date TEXT')
+            
+            if 'created_at' in columns:
+                # Avaliações antigas usam o dia em que foram registradas
+                cursor.execute('''
+                    UPDATE reviews SET review_date = DATE(created_at)
+                    WHERE review_date IS NULL AND created_at IS NOT NULL
+                ''')
+        
+        # Chave natural: uma avaliação por usuário por dia (NULLs não conflitam)
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_reviews_user_date'")
+        if cursor.fetchone() is None:
+            # Bancos antigos podem ter mais de uma avaliação no mesmo dia:
+            # mantém a mais recente, senão o índice único não pode ser criado.
+            # As demais são copiadas para DUPLICATES_BACKUP_TABLE antes de sair
+            duplicates = '''
+                user_email IS NOT NULL AND review_date IS NOT NULL
+                AND id NOT IN (
+                    SELECT MAX(id) FROM reviews
+                    WHERE user_email IS NOT NULL AND review_date IS NOT NULL
+                    GROUP BY user_email, review_date
+                )
+            '''
+            cursor.execute(f'SELECT COUNT(*) FROM reviews WHERE {duplicates}')
+            duplicate_count = cursor.fetchone()[0]
+            
+            if duplicate_count > 0:
+                cursor.execute(f'''
+                    CREATE TABLE IF NOT EXISTS {DUPLICATES_BACKUP_TABLE} AS
+                    SELECT * FROM reviews WHERE 0
+                ''')
+                cursor.execute(f'INSERT INTO {DUPLICATES_BACKUP_TABLE} SELECT * FROM reviews WHERE {duplicates}')
+                cursor.execute(f'DELETE FROM reviews WHERE {duplicates}')
+                print(f"⚠️  {duplicate_count} avaliações duplicadas por usuário/dia movidas para "
+                      f"{DUPLICATES_BACKUP_TABLE} (mantida a mais recente)")
+                
+                # Os agregados incluíam as duplicadas; são recalculados em create_tables
+                for table in DERIVED_TABLES:
+                    cursor.execute(f'DROP TABLE IF EXISTS {table}')
+            
+            cursor.execute('''
+                CREATE UNIQUE INDEX idx_reviews_user_date
+                ON reviews (user_email, review_date)
+            ''')
+        
+        # Consultas por período (API de leitura e relatórios)
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_reviews_review_date
+            ON reviews (review_date)
+        ''')
+    
+    def _migrate_anomaly_state_table(self, cursor, state_definitions: str):
+        """Recria review_anomaly_state com count INTEGER em bancos em que a coluna é REAL."""
+        cursor.execute('PRAGMA table_info(review_anomaly_state)')
+        if not any(column[1] == 'count' and column[2].upper() == 'REAL' for column in cursor.fetchall()):
+            return
+        
+        # O SQLite não altera o tipo de uma coluna: copia para uma tabela nova
+        cursor.execute('ALTER TABLE review_anomaly_state RENAME TO review_anomaly_state_old')
+        cursor.execute(f'''
+            CREATE TABLE review_anomaly_state (
+                user_email TEXT PRIMARY KEY,
+                {state_definitions}
+            )
+        ''')
+        other_columns = ANOMALY_STATE_COLUMNS.split(', ', 1)[1]
+        cursor.execute(f'''
+            INSERT INTO review_anomaly_state (user_email, {ANOMALY_STATE_COLUMNS})
+            SELECT user_email, CAST(count AS INTEGER), {other_columns}
+            FROM review_anomaly_state_old
+        ''')
+        cursor.execute('DROP TABLE review_anomaly_state_old')
+    
+    def _row_to_review(self, row) -> Review:
+        """
+        Converte uma linha selecionada com REVIEW_COLUMNS em Review.
+        
+        As linhas foram validadas antes de gravar: não valida de novo.
+        """
+        return Review.from_validated({
+            'work': row[1],
+            'training': row[2],
+            'studies': row[3],
+            'mind': row[4],
+            'positive_points': row[5],
+            'negative_points': row[6],
+            'user_email': row[7],
+            'review_date': row[8]
+        }, id=row[0])
+    
     def insert_review(self, review: Review) -> Result:
         """Insere uma nova avaliação no banco de dados."""
         try:
@@ -75,26 +573,721 @@ class DatabaseService:
             cursor = conn.cursor()
             
             cursor.execute('''
-                INSERT INTO reviews (work, training, studies, mind, positive_points, negative_points)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
-                review.work,
-                review.training,
-                review.studies,
-                review.mind,
-                review.positive_points,
-                review.negative_points
-            ))
+                INSERT INTO reviews (work, training, studies, mind, positive_points, negative_points,
+                                     user_email, review_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', self._review_params(review))
             
             review.id = cursor.lastrowid
+            anomalies = self._update_aggregates(cursor, [review])
             conn.commit()
             conn.close()
             
+            self._notify_anomalies(anomalies)
             return Result.success_result(review)
             
         except Exception as e:
             return Result.error_result(f"Erro ao inserir avaliação: {str(e)}")
     
+    def insert_review_once(self, review: Review) -> Result:
+        """
+        Insere uma avaliação respeitando a chave natural (usuário + dia).
+        
+        Se o usuário já registrou uma avaliação para o mesmo dia, nada é
+        gravado e a avaliação original é retornada.
+        
+        Returns:
+            Result: Dicionário com 'review' (gravada ou original) e 'created'
+        """
+        try:
+            conn_result = self._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            try:
+                cursor = conn.cursor()
+                
+                with conn:
+                    stored, created = self._insert_once(cursor, review)
+                    anomalies = self._update_aggregates(cursor, [stored] if created else [])
+            finally:
+                conn.close()
+            
+            self._notify_anomalies(anomalies)
+            return Result.success_result({'review': stored, 'created': created})
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao inserir avaliação: {str(e)}")
+    
+    def insert_reviews(self, reviews: List[Review]) -> Result:
+        """
+        Insere várias avaliações em uma única transação.
+        
+        Se qualquer inserção falhar, nenhuma avaliação é gravada. Avaliações
+        que repetem usuário + dia de uma avaliação existente não são gravadas
+        de novo: a original é retornada no lugar.
+        
+        Args:
+            reviews: Avaliações já validadas
+            
+        Returns:
+            Result: Dicionário com 'reviews' (gravadas ou originais) e
+            'created' (bool por avaliação, na mesma ordem)
+        """
+        try:
+            conn_result = self._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            stored_reviews = []
+            created_flags = []
+            try:
+                cursor = conn.cursor()
+                
+                with conn:
+                    for review in reviews:
+                        stored, created = self._insert_once(cursor, review)
+                        stored_reviews.append(stored)
+                        created_flags.append(created)
+                    
+                    anomalies = self._update_aggregates(cursor, [
+                        stored for stored, created in zip(stored_reviews, created_flags) if created
+                    ])
+            finally:
+                conn.close()
+            
+            self._notify_anomalies(anomalies)
+            return Result.success_result({'reviews': stored_reviews, 'created': created_flags})
+            
+        except Exception as e:
+            for review in reviews:
+                review.id = None
+            return Result.error_result(f"Erro ao inserir avaliações em lote: {str(e)}")
+    
+    def import_reviews(self, rows: List[dict]) -> Result:
+        """
+        Importa um lote de avaliações históricas em uma única transação.
+        
+        As linhas já vêm validadas (IMPORT_VALIDATOR); created_at guarda a
+        data/hora original (ou o início do dia da avaliação, se não vier).
+        Linhas que repetem usuário + dia de uma avaliação existente são ignoradas.
+        
+        Args:
+            rows: Dicionários com as notas, comentários, user_email,
+                review_date e, opcionalmente, created_at
+        
+        Returns:
+            Result: Dicionário com 'created' e 'duplicates'
+        """
+        try:
+            conn_result = self._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            try:
+                cursor = conn.cursor()
+                
+                # Reserva a escrita antes de ler o maior ID, para que só as
+                # avaliações deste lote fiquem acima dele
+                cursor.execute('BEGIN IMMEDIATE')
+                try:
+                    last_id = cursor.execute('SELECT COALESCE(MAX(id), 0) FROM reviews').fetchone()[0]
+                    cursor.executemany(IMPORT_REVIEW_SQL, [
+                        (
+                            row['work'], row['training'], row['studies'], row['mind'],
+                            row['positive_points'], row['negative_points'],
+                            row['user_email'], row['review_date'],
+                            row.get('created_at') or f"{row['review_date']} 00:00:00"
+                        )
+                        for row in rows
+                    ])
+                    
+                    cursor.execute(f'SELECT {REVIEW_COLUMNS} FROM reviews WHERE id > ? ORDER BY id', (last_id,))
+                    created = [self._row_to_review(row) for row in cursor.fetchall()]
+                    anomalies = self._update_aggregates(cursor, created)
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+            finally:
+                conn.close()
+            
+            self._notify_anomalies(anomalies)
+            return Result.success_result({'created': len(created), 'duplicates': len(rows) - len(created)})
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao importar avaliações: {str(e)}")
+    
+    def _insert_once(self, cursor, review: Review) -> tuple:
+        """Insere a avaliação ou busca a original; retorna (review, created)."""
+        cursor.execute(INSERT_REVIEW_ONCE_SQL, self._review_params(review))
+        
+        if cursor.rowcount == 1:
+            review.id = cursor.lastrowid
+            return review, True
+        
+        cursor.execute(f'''
+            SELECT {REVIEW_COLUMNS} FROM reviews
+            WHERE user_email = ? AND review_date = ?
+        ''', (review.user_email, review.review_date))
+        return self._row_to_review(cursor.fetchone()), False
+    
+    def _accumulate_rollup(self, pending: dict, work: int, training: int, studies: int, mind: int,
+                           user_email: Optional[str], review_date: str):
+        """Soma uma avaliação nos acumuladores do dia e da semana (do usuário e de todos)."""
+        week = week_start(review_date)
+        keys = [(ALL_USERS, 'day', review_date), (ALL_USERS, 'week', week)]
+        if user_email:
+            keys += [(user_email, 'day', review_date), (user_email, 'week', week)]
+        
+        for key in keys:
+            accumulator = pending.get(key)
+            if accumulator is None:
+                accumulator = pending[key] = ReviewAccumulator()
+            accumulator.add(work, training, studies, mind)
+    
+    def _save_rollups(self, cursor, pending: dict):
+        """Combina os acumuladores novos com os gravados e salva o resultado."""
+        placeholders = ', '.join(['?'] * (3 + len(ROLLUP_COLUMNS.split(','))))
+        
+        for key, accumulator in pending.items():
+            cursor.execute(f'''
+                SELECT {ROLLUP_COLUMNS} FROM review_rollups
+                WHERE user_email = ? AND period = ? AND period_start = ?
+            ''', key)
+            row = cursor.fetchone()
+            if row:
+                stored = ReviewAccumulator.from_row(row)
+                stored.merge(accumulator)
+                accumulator = stored
+            
+            cursor.execute(f'''
+                INSERT OR REPLACE INTO review_rollups (user_email, period, period_start, {ROLLUP_COLUMNS})
+                VALUES ({placeholders})
+            ''', key + accumulator.to_row())
+    
+    def _update_aggregates(self, cursor, reviews: List[Review]) -> List[Anomaly]:
+        """
+        Atualiza tudo que é derivado das avaliações recém-gravadas (mesma transação).
+        
+        Returns:
+            list: Anomalias encontradas nas avaliações (ver _notify_anomalies)
+        """
+        if not reviews:
+            return []
+        self._update_rollups(cursor, reviews)
+        self._update_comoments(cursor, reviews)
+        self._update_histograms(cursor, reviews)
+        self._update_terms(cursor, reviews)
+        self._save_sentiment(cursor, [
+            (review.id, review.positive_points, review.negative_points) for review in reviews
+        ])
+        return self._update_anomalies(cursor, [
+            (review.id, review.user_email, review.review_date,
+             review.work, review.training, review.studies, review.mind)
+            for review in reviews if review.user_email
+        ])
+    
+    def _update_rollups(self, cursor, reviews: List[Review]):
+        """Atualiza os acumuladores com avaliações recém-gravadas (mesma transação)."""
+        pending = {}
+        for review in reviews:
+            self._accumulate_rollup(pending, review.work, review.training, review.studies,
+                                    review.mind, review.user_email, review.review_date)
+        self._save_rollups(cursor, pending)
+    
+    def _rebuild_rollups(self, cursor):
+        """Recalcula todos os acumuladores lendo as avaliações uma vez."""
+        cursor.execute('DELETE FROM review_rollups')
+        
+        pending = {}
+        rows = cursor.execute('''
+            SELECT work, training, studies, mind, user_email, review_date FROM reviews
+            WHERE review_date IS NOT NULL
+        ''').fetchall()
+        for row in rows:
+            self._accumulate_rollup(pending, *row)
+        
+        self._save_rollups(cursor, pending)
+    
+    def _accumulate_histograms(self, pending: dict, work: int, training: int, studies: int,
+                               mind: int, user_email: Optional[str], review_date: str):
+        """Conta as notas de uma avaliação nos histogramas da semana (do usuário e de todos)."""
+        week = week_start(review_date)
+        users = [ALL_USERS, user_email] if user_email else [ALL_USERS]
+        
+        for user in users:
+            for (field, _), score in zip(AREAS, (work, training, studies, mind)):
+                key = (user, week, field)
+                histogram = pending.get(key)
+                if histogram is None:
+                    histogram = pending[key] = ScoreHistogram()
+                histogram.add(score)
+    
+    def _save_histograms(self, cursor, pending: dict):
+        """Soma os contadores novos aos gravados."""
+        columns = HISTOGRAM_COLUMNS.split(', ')
+        placeholders = ', '.join(['?'] * (3 + len(columns)))
+        updates = ', '.join(f'{column} = {column} + excluded.{column}' for column in columns)
+        
+        cursor.executemany(f'''
+            INSERT INTO review_histograms (user_email, week_start, area, {HISTOGRAM_COLUMNS})
+            VALUES ({placeholders})
+            ON CONFLICT(user_email, week_start, area) DO UPDATE SET {updates}
+        ''', [key + tuple(histogram.counts) for key, histogram in pending.items()])
+    
+    def _update_histograms(self, cursor, reviews: List[Review]):
+        """Atualiza os histogramas com avaliações recém-gravadas (mesma transação)."""
+        pending = {}
+        for review in reviews:
+            self._accumulate_histograms(pending, review.work, review.training, review.studies,
+                                        review.mind, review.user_email, review.review_date)
+        self._save_histograms(cursor, pending)
+    
+    def _rebuild_histograms(self, cursor):
+        """Recalcula todos os histogramas lendo as avaliações uma vez."""
+        cursor.execute('DELETE FROM review_histograms')
+        
+        pending = {}
+        rows = cursor.connection.execute('''
+            SELECT work, training, studies, mind, user_email, review_date FROM reviews
+            WHERE review_date IS NOT NULL
+        ''')
+        for row in rows:
+            self._accumulate_histograms(pending, *row)
+        
+        self._save_histograms(cursor, pending)
+    
+    def _observe_anomalies(self, states: Dict[str, AnomalyState], rows: Iterable[tuple]) -> List[Anomaly]:
+        """Passa (id, usuário, dia, notas...) pelo detector, em ordem de dia, atualizando os estados."""
+        observe = self.anomaly_detector.observe
+        anomalies = []
+        for row in rows:
+            user_email = row[1]
+            state = states.get(user_email)
+            if state is None:
+                state = states[user_email] = AnomalyState()
+            anomalies.extend(observe(state, row[0], user_email, row[2], row[3:]))
+        return anomalies
+    
+    def _save_anomalies(self, cursor, states: Dict[str, AnomalyState], anomalies: List[Anomaly]):
+        """Grava os estados atualizados e os dias sinalizados."""
+        placeholders = ', '.join(['?'] * (1 + len(ANOMALY_STATE_COLUMNS.split(', '))))
+        cursor.executemany(f'''
+            INSERT OR REPLACE INTO review_anomaly_state (user_email, {ANOMALY_STATE_COLUMNS})
+            VALUES ({placeholders})
+        ''', [(user_email,) + state.to_row() for user_email, state in states.items()])
+        cursor.executemany('''
+            INSERT OR REPLACE INTO review_anomalies
+                (review_id, area, user_email, review_date, value, expected, z_score)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [anomaly.to_row() for anomaly in anomalies])
+    
+    def _update_anomalies(self, cursor, rows: List[tuple]) -> List[Anomaly]:
+        """
+        Atualiza o detector com avaliações recém-gravadas (mesma transação).
+        
+        Lê só o estado de cada usuário envolvido, então o custo não depende
+        do tamanho do histórico.
+        """
+        states = {}
+        for user_email in {row[1] for row in rows}:
+            cursor.execute(f'''
+                SELECT {ANOMALY_STATE_COLUMNS} FROM review_anomaly_state WHERE user_email = ?
+            ''', (user_email,))
+            row = cursor.fetchone()
+            if row:
+                states[user_email] = AnomalyState.from_row(row)
+        
+        anomalies = self._observe_anomalies(states, sorted(rows, key=lambda row: (row[2], row[0])))
+        self._save_anomalies(cursor, states, anomalies)
+        return anomalies
+    
+    def _rebuild_anomalies(self, cursor):
+        """Recalcula os estados do detector percorrendo o histórico uma vez, em ordem de dia."""
+        cursor.execute('DELETE FROM review_anomaly_state')
+        cursor.execute('DELETE FROM review_anomalies')
+        
+        states = {}
+        rows = cursor.connection.execute('''
+            SELECT id, user_email, review_date, work, training, studies, mind FROM reviews
+            WHERE user_email IS NOT NULL AND review_date IS NOT NULL
+            ORDER BY review_date, id
+        ''')
+        anomalies = self._observe_anomalies(states, rows)
+        self._save_anomalies(cursor, states, anomalies)
+    
+    def _notify_anomalies(self, anomalies: List[Anomaly]):
+        """Avisa os interessados (ex.: alerta por email) das anomalias de uma gravação confirmada."""
+        if not anomalies:
+            return
+        for listener in self.anomaly_listeners:
+            try:
+                listener(anomalies)
+            except Exception as e:
+                print(f"❌ Erro ao avisar anomalias: {str(e)}")
+    
+    def _accumulate_comoments(self, pending: dict, work: int, training: int, studies: int,
+                              mind: int, user_email: Optional[str], review_date: str):
+        """Soma uma avaliação nos co-momentos da semana (do usuário e de todos)."""
+        week = week_start(review_date)
+        keys = [(ALL_USERS, week)]
+        if user_email:
+            keys.append((user_email, week))
+        
+        for key in keys:
+            accumulator = pending.get(key)
+            if accumulator is None:
+                accumulator = pending[key] = CoMomentAccumulator()
+            accumulator.add(work, training, studies, mind)
+    
+    def _save_comoments(self, cursor, pending: dict):
+        """Soma os co-momentos novos aos gravados (as somas são inteiras, basta adicionar)."""
+        columns = COMOMENT_COLUMNS.split(', ')
+        placeholders = ', '.join(['?'] * (2 + len(columns)))
+        updates = ', '.join(f'{column} = {column} + excluded.{column}' for column in columns)
+        
+        cursor.executemany(f'''
+            INSERT INTO review_comoments (user_email, week_start, {COMOMENT_COLUMNS})
+            VALUES ({placeholders})
+            ON CONFLICT(user_email, week_start) DO UPDATE SET {updates}
+        ''', [key + accumulator.to_row() for key, accumulator in pending.items()])
+    
+    def _update_comoments(self, cursor, reviews: List[Review]):
+        """Atualiza os co-momentos com avaliações recém-gravadas (mesma transação)."""
+        pending = {}
+        for review in reviews:
+            self._accumulate_comoments(pending, review.work, review.training, review.studies,
+                                       review.mind, review.user_email, review.review_date)
+        self._save_comoments(cursor, pending)
+    
+    def _rebuild_comoments(self, cursor):
+        """Recalcula todos os co-momentos lendo as avaliações uma vez."""
+        cursor.execute('DELETE FROM review_comoments')
+        
+        pending = {}
+        rows = cursor.connection.execute('''
+            SELECT work, training, studies, mind, user_email, review_date FROM reviews
+            WHERE review_date IS NOT NULL
+        ''')
+        for row in rows:
+            self._accumulate_comoments(pending, *row)
+        
+        self._save_comoments(cursor, pending)
+    
+    def _accumulate_terms(self, pending: dict, user_email: Optional[str], review_date: str,
+                          positive_points: Optional[str], negative_points: Optional[str]):
+        """Soma os termos dos comentários de uma avaliação na semana (do usuário e de todos)."""
+        week = week_start(review_date)
+        users = (ALL_USERS, user_email) if user_email else (ALL_USERS,)
+        
+        for kind, text in (('positive', positive_points), ('negative', negative_points)):
+            for term, (count, word) in count_terms(text).items():
+                for user in users:
+                    key = (user, week, kind, term)
+                    total, first_word = pending.get(key, (0, word))
+                    pending[key] = (total + count, first_word)
+    
+    def _save_terms(self, cursor, pending: dict):
+        """Soma as contagens novas às gravadas (a palavra exibida é a primeira vista)."""
+        cursor.executemany('''
+            INSERT INTO review_terms (user_email, week_start, kind, term, word, count)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(user_email, week_start, kind, term) DO UPDATE SET count = count + excluded.count
+        ''', [key + (word, count) for key, (count, word) in pending.items()])
+    
+    def _update_terms(self, cursor, reviews: List[Review]):
+        """Indexa os comentários das avaliações recém-gravadas (mesma transação)."""
+        pending = {}
+        for review in reviews:
+            self._accumulate_terms(pending, review.user_email, review.review_date,
+                                   review.positive_points, review.negative_points)
+        self._save_terms(cursor, pending)
+    
+    def _rebuild_terms(self, cursor):
+        """Recalcula o índice de termos lendo os comentários uma vez."""
+        cursor.execute('DELETE FROM review_terms')
+        
+        pending = {}
+        rows = cursor.connection.execute('''
+            SELECT user_email, review_date, positive_points, negative_points FROM reviews
+            WHERE review_date IS NOT NULL
+        ''')
+        for row in rows:
+            self._accumulate_terms(pending, *row)
+        
+        self._save_terms(cursor, pending)
+    
+    def _save_sentiment(self, cursor, comments: List[tuple]):
+        """Calcula e grava as notas de sentimento de (review_id, positivos, negativos)."""
+        score_review = SENTIMENT_SCORER.score_review
+        cursor.executemany('''
+            INSERT OR REPLACE INTO review_sentiment
+                (review_id, positive_score, negative_score, score, lexicon_version)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [
+            (review_id,) + score_review(positive, negative) + (LEXICON_VERSION,)
+            for review_id, positive, negative in comments
+        ])
+    
+    def _score_missing_sentiment(self, cursor, batch_size: int = 5000):
+        """Calcula, em lotes, a nota das avaliações sem nota do léxico atual."""
+        rows = cursor.connection.execute('''
+            SELECT r.id, r.positive_points, r.negative_points FROM reviews r
+            LEFT JOIN review_sentiment s ON s.review_id = r.id AND s.lexicon_version = ?
+            WHERE s.review_id IS NULL
+        ''', (LEXICON_VERSION,)).fetchall()
+        
+        for start in range(0, len(rows), batch_size):
+            self._save_sentiment(cursor, rows[start:start + batch_size])
+    
+    def rebuild_rollups(self) -> Result:
+        """Recalcula os acumuladores de review_rollups a partir das avaliações."""
+        try:
+            conn_result = self._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            try:
+                with conn:
+                    self._rebuild_rollups(conn.cursor())
+            finally:
+                conn.close()
+            
+            return Result.success_result("Acumuladores recalculados com sucesso!")
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao recalcular acumuladores: {str(e)}")
+    
+    def _review_params(self, review: Review) -> tuple:
+        """Parâmetros do INSERT de uma avaliação (sem data, assume o dia de hoje)."""
+        if not review.review_date:
+            review.review_date = parse_review_date(None)
+        
+        return (
+            review.work,
+            review.training,
+            review.studies,
+            review.mind,
+            review.positive_points,
+            review.negative_points,
+            review.user_email,
+            review.review_date
+        )
+    
+    def _build_filters(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                       user_email: Optional[str] = None) -> tuple:
+        """Monta a cláusula WHERE (e parâmetros) dos filtros por período e usuário."""
+        conditions = []
+        params = []
+        
+        if start_date:
+            conditions.append('review_date >= ?')
+            params.append(start_date)
+        if end_date:
+            conditions.append('review_date <= ?')
+            params.append(end_date)
+        if user_email:
+            conditions.append('user_email = ?')
+            params.append(user_email)
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        return where, params
+    
+    def _build_week_filters(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                            user_email: Optional[str] = None,
+                            user_emails: Optional[List[str]] = None) -> tuple:
+        """
+        Monta a cláusula WHERE (e parâmetros) das tabelas por usuário e semana
+        ISO: semanas da de start_date (padrão: todas) à de end_date (padrão: hoje)
+        de um usuário ou de vários (ver _user_filter).
+        """
+        condition, params = self._user_filter(user_email, user_emails)
+        conditions = [condition]
+        if start_date:
+            conditions.append('week_start >= ?')
+            params.append(week_start(start_date))
+        conditions.append('week_start <= ?')
+        params.append(week_start(end_date or date.today().isoformat()))
+        return f"WHERE {' AND '.join(conditions)}", params
+    
+    def get_latest_review_id(self) -> Result:
+        """Retorna o maior ID de avaliação (0 se não houver avaliações)."""
+        try:
+            conn_result = self._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT MAX(id) FROM reviews')
+            latest_id = cursor.fetchone()[0] or 0
+            conn.close()
+            
+            return Result.success_result(latest_id)
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao buscar última avaliação: {str(e)}")
+    
+    def get_summary_stats(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                          user_email: Optional[str] = None) -> Result:
+        """
+        Resumo das avaliações de um período, sem carregá-las.
+        
+        É a base de todas as estatísticas (get_stats_by_date_range,
+        get_weekly_average, processamento de emails). Sem período (ou com
+        início e fim), as notas vêm dos acumuladores (review_rollups);
+        períodos abertos em uma das pontas somam as notas em uma única
+        consulta de agregação. O maior ID e o primeiro e o último dia vêm
+        dos índices.
+        
+        Args:
+            start_date, end_date: Período (YYYY-MM-DD, inclusive)
+            user_email: Usuário (padrão: todos os usuários)
+        
+        Returns:
+            Result: Dicionário com count, last_id, first_date, last_date,
+            average (média das quatro notas) e stats (ReviewAccumulator do
+            período); last_id, as datas e average são None se não houver
+            avaliações
+        """
+        try:
+            where, params = self._build_filters(start_date, end_date, user_email)
+            
+            stats = None
+            if start_date and end_date:
+                stats_result = self.get_rollup_stats(start_date, end_date, user_email)
+                if not stats_result.success:
+                    return stats_result
+                stats = stats_result.data
+            
+            conn_result = self._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            try:
+                if stats is None and (start_date or end_date):
+                    row = conn.execute(f'''
+                        SELECT
+                            COUNT(*),
+                            SUM(work), SUM(training), SUM(studies), SUM(mind),
+                            SUM(work * work), SUM(training * training), SUM(studies * studies), SUM(mind * mind)
+                        FROM reviews {where}
+                    ''', params).fetchone()
+                    stats = ReviewAccumulator.from_sums(row[0], row[1:5], row[5:9])
+                elif stats is None:
+                    cursor = conn.execute(f'''
+                        SELECT {ROLLUP_COLUMNS} FROM review_rollups
+                        WHERE user_email = ? AND period = 'week'
+                    ''', (user_email or ALL_USERS,))
+                    stats = ReviewAccumulator.merged(ReviewAccumulator.from_row(row) for row in cursor)
+                
+                # Cada subconsulta usa a otimização de MIN/MAX do SQLite sobre os índices
+                last_id, first_date, last_date = conn.execute(f'''
+                    SELECT
+                        (SELECT MAX(id) FROM reviews {where}),
+                        (SELECT MIN(review_date) FROM reviews {where}),
+                        (SELECT MAX(review_date) FROM reviews {where})
+                ''', params * 3).fetchone()
+            finally:
+                conn.close()
+            
+            return Result.success_result({
+                'count': stats.count,
+                'last_id': last_id,
+                'first_date': first_date,
+                'last_date': last_date,
+                'average': stats.overall_average,
+                'stats': stats
+            })
+        
+        except Exception as e:
+            return Result.error_result(f"Erro ao calcular resumo das avaliações: {str(e)}")
+    
+    def get_reviews_page(self, limit: int, cursor_id: Optional[int] = None,
+                         start_date: Optional[str] = None, end_date: Optional[str] = None,
+                         user_email: Optional[str] = None,
+                         fields: Optional[List[str]] = None) -> Result:
+        """
+        Retorna uma página de avaliações, da mais recente para a mais antiga.
+        
+        Usa paginação por cursor (ID da última avaliação da página anterior),
+        então cada página custa o mesmo independente da profundidade.
+        
+        Args:
+            limit: Quantidade máxima de avaliações na página
+            cursor_id: Retorna apenas avaliações com ID menor que este
+            start_date, end_date: Período (YYYY-MM-DD, inclusive)
+            user_email: Filtra pelas avaliações de um usuário
+            fields: Campos a retornar (subconjunto de REVIEW_FIELDS; 'id' sempre incluído)
+            
+        Returns:
+            Result: Dicionário com 'reviews' (lista de dicts) e 'next_cursor'
+        """
+        try:
+            fields = list(fields or REVIEW_FIELDS)
+            invalid = [field for field in fields if field not in REVIEW_FIELDS]
+            if invalid:
+                return Result.error_result(f"Campos inválidos: {', '.join(invalid)}")
+            if 'id' not in fields:
+                fields.insert(0, 'id')
+            
+            where, params = self._build_filters(start_date, end_date, user_email)
+            if cursor_id is not None:
+                where = f"{where} AND id < ?" if where else "WHERE id < ?"
+                params.append(cursor_id)
+            
+            conn_result = self._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            cursor = conn.cursor()
+            
+            # Busca um item a mais para saber se existe próxima página
+            cursor.execute(
+                f"SELECT {', '.join(fields)} FROM reviews {where} ORDER BY id DESC LIMIT ?",
+                params + [limit + 1]
+            )
+            rows = cursor.fetchall()
+            conn.close()
+            
+            has_more = len(rows) > limit
+            reviews = [dict(zip(fields, row)) for row in rows[:limit]]
+            
+            return Result.success_result({
+                'reviews': reviews,
+                'next_cursor': reviews[-1]['id'] if has_more else None
+            })
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao buscar página de avaliações: {str(e)}")
+    
+    def get_stats_by_date_range(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                                user_email: Optional[str] = None) -> Result:
+        """
+        Médias por área e média geral de um período (a partir de get_summary_stats).
+        
+        Returns:
+            Result: Dicionário no mesmo formato de get_weekly_average, com
+            first_date e last_date (total_reviews = 0 se não houver avaliações
+            no período)
+        """
+        summary_result = self.get_summary_stats(start_date, end_date, user_email)
+        if not summary_result.success:
+            return summary_result
+        
+        summary = summary_result.data
+        data = summary['stats'].to_dict()
+        data.update({'first_date': summary['first_date'], 'last_date': summary['last_date']})
+        return Result.success_result(data)
+    
     def get_all_reviews(self) -> Result:
         """Retorna todas as avaliações do banco de dados."""
         try:
@@ -105,21 +1298,10 @@ class DatabaseService:
             conn = conn_result.data
             cursor = conn.cursor()
             
-            cursor.execute('SELECT * FROM reviews ORDER BY created_at DESC')
+            cursor.execute(f'SELECT {REVIEW_COLUMNS} FROM reviews ORDER BY created_at DESC')
             rows = cursor.fetchall()
             
-            reviews = []
-            for row in rows:
-                review_data = {
-                    'id': row[0],
-                    'work': row[1],
-                    'training': row[2],
-                    'studies': row[3],
-                    'mind': row[4],
-                    'positive_points': row[5],
-                    'negative_points': row[6]
-                }
-                reviews.append(Review.from_dict(review_data))
+            reviews = [self._row_to_review(row) for row in rows]
             
             conn.close()
             return Result.success_result(reviews)
@@ -128,104 +1310,668 @@ class DatabaseService:
             return Result.error_result(f"Erro ao buscar avaliações: {str(e)}")
     
     def get_reviews_by_date_range(self, start_date: str, end_date: str) -> Result:
-        """Retorna avaliações dentro de um período específico."""
+        """Retorna avaliações dentro de um período específico (pelo dia da avaliação)."""
         try:
             conn_result = self._get_connection()
             if not conn_result.success:
                 return conn_result
             
             conn = conn_result.data
-            cursor = conn.cursor()
+            try:
+                where, params = self._build_filters(start_date, end_date)
+                
+                # Filtra por review_date (índice idx_reviews_review_date), não pelo
+                # dia do registro: avaliações de dias anteriores entram no seu dia
+                cursor = conn.execute(f'''
+                    SELECT {REVIEW_COLUMNS} FROM reviews
+                    {where}
+                    ORDER BY review_date DESC, id DESC
+                ''', params)
+                
+                reviews = [self._row_to_review(row) for row in cursor]
+            finally:
+                conn.close()
             
-            # Verifica se a coluna created_at existe
-            cursor.execute("PRAGMA table_info(reviews)")
-            columns = [column[1] for column in cursor.fetchall()]
+            return Result.success_result(reviews)
             
-            if 'created_at' in columns:
-                # Se a coluna created_at existe, usa ela
-                cursor.execute('''
-                    SELECT * FROM reviews 
-                    WHERE DATE(created_at) BETWEEN ? AND ?
-                    ORDER BY created_at DESC
-                ''', (start_date, end_date))
+        except Exception as e:
+            return Result.error_result(f"Erro ao buscar avaliações por período: {str(e)}")
+    
+    def get_weekly_stats(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                         user_email: Optional[str] = None) -> Result:
+        """
+        Calcula as estatísticas de um período com uma única consulta agregada.
+        
+        O SQLite soma as notas e os quadrados de cada área (varredura pelo
+        índice de review_date) e o ReviewAccumulator é montado a partir desses
+        agregados: médias por área, contagem e consistência.
+        
+        Args:
+            start_date: Data inicial (padrão: 6 dias antes de end_date)
+            end_date: Data final (padrão: hoje)
+            user_email: Filtra as avaliações de um usuário
+        
+        Returns:
+            Result: ReviewAccumulator do período (count = 0 se não houver avaliações)
+        """
+        try:
+            end = date.fromisoformat(end_date) if end_date else date.today()
+            start_date = start_date or (end - timedelta(days=6)).isoformat()
+            where, params = self._build_filters(start_date, end.isoformat(), user_email)
+            
+            conn_result = self._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            try:
+                row = conn.execute(f'''
+                    SELECT
+                        COUNT(*),
+                        SUM(work), SUM(training), SUM(studies), SUM(mind),
+                        SUM(work * work), SUM(training * training), SUM(studies * studies), SUM(mind * mind)
+                    FROM reviews {where}
+                ''', params).fetchone()
+                stats = ReviewAccumulator.from_sums(row[0], row[1:5], row[5:9])
+            finally:
+                conn.close()
+            
+            return Result.success_result(stats)
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao calcular estatísticas da semana: {str(e)}")
+    
+    def get_rollup_stats(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                         user_email: Optional[str] = None) -> Result:
+        """
+        Estatísticas de um período a partir dos acumuladores, sem ler as avaliações.
+        
+        Semanas ISO completas dentro do período usam o acumulador da semana e
+        as pontas usam os acumuladores diários, então o custo depende só do
+        tamanho do período, não da quantidade de avaliações.
+        
+        Args:
+            start_date: Data inicial (padrão: 6 dias antes de end_date)
+            end_date: Data final (padrão: hoje)
+            user_email: Usuário (padrão: todos os usuários)
+        
+        Returns:
+            Result: ReviewAccumulator do período (count = 0 se não houver avaliações)
+        """
+        try:
+            end = date.fromisoformat(end_date) if end_date else date.today()
+            start = date.fromisoformat(start_date) if start_date else end - timedelta(days=6)
+            
+            # Semanas completas: da primeira segunda-feira até o último domingo do período
+            first_monday = start + timedelta(days=(7 - start.weekday()) % 7)
+            last_sunday = end - timedelta(days=(end.weekday() + 1) % 7)
+            
+            if first_monday + timedelta(days=6) <= last_sunday:
+                conditions = [
+                    "(period = 'week' AND period_start >= ? AND period_start <= ?)",
+                    "(period = 'day' AND period_start >= ? AND period_start < ?)",
+                    "(period = 'day' AND period_start > ? AND period_start <= ?)",
+                ]
+                params = [
+                    first_monday.isoformat(), (last_sunday - timedelta(days=6)).isoformat(),
+                    start.isoformat(), first_monday.isoformat(),
+                    last_sunday.isoformat(), end.isoformat()
+                ]
             else:
-                # Se não existe, retorna todas as avaliações
-                cursor.execute('SELECT * FROM reviews ORDER BY id DESC')
+                conditions = ["(period = 'day' AND period_start >= ? AND period_start <= ?)"]
+                params = [start.isoformat(), end.isoformat()]
             
-            rows = cursor.fetchall()
+            conn_result = self._get_connection()
+            if not conn_result.success:
+                return conn_result
             
-            reviews = []
-            for row in rows:
-                review_data = {
-                    'id': row[0],
-                    'work': row[1],
-                    'training': row[2],
-                    'studies': row[3],
-                    'mind': row[4],
-                    'positive_points': row[5],
-                    'negative_points': row[6]
-                }
-                reviews.append(Review.from_dict(review_data))
+            conn = conn_result.data
+            try:
+                cursor = conn.execute(f'''
+                    SELECT {ROLLUP_COLUMNS} FROM review_rollups
+                    WHERE user_email = ? AND ({' OR '.join(conditions)})
+                ''', [user_email or ALL_USERS] + params)
+                
+                stats = ReviewAccumulator.merged(ReviewAccumulator.from_row(row) for row in cursor)
+            finally:
+                conn.close()
+            
+            return Result.success_result(stats)
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao consultar acumuladores: {str(e)}")
+    
+    def get_week_rollups(self, per_user: bool = False) -> Result:
+        """
+        Lista os acumuladores de todas as semanas ISO com avaliações.
+        
+        Args:
+            per_user: Se True, uma entrada por usuário e semana; senão, uma por
+                semana somando todos os usuários
+        
+        Returns:
+            Result: Lista de (user_email, week_start, linha do acumulador),
+            com user_email = '' nas entradas de todos os usuários
+        """
+        try:
+            conn_result = self._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            try:
+                cursor = conn.execute(f'''
+                    SELECT user_email, period_start, {ROLLUP_COLUMNS} FROM review_rollups
+                    WHERE period = 'week' AND user_email {'!=' if per_user else '='} ?
+                    ORDER BY user_email, period_start
+                ''', (ALL_USERS,))
+                weeks = [(row[0], row[1], tuple(row[2:])) for row in cursor]
+            finally:
+                conn.close()
             
+            return Result.success_result(weeks)
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao listar semanas: {str(e)}")
+    
+    def _user_filter(self, user_email: Optional[str] = None,
+                     user_emails: Optional[Iterable[str]] = None) -> tuple:
+        """
+        Condição (e parâmetros) de usuário das tabelas por usuário: um usuário
+        (padrão: a soma de todos) ou, com user_emails, cada um dos usuários.
+        """
+        if user_emails is not None:
+            return 'user_email IN (SELECT value FROM json_each(?))', [json.dumps(list(user_emails))]
+        return 'user_email = ?', [user_email or ALL_USERS]
+    
+    def _fetch_by_user(self, sql: str, params: List) -> Dict[str, List[tuple]]:
+        """Executa uma consulta cuja primeira coluna é o usuário e agrupa as linhas por usuário."""
+        conn_result = self._get_connection()
+        if not conn_result.success:
+            raise RuntimeError(conn_result.get_first_error())
+        
+        conn = conn_result.data
+        try:
+            return _group_by_user(conn.execute(sql, params))
+        finally:
             conn.close()
-            return Result.success_result(reviews)
+    
+    def _correlation_rows(self, start_date: Optional[str], end_date: Optional[str],
+                          user_email: Optional[str] = None,
+                          user_emails: Optional[List[str]] = None) -> Dict[str, List[tuple]]:
+        """Linhas de co-momentos semanais do período por usuário."""
+        where, params = self._build_week_filters(start_date, end_date, user_email, user_emails)
+        return self._fetch_by_user(f'''
+            SELECT user_email, {COMOMENT_COLUMNS} FROM review_comoments {where}
+        ''', params)
+    
+    def get_area_correlations(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                              user_email: Optional[str] = None) -> Result:
+        """
+        Correlação entre as áreas em um período, a partir dos co-momentos semanais.
+        
+        Combina as semanas ISO que tocam o período (da semana de start_date à
+        de end_date), então o custo depende só do número de semanas.
+        
+        Args:
+            start_date: Data inicial (padrão: todo o histórico)
+            end_date: Data final (padrão: hoje)
+            user_email: Usuário (padrão: todos os usuários)
+        
+        Returns:
+            Result: Dicionário com count, weeks, matrix (área -> área ->
+            correlação ou None) e pairs (pares ordenados pela força da correlação)
+        """
+        try:
+            rows = self._correlation_rows(start_date, end_date, user_email)
+            return Result.success_result(_correlations_summary(rows.get(user_email or ALL_USERS, [])))
             
         except Exception as e:
-            return Result.error_result(f"Erro ao buscar avaliações por período: {str(e)}")
+            return Result.error_result(f"Erro ao calcular correlações: {str(e)}")
     
-    def get_weekly_average(self) -> Result:
-        """Calcula a média semanal das avaliações."""
+    def get_area_correlations_by_user(self, user_emails: List[str], start_date: Optional[str] = None,
+                                      end_date: Optional[str] = None) -> Result:
+        """
+        Correlações do período de vários usuários com uma única consulta.
+        
+        Returns:
+            Result: Dicionário email -> formato de get_area_correlations
+        """
         try:
+            rows = self._correlation_rows(start_date, end_date, user_emails=user_emails)
+            return Result.success_result({
+                email: _correlations_summary(rows.get(email, [])) for email in user_emails
+            })
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao calcular correlações por usuário: {str(e)}")
+    
+    def _histogram_rows(self, start_date: Optional[str], end_date: Optional[str],
+                        user_email: Optional[str] = None,
+                        user_emails: Optional[List[str]] = None) -> Dict[str, List[tuple]]:
+        """Linhas (semana, área, contadores) dos histogramas semanais do período por usuário."""
+        where, params = self._build_week_filters(start_date, end_date, user_email, user_emails)
+        return self._fetch_by_user(f'''
+            SELECT user_email, week_start, area, {HISTOGRAM_COLUMNS} FROM review_histograms {where}
+        ''', params)
+    
+    def get_score_distribution(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                               user_email: Optional[str] = None) -> Result:
+        """
+        Distribuição das notas de cada área em um período, a partir dos histogramas semanais.
+        
+        Combina as semanas ISO que tocam o período (da semana de start_date à
+        de end_date): 11 contadores por área e semana, qualquer que seja a
+        quantidade de avaliações.
+        
+        Args:
+            start_date: Data inicial (padrão: todo o histórico)
+            end_date: Data final (padrão: hoje)
+            user_email: Usuário (padrão: todos os usuários)
+        
+        Returns:
+            Result: Dicionário com count, weeks e areas (nome da área -> median,
+            p25, p75, p90, share_good_days e histogram; ver ScoreHistogram.to_dict)
+        """
+        try:
+            rows = self._histogram_rows(start_date, end_date, user_email)
+            return Result.success_result(_distribution_summary(rows.get(user_email or ALL_USERS, [])))
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao calcular distribuição das notas: {str(e)}")
+    
+    def get_score_distribution_by_user(self, user_emails: List[str], start_date: Optional[str] = None,
+                                       end_date: Optional[str] = None) -> Result:
+        """
+        Distribuição das notas do período de vários usuários com uma única consulta.
+        
+        Returns:
+            Result: Dicionário email -> formato de get_score_distribution
+        """
+        try:
+            rows = self._histogram_rows(start_date, end_date, user_emails=user_emails)
+            return Result.success_result({
+                email: _distribution_summary(rows.get(email, [])) for email in user_emails
+            })
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao calcular distribuição das notas por usuário: {str(e)}")
+    
+    def get_sentiment_stats(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                            user_email: Optional[str] = None) -> Result:
+        """
+        Resumo do sentimento dos comentários de um período (notas já em cache).
+        
+        Args:
+            start_date: Data inicial (padrão: 6 dias antes de end_date)
+            end_date: Data final (padrão: hoje)
+            user_email: Usuário (padrão: todos os usuários)
+        
+        Returns:
+            Result: Dicionário com count, average (-1 a 1), positive_average,
+            negative_average (notas dos dois campos), positive_days e negative_days
+        """
+        try:
+            end = date.fromisoformat(end_date) if end_date else date.today()
+            start_date = start_date or (end - timedelta(days=6)).isoformat()
+            where, params = self._build_filters(start_date, end.isoformat(), user_email)
+            
             conn_result = self._get_connection()
             if not conn_result.success:
                 return conn_result
             
             conn = conn_result.data
-            cursor = conn.cursor()
+            try:
+                row = conn.execute(f'''
+                    SELECT
+                        COUNT(s.review_id), AVG(s.score), AVG(s.positive_score), AVG(s.negative_score),
+                        SUM(s.score > 0), SUM(s.score < 0)
+                    FROM reviews JOIN review_sentiment s ON s.review_id = reviews.id
+                    {where}
+                ''', params).fetchone()
+            finally:
+                conn.close()
             
-            # Primeiro, vamos verificar se a coluna created_at existe
-            cursor.execute("PRAGMA table_info(reviews)")
-            columns = [column[1] for column in cursor.fetchall()]
+            return Result.success_result(_sentiment_summary(row))
             
-            if 'created_at' in columns:
-                # Se a coluna created_at existe, usa ela
-                cursor.execute('''
-                    SELECT 
-                        AVG(work) as avg_work,
-                        AVG(training) as avg_training,
-                        AVG(studies) as avg_studies,
-                        AVG(mind) as avg_mind,
-                        COUNT(*) as total_reviews
-                    FROM reviews 
-                    WHERE created_at >= datetime('now', '-7 days')
-                ''')
-            else:
-                # Se não existe, calcula a média de todas as avaliações
-                cursor.execute('''
-                    SELECT 
-                        AVG(work) as avg_work,
-                        AVG(training) as avg_training,
-                        AVG(studies) as avg_studies,
-                        AVG(mind) as avg_mind,
-                        COUNT(*) as total_reviews
-                    FROM reviews
-                ''')
+        except Exception as e:
+            return Result.error_result(f"Erro ao calcular sentimento: {str(e)}")
+    
+    def get_sentiment_stats_by_user(self, user_emails: List[str], start_date: str, end_date: str) -> Result:
+        """
+        Resumo do sentimento do período de vários usuários com uma consulta agrupada.
+        
+        Args:
+            user_emails: Usuários
+            start_date, end_date: Período (YYYY-MM-DD, inclusive)
+        
+        Returns:
+            Result: Dicionário email -> formato de get_sentiment_stats
+        """
+        try:
+            user_filter, user_params = self._user_filter(user_emails=user_emails)
+            rows = self._fetch_by_user(f'''
+                SELECT
+                    user_email,
+                    COUNT(s.review_id), AVG(s.score), AVG(s.positive_score), AVG(s.negative_score),
+                    SUM(s.score > 0), SUM(s.score < 0)
+                FROM reviews JOIN review_sentiment s ON s.review_id = reviews.id
+                WHERE review_date >= ? AND review_date <= ? AND {user_filter}
+                GROUP BY user_email
+            ''', [start_date, end_date] + user_params)
+            
+            return Result.success_result({
+                email: _sentiment_summary(rows[email][0] if email in rows else None)
+                for email in user_emails
+            })
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao calcular sentimento por usuário: {str(e)}")
+    
+    def _top_term_rows(self, start_date: Optional[str], end_date: Optional[str], limit: int,
+                       user_email: Optional[str] = None,
+                       user_emails: Optional[List[str]] = None) -> Dict[str, List[tuple]]:
+        """Linhas de TOP_TERMS_SQL por usuário (período padrão: 6 dias antes de end_date até ela)."""
+        end = date.fromisoformat(end_date) if end_date else date.today()
+        start = date.fromisoformat(start_date) if start_date else end - timedelta(days=6)
+        user_filter, params = self._user_filter(user_email, user_emails)
+        
+        return self._fetch_by_user(
+            TOP_TERMS_SQL.format(user_filter=user_filter),
+            params + [week_start(start.isoformat()), week_start(end.isoformat()), limit]
+        )
+    
+    def get_top_terms(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                      user_email: Optional[str] = None, limit: int = 5) -> Result:
+        """
+        Termos mais citados nos pontos positivos e negativos de um período.
+        
+        Soma as contagens do índice de termos (review_terms) das semanas ISO
+        que cobrem o período, sem ler os comentários.
+        
+        Args:
+            start_date: Data inicial (padrão: 6 dias antes de end_date)
+            end_date: Data final (padrão: hoje)
+            user_email: Usuário (padrão: todos os usuários)
+            limit: Quantidade de termos de cada tipo
+        
+        Returns:
+            Result: Dicionário com 'positive' e 'negative': listas de
+            {'term', 'word', 'count'} em ordem decrescente de citações
+        """
+        try:
+            rows = self._top_term_rows(start_date, end_date, limit, user_email)
+            return Result.success_result(_terms_summary(rows.get(user_email or ALL_USERS, [])))
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao buscar termos mais citados: {str(e)}")
+    
+    def get_top_terms_by_user(self, user_emails: List[str], start_date: Optional[str] = None,
+                              end_date: Optional[str] = None, limit: int = 5) -> Result:
+        """
+        Termos mais citados do período de vários usuários com uma única consulta.
+        
+        Returns:
+            Result: Dicionário email -> formato de get_top_terms
+        """
+        try:
+            rows = self._top_term_rows(start_date, end_date, limit, user_emails=user_emails)
+            return Result.success_result({email: _terms_summary(rows.get(email, [])) for email in user_emails})
             
-            result = cursor.fetchone()
+        except Exception as e:
+            return Result.error_result(f"Erro ao buscar termos mais citados por usuário: {str(e)}")
+    
+    def _trend_history(self, end_date: str, user_email: Optional[str] = None,
+                       user_emails: Optional[List[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Semanas de WEEKLY_TRENDS_SQL até a semana de end_date, por usuário."""
+        user_filter, params = self._user_filter(user_email, user_emails)
+        
+        conn_result = self._get_connection()
+        if not conn_result.success:
+            raise RuntimeError(conn_result.get_first_error())
+        
+        conn = conn_result.data
+        try:
+            conn.row_factory = sqlite3.Row
+            history: Dict[str, List[Dict[str, Any]]] = {}
+            for row in conn.execute(WEEKLY_TRENDS_SQL.format(user_filter=user_filter),
+                                    params + [week_start(end_date)]):
+                week = dict(row)
+                history.setdefault(week.pop('user_email'), []).append(week)
+            return history
+        finally:
             conn.close()
+    
+    def get_weekly_trends(self, user_email: Optional[str] = None,
+                          end_date: Optional[str] = None) -> Result:
+        """
+        Calcula as tendências de longo prazo das semanas ISO até end_date.
+        
+        Tudo é calculado no SQLite sobre os acumuladores semanais (ver
+        WEEKLY_TRENDS_SQL), então o custo depende do número de semanas, não
+        do número de avaliações.
+        
+        Args:
+            user_email: Usuário (padrão: todos os usuários)
+            end_date: Data da última semana considerada (padrão: hoje)
+        
+        Returns:
+            Result: Dicionário com 'history' (uma entrada por semana com média,
+            variação e média móvel de 4 semanas de cada área e da geral, e a
+            sequência atual), 'latest', 'best_week', 'worst_week',
+            'current_streak' e 'longest_streak' (vazio se não houver semanas)
+        """
+        try:
+            end = end_date or date.today().isoformat()
+            history = self._trend_history(end, user_email)
+            return Result.success_result(_trends_summary(history.get(user_email or ALL_USERS, []), end))
             
-            if result and result[4] > 0:  # Se há avaliações
-                weekly_data = {
-                    'avg_work': round(result[0], 2),
-                    'avg_training': round(result[1], 2),
-                    'avg_studies': round(result[2], 2),
-                    'avg_mind': round(result[3], 2),
-                    'total_reviews': result[4],
-                    'overall_average': round((result[0] + result[1] + result[2] + result[3]) / 4, 2)
-                }
-                return Result.success_result(weekly_data)
-            else:
-                return Result.error_result("Nenhuma avaliação encontrada.")
+        except Exception as e:
+            return Result.error_result(f"Erro ao calcular tendências semanais: {str(e)}")
+    
+    def get_weekly_trends_by_user(self, user_emails: List[str], end_date: Optional[str] = None) -> Result:
+        """
+        Tendências das semanas ISO até end_date de vários usuários com uma única consulta.
+        
+        Returns:
+            Result: Dicionário email -> formato de get_weekly_trends
+        """
+        try:
+            end = end_date or date.today().isoformat()
+            history = self._trend_history(end, user_emails=user_emails)
+            return Result.success_result({
+                email: _trends_summary(history.get(email, []), end) for email in user_emails
+            })
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao calcular tendências semanais por usuário: {str(e)}")
+    
+    def save_weekly_reports(self, reports: List[dict]) -> Result:
+        """
+        Grava (ou substitui) relatórios semanais em uma única transação.
+        
+        Args:
+            reports: Dicionários com user_email, week_start, weekly_data e analysis
+        """
+        try:
+            conn_result = self._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            try:
+                with conn:
+                    conn.executemany('''
+                        INSERT OR REPLACE INTO weekly_reports (
+                            user_email, week_start, total_reviews, avg_work, avg_training,
+                            avg_studies, avg_mind, overall_average, consistency_score,
+                            performance_level, strongest_area, weakest_area, analysis
+                        )
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', [
+                        (
+                            report['user_email'],
+                            report['week_start'],
+                            report['weekly_data']['total_reviews'],
+                            report['weekly_data']['avg_work'],
+                            report['weekly_data']['avg_training'],
+                            report['weekly_data']['avg_studies'],
+                            report['weekly_data']['avg_mind'],
+                            report['weekly_data']['overall_average'],
+                            report['analysis']['patterns'].get('consistency_score'),
+                            report['analysis']['performance_level'],
+                            report['analysis']['patterns'].get('strongest_area'),
+                            report['analysis']['patterns'].get('weakest_area'),
+                            json.dumps(report['analysis'], ensure_ascii=False)
+                        )
+                        for report in reports
+                    ])
+            finally:
+                conn.close()
+            
+            return Result.success_result(len(reports))
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao gravar relatórios semanais: {str(e)}")
+    
+    def get_weekly_reports(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                           user_email: Optional[str] = None) -> Result:
+        """
+        Lê os relatórios semanais já calculados, em ordem de semana.
+        
+        Args:
+            start_date, end_date: Filtram pelo início da semana (YYYY-MM-DD)
+            user_email: Usuário (padrão: relatórios de todos os usuários)
+        
+        Returns:
+            Result: Lista de dicionários (com 'analysis' já decodificado)
+        """
+        try:
+            conditions = ['user_email = ?']
+            params = [user_email or ALL_USERS]
+            if start_date:
+                conditions.append('week_start >= ?')
+                params.append(start_date)
+            if end_date:
+                conditions.append('week_start <= ?')
+                params.append(end_date)
+            
+            conn_result = self._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            try:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.execute(f'''
+                    SELECT * FROM weekly_reports
+                    WHERE {' AND '.join(conditions)}
+                    ORDER BY week_start
+                ''', params)
+                reports = [dict(row) for row in cursor]
+            finally:
+                conn.close()
+            
+            for report in reports:
+                report['analysis'] = json.loads(report['analysis']) if report['analysis'] else None
+            
+            return Result.success_result(reports)
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao buscar relatórios semanais: {str(e)}")
+    
+    def get_weekly_stats_by_user(self, start_date: str, end_date: str) -> Result:
+        """
+        Calcula as estatísticas do período de todos os usuários com uma consulta agrupada.
+        
+        Args:
+            start_date, end_date: Período (YYYY-MM-DD, inclusive)
+        
+        Returns:
+            Result: Dicionário email -> ReviewAccumulator (só usuários com avaliações)
+        """
+        try:
+            conn_result = self._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            try:
+                cursor = conn.execute('''
+                    SELECT
+                        user_email,
+                        COUNT(*),
+                        SUM(work), SUM(training), SUM(studies), SUM(mind),
+                        SUM(work * work), SUM(training * training), SUM(studies * studies), SUM(mind * mind)
+                    FROM reviews
+                    WHERE review_date >= ? AND review_date <= ? AND user_email IS NOT NULL
+                    GROUP BY user_email
+                ''', (start_date, end_date))
                 
+                stats_by_user = {
+                    row[0]: ReviewAccumulator.from_sums(row[1], row[2:6], row[6:10])
+                    for row in cursor
+                }
+            finally:
+                conn.close()
+            
+            return Result.success_result(stats_by_user)
+            
         except Exception as e:
-            return Result.error_result(f"Erro ao calcular média semanal: {str(e)}")
+            return Result.error_result(f"Erro ao calcular estatísticas por usuário: {str(e)}")
+    
+    def get_delivered_weekly_reports(self, week_start: str) -> Result:
+        """Retorna o conjunto de emails que já receberam o relatório da semana."""
+        try:
+            conn_result = self._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            try:
+                cursor = conn.execute(
+                    'SELECT user_email FROM weekly_report_deliveries WHERE week_start = ?',
+                    (week_start,)
+                )
+                delivered = {row[0] for row in cursor}
+            finally:
+                conn.close()
+            
+            return Result.success_result(delivered)
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao buscar relatórios entregues: {str(e)}")
+    
+    def mark_weekly_reports_delivered(self, week_start: str, user_emails: List[str]) -> Result:
+        """Registra a entrega do relatório da semana para vários usuários."""
+        try:
+            conn_result = self._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            try:
+                with conn:
+                    conn.executemany('''
+                        INSERT OR IGNORE INTO weekly_report_deliveries (week_start, user_email)
+                        VALUES (?, ?)
+                    ''', [(week_start, email) for email in user_emails])
+            finally:
+                conn.close()
+            
+            return Result.success_result(len(user_emails))
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao registrar relatórios entregues: {str(e)}")
+    
+    def get_weekly_average(self) -> Result:
+        """Calcula a média semanal (últimos 7 dias) das avaliações."""
+        today = date.today()
+        result = self.get_summary_stats((today - timedelta(days=6)).isoformat(), today.isoformat())
+        if not result.success:
+            return result
+        
+        if not result.data['count']:
+            return Result.error_result("Nenhuma avaliação encontrada.")
+        
+        return Result.success_result(result.data['stats'].to_dict())
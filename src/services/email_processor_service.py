@@ -5,21 +5,121 @@ Mantido apenas para referência/histórico.
 """
 
 import re
-from datetime import datetime
 from typing import Dict, Optional
 from ..models.result import Result
 from ..models.review import Review
+from ..models.validation import REVIEW_INPUT_VALIDATOR
 from .database_service import DatabaseService
 from .confirmation_service import ConfirmationService
 
 
+# Campos da avaliação no corpo da resposta ("work: 8", "positive_points: ...")
+SCORE_FIELDS = ('work', 'training', 'studies', 'mind')
+TEXT_FIELDS = ('positive_points', 'negative_points')
+_FIELDS = SCORE_FIELDS + TEXT_FIELDS
+
+# Nome de um campo seguido de ':' ("work: 8"); uma linha pode ter vários campos
+_FIELD_RE = re.compile(
+    r'\b(' + '|'.join(_FIELDS) + r')[ \t]*:',
+    re.IGNORECASE
+)
+
+# Linha de campos: começa com "campo:" (as demais continuam o comentário)
+_FIELD_LINE_RE = re.compile(r'[ \t]*' + _FIELD_RE.pattern, re.IGNORECASE)
+
+# Nota no início do valor
+_SCORE_RE = re.compile(r'[ \t]*(\d+)')
+
+# Início da mensagem citada na resposta ou da assinatura: o resto é ignorado.
+# O cabeçalho da citação é uma linha curta, com data, que termina em
+# "wrote:"/"escreveu:", para não confundir com um comentário que começa
+# com "on"/"em".
+_REPLY_END_RE = re.compile(
+    r'[ \t]*(?:'
+    r'(?:on|em)\b(?=.{0,300}$)(?=.*\d).*\b(?:wrote|escreveu):[ \t]*$|'
+    r'-{2,}\s*(?:original message|mensagem original)\s*-{2,}|'
+    r'(?:from|de):\s.*@|'
+    r'--[ \t]*$|_{5,}'
+    r')',
+    re.IGNORECASE
+)
+
+
+def parse_email_body(body: str) -> Optional[Dict]:
+    """
+    Extrai as notas e comentários de uma resposta por email em uma única passada.
+    
+    Percorre o corpo linha a linha: linhas citadas ("> ...") são ignoradas e
+    a leitura para no cabeçalho da mensagem original ("Em ... escreveu:",
+    "On ... wrote:", "-----Original Message-----") ou na assinatura ("-- ").
+    Uma linha de campos começa com "campo:" e pode trazer várias notas
+    ("work: 8 training: 7"); um comentário vai até o fim da linha e as
+    linhas seguintes o continuam até o próximo campo. Vale a primeira
+    ocorrência de cada campo.
+    
+    Returns:
+        Dict com os seis campos (notas como int) ou None se faltar algum
+    """
+    extracted: Dict = {}
+    text_field = None
+    text_lines = []
+    
+    def close_text():
+        if text_field is not None and text_field not in extracted:
+            extracted[text_field] = '\n'.join(text_lines).strip()
+    
+    for line in body.splitlines():
+        if line.lstrip().startswith('>'):
+            continue
+        if _REPLY_END_RE.match(line):
+            break
+        
+        first = _FIELD_LINE_RE.match(line)
+        if first is None:
+            if text_field is not None:
+                text_lines.append(line.strip())
+            continue
+        
+        close_text()
+        text_field = None
+        
+        # Só notas são seguidas por outros campos na mesma linha: um comentário
+        # vai até o fim da linha, mesmo que cite "work:" ou "mind:"
+        match = first
+        while match is not None:
+            field = match.group(1).lower()
+            
+            if field in TEXT_FIELDS:
+                text_field = field
+                text_lines = [line[match.end():].strip()]
+                break
+            
+            following = None
+            if line.find(':', match.end()) >= 0:
+                following = _FIELD_RE.search(line, match.end())
+            value = line[match.end():following.start() if following else len(line)]
+            
+            if field not in extracted:
+                score = _SCORE_RE.match(value)
+                if score:
+                    extracted[field] = int(score.group(1))
+            match = following
+    
+    close_text()
+    
+    if len(extracted) < len(_FIELDS):
+        return None
+    return extracted
+
+
 class EmailProcessorService:
     """Serviço para processar respostas de email com avaliações."""
     
-    def __init__(self):
+    def __init__(self, db_service: Optional[DatabaseService] = None,
+                 confirmation_service: Optional[ConfirmationService] = None):
         """Inicializa o serviço de processamento de email."""
-        self.db_service = DatabaseService()
-        self.confirmation_service = ConfirmationService()
+        self.db_service = db_service or DatabaseService()
+        self.confirmation_service = confirmation_service or ConfirmationService()
     
     def process_email_response(self, email_content: str) -> Result:
         """
@@ -43,15 +143,8 @@ class EmailProcessorService:
             if not validation_result.success:
                 return validation_result
             
-            # Cria o objeto Review
-            review = Review(
-                work=extracted_data['work'],
-                training=extracted_data['training'],
-                studies=extracted_data['studies'],
-                mind=extracted_data['mind'],
-                positive_points=extracted_data['positive_points'],
-                negative_points=extracted_data['negative_points']
-            )
+            # Cria o objeto Review (dados já validados)
+            review = Review.from_validated(validation_result.data)
             
             # Salva no banco de dados
             save_result = self.db_service.insert_review(review)
@@ -98,38 +191,7 @@ class EmailProcessorService:
             Dict com os dados extraídos ou None se não conseguir
         """
         try:
-            # Padrões para extrair os dados
-            patterns = {
-                'work': r'work[:\s]*(\d+)',
-                'training': r'training[:\s]*(\d+)',
-                'studies': r'studies[:\s]*(\d+)',
-                'mind': r'mind[:\s]*(\d+)',
-                'positive_points': r'positive_points[:\s]*(.*?)(?=negative_points|$)',
-                'negative_points': r'negative_points[:\s]*(.*?)$'
-            }
-            
-            extracted = {}
-            
-            # Extrai notas numéricas
-            for field, pattern in patterns.items():
-                if field in ['work', 'training', 'studies', 'mind']:
-                    match = re.search(pattern, email_content, re.IGNORECASE)
-                    if match:
-                        try:
-                            extracted[field] = int(match.group(1))
-                        except ValueError:
-                            return None
-                    else:
-                        return None
-                else:
-                    # Extrai texto
-                    match = re.search(pattern, email_content, re.IGNORECASE | re.DOTALL)
-                    if match:
-                        extracted[field] = match.group(1).strip()
-                    else:
-                        return None
-            
-            return extracted
+            return parse_email_body(email_content)
             
         except Exception as e:
             print(f"Erro ao extrair dados: {str(e)}")
@@ -143,28 +205,14 @@ class EmailProcessorService:
             data: Dados extraídos
             
         Returns:
-            Result: Resultado da validação
+            Result: Dados normalizados se válidos, ou os erros de validação
         """
-        errors = []
-        
-        # Valida notas (0-10)
-        for field in ['work', 'training', 'studies', 'mind']:
-            if field not in data:
-                errors.append(f"Campo {field} não encontrado")
-            elif not isinstance(data[field], int) or data[field] < 0 or data[field] > 10:
-                errors.append(f"Campo {field} deve ser um número entre 0 e 10")
-        
-        # Valida textos
-        for field in ['positive_points', 'negative_points']:
-            if field not in data:
-                errors.append(f"Campo {field} não encontrado")
-            elif not isinstance(data[field], str) or not data[field].strip():
-                errors.append(f"Campo {field} não pode estar vazio")
+        validation = REVIEW_INPUT_VALIDATOR.validate(data)
         
-        if errors:
-            return Result.error_result_multiple(errors)
+        if not validation.valid:
+            return Result.error_result_multiple(validation.messages())
         
-        return Result.success_result()
+        return Result.success_result(validation.data)
     
     def simulate_email_processing(self, work: int, training: int, studies: int, 
                                 mind: int, positive_points: str, negative_points: str) -> Result:
@@ -198,16 +246,15 @@ class EmailProcessorService:
             Result: Estatísticas do processamento
         """
         try:
-            # Busca todas as avaliações
-            reviews_result = self.db_service.get_all_reviews()
+            # Quantidade, último ID e média calculados no banco (sem carregar as avaliações)
+            summary_result = self.db_service.get_summary_stats()
             
-            if not reviews_result.success:
-                return reviews_result
+            if not summary_result.success:
+                return summary_result
             
-            reviews = reviews_result.data
-            total_reviews = len(reviews)
+            summary = summary_result.data
             
-            if total_reviews == 0:
+            if summary['count'] == 0:
                 return Result.success_result({
                     'total_processed': 0,
                     'last_processing': None,
@@ -216,10 +263,10 @@ class EmailProcessorService:
             
             # Calcula estatísticas
             stats = {
-                'total_processed': total_reviews,
-                'last_processing': reviews[0].id if reviews else None,
+                'total_processed': summary['count'],
+                'last_processing': summary['last_id'],
                 'success_rate': 100,  # Assumindo que todas foram processadas com sucesso
-                'average_score': sum(r.get_average_score() for r in reviews) / total_reviews
+                'average_score': summary['average']
             }
             
             return Result.success_result(stats)
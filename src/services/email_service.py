@@ -3,10 +3,7 @@ Serviço para envio de emails.
 Centraliza todas as operações relacionadas ao envio de emails.
 """
 
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Optional, Tuple
 from ..models.result import Result
 from ..config.settings import settings
 
@@ -43,6 +40,11 @@ class EmailService:
         Returns:
             Result: Resultado da operação
         """
+        # Importados só quando um email é de fato enviado (smtplib carrega ssl)
+        import smtplib
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
+        
         try:
             # Valida configurações
             config_result = self._validate_email_settings()
@@ -95,6 +97,11 @@ class EmailService:
         Returns:
             Result: Resultado da operação
         """
+        # Importados só quando um email é de fato enviado (smtplib carrega ssl)
+        import smtplib
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
+        
         try:
             # Valida configurações
             config_result = self._validate_email_settings()
@@ -135,6 +142,137 @@ class EmailService:
         except Exception as e:
             return Result.error_result(f"Erro ao enviar email HTML: {str(e)}")
     
+    def send_bulk_emails(self, messages: Iterable[Tuple[str, str, str]], subtype: str = 'plain') -> Result:
+        """
+        Envia vários emails reaproveitando uma única conexão SMTP.
+        
+        Uma falha de envio não interrompe o lote: o erro é registrado para
+        o destinatário, a conexão é descartada e a próxima mensagem abre
+        outra. Se o servidor derrubar a conexão, o envio é tentado de novo
+        uma vez. Em erro inesperado, o Result de erro traz em data os
+        resultados parciais.
+        
+        Args:
+            messages: Tuplas (destinatário, assunto, corpo)
+            subtype (str): 'plain' ou 'html'
+            
+        Returns:
+            Result: Dicionário destinatário -> None (enviado) ou mensagem de erro
+        """
+        import smtplib
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
+        
+        config_result = self._validate_email_settings()
+        if not config_result.success:
+            return config_result
+        
+        outcomes: Dict[str, Optional[str]] = {}
+        server = None
+        auth_error = None
+        
+        try:
+            for to_email, subject, body in messages:
+                # Sem login não há como enviar o restante do lote
+                if auth_error:
+                    outcomes[to_email] = auth_error
+                    continue
+                
+                validation_result = self._validate_email_params(to_email, subject, body)
+                if not validation_result.success:
+                    outcomes[to_email] = validation_result.get_first_error()
+                    continue
+                
+                msg = MIMEMultipart()
+                msg['From'] = self.email_user
+                msg['To'] = to_email
+                msg['Subject'] = subject
+                msg.attach(MIMEText(body, subtype, 'utf-8'))
+                text = msg.as_string()
+                
+                for attempt in range(2):
+                    try:
+                        if server is None:
+                            server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+                            server.starttls()
+                            server.login(self.email_user, self.email_password)
+                        server.sendmail(self.email_user, to_email, text)
+                        outcomes[to_email] = None
+                        break
+                    except smtplib.SMTPServerDisconnected as e:
+                        server = None
+                        if attempt:
+                            outcomes[to_email] = f"Erro SMTP: {str(e)}"
+                    except smtplib.SMTPRecipientsRefused:
+                        outcomes[to_email] = "Email do destinatário inválido."
+                        break
+                    except smtplib.SMTPAuthenticationError:
+                        auth_error = "Erro de autenticação. Verifique usuário e senha."
+                        outcomes[to_email] = auth_error
+                        server = self._drop_connection(server)
+                        break
+                    except (smtplib.SMTPException, OSError) as e:
+                        # Erro deste envio (ex.: SMTPDataError); a conexão é
+                        # descartada e o lote segue com uma nova
+                        outcomes[to_email] = f"Erro SMTP: {str(e)}"
+                        server = self._drop_connection(server)
+                        break
+            
+            return Result.success_result(outcomes)
+            
+        except Exception as e:
+            # O erro interrompe o lote, mas quem já recebeu segue em data
+            result = Result.error_result(f"Erro ao enviar emails em lote: {str(e)}")
+            result.data = outcomes
+            return result
+        finally:
+            self._drop_connection(server)
+    
+    @staticmethod
+    def _drop_connection(server) -> None:
+        """Encerra uma conexão SMTP ignorando erros; sempre retorna None."""
+        if server is not None:
+            try:
+                server.quit()
+            except Exception:
+                pass
+        return None
+    
+    def check_connection(self, timeout: float = 5.0) -> Result:
+        """
+        Verifica se o servidor SMTP está acessível e aceita o login.
+        
+        Não envia nenhum email; usado pelas verificações de saúde.
+        
+        Args:
+            timeout (float): Tempo máximo (segundos) para conectar e autenticar
+            
+        Returns:
+            Result: Resultado da verificação
+        """
+        import smtplib
+        
+        try:
+            config_result = self._validate_email_settings()
+            if not config_result.success:
+                return config_result
+            
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=timeout)
+            try:
+                server.starttls()
+                server.login(self.email_user, self.email_password)
+            finally:
+                server.quit()
+            
+            return Result.success_result("Servidor SMTP acessível")
+            
+        except smtplib.SMTPAuthenticationError:
+            return Result.error_result("Erro de autenticação. Verifique usuário e senha.")
+        except smtplib.SMTPException as e:
+            return Result.error_result(f"Erro SMTP: {str(e)}")
+        except Exception as e:
+            return Result.error_result(f"Erro ao conectar com o servidor SMTP: {str(e)}")
+    
     def _validate_email_params(self, to_email: str, subject: str, body: str) -> Result:
         """Valida os parâmetros do email."""
         errors = []
@@ -0,0 +1,173 @@
+"""
+Serviço de exportação das avaliações.
+Lê as avaliações do banco em lotes por um cursor e gera CSV ou NDJSON (JSON
+Lines) aos pedaços, opcionalmente comprimido com gzip, usando memória
+constante qualquer que seja o tamanho do histórico.
+"""
+
+import csv
+import io
+import json
+import os
+import time
+import zlib
+from typing import Iterator, List, Optional, Tuple
+from ..models.result import Result
+from .database_service import DatabaseService, REVIEW_FIELDS
+
+
+# Formatos de exportação aceitos e o tipo MIME de cada um
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+# Avaliações lidas do banco por vez
+EXPORT_BATCH_SIZE = 5000
+
+
+class ExportService:
+    """Serviço para exportar avaliações em CSV ou NDJSON sem carregar tudo em memória."""
+    
+    def __init__(self, db_service: Optional[DatabaseService] = None):
+        """Inicializa o serviço de exportação."""
+        self.db_service = db_service or DatabaseService()
+    
+    def iter_batches(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                     user_email: Optional[str] = None,
+                     batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[tuple]]:
+        """
+        Percorre as avaliações em ordem de ID, um lote de linhas por vez.
+        
+        Yields:
+            list: Até batch_size tuplas com as colunas de REVIEW_FIELDS
+        """
+        where, params = self.db_service._build_filters(start_date, end_date, user_email)
+        
+        conn_result = self.db_service._get_connection()
+        if not conn_result.success:
+            raise RuntimeError(conn_result.get_first_error())
+        
+        conn = conn_result.data
+        try:
+            cursor = conn.execute(
+                f"SELECT {', '.join(REVIEW_FIELDS)} FROM reviews {where} ORDER BY id", params
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            conn.close()
+    
+    def iter_export(self, export_format: str = 'csv', compress: bool = False,
+                    start_date: Optional[str] = None, end_date: Optional[str] = None,
+                    user_email: Optional[str] = None, batch_size: int = EXPORT_BATCH_SIZE,
+                    progress: Optional[dict] = None) -> Iterator[bytes]:
+        """
+        Gera o arquivo de exportação em pedaços (um por lote de avaliações).
+        
+        Args:
+            export_format: 'csv' ou 'ndjson'
+            compress: Se True, os pedaços formam um arquivo gzip
+            start_date, end_date, user_email: Filtros das avaliações
+            batch_size: Avaliações por pedaço
+            progress: Dicionário opcional em que 'rows' é atualizado a cada lote
+        
+        Yields:
+            bytes: Pedaços do arquivo, prontos para gravar ou enviar
+        
+        Raises:
+            ValueError: Se o formato não for suportado
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Formato não suportado: {export_format} (use csv ou ndjson)")
+        
+        encode = self._encode_csv if export_format == 'csv' else self._encode_ndjson
+        compressor = zlib.compressobj(wbits=31) if compress else None
+        
+        def output(text: str) -> bytes:
+            data = text.encode('utf-8')
+            return compressor.compress(data) if compressor else data
+        
+        if export_format == 'csv':
+            yield output(self._encode_csv([REVIEW_FIELDS]))
+        
+        for rows in self.iter_batches(start_date, end_date, user_email, batch_size):
+            if progress is not None:
+                progress['rows'] = progress.get('rows', 0) + len(rows)
+            chunk = output(encode(rows))
+            if chunk:
+                yield chunk
+        
+        if compressor:
+            yield compressor.flush()
+    
+    def export_to_file(self, path: str, export_format: Optional[str] = None,
+                       compress: Optional[bool] = None, start_date: Optional[str] = None,
+                       end_date: Optional[str] = None, user_email: Optional[str] = None) -> Result:
+        """
+        Exporta as avaliações para um arquivo, gravando cada pedaço assim que é gerado.
+        
+        Args:
+            path: Caminho do arquivo; formato e compressão são deduzidos da
+                extensão (.csv, .ndjson, .jsonl, com ou sem .gz) se não forem informados
+            export_format: 'csv' ou 'ndjson'
+            compress: Se True, grava em gzip
+            start_date, end_date, user_email: Filtros das avaliações
+        
+        Returns:
+            Result: Dicionário com path, format, compressed, rows, bytes e seconds
+        """
+        try:
+            guessed_format, guessed_compress = self.guess_format(path)
+            export_format = export_format or guessed_format
+            compress = guessed_compress if compress is None else compress
+            
+            started = time.perf_counter()
+            progress = {'rows': 0}
+            written = 0
+            
+            with open(path, 'wb') as output:
+                for chunk in self.iter_export(export_format, compress, start_date, end_date,
+                                              user_email, progress=progress):
+                    output.write(chunk)
+                    written += len(chunk)
+            
+            return Result.success_result({
+                'path': path,
+                'format': export_format,
+                'compressed': compress,
+                'rows': progress['rows'],
+                'bytes': written,
+                'seconds': time.perf_counter() - started
+            })
+        
+        except Exception as e:
+            return Result.error_result(f"Erro ao exportar avaliações: {str(e)}")
+    
+    @staticmethod
+    def guess_format(path: str) -> Tuple[str, bool]:
+        """Formato ('csv' ou 'ndjson') e compressão deduzidos da extensão do arquivo."""
+        name = os.path.basename(path).lower()
+        compress = name.endswith('.gz')
+        if compress:
+            name = name[:-3]
+        export_format = 'ndjson' if name.endswith(('.ndjson', '.jsonl', '.json')) else 'csv'
+        return export_format, compress
+    
+    @staticmethod
+    def _encode_csv(rows: List[tuple]) -> str:
+        """Linhas em CSV (com o escape padrão do módulo csv)."""
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerows(rows)
+        return buffer.getvalue()
+    
+    @staticmethod
+    def _encode_ndjson(rows: List[tuple]) -> str:
+        """Linhas em NDJSON: um objeto JSON por linha."""
+        dumps = json.dumps
+        return ''.join(
+            dumps(dict(zip(REVIEW_FIELDS, row)), ensure_ascii=False) + '\n' for row in rows
+        )
@@ -0,0 +1,172 @@
+"""
+Serviço de verificação de saúde da aplicação.
+Mede a latência das dependências (banco e SMTP) para as sondas de prontidão.
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+from .database_service import DatabaseService
+from .email_service import EmailService
+from ..config.settings import settings
+
+
+class HealthService:
+    """Serviço para as verificações de prontidão (readiness) da aplicação."""
+    
+    def __init__(self, db_service: Optional[DatabaseService] = None,
+                 email_service: Optional[EmailService] = None):
+        """Inicializa o serviço de saúde."""
+        self.db_service = db_service or DatabaseService()
+        self.email_service = email_service or EmailService()
+        self._smtp_cache: Optional[Dict[str, Any]] = None
+        self._smtp_checked_at = 0.0
+        self._smtp_lock = threading.Lock()
+        self._smtp_refreshing = False
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+    
+    def request_started(self):
+        """Registra o início de uma requisição em andamento."""
+        with self._in_flight_lock:
+            self._in_flight += 1
+    
+    def request_finished(self):
+        """Registra o fim de uma requisição em andamento."""
+        with self._in_flight_lock:
+            self._in_flight -= 1
+    
+    def check_database(self) -> Dict[str, Any]:
+        """
+        Mede a latência de uma leitura no banco, aberto somente para leitura.
+        
+        A sonda não disputa o lock de escrita com as gravações. Com
+        HEALTH_DB_CHECK_WRITE ligado, também obtém e libera o lock de escrita
+        (BEGIN IMMEDIATE + ROLLBACK), esperando no máximo HEALTH_DB_TIMEOUT_SECONDS,
+        o que detecta um banco travado por outro processo sem gravar nada.
+        """
+        start = time.perf_counter()
+        try:
+            read_only_uri = Path(self.db_service.db_path).resolve().as_uri() + '?mode=ro'
+            conn = sqlite3.connect(read_only_uri, uri=True, timeout=settings.HEALTH_DB_TIMEOUT_SECONDS)
+            try:
+                conn.execute('SELECT 1 FROM reviews LIMIT 1').fetchall()
+            finally:
+                conn.close()
+            
+            if settings.HEALTH_DB_CHECK_WRITE:
+                conn = sqlite3.connect(self.db_service.db_path, timeout=settings.HEALTH_DB_TIMEOUT_SECONDS)
+                try:
+                    conn.execute('BEGIN IMMEDIATE')
+                    conn.execute('ROLLBACK')
+                finally:
+                    conn.close()
+        except Exception as e:
+            return {
+                'ok': False,
+                'latency_ms': self._elapsed_ms(start),
+                'error': str(e)
+            }
+        
+        latency_ms = self._elapsed_ms(start)
+        check = {
+            'ok': latency_ms <= settings.HEALTH_DB_MAX_LATENCY_MS,
+            'latency_ms': latency_ms
+        }
+        if not check['ok']:
+            check['error'] = f'Latência acima de {settings.HEALTH_DB_MAX_LATENCY_MS} ms'
+        return check
+    
+    def check_smtp(self) -> Dict[str, Any]:
+        """
+        Verifica o login no servidor SMTP, reaproveitando o último resultado.
+        
+        O resultado fica em cache por HEALTH_SMTP_CACHE_SECONDS para que as
+        sondas frequentes do balanceador não abram uma sessão SMTP a cada chamada.
+        A verificação roda fora do lock: só uma sonda por vez renova o cache e as
+        demais recebem o último resultado enquanto isso. Sem EMAIL_USER, o SMTP é
+        informado como não configurado e não tira a instância do ar.
+        """
+        if not self.email_service.email_user:
+            return {'ok': True, 'configured': False, 'status': 'not configured'}
+        
+        now = time.monotonic()
+        
+        with self._smtp_lock:
+            cache_age = now - self._smtp_checked_at
+            if self._smtp_cache is not None and (cache_age < settings.HEALTH_SMTP_CACHE_SECONDS
+                                                 or self._smtp_refreshing):
+                return {**self._smtp_cache, 'cached': True, 'age_seconds': round(cache_age, 1),
+                        'refreshing': self._smtp_refreshing}
+            if self._smtp_refreshing:
+                # Primeira verificação ainda em andamento em outra sonda
+                return {
+                    'ok': not settings.HEALTH_REQUIRE_SMTP,
+                    'configured': True,
+                    'error': 'Primeira verificação SMTP em andamento',
+                    'cached': False,
+                    'refreshing': True
+                }
+            self._smtp_refreshing = True
+        
+        try:
+            start = time.perf_counter()
+            result = self.email_service.check_connection(timeout=settings.HEALTH_SMTP_TIMEOUT_SECONDS)
+            
+            check = {
+                'ok': result.success or not settings.HEALTH_REQUIRE_SMTP,
+                'configured': True,
+                'latency_ms': self._elapsed_ms(start),
+                'checked_at': datetime.now().isoformat()
+            }
+            if not result.success:
+                check['error'] = result.get_first_error()
+            
+            with self._smtp_lock:
+                self._smtp_cache = check
+                self._smtp_checked_at = time.monotonic()
+        finally:
+            with self._smtp_lock:
+                self._smtp_refreshing = False
+        
+        return {**check, 'cached': False, 'age_seconds': 0.0, 'refreshing': False}
+    
+    def check_pending_work(self) -> Dict[str, Any]:
+        """Informa quantas requisições estão em andamento nesta instância (inclui a sonda)."""
+        with self._in_flight_lock:
+            in_flight = self._in_flight
+        
+        check = {
+            'ok': in_flight <= settings.HEALTH_MAX_IN_FLIGHT,
+            'in_flight_requests': in_flight
+        }
+        if not check['ok']:
+            check['error'] = f'Mais de {settings.HEALTH_MAX_IN_FLIGHT} requisições em andamento'
+        return check
+    
+    def get_readiness(self) -> Dict[str, Any]:
+        """
+        Executa todas as verificações de prontidão.
+        
+        Returns:
+            Dict: 'ready' (bool), 'checks' por dependência e 'timestamp'
+        """
+        checks = {
+            'database': self.check_database(),
+            'smtp': self.check_smtp(),
+            'pending_work': self.check_pending_work()
+        }
+        
+        return {
+            'ready': all(check['ok'] for check in checks.values()),
+            'checks': checks,
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    @staticmethod
+    def _elapsed_ms(start: float) -> float:
+        """Milissegundos desde start (time.perf_counter)."""
+        return round((time.perf_counter() - start) * 1000, 2)
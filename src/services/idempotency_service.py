@@ -0,0 +1,147 @@
+"""
+Serviço de chaves de idempotência para a API.
+Guarda a resposta original de cada requisição com Idempotency-Key para que
+retentativas do cliente não gravem de novo nem reenviem emails.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+from ..models.result import Result
+from .database_service import DatabaseService
+from ..config.settings import settings
+
+
+class StoredResponse:
+    """Resposta guardada para uma chave de idempotência."""
+    
+    __slots__ = ('request_hash', 'status_code', 'body')
+    
+    def __init__(self, request_hash: str, status_code: int, body: str):
+        self.request_hash = request_hash
+        self.status_code = status_code
+        self.body = body
+
+
+class IdempotencyService:
+    """Serviço para guardar e reaproveitar respostas por Idempotency-Key."""
+    
+    def __init__(self, db_service: Optional[DatabaseService] = None):
+        """Inicializa o serviço com um cache LRU em memória na frente do banco."""
+        self.db_service = db_service or DatabaseService()
+        self.cache_size = settings.IDEMPOTENCY_CACHE_SIZE
+        self.ttl_hours = settings.IDEMPOTENCY_KEY_TTL_HOURS
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def create_tables(self) -> Result:
+        """Cria a tabela de chaves de idempotência."""
+        try:
+            conn_result = self.db_service._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS idempotency_keys (
+                    key TEXT PRIMARY KEY,
+                    request_hash TEXT NOT NULL,
+                    status_code INTEGER NOT NULL,
+                    response_body TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Remove chaves expiradas
+            cursor.execute(
+                "DELETE FROM idempotency_keys WHERE created_at < datetime('now', ?)",
+                (f'-{self.ttl_hours} hours',)
+            )
+            
+            conn.commit()
+            conn.close()
+            
+            return Result.success_result("Tabela de idempotência criada com sucesso!")
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao criar tabela de idempotência: {str(e)}")
+    
+    @staticmethod
+    def hash_request(path: str, body: bytes) -> str:
+        """Gera a impressão digital de uma requisição (rota + corpo)."""
+        digest = hashlib.sha256(path.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(body or b'')
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[StoredResponse]:
+        """
+        Busca a resposta guardada para uma chave.
+        
+        Consulta primeiro o cache em memória e depois o banco.
+        
+        Returns:
+            StoredResponse ou None se a chave ainda não foi usada
+        """
+        with self._lock:
+            stored = self._cache.get(key)
+            if stored is not None:
+                self._cache.move_to_end(key)
+                return stored
+        
+        conn_result = self.db_service._get_connection()
+        if not conn_result.success:
+            return None
+        
+        conn = conn_result.data
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT request_hash, status_code, response_body FROM idempotency_keys
+                WHERE key = ? AND created_at >= datetime('now', ?)
+            ''', (key, f'-{self.ttl_hours} hours'))
+            row = cursor.fetchone()
+        finally:
+            conn.close()
+        
+        if not row:
+            return None
+        
+        stored = StoredResponse(row[0], row[1], row[2])
+        self._remember(key, stored)
+        return stored
+    
+    def save(self, key: str, request_hash: str, status_code: int, body: str) -> Result:
+        """Guarda a resposta de uma requisição para futuras retentativas."""
+        try:
+            conn_result = self.db_service._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            try:
+                with conn:
+                    conn.execute('''
+                        INSERT OR REPLACE INTO idempotency_keys
+                            (key, request_hash, status_code, response_body)
+                        VALUES (?, ?, ?, ?)
+                    ''', (key, request_hash, status_code, body))
+            finally:
+                conn.close()
+            
+            self._remember(key, StoredResponse(request_hash, status_code, body))
+            return Result.success_result()
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao guardar chave de idempotência: {str(e)}")
+    
+    def _remember(self, key: str, stored: StoredResponse):
+        """Adiciona a resposta ao cache LRU, descartando a mais antiga se cheio."""
+        with self._lock:
+            self._cache[key] = stored
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
@@ -0,0 +1,159 @@
+"""
+Serviço de importação de histórico de avaliações.
+Lê arquivos CSV ou NDJSON (no mesmo formato da exportação, com ou sem gzip)
+linha a linha, valida em lotes e grava cada lote em uma única transação,
+preservando a data/hora original em created_at.
+"""
+
+import csv
+import gzip
+import json
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from ..models.result import Result
+from ..models.validation import IMPORT_VALIDATOR
+from .database_service import DatabaseService
+from .export_service import EXPORT_FORMATS, ExportService
+
+
+# Linhas validadas e gravadas por transação
+IMPORT_BATCH_SIZE = 10000
+
+# Quantas linhas rejeitadas são detalhadas no resumo (o total é sempre contado)
+IMPORT_MAX_REPORTED_ERRORS = 100
+
+# Nomes alternativos de colunas aceitos (formato do envio pela API)
+COLUMN_ALIASES = {
+    'email': 'user_email',
+    'date': 'review_date',
+}
+
+
+class ImportService:
+    """Serviço para importar avaliações históricas em lote sem carregar o arquivo em memória."""
+    
+    def __init__(self, db_service: Optional[DatabaseService] = None):
+        """Inicializa o serviço de importação."""
+        self.db_service = db_service or DatabaseService()
+    
+    def iter_records(self, stream: TextIO, import_format: str) -> Iterator[Tuple[int, Any]]:
+        """
+        Percorre os registros de um arquivo texto, um por vez.
+        
+        Yields:
+            (linha, registro): Número da linha no arquivo e o dicionário lido
+            (ou None se a linha não for um JSON válido)
+        
+        Raises:
+            ValueError: Se o formato não for suportado
+        """
+        if import_format not in EXPORT_FORMATS:
+            raise ValueError(f"Formato não suportado: {import_format} (use csv ou ndjson)")
+        
+        if import_format == 'csv':
+            reader = csv.DictReader(stream)
+            for record in reader:
+                yield reader.line_num, record
+            return
+        
+        loads = json.loads
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, loads(line)
+            except ValueError:
+                yield line_number, None
+    
+    def import_records(self, records: Iterable[Tuple[int, Any]],
+                       batch_size: int = IMPORT_BATCH_SIZE) -> Result:
+        """
+        Valida e grava registros em lotes.
+        
+        Args:
+            records: Pares (linha, registro), como os de iter_records
+            batch_size: Linhas por transação
+        
+        Returns:
+            Result: Dicionário com rows, created, duplicates, rejected,
+            errors (até IMPORT_MAX_REPORTED_ERRORS, com line e messages),
+            seconds e rows_per_second
+        """
+        summary = {'rows': 0, 'created': 0, 'duplicates': 0, 'rejected': 0, 'errors': []}
+        started = time.perf_counter()
+        validate = IMPORT_VALIDATOR.validate
+        batch: List[dict] = []
+        
+        try:
+            for line_number, record in records:
+                summary['rows'] += 1
+                
+                if isinstance(record, dict):
+                    for alias, name in COLUMN_ALIASES.items():
+                        if name not in record and alias in record:
+                            record[name] = record[alias]
+                    validation = validate(record)
+                    if validation.valid:
+                        batch.append(validation.data)
+                        if len(batch) >= batch_size:
+                            self._save_batch(batch, summary)
+                            batch = []
+                        continue
+                    messages = validation.messages()
+                else:
+                    messages = ['Linha não é um objeto JSON válido']
+                
+                summary['rejected'] += 1
+                if len(summary['errors']) < IMPORT_MAX_REPORTED_ERRORS:
+                    summary['errors'].append({'line': line_number, 'messages': messages})
+            
+            if batch:
+                self._save_batch(batch, summary)
+        
+        except Exception as e:
+            return Result.error_result(
+                f"Erro ao importar avaliações (após {summary['created']} gravadas): {str(e)}"
+            )
+        
+        seconds = time.perf_counter() - started
+        summary['seconds'] = seconds
+        summary['rows_per_second'] = summary['rows'] / seconds if seconds else 0.0
+        return Result.success_result(summary)
+    
+    def import_file(self, path: str, import_format: Optional[str] = None,
+                    batch_size: Optional[int] = None) -> Result:
+        """
+        Importa um arquivo de avaliações.
+        
+        Args:
+            path: Caminho do arquivo; formato e compressão são deduzidos da
+                extensão (.csv, .ndjson, .jsonl, com ou sem .gz)
+            import_format: 'csv' ou 'ndjson' (se a extensão não indicar)
+            batch_size: Linhas por transação (padrão: IMPORT_BATCH_SIZE)
+        
+        Returns:
+            Result: Resumo da importação (ver import_records) com path e format
+        """
+        try:
+            guessed_format, compressed = ExportService.guess_format(path)
+            import_format = import_format or guessed_format
+            opener = gzip.open if compressed else open
+            
+            with opener(path, 'rt', encoding='utf-8-sig', newline='') as stream:
+                result = self.import_records(self.iter_records(stream, import_format),
+                                             batch_size or IMPORT_BATCH_SIZE)
+            
+            if result.success:
+                result.data.update({'path': path, 'format': import_format})
+            return result
+        
+        except Exception as e:
+            return Result.error_result(f"Erro ao importar avaliações: {str(e)}")
+    
+    def _save_batch(self, batch: List[dict], summary: Dict[str, Any]):
+        """Grava um lote validado e soma o resultado no resumo."""
+        result = self.db_service.import_reviews(batch)
+        if not result.success:
+            raise RuntimeError(result.get_first_error())
+        summary['created'] += result.data['created']
+        summary['duplicates'] += result.data['duplicates']
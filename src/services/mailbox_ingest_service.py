@@ -0,0 +1,369 @@
+"""
+Serviço de ingestão em lote das avaliações respondidas por email.
+Percorre um arquivo mbox ou um diretório Maildir mensagem a mensagem,
+interpreta as mensagens em processos paralelos, descarta as repetidas pelo
+Message-ID e grava cada lote em uma única transação. Um ponto de controle
+por caixa faz com que a próxima execução leia só as mensagens novas, e as
+confirmações são enviadas todas juntas no final, em uma única conexão SMTP.
+"""
+
+import email
+import hashlib
+import mailbox
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from email.message import Message
+from email.utils import parseaddr, parsedate_to_datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from ..models.result import Result
+from ..models.review import Review
+from ..models.validation import BATCH_SUBMISSION_VALIDATOR
+from .database_service import DatabaseService
+from .confirmation_service import ConfirmationService
+from .email_processor_service import parse_email_body
+from ..config.settings import settings
+
+
+# Mensagens interpretadas e gravadas por transação
+INGEST_BATCH_SIZE = 1000
+
+# Quantas mensagens rejeitadas são detalhadas no resumo (o total é sempre contado)
+INGEST_MAX_REPORTED_ERRORS = 100
+
+# Situação de cada Message-ID já processado (tabela ingested_messages)
+STATUS_CREATED = 'created'
+STATUS_EXISTING = 'existing'
+STATUS_REJECTED = 'rejected'
+
+
+def _plain_text(message: Message) -> Optional[str]:
+    """Texto da primeira parte text/plain da mensagem (None se não houver)."""
+    for part in message.walk():
+        if part.get_content_type() == 'text/plain' and not part.is_multipart():
+            payload = part.get_payload(decode=True) or b''
+            return payload.decode(part.get_content_charset() or 'utf-8', errors='replace')
+    return None
+
+
+def _parse_message(raw: bytes) -> Tuple[str, Optional[dict], List[str]]:
+    """
+    Interpreta uma mensagem bruta (executado nos processos do pool).
+    
+    Usa o parser compat32 da biblioteca padrão, bem mais rápido que o
+    email.policy.default e suficiente para ler remetente, data e o corpo em
+    texto. O remetente vira o usuário da avaliação e a data do cabeçalho Date
+    (no fuso de quem enviou) vira o dia avaliado.
+    
+    Returns:
+        (message_id, dados, erros): Message-ID (ou um hash do conteúdo, se a
+        mensagem não tiver um), dados validados (None se rejeitada) e as
+        mensagens de erro
+    """
+    message = email.message_from_bytes(raw)
+    message_id = str(message.get('Message-ID') or '').strip()
+    if not message_id:
+        message_id = 'sha1:' + hashlib.sha1(raw).hexdigest()
+    
+    try:
+        body = _plain_text(message)
+        fields = parse_email_body(body) if body is not None else None
+        if fields is None:
+            return message_id, None, ['Campos da avaliação não encontrados no corpo']
+        
+        fields['email'] = parseaddr(str(message.get('From', '')))[1]
+        sent_at = message.get('Date')
+        fields['date'] = parsedate_to_datetime(str(sent_at)).date().isoformat() if sent_at else None
+    except Exception as e:
+        return message_id, None, [f"Mensagem ilegível: {str(e)}"]
+    
+    validation = BATCH_SUBMISSION_VALIDATOR.validate(fields)
+    if not validation.valid:
+        return message_id, None, validation.messages()
+    return message_id, validation.data, []
+
+
+class MailboxIngestService:
+    """Serviço para ingerir avaliações de caixas mbox/Maildir com ponto de controle."""
+    
+    def __init__(self, db_service: Optional[DatabaseService] = None,
+                 confirmation_service: Optional[ConfirmationService] = None):
+        """Inicializa o serviço de ingestão."""
+        self.db_service = db_service or DatabaseService()
+        self.confirmation_service = confirmation_service or ConfirmationService()
+    
+    def create_tables(self) -> Result:
+        """Cria as tabelas de Message-IDs processados e de pontos de controle."""
+        try:
+            conn_result = self.db_service._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS ingested_messages (
+                    message_id TEXT PRIMARY KEY,
+                    source TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    review_id INTEGER,
+                    ingested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS ingest_checkpoints (
+                    source TEXT PRIMARY KEY,
+                    position REAL NOT NULL,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.commit()
+            conn.close()
+            
+            return Result.success_result("Tabelas de ingestão de emails criadas com sucesso!")
+        
+        except Exception as e:
+            return Result.error_result(f"Erro ao criar tabelas de ingestão de emails: {str(e)}")
+    
+    def ingest(self, path: str, workers: Optional[int] = None,
+               batch_size: Optional[int] = None, send_confirmations: bool = True) -> Result:
+        """
+        Ingere as mensagens novas de um arquivo mbox ou diretório Maildir.
+        
+        Args:
+            path: Arquivo mbox ou diretório Maildir (com cur/ e new/)
+            workers: Processos que interpretam as mensagens (padrão:
+                MAIL_INGEST_WORKERS; 1 interpreta no próprio processo)
+            batch_size: Mensagens por transação (padrão: INGEST_BATCH_SIZE)
+            send_confirmations: Se True, confirma as avaliações gravadas aos
+                usuários (e envia o resumo ao administrador) no final, inclusive
+                quando um lote falha depois de outros já gravados
+        
+        Returns:
+            Result: Dicionário com source, messages, skipped (já processadas),
+            created, existing (usuário já tinha avaliação no dia), rejected,
+            errors (até INGEST_MAX_REPORTED_ERRORS, com message_id e messages),
+            confirmations, seconds e messages_per_second (em caso de erro, o
+            resumo parcial vai em data do Result de erro)
+        """
+        summary: Dict[str, Any] = {
+            'source': os.path.abspath(path), 'messages': 0, 'skipped': 0, 'created': 0,
+            'existing': 0, 'rejected': 0, 'errors': [], 'confirmations': {}
+        }
+        started = time.perf_counter()
+        workers = workers or settings.MAIL_INGEST_WORKERS
+        batch_size = batch_size or INGEST_BATCH_SIZE
+        reviews_by_user: Dict[str, List[Review]] = {}
+        pool = None
+        error_result = None
+        
+        try:
+            tables_result = self.create_tables()
+            if not tables_result.success:
+                return tables_result
+            
+            source = summary['source']
+            position = self._get_checkpoint(source)
+            
+            if os.path.isdir(path):
+                messages = self._iter_maildir(path, position)
+            else:
+                messages = self._iter_mbox(path, int(position))
+            
+            if workers > 1:
+                pool = ProcessPoolExecutor(max_workers=workers)
+            
+            batch: List[Tuple[float, bytes]] = []
+            for item in messages:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    self._ingest_batch(source, batch, pool, workers, summary, reviews_by_user)
+                    batch = []
+            if batch:
+                self._ingest_batch(source, batch, pool, workers, summary, reviews_by_user)
+        
+        except Exception as e:
+            error_result = Result.error_result(
+                f"Erro ao ingerir emails (após {summary['created']} avaliações gravadas): {str(e)}"
+            )
+        
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        
+        # Os lotes já gravados não são reprocessados na próxima execução, então
+        # são confirmados mesmo que um lote seguinte tenha falhado
+        if send_confirmations and reviews_by_user:
+            confirmation_result = self.confirmation_service.send_batch_confirmations(reviews_by_user)
+            if confirmation_result.data:
+                summary['confirmations'] = confirmation_result.data
+            if not confirmation_result.success:
+                summary['confirmations']['*'] = confirmation_result.get_first_error()
+        
+        seconds = time.perf_counter() - started
+        summary['seconds'] = seconds
+        summary['messages_per_second'] = summary['messages'] / seconds if seconds else 0.0
+        
+        if error_result is not None:
+            # O resumo parcial (avaliações gravadas e confirmadas) segue em data
+            error_result.data = summary
+            return error_result
+        return Result.success_result(summary)
+    
+    def _iter_mbox(self, path: str, position: int) -> Iterator[Tuple[float, bytes]]:
+        """
+        Mensagens de um mbox a partir da posição do ponto de controle.
+        
+        Yields:
+            (posição, bytes): Posição após a mensagem (quantas já foram lidas) e o conteúdo
+        """
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Caixa de email não encontrada: {path}")
+        
+        box = mailbox.mbox(path, create=False)
+        try:
+            keys = box.keys()
+            # Caixa menor que o ponto de controle: foi reescrita, relê tudo
+            # (os Message-IDs já gravados continuam evitando duplicatas)
+            if position > len(keys):
+                position = 0
+            for index in range(position, len(keys)):
+                yield index + 1, box.get_bytes(keys[index])
+        finally:
+            box.close()
+    
+    def _iter_maildir(self, path: str, position: float) -> Iterator[Tuple[float, bytes]]:
+        """
+        Mensagens de um Maildir modificadas a partir do ponto de controle, da mais antiga à mais nova.
+        
+        Arquivos com a mesma data de modificação do ponto de controle são
+        lidos de novo; o Message-ID evita gravá-los duas vezes.
+        
+        Yields:
+            (posição, bytes): Data de modificação do arquivo e o conteúdo
+        """
+        entries = []
+        for folder in ('new', 'cur'):
+            directory = os.path.join(path, folder)
+            if not os.path.isdir(directory):
+                raise FileNotFoundError(f"Diretório Maildir inválido (sem {folder}/): {path}")
+            with os.scandir(directory) as iterator:
+                for entry in iterator:
+                    if entry.name.startswith('.') or not entry.is_file():
+                        continue
+                    modified = entry.stat().st_mtime
+                    if modified >= position:
+                        entries.append((modified, entry.path))
+        
+        entries.sort()
+        for modified, file_path in entries:
+            with open(file_path, 'rb') as message_file:
+                yield modified, message_file.read()
+    
+    def _ingest_batch(self, source: str, batch: List[Tuple[float, bytes]],
+                      pool: Optional[ProcessPoolExecutor], workers: int,
+                      summary: Dict[str, Any], reviews_by_user: Dict[str, List[Review]]):
+        """Interpreta, deduplica e grava um lote de mensagens e avança o ponto de controle."""
+        raws = [raw for _, raw in batch]
+        if pool is not None:
+            chunksize = max(1, len(raws) // (workers * 4))
+            parsed = list(pool.map(_parse_message, raws, chunksize=chunksize))
+        else:
+            parsed = [_parse_message(raw) for raw in raws]
+        summary['messages'] += len(parsed)
+        
+        seen = self._get_ingested([message_id for message_id, _, _ in parsed])
+        reviews: List[Review] = []
+        review_ids: List[str] = []
+        records: List[tuple] = []
+        
+        for message_id, data, messages in parsed:
+            if message_id in seen:
+                summary['skipped'] += 1
+                continue
+            seen.add(message_id)
+            
+            if data is None:
+                summary['rejected'] += 1
+                if len(summary['errors']) < INGEST_MAX_REPORTED_ERRORS:
+                    summary['errors'].append({'message_id': message_id, 'messages': messages})
+                records.append((message_id, source, STATUS_REJECTED, None))
+                continue
+            
+            reviews.append(Review.from_validated(data))
+            review_ids.append(message_id)
+        
+        if reviews:
+            insert_result = self.db_service.insert_reviews(reviews)
+            if not insert_result.success:
+                raise RuntimeError(insert_result.get_first_error())
+            
+            for message_id, review, created in zip(review_ids, insert_result.data['reviews'],
+                                                   insert_result.data['created']):
+                if created:
+                    summary['created'] += 1
+                    reviews_by_user.setdefault(review.user_email, []).append(review)
+                else:
+                    summary['existing'] += 1
+                records.append((message_id, source,
+                                STATUS_CREATED if created else STATUS_EXISTING, review.id))
+        
+        self._save_ingested(source, records, batch[-1][0])
+    
+    def _get_checkpoint(self, source: str) -> float:
+        """Posição do ponto de controle de uma caixa (0 se ainda não foi lida)."""
+        conn_result = self.db_service._get_connection()
+        if not conn_result.success:
+            raise RuntimeError(conn_result.get_first_error())
+        
+        conn = conn_result.data
+        try:
+            row = conn.execute('SELECT position FROM ingest_checkpoints WHERE source = ?',
+                               (source,)).fetchone()
+            return row[0] if row else 0
+        finally:
+            conn.close()
+    
+    def _get_ingested(self, message_ids: List[str]) -> set:
+        """Quais dos Message-IDs já foram processados em execuções anteriores."""
+        conn_result = self.db_service._get_connection()
+        if not conn_result.success:
+            raise RuntimeError(conn_result.get_first_error())
+        
+        conn = conn_result.data
+        seen = set()
+        try:
+            # Consulta em pedaços para respeitar o limite de parâmetros do SQLite
+            for start in range(0, len(message_ids), 500):
+                chunk = message_ids[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT message_id FROM ingested_messages WHERE message_id IN "
+                    f"({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                seen.update(row[0] for row in rows)
+            return seen
+        finally:
+            conn.close()
+    
+    def _save_ingested(self, source: str, records: List[tuple], position: float):
+        """Grava os Message-IDs do lote e o novo ponto de controle em uma transação."""
+        conn_result = self.db_service._get_connection()
+        if not conn_result.success:
+            raise RuntimeError(conn_result.get_first_error())
+        
+        conn = conn_result.data
+        try:
+            with conn:
+                conn.executemany('''
+                    INSERT OR IGNORE INTO ingested_messages (message_id, source, status, review_id)
+                    VALUES (?, ?, ?, ?)
+                ''', records)
+                conn.execute('''
+                    INSERT INTO ingest_checkpoints (source, position, updated_at)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT (source) DO UPDATE SET
+                        position = excluded.position,
+                        updated_at = excluded.updated_at
+                ''', (source, position, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        finally:
+            conn.close()
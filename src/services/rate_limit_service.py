@@ -0,0 +1,100 @@
+"""
+Serviço de limite de requisições em memória (token bucket).
+Descarta excesso de requisições antes que elas cheguem ao banco e ao SMTP.
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, List
+
+
+class RateLimitService:
+    """
+    Limite por chave (IP, email...) usando token bucket.
+    
+    Cada chave tem um balde com até `capacity` fichas, reabastecido a
+    `rate` fichas por segundo. Cada requisição consome fichas; sem fichas
+    suficientes, a requisição é recusada e o tempo de espera é informado.
+    """
+    
+    def __init__(self, rate: float, capacity: float, max_keys: int = 10000):
+        """
+        Inicializa o limitador.
+        
+        Args:
+            rate: Fichas repostas por segundo
+            capacity: Tamanho máximo do balde (rajada permitida)
+            max_keys: Quantidade máxima de chaves mantidas em memória
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+    
+    def try_acquire(self, key: str, cost: float = 1) -> float:
+        """
+        Tenta consumir fichas de uma chave.
+        
+        Returns:
+            float: 0 se permitido; caso contrário, segundos até haver fichas
+        """
+        return self.try_acquire_all([key], cost)
+    
+    def try_acquire_all(self, keys: Iterable[str], cost: float = 1) -> float:
+        """
+        Consome fichas de todas as chaves, ou de nenhuma se alguma não tiver saldo.
+        
+        Returns:
+            float: 0 se permitido; caso contrário, o maior tempo de espera
+        """
+        now = time.monotonic()
+        
+        with self._lock:
+            buckets = [self._refill(key, now) for key in set(keys)]
+            
+            wait = max((self._wait_time(bucket, cost) for bucket in buckets), default=0.0)
+            if wait > 0:
+                return wait
+            
+            for bucket in buckets:
+                bucket[0] -= cost
+            
+            return 0.0
+    
+    def _refill(self, key: str, now: float) -> List[float]:
+        """Retorna o balde da chave ([fichas, último acesso]) já reabastecido."""
+        bucket = self._buckets.get(key)
+        
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._prune(now)
+            bucket = [self.capacity, now]
+            self._buckets[key] = bucket
+        else:
+            bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        
+        return bucket
+    
+    def _wait_time(self, bucket: List[float], cost: float) -> float:
+        """Segundos até o balde ter fichas suficientes para o custo."""
+        if bucket[0] >= cost:
+            return 0.0
+        if cost > self.capacity or self.rate <= 0:
+            return float('inf')
+        return (cost - bucket[0]) / self.rate
+    
+    def _prune(self, now: float):
+        """Remove baldes que já estariam cheios (chaves inativas)."""
+        full_after = self.capacity / self.rate if self.rate > 0 else float('inf')
+        
+        idle_keys = [key for key, (_, last) in self._buckets.items() if now - last >= full_after]
+        for key in idle_keys:
+            del self._buckets[key]
+        
+        # Se ainda estiver cheio, descarta as chaves acessadas há mais tempo
+        if len(self._buckets) >= self.max_keys:
+            oldest = sorted(self._buckets, key=lambda k: self._buckets[k][1])
+            for key in oldest[:len(self._buckets) - self.max_keys + 1]:
+                del self._buckets[key]
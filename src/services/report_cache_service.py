@@ -0,0 +1,199 @@
+"""
+Cache dos relatórios semanais já gerados.
+Cada relatório fica guardado com a marca d'água dos dados do histórico até o fim
+da semana (maior ID e quantidade de avaliações, já que as tendências dependem das
+semanas anteriores); enquanto os dados não mudam, retentativas e reenvios
+reaproveitam o texto e o HTML exatamente iguais.
+"""
+
+import json
+from typing import Any, Dict, Iterable, Optional
+from ..models.result import Result
+from ..models.sentiment import LEXICON_VERSION
+from .database_service import DatabaseService, ALL_USERS
+
+
+# Muda quando o formato do relatório muda, invalidando o que está em cache
+REPORT_CACHE_VERSION = 7
+
+
+class CachedReport:
+    """Relatório renderizado guardado no cache."""
+    
+    __slots__ = ('subject', 'text', 'html', 'weekly_data', 'analysis')
+    
+    def __init__(self, subject: str, text: str, html: str,
+                 weekly_data: Dict[str, Any], analysis: Dict[str, Any]):
+        self.subject = subject
+        self.text = text
+        self.html = html
+        self.weekly_data = weekly_data
+        self.analysis = analysis
+
+
+class ReportCacheService:
+    """Serviço para guardar e reaproveitar relatórios semanais renderizados."""
+    
+    def __init__(self, db_service: Optional[DatabaseService] = None):
+        """Inicializa o serviço de cache de relatórios."""
+        self.db_service = db_service or DatabaseService()
+    
+    def create_tables(self) -> Result:
+        """Cria a tabela do cache de relatórios."""
+        try:
+            conn_result = self.db_service._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS report_cache (
+                    user_email TEXT NOT NULL,
+                    week_start TEXT NOT NULL,
+                    watermark TEXT NOT NULL,
+                    subject TEXT NOT NULL,
+                    report_text TEXT NOT NULL,
+                    report_html TEXT NOT NULL,
+                    weekly_data TEXT NOT NULL,
+                    analysis TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (user_email, week_start)
+                )
+            ''')
+            conn.commit()
+            conn.close()
+            
+            return Result.success_result("Tabela de cache de relatórios criada com sucesso!")
+        
+        except Exception as e:
+            return Result.error_result(f"Erro ao criar tabela de cache de relatórios: {str(e)}")
+    
+    @staticmethod
+    def _watermark(max_id: Optional[int], count: int) -> str:
+        """Marca d'água dos dados: versões do formato e do léxico, maior ID e quantidade de avaliações."""
+        return f"{REPORT_CACHE_VERSION}.{LEXICON_VERSION}:{max_id or 0}:{count}"
+    
+    def get_watermark(self, start_date: str, end_date: str, user_email: Optional[str] = None) -> Result:
+        """
+        Marca d'água das avaliações até o fim do período (de um usuário ou de todos).
+        
+        Inclui as semanas anteriores a start_date porque as tendências do
+        relatório dependem delas.
+        """
+        try:
+            where, params = self.db_service._build_filters(None, end_date, user_email)
+            
+            conn_result = self.db_service._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            try:
+                row = conn.execute(f'SELECT MAX(id), COUNT(*) FROM reviews {where}', params).fetchone()
+            finally:
+                conn.close()
+            
+            return Result.success_result(self._watermark(row[0], row[1]))
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao calcular marca d'água: {str(e)}")
+    
+    def get_watermarks_by_user(self, start_date: str, end_date: str) -> Result:
+        """Marcas d'água até o fim do período de todos os usuários com avaliações no período."""
+        try:
+            conn_result = self.db_service._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            try:
+                cursor = conn.execute('''
+                    SELECT user_email, MAX(id), COUNT(*) FROM reviews
+                    WHERE review_date <= ? AND user_email IS NOT NULL
+                    GROUP BY user_email
+                    HAVING MAX(review_date) >= ?
+                ''', (end_date, start_date))
+                watermarks = {row[0]: self._watermark(row[1], row[2]) for row in cursor}
+            finally:
+                conn.close()
+            
+            return Result.success_result(watermarks)
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao calcular marcas d'água: {str(e)}")
+    
+    def get_many(self, week_start: str, watermarks: Dict[str, str]) -> Dict[str, CachedReport]:
+        """
+        Busca os relatórios em cache da semana cuja marca d'água ainda é a atual.
+        
+        Args:
+            week_start: Início da semana do relatório
+            watermarks: Marca d'água atual por usuário ('' = todos os usuários)
+        
+        Returns:
+            Dict: Usuário -> CachedReport (só os acertos)
+        """
+        if not watermarks:
+            return {}
+        
+        conn_result = self.db_service._get_connection()
+        if not conn_result.success:
+            return {}
+        
+        conn = conn_result.data
+        try:
+            cursor = conn.execute('''
+                SELECT user_email, watermark, subject, report_text, report_html, weekly_data, analysis
+                FROM report_cache WHERE week_start = ?
+            ''', (week_start,))
+            
+            return {
+                row[0]: CachedReport(row[2], row[3], row[4], json.loads(row[5]), json.loads(row[6]))
+                for row in cursor
+                if watermarks.get(row[0]) == row[1]
+            }
+        finally:
+            conn.close()
+    
+    def get(self, user_email: Optional[str], week_start: str, watermark: str) -> Optional[CachedReport]:
+        """Relatório em cache do usuário na semana, se a marca d'água for a atual."""
+        key = user_email or ALL_USERS
+        return self.get_many(week_start, {key: watermark}).get(key)
+    
+    def save(self, entries: Iterable[tuple]) -> Result:
+        """
+        Guarda relatórios renderizados, substituindo versões anteriores.
+        
+        Args:
+            entries: Tuplas (user_email, week_start, watermark, CachedReport)
+        """
+        try:
+            conn_result = self.db_service._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            try:
+                with conn:
+                    conn.executemany('''
+                        INSERT OR REPLACE INTO report_cache (
+                            user_email, week_start, watermark, subject,
+                            report_text, report_html, weekly_data, analysis
+                        )
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', [
+                        (
+                            user_email or ALL_USERS, week_start, watermark, report.subject,
+                            report.text, report.html,
+                            json.dumps(report.weekly_data, ensure_ascii=False),
+                            json.dumps(report.analysis, ensure_ascii=False)
+                        )
+                        for user_email, week_start, watermark, report in entries
+                    ])
+            finally:
+                conn.close()
+            
+            return Result.success_result()
+        
+        except Exception as e:
+            return Result.error_result(f"Erro ao guardar relatório em cache: {str(e)}")
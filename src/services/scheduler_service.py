@@ -0,0 +1,346 @@
+"""
+Agendador em processo das tarefas automáticas (formulário diário e relatório semanal).
+Roda como um processo contínuo no lugar das execuções separadas do GitHub
+Actions: os serviços são criados uma vez e reaproveitados a cada horário. O
+último horário de cada tarefa fica gravado no banco, então horários perdidos
+durante um reinício são recuperados, e cada horário é reservado antes de rodar,
+então uma tarefa nunca roda duas vezes para o mesmo horário (nem com dois
+processos usando o mesmo banco).
+"""
+
+import threading
+from datetime import datetime, timedelta
+from datetime import time as day_time
+from typing import Callable, Dict, List, Optional, Tuple
+from ..models.result import Result
+from .database_service import DatabaseService
+from .daily_form_sender import DailyFormService
+from .weekly_report_service import WeeklyReportService
+from ..config.settings import settings
+
+
+# Nomes dos dias aceitos na configuração (na ordem de date.weekday())
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+
+# Formato do horário gravado em scheduler_runs (ordenável como texto)
+SLOT_FORMAT = '%Y-%m-%d %H:%M'
+
+# Situação da última execução de cada tarefa
+STATUS_RUNNING = 'running'
+STATUS_SUCCESS = 'success'
+STATUS_ERROR = 'error'
+
+
+def parse_days(text: str) -> Tuple[int, ...]:
+    """
+    Converte 'monday,wednesday,friday' nos números de date.weekday().
+    
+    Raises:
+        ValueError: Se algum dia não for reconhecido
+    """
+    days = []
+    for name in text.split(','):
+        name = name.strip().lower()
+        if name not in WEEKDAYS:
+            raise ValueError(f"Dia da semana inválido: '{name}' (use {', '.join(WEEKDAYS)})")
+        days.append(WEEKDAYS.index(name))
+    return tuple(sorted(set(days)))
+
+
+def parse_time(text: str) -> day_time:
+    """
+    Converte 'HH:MM' em horário.
+    
+    Raises:
+        ValueError: Se o horário não estiver no formato HH:MM
+    """
+    try:
+        return datetime.strptime(text.strip(), '%H:%M').time()
+    except ValueError:
+        raise ValueError(f"Horário inválido: '{text}' (use HH:MM)")
+
+
+class ScheduledJob:
+    """Tarefa executada em alguns dias da semana, em um horário fixo (hora local)."""
+    
+    __slots__ = ('name', 'days', 'at', 'action')
+    
+    def __init__(self, name: str, days: Tuple[int, ...], at: day_time,
+                 action: Callable[[datetime], Result]):
+        self.name = name
+        self.days = days
+        self.at = at
+        self.action = action
+    
+    def latest_slot(self, now: datetime) -> Optional[datetime]:
+        """Horário mais recente da tarefa até now (None se não houver dias configurados)."""
+        for days_back in range(8):
+            day = now.date() - timedelta(days=days_back)
+            if day.weekday() in self.days:
+                slot = datetime.combine(day, self.at)
+                if slot <= now:
+                    return slot
+        return None
+    
+    def describe(self) -> str:
+        """Dias e horário da tarefa, para exibir."""
+        return f"{', '.join(WEEKDAYS[day] for day in self.days)} às {self.at.strftime('%H:%M')}"
+
+
+class SchedulerService:
+    """Serviço que executa as tarefas automáticas nos horários configurados."""
+    
+    def __init__(self, db_service: Optional[DatabaseService] = None,
+                 daily_form_service: Optional[DailyFormService] = None,
+                 weekly_report_service: Optional[WeeklyReportService] = None):
+        """
+        Inicializa o agendador com as tarefas da configuração.
+        
+        Raises:
+            ValueError: Se os dias ou horários configurados forem inválidos
+        """
+        self.db_service = db_service or DatabaseService()
+        self.daily_form_service = daily_form_service or DailyFormService()
+        self.weekly_report_service = weekly_report_service or WeeklyReportService(db_service=self.db_service)
+        
+        self.jobs: Dict[str, ScheduledJob] = {
+            'daily_form': ScheduledJob(
+                'daily_form', parse_days(settings.SCHEDULER_DAILY_FORM_DAYS),
+                parse_time(settings.SCHEDULER_DAILY_FORM_TIME), self._run_daily_form
+            ),
+            'weekly_report': ScheduledJob(
+                'weekly_report', parse_days(settings.SCHEDULER_WEEKLY_REPORT_DAYS),
+                parse_time(settings.SCHEDULER_WEEKLY_REPORT_TIME), self._run_weekly_report
+            ),
+        }
+        self._stop_event = threading.Event()
+    
+    def create_tables(self) -> Result:
+        """Cria a tabela com a última execução de cada tarefa."""
+        try:
+            conn_result = self.db_service._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS scheduler_runs (
+                    job TEXT PRIMARY KEY,
+                    slot TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    error TEXT,
+                    started_at TIMESTAMP,
+                    finished_at TIMESTAMP
+                )
+            ''')
+            conn.commit()
+            conn.close()
+            
+            return Result.success_result("Tabela do agendador criada com sucesso!")
+        
+        except Exception as e:
+            return Result.error_result(f"Erro ao criar tabela do agendador: {str(e)}")
+    
+    def run_job(self, name: str, now: Optional[datetime] = None) -> Optional[Result]:
+        """
+        Executa uma tarefa se o horário mais recente dela ainda não rodou.
+        
+        Horários mais antigos que SCHEDULER_CATCHUP_HOURS são ignorados (um
+        formulário de dias atrás não serve mais). O horário é reservado no
+        banco antes da execução; se já estava reservado, nada é executado.
+        
+        Returns:
+            Result da tarefa, ou None se não havia nada para executar
+        """
+        job = self.jobs[name]
+        now = now or datetime.now()
+        
+        slot = job.latest_slot(now)
+        if slot is None or now - slot > timedelta(hours=settings.SCHEDULER_CATCHUP_HOURS):
+            return None
+        
+        claim_result = self._claim(name, slot)
+        if not claim_result.success:
+            print(f"❌ {claim_result.get_first_error()}")
+            return claim_result
+        if not claim_result.data:
+            return None
+        
+        late = " (recuperando horário perdido)" if now - slot > timedelta(minutes=5) else ""
+        print(f"⏰ {datetime.now():%d/%m/%Y %H:%M} - executando {name} "
+              f"do horário {slot:%d/%m/%Y %H:%M}{late}")
+        
+        try:
+            result = job.action(slot)
+        except Exception as e:
+            result = Result.error_result(f"Erro ao executar {name}: {str(e)}")
+        
+        finish_result = self._finish(name, slot, result)
+        if not finish_result.success:
+            print(f"⚠️ {finish_result.get_first_error()}")
+        
+        if result.success:
+            print(f"✅ {name} concluído")
+        else:
+            print(f"❌ {name} falhou: {result.get_first_error()}")
+        return result
+    
+    def run_due(self, now: Optional[datetime] = None) -> Dict[str, Optional[Result]]:
+        """Executa todas as tarefas com horário pendente (usado na inicialização)."""
+        return {name: self.run_job(name, now) for name in self.jobs}
+    
+    def run_forever(self, poll_seconds: int = 60):
+        """
+        Recupera os horários perdidos e passa a executar as tarefas nos horários.
+        
+        Roda até stop() ser chamado (ou o processo ser interrompido).
+        """
+        import schedule
+        
+        scheduler = schedule.Scheduler()
+        for name, job in self.jobs.items():
+            for day in job.days:
+                getattr(scheduler.every(), WEEKDAYS[day]).at(job.at.strftime('%H:%M')).do(self.run_job, name)
+            print(f"📅 {name}: {job.describe()}")
+        
+        self.run_due()
+        
+        while not self._stop_event.is_set():
+            scheduler.run_pending()
+            idle = scheduler.idle_seconds
+            self._stop_event.wait(max(1, min(idle if idle is not None else poll_seconds, poll_seconds)))
+    
+    def stop(self):
+        """Faz run_forever terminar (pode ser chamado de um tratador de sinal)."""
+        self._stop_event.set()
+    
+    def get_status(self) -> Result:
+        """
+        Última execução de cada tarefa.
+        
+        Returns:
+            Result: Lista de dicionários com job, schedule, slot, status, error,
+            started_at, finished_at e next_slot
+        """
+        try:
+            conn_result = self.db_service._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            try:
+                rows = conn.execute('''
+                    SELECT job, slot, status, error, started_at, finished_at FROM scheduler_runs
+                ''').fetchall()
+            finally:
+                conn.close()
+            
+            runs = {row[0]: row for row in rows}
+            now = datetime.now()
+            status: List[dict] = []
+            for name, job in self.jobs.items():
+                run = runs.get(name, (name, None, None, None, None, None))
+                status.append({
+                    'job': name,
+                    'schedule': job.describe(),
+                    'slot': run[1],
+                    'status': run[2],
+                    'error': run[3],
+                    'started_at': run[4],
+                    'finished_at': run[5],
+                    'next_slot': self._next_slot(job, now).strftime(SLOT_FORMAT)
+                })
+            
+            return Result.success_result(status)
+        
+        except Exception as e:
+            return Result.error_result(f"Erro ao consultar execuções do agendador: {str(e)}")
+    
+    def _next_slot(self, job: ScheduledJob, now: datetime) -> datetime:
+        """Próximo horário da tarefa depois de now."""
+        for days_ahead in range(8):
+            day = now.date() + timedelta(days=days_ahead)
+            if day.weekday() in job.days:
+                slot = datetime.combine(day, job.at)
+                if slot > now:
+                    return slot
+        return datetime.combine(now.date() + timedelta(days=7), job.at)
+    
+    def _claim(self, name: str, slot: datetime) -> Result:
+        """
+        Reserva o horário de uma tarefa em uma única escrita atômica.
+        
+        Returns:
+            Result: True se o horário foi reservado agora, False se já tinha
+            sido reservado (por esta ou outra execução)
+        """
+        try:
+            conn_result = self.db_service._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            try:
+                with conn:
+                    cursor = conn.execute('''
+                        INSERT INTO scheduler_runs (job, slot, status, started_at)
+                        VALUES (?, ?, ?, ?)
+                        ON CONFLICT (job) DO UPDATE SET
+                            slot = excluded.slot,
+                            status = excluded.status,
+                            error = NULL,
+                            started_at = excluded.started_at,
+                            finished_at = NULL
+                        WHERE scheduler_runs.slot < excluded.slot
+                    ''', (name, slot.strftime(SLOT_FORMAT), STATUS_RUNNING,
+                          datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+                    claimed = cursor.rowcount == 1
+            finally:
+                conn.close()
+            
+            return Result.success_result(claimed)
+        
+        except Exception as e:
+            return Result.error_result(f"Erro ao reservar horário de {name}: {str(e)}")
+    
+    def _finish(self, name: str, slot: datetime, result: Result) -> Result:
+        """Grava o resultado da execução de um horário."""
+        try:
+            conn_result = self.db_service._get_connection()
+            if not conn_result.success:
+                return conn_result
+            
+            conn = conn_result.data
+            try:
+                with conn:
+                    conn.execute('''
+                        UPDATE scheduler_runs SET status = ?, error = ?, finished_at = ?
+                        WHERE job = ? AND slot = ?
+                    ''', (STATUS_SUCCESS if result.success else STATUS_ERROR,
+                          None if result.success else result.get_first_error(),
+                          datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                          name, slot.strftime(SLOT_FORMAT)))
+            finally:
+                conn.close()
+            
+            return Result.success_result()
+        
+        except Exception as e:
+            return Result.error_result(f"Erro ao gravar execução de {name}: {str(e)}")
+    
+    def _run_daily_form(self, slot: datetime) -> Result:
+        """Envia o formulário diário (os dias já vêm da configuração do agendador)."""
+        if not settings.DAILY_FORM_EMAIL:
+            return Result.error_result("DAILY_FORM_EMAIL não configurado")
+        return self.daily_form_service.send_daily_form(settings.DAILY_FORM_EMAIL)
+    
+    def _run_weekly_report(self, slot: datetime) -> Result:
+        """Envia o relatório da semana que termina no dia do horário."""
+        if settings.SCHEDULER_WEEKLY_ALL_USERS:
+            return self.weekly_report_service.send_weekly_reports_to_all_users(
+                end_date=slot.date().isoformat()
+            )
+        
+        if not settings.WEEKLY_REPORT_EMAIL:
+            return Result.error_result("WEEKLY_REPORT_EMAIL não configurado")
+        return self.weekly_report_service.schedule_weekly_report(settings.WEEKLY_REPORT_EMAIL)
@@ -3,24 +3,123 @@ Serviço para geração de relatórios semanais automáticos.
 Combina dados estatísticos com análise de IA para criar relatórios personalizados.
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Dict, Any, List, Optional, Tuple
 from ..models.result import Result
 from ..models.review import Review
+from ..models.running_stats import ReviewAccumulator
 from .database_service import DatabaseService
 from .email_service import EmailService
 from .ai_analysis_service import AIAnalysisService
+from .report_cache_service import CachedReport, ReportCacheService
 from ..config.settings import settings
 
 
+_worker_ai_service = None
+_worker_db_service = None
+
+
+def _report_week(day: date) -> Tuple[str, str]:
+    """
+    Semana ISO (segunda a domingo) do relatório que contém o dia.
+    
+    É a mesma semana dos acumuladores, histogramas e termos, então todas as
+    seções do relatório cobrem exatamente o mesmo período.
+    """
+    monday = day - timedelta(days=day.weekday())
+    return monday.isoformat(), (monday + timedelta(days=6)).isoformat()
+
+
+def _init_worker(db_path: str):
+    """Cria os serviços usados por _analyze_week (um por processo do backfill)."""
+    global _worker_ai_service, _worker_db_service
+    _worker_ai_service = AIAnalysisService()
+    _worker_db_service = DatabaseService()
+    _worker_db_service.db_path = db_path
+
+
+def _analyze_week(task: Tuple[str, str, tuple]) -> Dict[str, Any]:
+    """
+    Gera estatísticas e análise de uma semana (executado nos processos do backfill).
+    
+    Args:
+        task: (user_email, week_start, linha do acumulador da semana)
+    """
+    user_email, week_start, row = task
+    stats = ReviewAccumulator.from_row(row)
+    weekly_data = stats.to_dict()
+    
+    week_end = (date.fromisoformat(week_start) + timedelta(days=6)).isoformat()
+    themes_result = _worker_db_service.get_top_terms(week_start, week_end, user_email, limit=3)
+    if not themes_result.success:
+        raise RuntimeError(themes_result.get_first_error())
+    
+    sentiment_result = _worker_db_service.get_sentiment_stats(week_start, week_end, user_email)
+    if not sentiment_result.success:
+        raise RuntimeError(sentiment_result.get_first_error())
+    
+    analysis_result = _worker_ai_service.analyze_weekly_stats(
+        stats, weekly_data, seed=f"{user_email}|{week_start}",
+        themes=themes_result.data, sentiment=sentiment_result.data
+    )
+    if not analysis_result.success:
+        raise RuntimeError(analysis_result.get_first_error())
+    
+    return {
+        'user_email': user_email,
+        'week_start': week_start,
+        'weekly_data': weekly_data,
+        'analysis': analysis_result.data
+    }
+
+
 class WeeklyReportService:
     """Serviço para geração e envio de relatórios semanais."""
     
-    def __init__(self):
-        """Inicializa o serviço de relatório semanal."""
-        self.db_service = DatabaseService()
-        self.email_service = EmailService()
-        self.ai_service = AIAnalysisService()
+    def __init__(self, db_service: Optional[DatabaseService] = None,
+                 email_service: Optional[EmailService] = None,
+                 ai_service: Optional[AIAnalysisService] = None):
+        """
+        Inicializa o serviço de relatório semanal.
+        
+        Os serviços não informados só são criados no primeiro uso.
+        """
+        self._db_service = db_service
+        self._email_service = email_service
+        self._ai_service = ai_service
+        self._report_cache = None
+    
+    @property
+    def db_service(self) -> DatabaseService:
+        """Serviço de banco de dados (criado no primeiro uso)."""
+        if self._db_service is None:
+            self._db_service = DatabaseService()
+        return self._db_service
+    
+    @property
+    def email_service(self) -> EmailService:
+        """Serviço de email (criado no primeiro uso)."""
+        if self._email_service is None:
+            self._email_service = EmailService()
+        return self._email_service
+    
+    @property
+    def ai_service(self) -> AIAnalysisService:
+        """Serviço de análise (criado no primeiro uso)."""
+        if self._ai_service is None:
+            self._ai_service = AIAnalysisService()
+        return self._ai_service
+    
+    @property
+    def report_cache(self) -> ReportCacheService:
+        """Cache dos relatórios renderizados (tabela criada no primeiro uso)."""
+        if self._report_cache is None:
+            cache = ReportCacheService(self.db_service)
+            cache.create_tables()
+            self._report_cache = cache
+        return self._report_cache
     
     def generate_weekly_report(self, target_email: Optional[str] = None) -> Result:
         """
@@ -35,41 +134,47 @@ class WeeklyReportService:
         try:
             print("📊 Gerando relatório semanal...")
             
-            # 1. Busca dados da semana
-            weekly_data_result = self.db_service.get_weekly_average()
-            if not weekly_data_result.success:
-                return weekly_data_result
+            week_start, week_end = _report_week(date.today())
             
-            weekly_data = weekly_data_result.data
+            # 1. Estatísticas da semana a partir dos acumuladores (sem reler avaliações)
+            stats_result = self.db_service.get_rollup_stats(week_start, week_end)
+            if not stats_result.success:
+                return stats_result
             
-            # 2. Busca avaliações da semana para análise
-            reviews_result = self._get_weekly_reviews()
-            if not reviews_result.success:
-                return reviews_result
+            stats = stats_result.data
+            print(f"📊 Encontradas {stats.count} avaliações na semana")
             
-            reviews = reviews_result.data
-            
-            # 2.1. Verifica se há avaliações na semana
-            if not reviews or len(reviews) == 0:
+            # 2. Verifica se há avaliações na semana
+            if not stats.count:
                 print("⚠️  Nenhuma avaliação encontrada na semana")
                 if target_email:
                     return self._send_no_data_email(target_email)
                 else:
                     return Result.success_result({
                         'message': 'Nenhuma avaliação encontrada na semana',
-                        'weekly_data': weekly_data,
+                        'weekly_data': stats.to_dict(),
                         'reviews_count': 0
                     })
             
-            # 3. Gera análise com IA
-            analysis_result = self.ai_service.analyze_weekly_data(weekly_data, reviews)
-            if not analysis_result.success:
-                return analysis_result
+            # 3. Reaproveita o relatório se os dados da semana não mudaram
+            watermark_result = self.report_cache.get_watermark(week_start, week_end)
+            if not watermark_result.success:
+                return watermark_result
+            watermark = watermark_result.data
             
-            analysis = analysis_result.data
+            report = self.report_cache.get(None, week_start, watermark)
+            cached = report is not None
             
-            # 4. Cria o relatório completo
-            report = self._create_complete_report(weekly_data, analysis)
+            # 4. Senão, gera análise e relatório e guarda no cache
+            if not cached:
+                render_result = self._render_report(None, week_start, stats)
+                if not render_result.success:
+                    return render_result
+                
+                report = render_result.data
+                self.report_cache.save([(None, week_start, watermark, report)])
+            else:
+                print("♻️  Relatório da semana reaproveitado do cache")
             
             # 5. Envia por email se solicitado
             if target_email:
@@ -78,38 +183,329 @@ class WeeklyReportService:
                     return email_result
             
             return Result.success_result({
-                'report': report,
-                'weekly_data': weekly_data,
-                'analysis': analysis,
-                'email_sent': target_email is not None
+                'report': report.text,
+                'weekly_data': report.weekly_data,
+                'analysis': report.analysis,
+                'email_sent': target_email is not None,
+                'cached': cached
             })
             
         except Exception as e:
             return Result.error_result(f"Erro ao gerar relatório semanal: {str(e)}")
     
-    def _get_weekly_reviews(self) -> Result:
-        """Busca avaliações da última semana."""
+    def send_weekly_reports_to_all_users(self, end_date: Optional[str] = None,
+                                         workers: Optional[int] = None,
+                                         batch_size: Optional[int] = None) -> Result:
+        """
+        Gera e envia o relatório semanal de todos os usuários com avaliações na semana.
+        
+        As estatísticas de todos vêm de uma única consulta agrupada; as análises
+        rodam em um pool de threads e os relatórios prontos são enviados em lotes
+        por uma única conexão SMTP. Cada lote entregue é registrado, então uma
+        execução interrompida pode ser repetida e só envia aos que faltam.
+        
+        Args:
+            end_date: Um dia da semana ISO do relatório (padrão: hoje)
+            workers: Threads de análise (padrão: WEEKLY_REPORT_WORKERS)
+            batch_size: Emails por conexão SMTP (padrão: WEEKLY_REPORT_EMAIL_BATCH)
+            
+        Returns:
+            Result: Resumo com total de usuários, enviados, já enviados e falhas
+        """
         try:
-            # Calcula data de uma semana atrás
-            end_date = datetime.now().strftime('%Y-%m-%d')
-            start_date = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+            workers = workers or settings.WEEKLY_REPORT_WORKERS
+            batch_size = batch_size or settings.WEEKLY_REPORT_EMAIL_BATCH
             
-            print(f"📅 Buscando avaliações de {start_date} até {end_date}")
+            end = date.fromisoformat(end_date) if end_date else date.today()
+            week_start, week_end = _report_week(end)
             
-            # Tenta buscar por período, se não conseguir, busca todas
-            result = self.db_service.get_reviews_by_date_range(start_date, end_date)
-            if not result.success:
-                # Se falhar, busca todas as avaliações
-                print("⚠️  Buscando todas as avaliações (fallback)")
-                result = self.db_service.get_all_reviews()
+            tables_result = self.db_service.create_tables()
+            if not tables_result.success:
+                return tables_result
+            
+            # 1. Estatísticas de todos os usuários (uma consulta)
+            stats_result = self.db_service.get_weekly_stats_by_user(week_start, week_end)
+            if not stats_result.success:
+                return stats_result
+            stats_by_user = stats_result.data
+            
+            # 2. Ignora quem já recebeu o relatório desta semana (retomada)
+            delivered_result = self.db_service.get_delivered_weekly_reports(week_start)
+            if not delivered_result.success:
+                return delivered_result
+            delivered = delivered_result.data
+            
+            pending = sorted(email for email in stats_by_user if email not in delivered)
+            total = len(pending)
+            
+            # Relatórios em cache cujos dados não mudaram desde a última execução
+            watermarks_result = self.report_cache.get_watermarks_by_user(week_start, week_end)
+            if not watermarks_result.success:
+                return watermarks_result
+            watermarks = watermarks_result.data
+            cached = self.report_cache.get_many(week_start, {email: watermarks[email] for email in pending})
+            print(f"📊 Semana de {week_start} a {week_end}: {len(stats_by_user)} usuários, "
+                  f"{len(stats_by_user) - total} já receberam, {total} pendentes")
+            
+            summary = {
+                'week_start': week_start,
+                'total_users': len(stats_by_user),
+                'already_sent': len(stats_by_user) - total,
+                'sent': 0,
+                'failed': {}
+            }
+            
+            # 3. Seções do relatório (tendências, temas, sentimento, correlações e
+            # distribuição) de todos os usuários sem relatório em cache, uma
+            # consulta agrupada por seção
+            to_render = [email for email in pending if email not in cached]
+            sections_result = self._get_report_sections_by_user(to_render, week_start)
+            if not sections_result.success:
+                return sections_result
+            sections = sections_result.data
+            
+            def render(email):
+                return self._render_user_report(email, week_start, stats_by_user[email],
+                                                cached.get(email), sections.get(email))
+            
+            # 4. Análises no pool, um lote à frente dos envios: uma falha de envio
+            # não espera a análise de todos os usuários restantes
+            batches = (pending[start:start + batch_size] for start in range(0, total, batch_size))
+            pool = ThreadPoolExecutor(max_workers=workers)
+            try:
+                futures = [pool.submit(render, email) for email in next(batches, [])]
+                processed = 0
+                while futures:
+                    next_futures = [pool.submit(render, email) for email in next(batches, [])]
+                    batch = [future.result() for future in futures]
+                    futures = next_futures
+                    
+                    messages = []
+                    new_reports = []
+                    for email, report, error in batch:
+                        if error:
+                            summary['failed'][email] = error
+                            continue
+                        messages.append((email, report.subject, report.html))
+                        if email not in cached:
+                            new_reports.append((email, week_start, watermarks[email], report))
+                    
+                    self.report_cache.save(new_reports)
+                    
+                    # 5. Envio em lote e registro dos entregues
+                    send_result = self.email_service.send_bulk_emails(messages)
+                    outcomes = send_result.data or {}
+                    
+                    sent = [email for email, error in outcomes.items() if error is None]
+                    summary['failed'].update(
+                        (email, error) for email, error in outcomes.items() if error
+                    )
+                    
+                    # Registra os entregues mesmo se o lote falhou no meio,
+                    # para que a retomada não reenvie a quem já recebeu
+                    mark_result = self.db_service.mark_weekly_reports_delivered(week_start, sent)
+                    if not send_result.success:
+                        return send_result
+                    if not mark_result.success:
+                        return mark_result
+                    
+                    summary['sent'] += len(sent)
+                    processed += len(batch)
+                    print(f"📤 {processed}/{total} processados ({summary['sent']} enviados, "
+                          f"{len(summary['failed'])} falhas)")
+            finally:
+                # Numa saída antecipada, as análises ainda não iniciadas são canceladas
+                pool.shutdown(cancel_futures=True)
+            
+            return Result.success_result(summary)
+            
+        except Exception as e:
+            return Result.error_result(f"Erro ao enviar relatórios semanais: {str(e)}")
+    
+    def backfill_weekly_reports(self, per_user: bool = False, workers: Optional[int] = None,
+                                batch_size: int = 500) -> Result:
+        """
+        Calcula e grava em weekly_reports o relatório de todas as semanas ISO do histórico.
+        
+        As estatísticas de cada semana vêm dos acumuladores (review_rollups) e
+        as análises são geradas em um pool de processos. Rodar de novo substitui
+        os relatórios já gravados.
+        
+        Args:
+            per_user: Se True, um relatório por usuário e semana; senão, um por
+                semana somando todos os usuários
+            workers: Processos do pool (padrão: REPORT_BACKFILL_WORKERS; 1 = sem pool)
+            batch_size: Relatórios gravados por transação
+            
+        Returns:
+            Result: Resumo com quantidade de semanas e relatórios gravados
+        """
+        try:
+            workers = workers or settings.REPORT_BACKFILL_WORKERS
+            
+            tables_result = self.db_service.create_tables()
+            if not tables_result.success:
+                return tables_result
+            
+            weeks_result = self.db_service.get_week_rollups(per_user)
+            if not weeks_result.success:
+                return weeks_result
+            weeks = weeks_result.data
+            total = len(weeks)
+            
+            print(f"📚 {total} semanas para calcular ({'por usuário' if per_user else 'todos os usuários'}, "
+                  f"{workers} processos)")
+            
+            if workers > 1 and total > 1:
+                pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                           initargs=(self.db_service.db_path,))
+                reports = pool.map(_analyze_week, weeks, chunksize=max(1, min(256, total // (workers * 4))))
+            else:
+                pool = None
+                _init_worker(self.db_service.db_path)
+                reports = map(_analyze_week, weeks)
             
-            reviews = result.data if result.success else []
-            print(f"📊 Encontradas {len(reviews)} avaliações na semana")
+            saved = 0
+            try:
+                while True:
+                    batch = list(islice(reports, batch_size))
+                    if not batch:
+                        break
+                    
+                    save_result = self.db_service.save_weekly_reports(batch)
+                    if not save_result.success:
+                        return save_result
+                    
+                    saved += len(batch)
+                    print(f"💾 {saved}/{total} relatórios gravados")
+            finally:
+                if pool is not None:
+                    pool.shutdown(cancel_futures=True)
             
-            return Result.success_result(reviews)
+            users = {user_email for user_email, _, _ in weeks}
+            return Result.success_result({
+                'weeks': len({week for _, week, _ in weeks}),
+                'users': len(users) if per_user else None,
+                'reports_saved': saved
+            })
             
         except Exception as e:
-            return Result.error_result(f"Erro ao buscar avaliações da semana: {str(e)}")
+            return Result.error_result(f"Erro no backfill de relatórios: {str(e)}")
+    
+    def _render_user_report(self, email: str, week_start: str, stats: ReviewAccumulator,
+                            cached: Optional[CachedReport] = None,
+                            sections: Optional[Dict[str, Any]] = None) -> Tuple[str, Optional[CachedReport], Optional[str]]:
+        """Relatório de um usuário: o do cache, se houver, ou um novo; retorna (email, relatório, erro)."""
+        if cached is not None:
+            return email, cached, None
+        
+        render_result = self._render_report(email, week_start, stats, sections)
+        if not render_result.success:
+            return email, None, render_result.get_first_error()
+        return email, render_result.data, None
+    
+    def _correlation_start(self, week_start: str) -> str:
+        """Início do período das correlações: as últimas REPORT_CORRELATION_WEEKS semanas."""
+        weeks_back = timedelta(weeks=settings.REPORT_CORRELATION_WEEKS - 1)
+        return (date.fromisoformat(week_start) - weeks_back).isoformat()
+    
+    def _get_report_sections(self, user_email: Optional[str], week_start: str) -> Result:
+        """
+        Seções do relatório de um usuário (ou de todos, com None) na semana.
+        
+        As tendências das semanas anteriores vêm de uma consulta com funções
+        de janela sobre os acumuladores semanais; os temas e o sentimento, do
+        índice de termos e das notas de sentimento já calculadas na gravação
+        dos comentários; as correlações entre as áreas, dos co-momentos das
+        últimas REPORT_CORRELATION_WEEKS semanas; medianas e dias bons, dos
+        histogramas semanais das notas.
+        
+        Returns:
+            Result: Dicionário com trends, themes, sentiment, correlations e distribution
+        """
+        week_end = (date.fromisoformat(week_start) + timedelta(days=6)).isoformat()
+        queries = {
+            'trends': lambda: self.db_service.get_weekly_trends(user_email, week_end),
+            'themes': lambda: self.db_service.get_top_terms(week_start, week_end, user_email, limit=3),
+            'sentiment': lambda: self.db_service.get_sentiment_stats(week_start, week_end, user_email),
+            'correlations': lambda: self.db_service.get_area_correlations(
+                self._correlation_start(week_start), week_end, user_email
+            ),
+            'distribution': lambda: self.db_service.get_score_distribution(week_start, week_end, user_email),
+        }
+        
+        sections = {}
+        for name, query in queries.items():
+            result = query()
+            if not result.success:
+                return result
+            sections[name] = result.data
+        
+        return Result.success_result(sections)
+    
+    def _get_report_sections_by_user(self, user_emails: List[str], week_start: str) -> Result:
+        """
+        Seções do relatório de vários usuários na semana, com uma consulta
+        agrupada por seção (ver _get_report_sections).
+        
+        Returns:
+            Result: Dicionário email -> seções
+        """
+        if not user_emails:
+            return Result.success_result({})
+        
+        week_end = (date.fromisoformat(week_start) + timedelta(days=6)).isoformat()
+        queries = {
+            'trends': lambda: self.db_service.get_weekly_trends_by_user(user_emails, week_end),
+            'themes': lambda: self.db_service.get_top_terms_by_user(user_emails, week_start, week_end, limit=3),
+            'sentiment': lambda: self.db_service.get_sentiment_stats_by_user(user_emails, week_start, week_end),
+            'correlations': lambda: self.db_service.get_area_correlations_by_user(
+                user_emails, self._correlation_start(week_start), week_end
+            ),
+            'distribution': lambda: self.db_service.get_score_distribution_by_user(
+                user_emails, week_start, week_end
+            ),
+        }
+        
+        sections = {email: {} for email in user_emails}
+        for name, query in queries.items():
+            result = query()
+            if not result.success:
+                return result
+            for email, data in result.data.items():
+                sections[email][name] = data
+        
+        return Result.success_result(sections)
+    
+    def _render_report(self, user_email: Optional[str], week_start: str, stats,
+                       sections: Optional[Dict[str, Any]] = None) -> Result:
+        """
+        Analisa as estatísticas da semana e renderiza texto, assunto e HTML do relatório.
+        
+        A análise usa usuário + semana como semente, então o mesmo conjunto de
+        dados sempre gera o mesmo relatório. As seções (ver
+        _get_report_sections) podem vir prontas do envio a todos os usuários,
+        que as busca agrupadas por usuário.
+        """
+        if sections is None:
+            sections_result = self._get_report_sections(user_email, week_start)
+            if not sections_result.success:
+                return sections_result
+            sections = sections_result.data
+        
+        weekly_data = stats.to_dict()
+        analysis_result = self.ai_service.analyze_weekly_stats(
+            stats, weekly_data, seed=f"{user_email or ''}|{week_start}",
+            **sections
+        )
+        if not analysis_result.success:
+            return analysis_result
+        
+        analysis = analysis_result.data
+        text = self._create_complete_report(weekly_data, analysis)
+        subject, html = self._build_report_email(text)
+        
+        return Result.success_result(CachedReport(subject, text, html, weekly_data, analysis))
     
     def _create_complete_report(self, weekly_data: Dict[str, Any], analysis: Dict[str, Any]) -> str:
         """Cria o relatório completo formatado."""
@@ -138,6 +534,11 @@ class WeeklyReportService:
         for insight in analysis['insights']:
             report += f"• {insight}\n"
         
+        # Adiciona a distribuição das notas (medianas e dias bons)
+        distribution = analysis.get('distribution')
+        if distribution:
+            report += self._create_distribution_section(distribution)
+        
         report += f"""
 🎯 RECOMENDAÇÕES PARA PRÓXIMA SEMANA:
 """
@@ -146,6 +547,16 @@ class WeeklyReportService:
         for recommendation in analysis['recommendations']:
             report += f"• {recommendation}\n"
         
+        # Adiciona tendências das últimas semanas
+        trends = analysis.get('trends')
+        if trends:
+            report += self._create_trends_section(trends)
+        
+        # Adiciona correlações entre as áreas
+        correlations = analysis.get('correlations')
+        if correlations:
+            report += self._create_correlations_section(correlations)
+        
         report += f"""
 🌟 LEMBRE-SE:
 Cada dia é uma nova oportunidade de crescimento. 
@@ -158,19 +569,77 @@ Pequenas melhorias diárias levam a grandes transformações!
         
         return report
     
-    def _send_weekly_report(self, email: str, report: str) -> Result:
-        """Envia o relatório por email."""
+    def _create_trends_section(self, trends: Dict[str, Any]) -> str:
+        """Cria a seção de tendências (semanas ISO) do relatório."""
+        
+        def format_delta(delta: Optional[float]) -> str:
+            return f"{delta:+.2f}" if delta is not None else "—"
+        
+        section = f"""
+📈 TENDÊNCIAS ({trends['weeks']} semanas registradas):
+"""
+        
+        # Média móvel de 4 semanas e variação sobre a semana anterior
+        for label, average in trends['moving_averages'].items():
+            section += f"• {label}: média de 4 semanas {average}/10 ({format_delta(trends['deltas'][label])} na semana)\n"
+        
+        best = trends['best_week']
+        worst = trends['worst_week']
+        section += f"""
+🔥 Sequência atual: {trends['current_streak']} semana(s) (recorde: {trends['longest_streak']})
+🏆 Melhor semana: {date.fromisoformat(best['week_start']).strftime('%d/%m/%Y')} ({best['overall_average']}/10)
+🌱 Semana mais difícil: {date.fromisoformat(worst['week_start']).strftime('%d/%m/%Y')} ({worst['overall_average']}/10)
+"""
+        
+        for insight in trends['insights']:
+            section += f"• {insight}\n"
+        
+        return section
+    
+    def _create_distribution_section(self, distribution: Dict[str, Any]) -> str:
+        """Cria a seção com mediana, quartis e dias bons de cada área."""
+        section = """
+📊 DISTRIBUIÇÃO DAS NOTAS:
+"""
+        
+        for label, stats in distribution['areas'].items():
+            spread = ''
+            if stats['p25'] != stats['p75']:
+                spread = f" (metade dos dias entre {stats['p25']:g} e {stats['p75']:g})"
+            section += (
+                f"• {label}: mediana {stats['median']:g}{spread}, "
+                f"nota 8+ em {stats['share_good_days']:.0%} dos dias\n"
+            )
+        
+        for insight in distribution['insights']:
+            section += f"• {insight}\n"
+        
+        return section
+    
+    def _create_correlations_section(self, correlations: Dict[str, Any]) -> str:
+        """Cria a seção de correlações entre as áreas do relatório."""
+        section = f"""
+🔗 COMO AS ÁREAS SE RELACIONAM ({correlations['weeks']} semanas, {correlations['count']} dias):
+"""
+        
+        for insight in correlations['insights']:
+            section += f"• {insight}\n"
+        
+        return section
+    
+    def _send_weekly_report(self, email: str, report: CachedReport) -> Result:
+        """Envia o relatório (já renderizado) por email."""
         try:
-            subject = f"{settings.APP_NAME} - Relatório Semanal ({datetime.now().strftime('%d/%m/%Y')})"
-            
-            # Adiciona formatação HTML para melhor visualização
-            html_body = self._format_html_email(report)
-            
-            return self.email_service.send_email(email, subject, html_body)
+            return self.email_service.send_email(email, report.subject, report.html)
             
         except Exception as e:
             return Result.error_result(f"Erro ao enviar relatório: {str(e)}")
     
+    def _build_report_email(self, report: str) -> Tuple[str, str]:
+        """Monta o assunto e o corpo (com formatação HTML) do email do relatório."""
+        subject = f"{settings.APP_NAME} - Relatório Semanal ({datetime.now().strftime('%d/%m/%Y')})"
+        return subject, self._format_html_email(report)
+    
     def _format_html_email(self, report: str) -> str:
         """Formata o relatório para HTML."""
         # Converte quebras de linha para HTML
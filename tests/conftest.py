@@ -0,0 +1,53 @@
+"""
+Fixtures compartilhadas dos testes.
+Cada teste usa um banco SQLite próprio em um diretório temporário e nenhum
+envia emails de verdade.
+"""
+
+import os
+import sys
+
+import pytest
+
+# Adiciona o diretório raiz ao path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.config.settings import settings
+from src.services.database_service import DatabaseService
+
+
+def pytest_addoption(parser):
+    parser.addoption('--run-slow', action='store_true', default=False,
+                     help='Roda também os testes marcados como slow (ex.: 1 milhão de avaliações)')
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'slow: teste demorado, só roda com --run-slow')
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--run-slow'):
+        return
+    skip_slow = pytest.mark.skip(reason='teste demorado: use --run-slow')
+    for item in items:
+        if 'slow' in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture
+def isolated_settings(tmp_path, monkeypatch):
+    """Banco temporário e email desligado para os serviços criados no teste."""
+    monkeypatch.setattr(settings, 'DATABASE_PATH', str(tmp_path / 'reviews.db'))
+    monkeypatch.setattr(settings, 'EMAIL_USER', '')
+    monkeypatch.setattr(settings, 'EMAIL_PASSWORD', '')
+    return settings
+
+
+@pytest.fixture
+def db_service(isolated_settings):
+    """DatabaseService com as tabelas criadas no banco temporário."""
+    db = DatabaseService()
+    result = db.create_tables()
+    assert result.success, result.get_first_error()
+    return db
@@ -0,0 +1,92 @@
+"""
+Motor de análise: NumPy e Python puro dão os mesmos números, que conferem
+com o cálculo direto nota a nota.
+"""
+
+import random
+import statistics
+
+import pytest
+
+from src.services.analytics_engine import get_analytics_engine
+
+
+def _random_rows(seed, count):
+    rng = random.Random(seed)
+    return [tuple(rng.randint(0, 10) for _ in range(4)) for _ in range(count)]
+
+
+def _baseline_consistency(rows):
+    """Cálculo das versões anteriores (_analyze_patterns): média e desvios nota a nota."""
+    scores = [row[i] for i in range(4) for row in rows]
+    mean = sum(scores) / len(scores)
+    variance = sum((score - mean) ** 2 for score in scores) / len(scores)
+    return max(0, 10 - variance ** 0.5)
+
+
+def test_empty_input():
+    engine = get_analytics_engine('python')
+    
+    summary = engine.summarize(engine.load([]))
+    
+    assert summary['count'] == 0
+    assert summary['consistency_score'] == 0
+    assert engine.rolling_averages(engine.load([]), 7) == []
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_python_backend_matches_direct_computation(seed):
+    rows = _random_rows(seed, 5 + seed * 7)
+    engine = get_analytics_engine('python')
+    
+    summary = engine.summarize(engine.load(rows))
+    
+    columns = list(zip(*rows))
+    labels = ['Trabalho', 'Treino', 'Estudos', 'Mente']
+    positions = list(range(len(rows)))
+    for label, column in zip(labels, columns):
+        assert summary['area_averages'][label] == sum(column) / len(column)
+        assert summary['area_variances'][label] == pytest.approx(statistics.pvariance(column), abs=1e-12)
+        assert summary['trend_slopes'][label] == pytest.approx(
+            statistics.linear_regression(positions, column).slope, abs=1e-12)
+    
+    for i in range(4):
+        for j in range(i + 1, 4):
+            expected = (statistics.correlation(columns[i], columns[j])
+                        if len(set(columns[i])) > 1 and len(set(columns[j])) > 1 else None)
+            assert summary['correlations'][labels[i]][labels[j]] == pytest.approx(expected, abs=1e-12)
+    
+    # Com o cálculo antigo nota a nota, a igualdade vale só até os últimos bits
+    assert summary['consistency_score'] == pytest.approx(_baseline_consistency(rows), abs=1e-12)
+
+
+def test_rolling_averages_match_direct_windows():
+    rows = _random_rows(7, 40)
+    engine = get_analytics_engine('python')
+    
+    averages = engine.rolling_averages(engine.load(rows), 7)
+    
+    assert len(averages) == 34
+    for start, window in enumerate(averages):
+        expected = [sum(row[i] for row in rows[start:start + 7]) / 7 for i in range(4)]
+        assert window == expected
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_numpy_and_python_backends_are_identical(seed):
+    pytest.importorskip('numpy')
+    rows = _random_rows(seed, 1 + seed * 53)
+    python_engine = get_analytics_engine('python')
+    numpy_engine = get_analytics_engine('numpy')
+    
+    python_scores = python_engine.load(rows)
+    numpy_scores = numpy_engine.load(rows)
+    
+    assert numpy_engine.name == 'numpy'
+    assert python_engine.summarize(python_scores) == numpy_engine.summarize(numpy_scores)
+    assert python_engine.rolling_averages(python_scores, 7) == numpy_engine.rolling_averages(numpy_scores, 7)
+    
+    python_stats = python_engine.weekly_stats(python_scores)
+    numpy_stats = numpy_engine.weekly_stats(numpy_scores)
+    assert python_stats.to_dict() == numpy_stats.to_dict()
+    assert python_stats.consistency_score == numpy_stats.consistency_score
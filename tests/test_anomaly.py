@@ -0,0 +1,132 @@
+"""
+Detector de dias fora do padrão (EWMA / z-score) e alertas de queda.
+"""
+
+import threading
+import time
+from datetime import date, timedelta
+
+from src.models.anomaly import AnomalyDetector, AnomalyState
+from src.models.result import Result
+from src.models.review import Review
+from src.services.anomaly_alert_service import AnomalyAlertService
+
+
+def _days(count, first=date(2026, 9, 1)):
+    return [(first + timedelta(days=index)).isoformat() for index in range(count)]
+
+
+def test_flags_only_after_min_history():
+    detector = AnomalyDetector(alpha=0.2, threshold=2.5, min_history=5)
+    state = AnomalyState()
+    days = _days(7)
+    
+    for index, day in enumerate(days[:3]):
+        assert detector.observe(state, index, 'ana@exemplo.com', day, (8, 8, 8, 8)) == []
+    # Pouco histórico: nem uma queda grande é sinalizada
+    assert detector.observe(state, 3, 'ana@exemplo.com', days[3], (0, 8, 8, 8)) == []
+    
+    state = AnomalyState()
+    for index, day in enumerate(days[:6]):
+        detector.observe(state, index, 'ana@exemplo.com', day, (8, 7, 8, 7))
+    anomalies = detector.observe(state, 6, 'ana@exemplo.com', days[6], (1, 7, 8, 7))
+    
+    assert [(a.field, a.value, a.is_drop) for a in anomalies] == [('work', 1, True)]
+    assert anomalies[0].expected == 8.0
+
+
+def test_state_matches_ewma_recurrence():
+    detector = AnomalyDetector(alpha=0.3, threshold=2.5, min_history=100)
+    state = AnomalyState()
+    values = [5, 7, 6, 9, 4, 8]
+    
+    for index, (day, value) in enumerate(zip(_days(len(values)), values)):
+        detector.observe(state, index, 'ana@exemplo.com', day, (value,) * 4)
+    
+    mean, variance = float(values[0]), 0.0
+    for value in values[1:]:
+        difference = value - mean
+        mean += 0.3 * difference
+        variance = 0.7 * (variance + difference * 0.3 * difference)
+    
+    assert state.count == len(values)
+    assert abs(state.means[0] - mean) < 1e-12
+    assert abs(state.variances[0] - variance) < 1e-12
+
+
+def test_older_days_do_not_change_state():
+    detector = AnomalyDetector(alpha=0.2, threshold=2.5, min_history=1)
+    state = AnomalyState()
+    detector.observe(state, 1, 'ana@exemplo.com', '2026-09-10', (8, 8, 8, 8))
+    
+    assert detector.observe(state, 2, 'ana@exemplo.com', '2026-09-09', (0, 0, 0, 0)) == []
+    assert detector.observe(state, 3, 'ana@exemplo.com', '2026-09-10', (0, 0, 0, 0)) == []
+    assert state.count == 1 and state.last_date == '2026-09-10'
+
+
+def test_insert_stores_state_and_anomalies(db_service):
+    days = _days(10)
+    for day in days[:-1]:
+        assert db_service.insert_review(Review(8, 8, 8, 8, 'Bom', 'Ruim', user_email='ana@exemplo.com',
+                                               review_date=day)).success
+    assert db_service.insert_review(Review(0, 8, 8, 8, 'Ruim', 'Ruim', user_email='ana@exemplo.com',
+                                           review_date=days[-1])).success
+    
+    conn = db_service._get_connection().data
+    try:
+        count = conn.execute("SELECT count FROM review_anomaly_state WHERE user_email = 'ana@exemplo.com'").fetchone()[0]
+        anomalies = conn.execute('SELECT area, value, review_date FROM review_anomalies').fetchall()
+        count_type = conn.execute('SELECT typeof(count) FROM review_anomaly_state').fetchone()[0]
+    finally:
+        conn.close()
+    
+    assert count == 10 and count_type == 'integer'
+    assert anomalies == [('work', 0, days[-1])]
+
+
+class SlowEmailService:
+    """Envio que demora até ser liberado pelo teste."""
+    
+    def __init__(self):
+        self.release = threading.Event()
+        self.sent = []
+    
+    def send_bulk_emails(self, messages, subtype='plain'):
+        self.release.wait(5)
+        messages = list(messages)
+        self.sent.extend(to_email for to_email, _, _ in messages)
+        return Result.success_result({to_email: None for to_email, _, _ in messages})
+
+
+def test_alert_does_not_block_the_insert(db_service):
+    email_service = SlowEmailService()
+    alerts = AnomalyAlertService(email_service=email_service)
+    db_service.anomaly_listeners.append(alerts.enqueue)
+    
+    today = date.today()
+    for days_ago in range(10, 0, -1):
+        review = Review(8, 8, 8, 8, 'Bom', 'Ruim', user_email='ana@exemplo.com',
+                        review_date=(today - timedelta(days=days_ago)).isoformat())
+        assert db_service.insert_review(review).success
+    
+    started = time.perf_counter()
+    drop = Review(0, 8, 8, 8, 'Ruim', 'Ruim', user_email='ana@exemplo.com', review_date=today.isoformat())
+    assert db_service.insert_review(drop).success
+    assert time.perf_counter() - started < 1
+    assert email_service.sent == []
+    
+    email_service.release.set()
+    assert alerts.wait(5)
+    assert email_service.sent == ['ana@exemplo.com']
+
+
+def test_old_or_positive_anomalies_are_not_queued():
+    alerts = AnomalyAlertService(email_service=SlowEmailService())
+    detector = AnomalyDetector(alpha=0.2, threshold=2.5, min_history=1)
+    state = AnomalyState()
+    detector.observe(state, 1, 'ana@exemplo.com', '2020-01-01', (2, 2, 2, 2))
+    
+    alerts.enqueue(detector.observe(state, 2, 'ana@exemplo.com', '2020-01-02', (9, 2, 2, 2)))
+    
+    assert alerts._worker is None
+    assert alerts.wait(0)
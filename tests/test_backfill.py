@@ -0,0 +1,73 @@
+"""
+Backfill dos relatórios semanais: uma linha por semana ISO (ou por usuário e
+semana), com os mesmos números dos acumuladores, em um ou vários processos.
+"""
+
+from datetime import date, timedelta
+
+from src.models.review import Review
+from src.services.weekly_report_service import WeeklyReportService
+
+USERS = ('ana@exemplo.com', 'bruno@exemplo.com')
+
+
+def _insert_history(db_service):
+    # 2026-09-02 (quarta) a 2026-09-30: cinco semanas ISO, a primeira e a última parciais
+    reviews = [
+        Review((offset + index) % 11, 7, (offset * 3) % 11, 5, 'Dia bom', 'Dia ruim', user_email=user_email,
+               review_date=(date(2026, 9, 2) + timedelta(days=offset)).isoformat())
+        for offset in range(29)
+        for index, user_email in enumerate(USERS)
+        if index == 0 or offset % 3
+    ]
+    assert db_service.insert_reviews(reviews).success
+
+
+def _reports(db_service, user_email=None):
+    reports = db_service.get_weekly_reports(user_email=user_email).data
+    for report in reports:
+        del report['generated_at']
+    return reports
+
+
+def test_backfill_writes_one_report_per_iso_week(db_service):
+    _insert_history(db_service)
+    
+    result = WeeklyReportService(db_service=db_service).backfill_weekly_reports(workers=1)
+    
+    assert result.success, result.get_first_error()
+    assert result.data == {'weeks': 5, 'users': None, 'reports_saved': 5}
+    reports = _reports(db_service)
+    assert [report['week_start'] for report in reports] == [
+        '2026-08-31', '2026-09-07', '2026-09-14', '2026-09-21', '2026-09-28'
+    ]
+    for report in reports:
+        week_end = (date.fromisoformat(report['week_start']) + timedelta(days=6)).isoformat()
+        expected = db_service.get_weekly_stats(report['week_start'], week_end).data.to_dict()
+        assert report['total_reviews'] == expected['total_reviews']
+        assert report['overall_average'] == expected['overall_average']
+        assert report['avg_work'] == expected['avg_work']
+        assert report['analysis']['performance_level'] == report['performance_level']
+
+
+def test_backfill_per_user_is_the_same_with_a_process_pool(db_service):
+    _insert_history(db_service)
+    service = WeeklyReportService(db_service=db_service)
+    
+    sequential = service.backfill_weekly_reports(per_user=True, workers=1, batch_size=3)
+    sequential_reports = {user_email: _reports(db_service, user_email) for user_email in USERS}
+    
+    pooled = service.backfill_weekly_reports(per_user=True, workers=2, batch_size=3)
+    pooled_reports = {user_email: _reports(db_service, user_email) for user_email in USERS}
+    
+    assert sequential.data == pooled.data == {'weeks': 5, 'users': 2, 'reports_saved': 10}
+    assert pooled_reports == sequential_reports
+    assert sum(report['total_reviews'] for report in pooled_reports['bruno@exemplo.com']) == 19
+
+
+def test_backfill_without_reviews(db_service):
+    result = WeeklyReportService(db_service=db_service).backfill_weekly_reports(workers=2)
+    
+    assert result.success
+    assert result.data['reports_saved'] == 0
+    assert _reports(db_service) == []
@@ -0,0 +1,128 @@
+"""
+Correlações entre as áreas a partir dos co-momentos semanais, conferidas
+contra statistics.correlation sobre as próprias avaliações.
+"""
+
+import random
+import statistics
+from datetime import date, timedelta
+
+import pytest
+
+from src.models.review import Review
+from src.models.running_stats import AREAS, CoMomentAccumulator
+
+USERS = ('ana@exemplo.com', 'bruno@exemplo.com')
+FIELDS = tuple(field for field, _ in AREAS)
+LABELS = tuple(label for _, label in AREAS)
+
+
+def _random_reviews(seed, days=70):
+    rng = random.Random(seed)
+    reviews = []
+    for offset in range(days):
+        day = (date(2026, 6, 1) + timedelta(days=offset)).isoformat()
+        for user_email in USERS:
+            if rng.random() < 0.85:
+                work = rng.randint(0, 10)
+                # Treino acompanha o trabalho e a mente vai no sentido oposto
+                training = min(10, max(0, work + rng.randint(-2, 2)))
+                mind = min(10, max(0, 10 - work + rng.randint(-3, 3)))
+                reviews.append(Review(work, training, rng.randint(0, 10), mind, 'Dia bom', 'Dia ruim',
+                                      user_email=user_email, review_date=day))
+    return reviews
+
+
+def _expected_matrix(reviews):
+    columns = [[getattr(review, field) for review in reviews] for field in FIELDS]
+    matrix = {}
+    for i, label in enumerate(LABELS):
+        matrix[label] = {}
+        for j, other in enumerate(LABELS):
+            try:
+                matrix[label][other] = round(statistics.correlation(columns[i], columns[j]), 3)
+            except statistics.StatisticsError:
+                matrix[label][other] = None
+    return matrix
+
+
+def test_accumulator_matches_statistics_correlation():
+    reviews = _random_reviews(1, days=20)
+    accumulator = CoMomentAccumulator()
+    for review in reviews:
+        accumulator.add(review.work, review.training, review.studies, review.mind)
+    
+    columns = [[getattr(review, field) for review in reviews] for field in FIELDS]
+    for i in range(len(FIELDS)):
+        for j in range(len(FIELDS)):
+            assert accumulator.correlation(i, j) == pytest.approx(statistics.correlation(columns[i], columns[j]))
+
+
+def test_merged_accumulators_equal_one_pass():
+    reviews = _random_reviews(2, days=30)
+    one_pass = CoMomentAccumulator()
+    parts = [CoMomentAccumulator() for _ in range(3)]
+    for index, review in enumerate(reviews):
+        scores = (review.work, review.training, review.studies, review.mind)
+        one_pass.add(*scores)
+        parts[index % 3].add(*scores)
+    
+    merged = CoMomentAccumulator.merged(parts)
+    
+    assert merged.to_row() == one_pass.to_row()
+    assert CoMomentAccumulator.from_row(merged.to_row()).to_dict() == one_pass.to_dict()
+
+
+def test_constant_area_or_single_review_has_no_correlation():
+    accumulator = CoMomentAccumulator()
+    accumulator.add(5, 7, 2, 9)
+    assert accumulator.correlation(0, 1) is None
+    
+    accumulator.add(6, 7, 3, 8)
+    assert accumulator.correlation(0, 1) is None
+    assert accumulator.correlation(0, 3) == pytest.approx(-1.0)
+    assert accumulator.to_dict()['pairs'][0] == {'areas': ['Trabalho', 'Estudos'], 'correlation': 1.0}
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_area_correlations_match_direct_computation(db_service, seed):
+    reviews = _random_reviews(seed)
+    for start in range(0, len(reviews), 11):
+        assert db_service.insert_reviews(reviews[start:start + 11]).success
+    
+    # 2026-06-08 (segunda) a 2026-07-26 (domingo): sete semanas ISO inteiras
+    for user_email in USERS + (None,):
+        in_period = [review for review in reviews
+                     if '2026-06-08' <= review.review_date <= '2026-07-26'
+                     and user_email in (None, review.user_email)]
+        correlations = db_service.get_area_correlations('2026-06-08', '2026-07-26', user_email).data
+        
+        assert (correlations['count'], correlations['weeks']) == (len(in_period), 7)
+        assert correlations['matrix'] == _expected_matrix(in_period)
+        strengths = [abs(pair['correlation']) for pair in correlations['pairs']]
+        assert strengths == sorted(strengths, reverse=True)
+
+
+def test_rebuilt_comoments_match_incremental(db_service):
+    for review in _random_reviews(6, days=30):
+        assert db_service.insert_review(review).success
+    incremental = db_service.get_area_correlations_by_user(list(USERS)).data
+    
+    conn = db_service._get_connection().data
+    with conn:
+        db_service._rebuild_comoments(conn.cursor())
+    conn.close()
+    
+    assert db_service.get_area_correlations_by_user(list(USERS)).data == incremental
+
+
+def test_correlations_by_user_match_single_user_queries(db_service):
+    assert db_service.insert_reviews(_random_reviews(4)).success
+    
+    grouped = db_service.get_area_correlations_by_user(list(USERS) + ['sem@exemplo.com'],
+                                                       '2026-06-15', '2026-07-05').data
+    
+    for user_email in USERS:
+        assert grouped[user_email] == db_service.get_area_correlations('2026-06-15', '2026-07-05', user_email).data
+    assert grouped['sem@exemplo.com']['count'] == 0
+    assert grouped['sem@exemplo.com']['pairs'] == []
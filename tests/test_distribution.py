@@ -0,0 +1,117 @@
+"""
+Distribuição das notas a partir dos histogramas semanais: mediana, percentis
+e proporção de dias bons conferidos contra o cálculo direto sobre as notas.
+"""
+
+import random
+import statistics
+from datetime import date, timedelta
+
+import pytest
+
+from src.models.review import Review
+from src.models.running_stats import AREAS, GOOD_DAY_SCORE, ScoreHistogram
+
+USERS = ('ana@exemplo.com', 'bruno@exemplo.com')
+
+
+def _random_reviews(seed, days=63):
+    rng = random.Random(seed)
+    return [
+        Review(rng.randint(0, 10), rng.choice((6, 7, 8, 8, 9)), rng.randint(3, 10), rng.randint(0, 10),
+               'Dia bom', 'Dia ruim', user_email=user_email,
+               review_date=(date(2026, 6, 1) + timedelta(days=offset)).isoformat())
+        for offset in range(days)
+        for user_email in USERS
+        if rng.random() < 0.8
+    ]
+
+
+def _expected(scores):
+    quartiles = statistics.quantiles(scores, n=4, method='inclusive')
+    return {
+        'count': len(scores),
+        'median': statistics.median(scores),
+        'p25': quartiles[0],
+        'p75': quartiles[2],
+        'p90': statistics.quantiles(scores, n=10, method='inclusive')[8],
+        'share_good_days': round(sum(score >= GOOD_DAY_SCORE for score in scores) / len(scores), 4),
+        'histogram': [scores.count(score) for score in range(11)],
+    }
+
+
+def _assert_distribution(distribution, expected):
+    assert distribution.keys() == expected.keys()
+    for key, value in expected.items():
+        assert distribution[key] == pytest.approx(value, abs=1e-9), key
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_histogram_matches_statistics_quantiles(seed):
+    rng = random.Random(seed)
+    scores = [rng.randint(0, 10) for _ in range(rng.randint(2, 60))]
+    histogram = ScoreHistogram()
+    for score in scores:
+        histogram.add(score)
+    
+    _assert_distribution(histogram.to_dict(), _expected(scores))
+    ordered = sorted(scores)
+    for fraction in (0.0, 0.1, 0.33, 1.0):
+        position = fraction * (len(scores) - 1)
+        lower = int(position)
+        upper = ordered[min(lower + 1, len(scores) - 1)]
+        expected = ordered[lower] + (upper - ordered[lower]) * (position - lower)
+        assert histogram.percentile(fraction) == pytest.approx(expected)
+
+
+def test_empty_and_single_score_histograms():
+    assert ScoreHistogram().to_dict()['median'] is None
+    assert ScoreHistogram().share_at_least(GOOD_DAY_SCORE) is None
+    
+    histogram = ScoreHistogram()
+    histogram.add(7)
+    assert (histogram.median, histogram.percentile(0.9), histogram.share_at_least(8)) == (7.0, 7.0, 0.0)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_score_distribution_matches_direct_computation(db_service, seed):
+    reviews = _random_reviews(seed)
+    for start in range(0, len(reviews), 13):
+        assert db_service.insert_reviews(reviews[start:start + 13]).success
+    
+    # 2026-06-08 (segunda) a 2026-07-26 (domingo): sete semanas ISO inteiras
+    for user_email in USERS + (None,):
+        in_period = [review for review in reviews
+                     if '2026-06-08' <= review.review_date <= '2026-07-26'
+                     and user_email in (None, review.user_email)]
+        distribution = db_service.get_score_distribution('2026-06-08', '2026-07-26', user_email).data
+        
+        assert (distribution['count'], distribution['weeks']) == (len(in_period), 7)
+        for field, label in AREAS:
+            _assert_distribution(distribution['areas'][label],
+                                 _expected([getattr(review, field) for review in in_period]))
+
+
+def test_rebuilt_histograms_match_incremental(db_service):
+    for review in _random_reviews(6, days=30):
+        assert db_service.insert_review(review).success
+    incremental = db_service.get_score_distribution_by_user(list(USERS)).data
+    
+    conn = db_service._get_connection().data
+    with conn:
+        db_service._rebuild_histograms(conn.cursor())
+    conn.close()
+    
+    assert db_service.get_score_distribution_by_user(list(USERS)).data == incremental
+
+
+def test_distribution_by_user_matches_single_user_queries(db_service):
+    assert db_service.insert_reviews(_random_reviews(4)).success
+    
+    grouped = db_service.get_score_distribution_by_user(list(USERS) + ['sem@exemplo.com'],
+                                                        '2026-06-15', '2026-07-05').data
+    
+    for user_email in USERS:
+        assert grouped[user_email] == db_service.get_score_distribution('2026-06-15', '2026-07-05', user_email).data
+    assert grouped['sem@exemplo.com']['count'] == 0
+    assert grouped['sem@exemplo.com']['areas']['Trabalho']['median'] is None
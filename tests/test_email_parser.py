@@ -0,0 +1,93 @@
+"""
+Leitura das avaliações enviadas por email (parse_email_body).
+"""
+
+from src.services.email_processor_service import parse_email_body
+
+
+def _body(**overrides):
+    fields = {
+        'work': '8', 'training': '7', 'studies': '9', 'mind': '6',
+        'positive_points': 'Dia produtivo', 'negative_points': 'Dormi pouco'
+    }
+    fields.update(overrides)
+    return ''.join(f"{field}: {value}\n" for field, value in fields.items())
+
+
+def test_reads_all_fields():
+    assert parse_email_body(_body()) == {
+        'work': 8, 'training': 7, 'studies': 9, 'mind': 6,
+        'positive_points': 'Dia produtivo', 'negative_points': 'Dormi pouco'
+    }
+
+
+def test_comment_mentioning_field_names_is_kept_whole():
+    body = _body(positive_points='terminei a tarefa de work: deploy feito',
+                 negative_points='mind: cansado, training: pulei')
+    
+    data = parse_email_body(body)
+    
+    assert data['positive_points'] == 'terminei a tarefa de work: deploy feito'
+    assert data['negative_points'] == 'mind: cansado, training: pulei'
+    assert data['work'] == 8 and data['mind'] == 6
+
+
+def test_several_scores_on_one_line():
+    body = (
+        "work: 8 training: 7, studies: 9 mind: 6\n"
+        "positive_points: Dia produtivo\n"
+        "negative_points: Dormi pouco\n"
+    )
+    data = parse_email_body(body)
+    assert (data['work'], data['training'], data['studies'], data['mind']) == (8, 7, 9, 6)
+
+
+def test_scores_followed_by_comment_on_the_same_line():
+    body = "work: 8 training: 7 studies: 9 mind: 6 positive_points: bom, mind: leve\nnegative_points: nada\n"
+    data = parse_email_body(body)
+    assert data['mind'] == 6
+    assert data['positive_points'] == 'bom, mind: leve'
+
+
+def test_multiline_comment_until_next_field():
+    body = _body(positive_points='Dia produtivo\nTreino pesado\n')
+    assert parse_email_body(body)['positive_points'] == 'Dia produtivo\nTreino pesado'
+
+
+def test_first_occurrence_wins():
+    assert parse_email_body(_body() + "work: 1\n")['work'] == 8
+
+
+def test_ignores_quoted_reply_and_signature():
+    body = (
+        _body(negative_points='Dormi pouco')
+        + "\n--\nFulano\n"
+        + "Em qua., 7 de out. de 2026 às 20:00, Diário <diario@exemplo.com> escreveu:\n"
+        + "> work: 1\n"
+    )
+    data = parse_email_body(body)
+    assert data['work'] == 8
+    assert data['negative_points'] == 'Dormi pouco'
+
+
+def test_stops_at_reply_header():
+    body = _body(negative_points='Nada') + "On Wed, Oct 7, 2026 at 8:00 PM Diario wrote:\nwork: 1\n"
+    data = parse_email_body(body)
+    assert data['work'] == 8 and data['negative_points'] == 'Nada'
+
+
+def test_comment_starting_with_on_or_em_is_not_a_reply_header():
+    body = _body(positive_points='ok', negative_points='x').replace(
+        'negative_points: x', 'negative_points: x\nem casa o dia todo, 2 reuniões'
+    )
+    assert parse_email_body(body)['negative_points'] == 'x\nem casa o dia todo, 2 reuniões'
+
+
+def test_missing_field_returns_none():
+    body = _body().replace('mind: 6\n', '')
+    assert parse_email_body(body) is None
+
+
+def test_field_name_without_separator_is_not_a_field():
+    body = _body().replace('work: 8', 'work 8')
+    assert parse_email_body(body) is None
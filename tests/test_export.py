@@ -0,0 +1,101 @@
+"""
+Exportação em streaming: conteúdo dos arquivos e memória constante.
+"""
+
+import csv
+import gzip
+import io
+import json
+import tracemalloc
+from datetime import date, timedelta
+
+import pytest
+
+from src.services.database_service import REVIEW_FIELDS
+from src.services.export_service import ExportService
+
+
+def _insert_reviews(db_service, n: int, first_id: int = 0):
+    """Grava n avaliações sintéticas direto na tabela (sem acumuladores)."""
+    first_day = date(2000, 1, 1)
+    conn = db_service._get_connection().data
+    with conn:
+        conn.executemany('''
+            INSERT INTO reviews (work, training, studies, mind, positive_points, negative_points,
+                                 user_email, review_date)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            (index % 11, (index + 1) % 11, (index + 2) % 11, (index + 3) % 11,
+             'Dia produtivo, treino "pesado"', 'Dormi pouco',
+             f'usuario{index % 100}@exemplo.com',
+             (first_day + timedelta(days=index // 100)).isoformat())
+            for index in range(first_id, first_id + n)
+        ))
+    conn.close()
+
+
+def _export_peak_bytes(exporter: ExportService, export_format: str) -> int:
+    """Pico de memória alocada enquanto a exportação é consumida e descartada."""
+    tracemalloc.start()
+    try:
+        for _ in exporter.iter_export(export_format, compress=True):
+            pass
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_export_files_round_trip(db_service, tmp_path):
+    _insert_reviews(db_service, 1200)
+    exporter = ExportService(db_service)
+    
+    result = exporter.export_to_file(str(tmp_path / 'avaliacoes.csv.gz'))
+    assert result.success, result.get_first_error()
+    assert result.data['rows'] == 1200 and result.data['compressed']
+    with gzip.open(tmp_path / 'avaliacoes.csv.gz', 'rt', encoding='utf-8', newline='') as file:
+        rows = list(csv.reader(file))
+    assert tuple(rows[0]) == REVIEW_FIELDS
+    assert len(rows) == 1201
+    assert rows[1][REVIEW_FIELDS.index('positive_points')] == 'Dia produtivo, treino "pesado"'
+    
+    result = exporter.export_to_file(str(tmp_path / 'avaliacoes.ndjson'))
+    assert result.success, result.get_first_error()
+    lines = (tmp_path / 'avaliacoes.ndjson').read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 1200
+    assert set(json.loads(lines[-1])) == set(REVIEW_FIELDS)
+
+
+@pytest.mark.parametrize('export_format', ['csv', 'ndjson'])
+def test_export_memory_does_not_grow_with_rows(db_service, export_format):
+    exporter = ExportService(db_service)
+    
+    _insert_reviews(db_service, 10000)
+    small_peak = _export_peak_bytes(exporter, export_format)
+    
+    # Quatro vezes mais avaliações: o pico continua o de um lote
+    _insert_reviews(db_service, 30000, first_id=10000)
+    large_peak = _export_peak_bytes(exporter, export_format)
+    
+    assert large_peak < small_peak * 1.25 + 512 * 1024, (small_peak, large_peak)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize('export_format', ['csv', 'ndjson'])
+def test_export_of_a_million_rows_keeps_memory_of_one_batch(db_service, export_format):
+    exporter = ExportService(db_service)
+    
+    _insert_reviews(db_service, 10000)
+    small_peak = _export_peak_bytes(exporter, export_format)
+    
+    _insert_reviews(db_service, 990000, first_id=10000)
+    progress = {}
+    tracemalloc.start()
+    try:
+        for _ in exporter.iter_export(export_format, compress=True, progress=progress):
+            pass
+        large_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    
+    assert progress['rows'] == 1000000
+    assert large_peak < small_peak * 1.25 + 512 * 1024, (small_peak, large_peak)
@@ -0,0 +1,133 @@
+"""
+Sondas de saúde: leitura do banco sem o lock de escrita, cache do SMTP e
+requisições em andamento.
+"""
+
+import os
+import sqlite3
+
+from src.models.result import Result
+from src.services.health_service import HealthService
+
+
+class _FakeEmailService:
+    """Email configurado cuja verificação de login só é contada."""
+    
+    email_user = 'diario@exemplo.com'
+    
+    def __init__(self, success=True):
+        self.success = success
+        self.checks = 0
+    
+    def check_connection(self, timeout=None):
+        self.checks += 1
+        if self.success:
+            return Result.success_result()
+        return Result.error_result('Falha no login')
+
+
+class _UnconfiguredEmailService:
+    email_user = ''
+
+
+def _holding_write_lock(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute('BEGIN IMMEDIATE')
+    return conn
+
+
+def test_ready_with_database_and_without_smtp(db_service):
+    readiness = HealthService(db_service, _UnconfiguredEmailService()).get_readiness()
+    
+    assert readiness['ready']
+    assert readiness['checks']['database']['ok']
+    assert readiness['checks']['smtp']['status'] == 'not configured'
+
+
+def test_database_probe_does_not_wait_for_the_write_lock(db_service, isolated_settings, monkeypatch):
+    monkeypatch.setattr(isolated_settings, 'HEALTH_DB_TIMEOUT_SECONDS', 0.2)
+    writer = _holding_write_lock(db_service.db_path)
+    try:
+        check = HealthService(db_service, _UnconfiguredEmailService()).check_database()
+    finally:
+        writer.rollback()
+        writer.close()
+    
+    assert check['ok'], check
+    assert check['latency_ms'] < 200
+
+
+def test_write_check_reports_a_locked_database(db_service, isolated_settings, monkeypatch):
+    monkeypatch.setattr(isolated_settings, 'HEALTH_DB_CHECK_WRITE', True)
+    monkeypatch.setattr(isolated_settings, 'HEALTH_DB_TIMEOUT_SECONDS', 0.05)
+    service = HealthService(db_service, _UnconfiguredEmailService())
+    
+    assert service.check_database()['ok']
+    
+    writer = _holding_write_lock(db_service.db_path)
+    try:
+        check = service.check_database()
+    finally:
+        writer.rollback()
+        writer.close()
+    
+    assert not check['ok']
+    assert 'locked' in check['error']
+
+
+def test_missing_database_is_not_ready_and_not_created(db_service, tmp_path):
+    db_service.db_path = str(tmp_path / 'ausente.db')
+    
+    check = HealthService(db_service, _UnconfiguredEmailService()).check_database()
+    
+    assert not check['ok']
+    assert not os.path.exists(db_service.db_path)
+
+
+def test_smtp_check_is_cached(db_service):
+    email_service = _FakeEmailService()
+    service = HealthService(db_service, email_service)
+    
+    first = service.check_smtp()
+    second = service.check_smtp()
+    
+    assert first['ok'] and not first['cached']
+    assert second['ok'] and second['cached']
+    assert email_service.checks == 1
+
+
+def test_failed_smtp_login_makes_instance_unready(db_service, isolated_settings, monkeypatch):
+    monkeypatch.setattr(isolated_settings, 'HEALTH_REQUIRE_SMTP', True)
+    
+    readiness = HealthService(db_service, _FakeEmailService(success=False)).get_readiness()
+    
+    assert not readiness['ready']
+    assert readiness['checks']['smtp']['error'] == 'Falha no login'
+
+
+def test_too_many_requests_in_flight(db_service, isolated_settings, monkeypatch):
+    monkeypatch.setattr(isolated_settings, 'HEALTH_MAX_IN_FLIGHT', 1)
+    service = HealthService(db_service, _UnconfiguredEmailService())
+    
+    service.request_started()
+    assert service.check_pending_work()['ok']
+    
+    service.request_started()
+    assert not service.check_pending_work()['ok']
+    
+    service.request_finished()
+    service.request_finished()
+    assert service.check_pending_work()['in_flight_requests'] == 0
+
+
+def test_ready_endpoint(isolated_settings):
+    from app.app import create_app
+    
+    app = create_app()
+    app.testing = True
+    
+    response = app.test_client().get('/health/ready')
+    
+    assert response.status_code == 200
+    assert response.get_json()['status'] == 'ok'
+
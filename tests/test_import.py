@@ -0,0 +1,101 @@
+"""
+Importação de histórico: ida e volta com a exportação (preservando
+created_at), linhas rejeitadas, duplicadas e acumuladores atualizados.
+"""
+
+import json
+
+import pytest
+
+from src.services.database_service import DatabaseService, REVIEW_FIELDS
+from src.services.export_service import ExportService
+from src.services.import_service import ImportService
+
+
+def _insert_history(db_service, days=40):
+    conn = db_service._get_connection().data
+    with conn:
+        conn.executemany('''
+            INSERT INTO reviews (work, training, studies, mind, positive_points, negative_points,
+                                 user_email, review_date, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (day % 11, (day * 3) % 11, 5, 10 - day % 11, f'Treino "forte", dia {day}', 'Sono\nruim',
+             user_email, f'2025-03-{day % 28 + 1:02d}' if day < 28 else f'2025-04-{day - 27:02d}',
+             f'2025-05-01 21:{day:02d}:07')
+            for day in range(days)
+            for user_email in ('ana@exemplo.com', 'bruno@exemplo.com')
+        ])
+    conn.close()
+
+
+def _rows(db_service):
+    conn = db_service._get_connection().data
+    try:
+        fields = ', '.join(field for field in REVIEW_FIELDS if field != 'id')
+        return sorted(conn.execute(f'SELECT {fields} FROM reviews').fetchall())
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def target_db(tmp_path):
+    """Segundo banco, vazio, que recebe a importação."""
+    db = DatabaseService()
+    db.db_path = str(tmp_path / 'destino.db')
+    assert db.create_tables().success
+    return db
+
+
+@pytest.mark.parametrize('filename', ['historico.csv', 'historico.csv.gz', 'historico.ndjson.gz'])
+def test_export_import_round_trip_preserves_created_at(db_service, target_db, tmp_path, filename):
+    _insert_history(db_service)
+    path = str(tmp_path / filename)
+    assert ExportService(db_service).export_to_file(path).success
+    
+    result = ImportService(target_db).import_file(path, batch_size=7)
+    
+    assert result.success, result.get_first_error()
+    assert (result.data['rows'], result.data['created'], result.data['rejected']) == (80, 80, 0)
+    assert _rows(target_db) == _rows(db_service)
+    assert _rows(target_db)[0][-1].startswith('2025-05-01 21:')
+    
+    stats = target_db.get_rollup_stats('2025-03-01', '2025-04-30').data
+    assert stats.count == 80
+    assert stats.to_dict() == db_service.get_weekly_stats('2025-03-01', '2025-04-30').data.to_dict()
+
+
+def test_reimport_counts_duplicates(db_service, target_db, tmp_path):
+    _insert_history(db_service, days=5)
+    path = str(tmp_path / 'historico.ndjson')
+    ExportService(db_service).export_to_file(path)
+    importer = ImportService(target_db)
+    
+    assert importer.import_file(path).data['created'] == 10
+    again = importer.import_file(path).data
+    
+    assert (again['created'], again['duplicates']) == (0, 10)
+    assert len(_rows(target_db)) == 10
+
+
+def test_rejected_lines_are_reported(target_db, tmp_path):
+    valid = {'work': 8, 'training': 7, 'studies': 9, 'mind': 6, 'positive_points': 'Bom',
+             'negative_points': 'Ruim', 'email': 'Ana@Exemplo.com', 'date': '05/10/2026'}
+    lines = [
+        json.dumps(valid),
+        '{quebrado',
+        json.dumps({**valid, 'date': '2026-10-06', 'work': 15}),
+        '',
+        json.dumps({**valid, 'date': '2026-10-07', 'created_at': 'ontem'}),
+        json.dumps([1, 2]),
+    ]
+    path = tmp_path / 'historico.ndjson'
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    
+    summary = ImportService(target_db).import_file(str(path)).data
+    
+    assert (summary['rows'], summary['created'], summary['rejected']) == (5, 1, 4)
+    assert [error['line'] for error in summary['errors']] == [2, 3, 5, 6]
+    assert summary['errors'][1]['messages'] == ['Campo work deve ser entre 0 e 10']
+    # Sem created_at, a avaliação importada fica no início do dia
+    assert _rows(target_db) == [(8, 7, 9, 6, 'Bom', 'Ruim', 'ana@exemplo.com', '2026-10-05', '2026-10-05 00:00:00')]
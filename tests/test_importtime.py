@@ -0,0 +1,32 @@
+"""
+Tempo de importação dos pontos de entrada (orçamentos de benchmark.py importtime).
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmark import IMPORT_BUDGETS_MS, _import_time_ms
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize('module, budget', sorted(IMPORT_BUDGETS_MS.items()))
+def test_entry_point_import_within_budget(module, budget):
+    # Melhor de 3 para não depender de ruído da máquina
+    elapsed = min(_import_time_ms(module) for _ in range(3))
+    assert elapsed <= budget, f"{module}: {elapsed:.1f} ms (orçamento {budget} ms)"
+
+
+@pytest.mark.parametrize('module', sorted(IMPORT_BUDGETS_MS))
+def test_entry_point_defers_heavy_modules(module):
+    # SMTP, MIME e Flask só são importados quando usados
+    code = (
+        f"import sys, {module}; "
+        "print(','.join(m for m in ('smtplib', 'email.mime.multipart', 'flask') if m in sys.modules))"
+    )
+    completed = subprocess.run([sys.executable, '-c', code], cwd=ROOT,
+                               capture_output=True, text=True, check=True)
+    assert completed.stdout.strip() == ''
@@ -0,0 +1,99 @@
+"""
+Índice de termos dos comentários: radicais, palavras ignoradas e temas mais
+citados conferidos contra a contagem direta dos comentários.
+"""
+
+import random
+from collections import Counter
+from datetime import date, timedelta
+
+import pytest
+
+from src.models.keywords import count_terms, iter_terms, stem
+from src.models.review import Review
+
+USERS = ('ana@exemplo.com', 'bruno@exemplo.com')
+POSITIVE_WORDS = ('treino', 'treinos', 'produtivo', 'produtiva', 'leitura', 'leituras', 'corrida',
+                  'reunião', 'reuniões', 'foco', 'meditação', 'família')
+NEGATIVE_WORDS = ('cansaço', 'sono', 'atraso', 'atrasos', 'ansiedade', 'dor', 'trânsito', 'prazo', 'prazos')
+
+
+def test_inflections_share_a_stem():
+    assert stem('produtivo') == stem('produtiva') == stem('produtivos')
+    assert stem('reunioes') == stem('reuniao')
+    assert stem('treinos') == stem('treino')
+
+
+def test_stopwords_accents_and_short_words_are_ignored():
+    terms = list(iter_terms('Hoje eu fiz TREINO às 6h e não fui à reunião 2x'))
+    
+    assert [word for _, word in terms] == ['fiz', 'treino', 'reunião']
+    assert list(iter_terms('')) == [] and list(iter_terms(None)) == []
+
+
+def test_count_terms_keeps_first_word_seen():
+    counts = count_terms('Reuniões longas, outra reunião e mais reuniões')
+    
+    assert counts[stem('reuniao')] == (3, 'reuniões')
+
+
+def _random_reviews(seed, days=35):
+    rng = random.Random(seed)
+    first_day = date(2026, 9, 1)
+    return [
+        Review(7, 7, 7, 7,
+               ' '.join(rng.choice(POSITIVE_WORDS) for _ in range(rng.randint(1, 4))),
+               'Dia com ' + ' e '.join(rng.choice(NEGATIVE_WORDS) for _ in range(rng.randint(1, 3))),
+               user_email=user_email, review_date=(first_day + timedelta(days=offset)).isoformat())
+        for offset in range(days)
+        for user_email in USERS
+        if rng.random() < 0.8
+    ]
+
+
+def _expected_top(reviews, kind, limit):
+    counts = Counter()
+    for review in reviews:
+        text = review.positive_points if kind == 'positive' else review.negative_points
+        counts.update(term for term, _ in iter_terms(text))
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    return ranked[:limit]
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_top_terms_match_direct_count(db_service, seed):
+    reviews = _random_reviews(seed)
+    for start in range(0, len(reviews), 9):
+        assert db_service.insert_reviews(reviews[start:start + 9]).success
+    
+    # 2026-09-07 (segunda) a 2026-09-27 (domingo): três semanas ISO inteiras
+    for user_email in USERS + (None,):
+        terms = db_service.get_top_terms('2026-09-07', '2026-09-27', user_email, limit=4).data
+        in_period = [review for review in reviews
+                     if '2026-09-07' <= review.review_date <= '2026-09-27'
+                     and user_email in (None, review.user_email)]
+        for kind in ('positive', 'negative'):
+            assert [(term['term'], term['count']) for term in terms[kind]] == _expected_top(in_period, kind, 4)
+
+
+def test_rebuilt_index_matches_incremental(db_service):
+    reviews = _random_reviews(8)
+    for review in reviews:
+        assert db_service.insert_review(review).success
+    incremental = db_service.get_top_terms('2026-09-01', '2026-10-05', limit=20).data
+    
+    conn = db_service._get_connection().data
+    with conn:
+        db_service._rebuild_terms(conn.cursor())
+    conn.close()
+    
+    assert db_service.get_top_terms('2026-09-01', '2026-10-05', limit=20).data == incremental
+
+
+def test_top_terms_by_user_match_single_user_queries(db_service):
+    assert db_service.insert_reviews(_random_reviews(4)).success
+    
+    grouped = db_service.get_top_terms_by_user(list(USERS), '2026-09-07', '2026-09-13', limit=3).data
+    
+    for user_email in USERS:
+        assert grouped[user_email] == db_service.get_top_terms('2026-09-07', '2026-09-13', user_email, limit=3).data
@@ -0,0 +1,113 @@
+"""
+Ingestão de caixas mbox: ponto de controle entre execuções e retomada
+depois de um lote com erro.
+"""
+
+import mailbox
+from email.message import EmailMessage
+
+from src.models.result import Result
+from src.services.mailbox_ingest_service import MailboxIngestService
+
+
+BODY = (
+    "work: 5\ntraining: 6\nstudies: 7\nmind: 8\n"
+    "positive_points: ok\nnegative_points: nada\n"
+)
+
+
+class FakeConfirmationService:
+    """Registra as confirmações em lote em vez de enviá-las."""
+    
+    def __init__(self):
+        self.confirmed = []
+    
+    def send_batch_confirmations(self, reviews_by_user, notify_admin=True):
+        self.confirmed.extend(
+            (email, review.review_date) for email, reviews in reviews_by_user.items() for review in reviews
+        )
+        return Result.success_result({email: None for email in reviews_by_user})
+
+
+def _append_messages(path, start, count):
+    box = mailbox.mbox(path)
+    try:
+        for index in range(start, start + count):
+            message = EmailMessage()
+            message['From'] = f'usuario{index}@exemplo.com'
+            message['To'] = 'diario@exemplo.com'
+            message['Subject'] = 'Re: Avaliação diária'
+            message['Date'] = 'Wed, 07 Oct 2026 21:00:00 -0300'
+            message['Message-ID'] = f'<mensagem-{index}@exemplo.com>'
+            message.set_content(BODY)
+            box.add(message)
+        box.flush()
+    finally:
+        box.close()
+
+
+def _count_reviews(db_service):
+    conn = db_service._get_connection().data
+    try:
+        return conn.execute('SELECT COUNT(*) FROM reviews').fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_rerun_only_reads_new_messages(db_service, tmp_path):
+    path = str(tmp_path / 'respostas.mbox')
+    _append_messages(path, 0, 3)
+    confirmations = FakeConfirmationService()
+    service = MailboxIngestService(db_service, confirmations)
+    
+    first = service.ingest(path, workers=1, batch_size=2)
+    assert first.success
+    assert first.data['messages'] == 3 and first.data['created'] == 3
+    
+    rerun = service.ingest(path, workers=1, batch_size=2)
+    assert rerun.success
+    assert rerun.data['messages'] == 0 and rerun.data['created'] == 0
+    
+    _append_messages(path, 3, 2)
+    appended = service.ingest(path, workers=1, batch_size=2)
+    assert appended.success
+    assert appended.data['messages'] == 2 and appended.data['created'] == 2
+    
+    assert _count_reviews(db_service) == 5
+    assert sorted(email for email, _ in confirmations.confirmed) == [
+        f'usuario{index}@exemplo.com' for index in range(5)
+    ]
+    assert {review_date for _, review_date in confirmations.confirmed} == {'2026-10-07'}
+
+
+def test_failed_batch_confirms_committed_reviews_and_resumes(db_service, tmp_path, monkeypatch):
+    path = str(tmp_path / 'respostas.mbox')
+    _append_messages(path, 0, 3)
+    confirmations = FakeConfirmationService()
+    service = MailboxIngestService(db_service, confirmations)
+    
+    insert_reviews = db_service.insert_reviews
+    calls = []
+    
+    def failing_insert(reviews):
+        calls.append(len(reviews))
+        if len(calls) == 2:
+            return Result.error_result('Banco indisponível')
+        return insert_reviews(reviews)
+    
+    monkeypatch.setattr(db_service, 'insert_reviews', failing_insert)
+    failed = service.ingest(path, workers=1, batch_size=1)
+    
+    assert not failed.success
+    assert failed.data['created'] == 1
+    assert confirmations.confirmed == [('usuario0@exemplo.com', '2026-10-07')]
+    
+    monkeypatch.setattr(db_service, 'insert_reviews', insert_reviews)
+    resumed = service.ingest(path, workers=1, batch_size=1)
+    
+    assert resumed.success
+    assert resumed.data['messages'] == 2 and resumed.data['created'] == 2
+    assert _count_reviews(db_service) == 3
+    assert sorted(email for email, _ in confirmations.confirmed) == [
+        f'usuario{index}@exemplo.com' for index in range(3)
+    ]
@@ -0,0 +1,115 @@
+"""
+Limites de requisições: token bucket, 429 com Retry-After e baldes
+separados para envios e leituras.
+"""
+
+import pytest
+
+from src.models.result import Result
+from src.services import rate_limit_service
+from src.services.confirmation_service import ConfirmationService
+from src.services.rate_limit_service import RateLimitService
+
+
+class _Clock:
+    """Relógio manual no lugar de time.monotonic."""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(rate_limit_service.time, 'monotonic', clock)
+    return clock
+
+
+@pytest.fixture
+def client(isolated_settings, monkeypatch):
+    """Cliente com limites baixos (rajada de 2) e confirmações desligadas."""
+    from app.app import create_app
+    
+    monkeypatch.setattr(isolated_settings, 'RATE_LIMIT_ENABLED', True)
+    monkeypatch.setattr(isolated_settings, 'RATE_LIMIT_IP_PER_MINUTE', 1)
+    monkeypatch.setattr(isolated_settings, 'RATE_LIMIT_IP_BURST', 2)
+    monkeypatch.setattr(isolated_settings, 'RATE_LIMIT_READ_PER_MINUTE', 1)
+    monkeypatch.setattr(isolated_settings, 'RATE_LIMIT_READ_BURST', 2)
+    monkeypatch.setattr(ConfirmationService, 'send_evaluation_confirmation',
+                        lambda self, review, user_email: Result.success_result())
+    monkeypatch.setattr(ConfirmationService, 'send_admin_notification',
+                        lambda self, review, user_email: Result.success_result())
+    
+    app = create_app()
+    app.testing = True
+    return app.test_client()
+
+
+def _submission(day):
+    return {
+        'work': 8, 'training': 7, 'studies': 9, 'mind': 6,
+        'positive_points': 'Dia produtivo', 'negative_points': 'Dormi pouco',
+        'email': 'usuario@exemplo.com', 'date': f'2026-10-0{day}'
+    }
+
+
+def test_bucket_allows_burst_then_reports_wait(clock):
+    limiter = RateLimitService(rate=0.5, capacity=2)
+    
+    assert limiter.try_acquire('ip') == 0
+    assert limiter.try_acquire('ip') == 0
+    assert limiter.try_acquire('ip') == pytest.approx(2.0)
+    
+    clock.now += 2
+    assert limiter.try_acquire('ip') == 0
+    assert limiter.try_acquire('outro-ip') == 0
+
+
+def test_acquire_all_consumes_nothing_when_one_key_is_empty(clock):
+    limiter = RateLimitService(rate=1, capacity=1)
+    assert limiter.try_acquire('b') == 0
+    
+    assert limiter.try_acquire_all(['a', 'b']) > 0
+    assert limiter.try_acquire('a') == 0
+
+
+def test_prune_keeps_key_count_bounded(clock):
+    limiter = RateLimitService(rate=1, capacity=1, max_keys=3)
+    
+    for index in range(10):
+        clock.now += 0.1
+        limiter.try_acquire(f'ip-{index}')
+    
+    assert len(limiter._buckets) <= 3
+    assert 'ip-9' in limiter._buckets
+
+
+def test_submit_returns_429_with_retry_after(client):
+    statuses = [client.post('/api/submit', json=_submission(day)).status_code for day in (1, 2, 3)]
+    
+    assert statuses == [200, 200, 429]
+    response = client.post('/api/submit', json=_submission(4))
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+    assert response.get_json()['success'] is False
+
+
+@pytest.mark.parametrize('path', [
+    '/api/reviews', '/api/stats/weekly', '/api/stats/range', '/api/stats/themes',
+    '/api/stats/correlations', '/api/export', '/api/reports/weekly',
+])
+def test_read_endpoints_are_limited(client, path):
+    statuses = [client.get(path).status_code for _ in range(3)]
+    
+    assert 429 not in statuses[:2]
+    assert statuses[2] == 429
+
+
+def test_reads_do_not_consume_the_submit_bucket(client):
+    for _ in range(3):
+        client.get('/api/reviews')
+    
+    assert client.post('/api/submit', json=_submission(1)).status_code == 200
@@ -0,0 +1,115 @@
+"""
+API de leitura: paginação por cursor, seleção de campos, estatísticas e
+ETags que evitam repetir consultas.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from src.models.review import Review
+from src.services.database_service import DatabaseService
+
+
+@pytest.fixture
+def client(db_service, isolated_settings, monkeypatch):
+    """Cliente da aplicação sobre o banco temporário, sem limites de requisições."""
+    from app.app import create_app
+    
+    monkeypatch.setattr(isolated_settings, 'RATE_LIMIT_ENABLED', False)
+    app = create_app()
+    app.testing = True
+    return app.test_client()
+
+
+def _review(day, work=8, user_email='usuario@exemplo.com'):
+    return Review(work, 7, 9, 6, 'Dia produtivo', 'Dormi pouco', user_email=user_email,
+                  review_date=(date(2026, 9, 1) + timedelta(days=day)).isoformat())
+
+
+def _insert(db_service, reviews):
+    result = db_service.insert_reviews(reviews)
+    assert result.success, result.get_first_error()
+
+
+def test_cursor_pages_cover_every_review_once(client, db_service):
+    _insert(db_service, [_review(day) for day in range(23)])
+    
+    ids = []
+    cursor = None
+    pages = 0
+    while True:
+        query = '/api/reviews?limit=5' + (f'&cursor={cursor}' if cursor else '')
+        body = client.get(query).get_json()
+        ids.extend(review['id'] for review in body['reviews'])
+        pages += 1
+        cursor = body['next_cursor']
+        if cursor is None:
+            break
+    
+    assert pages == 5
+    assert ids == sorted(ids, reverse=True)
+    assert len(ids) == len(set(ids)) == 23
+
+
+def test_filters_and_field_selection(client, db_service):
+    _insert(db_service, [_review(day) for day in range(10)] + [_review(3, user_email='outro@exemplo.com')])
+    
+    body = client.get('/api/reviews?start=2026-09-03&end=05/09/2026&email=usuario@exemplo.com'
+                      '&fields=review_date,work').get_json()
+    
+    assert [review['review_date'] for review in body['reviews']] == ['2026-09-05', '2026-09-04', '2026-09-03']
+    assert set(body['reviews'][0]) == {'id', 'review_date', 'work'}
+
+
+@pytest.mark.parametrize('query', ['limit=0', 'limit=abc', 'fields=senha', 'start=ontem'])
+def test_invalid_parameters(client, query):
+    response = client.get(f'/api/reviews?{query}')
+    
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+def test_limit_is_capped(client, db_service, isolated_settings, monkeypatch):
+    monkeypatch.setattr(isolated_settings, 'API_PAGE_MAX_LIMIT', 3)
+    _insert(db_service, [_review(day) for day in range(5)])
+    
+    body = client.get('/api/reviews?limit=100').get_json()
+    
+    assert len(body['reviews']) == 3
+    assert body['next_cursor'] is not None
+
+
+def test_range_stats(client, db_service):
+    _insert(db_service, [_review(0, work=4), _review(1, work=10), _review(9, work=0)])
+    
+    body = client.get('/api/stats/range?start=2026-09-01&end=2026-09-02').get_json()
+    
+    assert body['total_reviews'] == 2
+    assert body['avg_work'] == 7
+    assert (body['first_date'], body['last_date']) == ('2026-09-01', '2026-09-02')
+
+
+def test_etag_skips_the_query_until_a_review_is_added(client, db_service, monkeypatch):
+    _insert(db_service, [_review(0)])
+    calls = []
+    original = DatabaseService.get_reviews_page
+    monkeypatch.setattr(DatabaseService, 'get_reviews_page',
+                        lambda self, *args: calls.append(args) or original(self, *args))
+    
+    first = client.get('/api/reviews')
+    etag = first.headers['ETag']
+    cached = client.get('/api/reviews', headers={'If-None-Match': etag})
+    other_query = client.get('/api/reviews?limit=1', headers={'If-None-Match': etag})
+    
+    assert first.status_code == 200
+    assert cached.status_code == 304
+    assert other_query.status_code == 200
+    assert len(calls) == 2
+    
+    _insert(db_service, [_review(1)])
+    changed = client.get('/api/reviews', headers={'If-None-Match': etag})
+    
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert len(changed.get_json()['reviews']) == 2
@@ -0,0 +1,122 @@
+"""
+Cache dos relatórios semanais: reaproveitado enquanto a marca d'água dos
+dados não muda e invalidado por novas avaliações ou mudança de versão.
+"""
+
+from datetime import date
+
+import pytest
+
+from src.models.review import Review
+from src.services import report_cache_service, weekly_report_service
+from src.services.report_cache_service import CachedReport, ReportCacheService
+from src.services.weekly_report_service import WeeklyReportService
+
+WEEK_START, WEEK_END = '2026-10-05', '2026-10-11'
+
+
+class _FixedDate(date):
+    """date.today() fixo em uma quarta-feira da semana do relatório."""
+    
+    @classmethod
+    def today(cls):
+        return cls(2026, 10, 7)
+
+
+def _review(review_date, user_email='usuario@exemplo.com', work=8):
+    return Review(work, 7, 9, 6, 'Dia produtivo', 'Dormi pouco', user_email=user_email, review_date=review_date)
+
+
+def _insert(db_service, *reviews):
+    assert db_service.insert_reviews(list(reviews)).success
+
+
+@pytest.fixture
+def cache(db_service):
+    cache = ReportCacheService(db_service)
+    assert cache.create_tables().success
+    return cache
+
+
+@pytest.fixture
+def service(db_service, monkeypatch):
+    monkeypatch.setattr(weekly_report_service, 'date', _FixedDate)
+    service = WeeklyReportService(db_service=db_service)
+    original = service._render_report
+    service.renders = 0
+    
+    def counting_render(*args, **kwargs):
+        service.renders += 1
+        return original(*args, **kwargs)
+    
+    monkeypatch.setattr(service, '_render_report', counting_render)
+    return service
+
+
+def test_watermark_changes_only_with_data_up_to_the_week(db_service, cache):
+    _insert(db_service, _review('2026-10-06'))
+    watermark = cache.get_watermark(WEEK_START, WEEK_END).data
+    
+    _insert(db_service, _review('2026-10-20'))
+    assert cache.get_watermark(WEEK_START, WEEK_END).data == watermark
+    
+    # As tendências dependem das semanas anteriores
+    _insert(db_service, _review('2026-09-01'))
+    assert cache.get_watermark(WEEK_START, WEEK_END).data != watermark
+
+
+def test_per_user_watermarks_ignore_other_users(db_service, cache):
+    _insert(db_service, _review('2026-10-06'), _review('2026-10-06', user_email='outro@exemplo.com'))
+    before = cache.get_watermarks_by_user(WEEK_START, WEEK_END).data
+    
+    _insert(db_service, _review('2026-10-07', user_email='outro@exemplo.com'))
+    after = cache.get_watermarks_by_user(WEEK_START, WEEK_END).data
+    
+    assert set(before) == {'usuario@exemplo.com', 'outro@exemplo.com'}
+    assert after['usuario@exemplo.com'] == before['usuario@exemplo.com']
+    assert after['outro@exemplo.com'] != before['outro@exemplo.com']
+
+
+def test_get_many_returns_only_current_entries(cache):
+    report = CachedReport('Assunto', 'texto', '<p>html</p>', {'total_reviews': 1}, {'insights': []})
+    assert cache.save([
+        ('a@exemplo.com', WEEK_START, 'w1', report),
+        ('b@exemplo.com', WEEK_START, 'w1', report),
+    ]).success
+    
+    hits = cache.get_many(WEEK_START, {'a@exemplo.com': 'w1', 'b@exemplo.com': 'w2', 'c@exemplo.com': 'w1'})
+    
+    assert list(hits) == ['a@exemplo.com']
+    assert hits['a@exemplo.com'].html == '<p>html</p>'
+    assert hits['a@exemplo.com'].weekly_data == {'total_reviews': 1}
+
+
+def test_report_is_reused_until_the_week_changes(db_service, service):
+    _insert(db_service, _review('2026-10-05'), _review('2026-10-06', work=3))
+    
+    first = service.generate_weekly_report()
+    second = service.generate_weekly_report()
+    
+    assert not first.data['cached'] and second.data['cached']
+    assert second.data['report'] == first.data['report']
+    assert service.renders == 1
+    
+    _insert(db_service, _review('2026-10-07', work=10))
+    third = service.generate_weekly_report()
+    
+    assert not third.data['cached']
+    assert third.data['weekly_data']['total_reviews'] == 3
+    assert service.renders == 2
+
+
+def test_lexicon_or_format_version_invalidates_the_cache(db_service, service, monkeypatch):
+    _insert(db_service, _review('2026-10-05'))
+    service.generate_weekly_report()
+    
+    monkeypatch.setattr(report_cache_service, 'LEXICON_VERSION', report_cache_service.LEXICON_VERSION + 1)
+    assert not service.generate_weekly_report().data['cached']
+    
+    monkeypatch.setattr(report_cache_service, 'REPORT_CACHE_VERSION', report_cache_service.REPORT_CACHE_VERSION + 1)
+    assert not service.generate_weekly_report().data['cached']
+    assert service.generate_weekly_report().data['cached']
+    assert service.renders == 3
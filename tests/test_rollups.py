@@ -0,0 +1,108 @@
+"""
+Acumuladores de Welford (review_rollups): períodos calculados pelos
+acumuladores de dias e semanas conferidos contra o recálculo direto.
+"""
+
+import random
+import statistics
+from datetime import date, timedelta
+
+import pytest
+
+from src.models.review import Review
+from src.models.running_stats import ReviewAccumulator, RunningStats
+
+USERS = ('ana@exemplo.com', 'bruno@exemplo.com')
+FIRST_DAY = date(2026, 8, 5)
+
+
+def _random_reviews(seed, days=60):
+    rng = random.Random(seed)
+    return [
+        Review(*(rng.randint(0, 10) for _ in range(4)), 'Dia bom', 'Dia ruim',
+               user_email=user_email, review_date=(FIRST_DAY + timedelta(days=offset)).isoformat())
+        for offset in range(days)
+        for user_email in USERS
+        if rng.random() < 0.8
+    ]
+
+
+def _assert_matches(stats, reviews):
+    columns = list(zip(*[(review.work, review.training, review.studies, review.mind) for review in reviews]))
+    assert stats.count == len(reviews)
+    for area, column in zip(stats.areas, columns):
+        assert area.integer_mean == sum(column) / len(column)
+        assert area.variance == pytest.approx(statistics.pvariance(column), abs=1e-9)
+    all_scores = [score for column in columns for score in column]
+    assert stats.overall.variance == pytest.approx(statistics.pvariance(all_scores), abs=1e-9)
+
+
+def test_running_stats_add_and_merge_match_direct_variance():
+    rng = random.Random(3)
+    values = [rng.randint(0, 10) for _ in range(500)]
+    
+    parts = [RunningStats() for _ in range(7)]
+    for index, value in enumerate(values):
+        parts[index % 7].add(value)
+    merged = RunningStats()
+    for part in parts + [RunningStats()]:
+        merged.merge(part)
+    
+    assert merged.count == 500
+    assert merged.integer_mean == sum(values) / 500
+    assert merged.variance == pytest.approx(statistics.pvariance(values), abs=1e-9)
+
+
+def test_accumulator_row_round_trip():
+    accumulator = ReviewAccumulator()
+    for row in ((8, 7, 9, 6), (3, 10, 0, 5), (6, 6, 6, 6)):
+        accumulator.add(*row)
+    
+    restored = ReviewAccumulator.from_row(accumulator.to_row())
+    
+    assert restored.to_row() == accumulator.to_row()
+    assert restored.consistency_score == accumulator.consistency_score
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_rollup_periods_match_direct_computation(db_service, seed):
+    reviews = _random_reviews(seed)
+    # Vários lotes: os acumuladores são combinados a cada gravação
+    for start in range(0, len(reviews), 17):
+        assert db_service.insert_reviews(reviews[start:start + 17]).success
+    
+    rng = random.Random(seed)
+    for _ in range(10):
+        first = FIRST_DAY + timedelta(days=rng.randint(0, 50))
+        last = first + timedelta(days=rng.randint(0, 30))
+        user_email = rng.choice(USERS + (None,))
+        
+        stats = db_service.get_rollup_stats(first.isoformat(), last.isoformat(), user_email).data
+        
+        _assert_matches(stats, [
+            review for review in reviews
+            if first.isoformat() <= review.review_date <= last.isoformat()
+            and user_email in (None, review.user_email)
+        ])
+
+
+def test_rebuild_matches_incremental_rollups(db_service):
+    reviews = _random_reviews(9)
+    for review in reviews:
+        assert db_service.insert_review(review).success
+    incremental = db_service.get_week_rollups(per_user=True).data
+    
+    assert db_service.rebuild_rollups().success
+    rebuilt = db_service.get_week_rollups(per_user=True).data
+    
+    assert [week[:2] for week in rebuilt] == [week[:2] for week in incremental]
+    for (_, _, rebuilt_row), (_, _, incremental_row) in zip(rebuilt, incremental):
+        assert rebuilt_row[0] == incremental_row[0]
+        assert rebuilt_row[1:] == pytest.approx(incremental_row[1:], abs=1e-9)
+
+
+def test_empty_period(db_service):
+    stats = db_service.get_rollup_stats('2026-09-01', '2026-09-30').data
+    
+    assert stats.count == 0
+    assert stats.to_dict()['total_reviews'] == 0
@@ -0,0 +1,132 @@
+"""
+Agendador em processo: cada horário é reservado no banco antes de rodar, então
+nenhuma tarefa roda duas vezes, e horários perdidos recentes são recuperados.
+"""
+
+import threading
+from datetime import datetime
+
+import pytest
+
+from src.models.result import Result
+from src.services.scheduler_service import SchedulerService, parse_days, parse_time
+
+# Sexta-feira: o formulário diário (segunda, quarta e sexta às 20:00) tem horário hoje
+FRIDAY_EVENING = datetime(2026, 10, 16, 20, 0, 30)
+
+
+@pytest.fixture
+def make_scheduler(db_service):
+    """Cria agendadores no mesmo banco, com tarefas que só registram os horários executados."""
+    def make(result=None):
+        scheduler = SchedulerService(db_service=db_service, daily_form_service=object(),
+                                     weekly_report_service=object())
+        assert scheduler.create_tables().success
+        scheduler.runs = []
+        
+        def action(slot):
+            scheduler.runs.append(slot)
+            return result if result is not None else Result.success_result()
+        
+        for job in scheduler.jobs.values():
+            job.action = action
+        return scheduler
+    
+    return make
+
+
+def _status(scheduler, name):
+    return next(run for run in scheduler.get_status().data if run['job'] == name)
+
+
+def test_parse_days_and_time():
+    assert parse_days('Friday, monday,wednesday,monday') == (0, 2, 4)
+    assert parse_time(' 07:05 ').strftime('%H:%M') == '07:05'
+    with pytest.raises(ValueError):
+        parse_days('segunda')
+    with pytest.raises(ValueError):
+        parse_time('25:00')
+
+
+def test_latest_slot_is_the_last_configured_day_and_time(make_scheduler):
+    job = make_scheduler().jobs['daily_form']
+    
+    assert job.latest_slot(FRIDAY_EVENING) == datetime(2026, 10, 16, 20, 0)
+    assert job.latest_slot(datetime(2026, 10, 16, 19, 59)) == datetime(2026, 10, 14, 20, 0)
+    assert job.latest_slot(datetime(2026, 10, 19, 8, 0)) == datetime(2026, 10, 16, 20, 0)
+
+
+def test_slot_runs_once(make_scheduler):
+    scheduler = make_scheduler()
+    
+    assert scheduler.run_job('daily_form', FRIDAY_EVENING).success
+    assert scheduler.run_job('daily_form', FRIDAY_EVENING) is None
+    assert scheduler.run_job('daily_form', datetime(2026, 10, 16, 23, 0)) is None
+    
+    assert scheduler.runs == [datetime(2026, 10, 16, 20, 0)]
+    status = _status(scheduler, 'daily_form')
+    assert (status['slot'], status['status'], status['error']) == ('2026-10-16 20:00', 'success', None)
+    assert status['next_slot'] > '2026-10-16 20:00'
+
+
+def test_concurrent_schedulers_on_one_database_claim_each_slot_once(make_scheduler):
+    schedulers = [make_scheduler() for _ in range(4)]
+    barrier = threading.Barrier(len(schedulers))
+    
+    def run(scheduler):
+        barrier.wait()
+        scheduler.run_due(FRIDAY_EVENING)
+    
+    threads = [threading.Thread(target=run, args=(scheduler,)) for scheduler in schedulers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    # O relatório semanal do último sábado já passou da janela de recuperação
+    assert sum(len(scheduler.runs) for scheduler in schedulers) == 1
+
+
+def test_missed_slot_is_caught_up_within_the_window(make_scheduler):
+    scheduler = make_scheduler()
+    
+    # Sábado 07:00: o formulário de sexta às 20:00 foi perdido há 11 horas
+    results = scheduler.run_due(datetime(2026, 10, 17, 7, 0))
+    
+    assert results['daily_form'].success and results['weekly_report'] is None
+    assert scheduler.runs == [datetime(2026, 10, 16, 20, 0)]
+
+
+def test_missed_slot_outside_the_window_is_skipped(make_scheduler, monkeypatch):
+    scheduler = make_scheduler()
+    
+    assert scheduler.run_job('daily_form', datetime(2026, 10, 17, 8, 1)) is None
+    
+    monkeypatch.setattr('src.services.scheduler_service.settings.SCHEDULER_CATCHUP_HOURS', 24)
+    assert scheduler.run_job('daily_form', datetime(2026, 10, 17, 8, 1)).success
+    assert scheduler.runs == [datetime(2026, 10, 16, 20, 0)]
+
+
+def test_failed_run_is_recorded_and_not_retried(make_scheduler):
+    scheduler = make_scheduler(Result.error_result('SMTP fora do ar'))
+    
+    assert not scheduler.run_job('daily_form', FRIDAY_EVENING).success
+    assert scheduler.run_job('daily_form', FRIDAY_EVENING) is None
+    
+    status = _status(scheduler, 'daily_form')
+    assert (status['status'], status['error']) == ('error', 'SMTP fora do ar')
+    assert len(scheduler.runs) == 1
+
+
+def test_exception_in_job_is_recorded(make_scheduler):
+    scheduler = make_scheduler()
+    
+    def broken(slot):
+        raise RuntimeError('sem conexão')
+    
+    scheduler.jobs['weekly_report'].action = broken
+    
+    result = scheduler.run_job('weekly_report', datetime(2026, 10, 17, 9, 30))
+    
+    assert result.get_first_error() == 'Erro ao executar weekly_report: sem conexão'
+    assert _status(scheduler, 'weekly_report')['status'] == 'error'
@@ -0,0 +1,56 @@
+"""
+Nota de sentimento dos comentários (léxico, negações e intensificadores).
+"""
+
+from src.models import sentiment
+from src.models.sentiment import SENTIMENT_SCORER, SentimentScorer
+
+
+def test_polarity_and_inflections():
+    assert SENTIMENT_SCORER.score('Dia produtivo e feliz') > 0
+    assert SENTIMENT_SCORER.score('Cansado e estressado') < 0
+    assert SENTIMENT_SCORER.score('cansada') == SENTIMENT_SCORER.score('cansado')
+    assert SENTIMENT_SCORER.score('Cansado') == SENTIMENT_SCORER.score('cansado')
+
+
+def test_neutral_and_empty_text():
+    assert SENTIMENT_SCORER.score(None) == 0.0
+    assert SENTIMENT_SCORER.score('') == 0.0
+    assert SENTIMENT_SCORER.score('reunião de planejamento às 10') == 0.0
+
+
+def test_negation_and_intensifier():
+    good = SENTIMENT_SCORER.score('foi bom')
+    assert SENTIMENT_SCORER.score('não foi bom') < 0 < good
+    assert SENTIMENT_SCORER.score('muito bom') > good
+    assert SENTIMENT_SCORER.score('pouco bom') < good
+
+
+def test_score_stays_in_range():
+    text = ' '.join(['excelente'] * 200)
+    assert 0 < SENTIMENT_SCORER.score(text) <= 1
+    assert -1 <= SENTIMENT_SCORER.score(' '.join(['péssimo'] * 200)) < 0
+
+
+def test_lexicon_words_are_not_stopwords():
+    from src.models.keywords import STOPWORDS, fold_accents
+    
+    assert not {fold_accents(word) for word in sentiment.LEXICON} & STOPWORDS
+
+
+def test_score_review_averages_both_comments():
+    positive, negative, average = SENTIMENT_SCORER.score_review('ótimo dia', 'cansado')
+    assert positive > 0 > negative
+    assert average == round((positive + negative) / 2, 4)
+
+
+def test_neutral_word_table_is_bounded(monkeypatch):
+    monkeypatch.setattr(sentiment, 'NEUTRAL_CACHE_SIZE', 100)
+    scorer = SentimentScorer()
+    initial = len(scorer._tokens)
+    
+    scorer.score_many(f'palavra{chr(97 + index % 26)}{index:05d}x' for index in range(5000))
+    scorer.score('produtivo produtiva produtivos')
+    
+    assert len(scorer._tokens) <= initial + 100 + 3
+    assert scorer.score('produtiva') > 0
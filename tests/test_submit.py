@@ -0,0 +1,235 @@
+"""
+Envio de avaliações pela API: retentativas com Idempotency-Key, uma
+avaliação por usuário por dia e envio em lote.
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from src.models.result import Result
+from src.models.review import Review
+from src.services.confirmation_service import ConfirmationService
+from src.services.database_service import DatabaseService
+
+
+@pytest.fixture
+def client(isolated_settings, monkeypatch):
+    """Cliente da aplicação com banco temporário e confirmações contadas (sem SMTP)."""
+    from app.app import create_app
+    
+    monkeypatch.setattr(isolated_settings, 'RATE_LIMIT_ENABLED', False)
+    
+    sent = []
+    monkeypatch.setattr(ConfirmationService, 'send_evaluation_confirmation',
+                        lambda self, review, user_email: sent.append(user_email) or Result.success_result())
+    monkeypatch.setattr(ConfirmationService, 'send_admin_notification',
+                        lambda self, review, user_email: Result.success_result())
+    
+    batch_sent = []
+    monkeypatch.setattr(ConfirmationService, 'send_batch_confirmation',
+                        lambda self, reviews, user_email: batch_sent.append((user_email, len(reviews)))
+                        or Result.success_result())
+    monkeypatch.setattr(ConfirmationService, 'send_admin_batch_notification',
+                        lambda self, reviews_by_user: Result.success_result())
+    
+    app = create_app()
+    app.testing = True
+    client = app.test_client()
+    client.confirmations = sent
+    client.batch_confirmations = batch_sent
+    return client
+
+
+def _submission(**overrides):
+    data = {
+        'work': 8, 'training': 7, 'studies': 9, 'mind': 6,
+        'positive_points': 'Dia produtivo', 'negative_points': 'Dormi pouco',
+        'email': 'usuario@exemplo.com', 'date': '2026-10-05'
+    }
+    data.update(overrides)
+    return data
+
+
+def _count_reviews(user_email='usuario@exemplo.com'):
+    conn = DatabaseService()._get_connection().data
+    try:
+        return conn.execute('SELECT COUNT(*) FROM reviews WHERE user_email = ?', (user_email,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_retry_with_same_key_replays_original_response(client):
+    headers = {'Idempotency-Key': 'chave-1'}
+    
+    first = client.post('/api/submit', json=_submission(), headers=headers)
+    retry = client.post('/api/submit', json=_submission(), headers=headers)
+    
+    assert first.status_code == 200
+    assert retry.status_code == 200
+    assert retry.headers.get('Idempotent-Replayed') == 'true'
+    assert retry.get_json() == first.get_json()
+    assert _count_reviews() == 1
+    assert client.confirmations == ['usuario@exemplo.com']
+
+
+def test_same_key_with_other_body_is_rejected(client):
+    headers = {'Idempotency-Key': 'chave-1'}
+    
+    client.post('/api/submit', json=_submission(), headers=headers)
+    response = client.post('/api/submit', json=_submission(work=2), headers=headers)
+    
+    assert response.status_code == 422
+    assert _count_reviews() == 1
+
+
+def test_corrected_submission_after_error_reuses_key(client):
+    headers = {'Idempotency-Key': 'chave-1'}
+    
+    invalid = client.post('/api/submit', json=_submission(work=11), headers=headers)
+    corrected = client.post('/api/submit', json=_submission(), headers=headers)
+    
+    assert invalid.status_code == 400
+    assert corrected.status_code == 200
+    assert 'Idempotent-Replayed' not in corrected.headers
+    assert _count_reviews() == 1
+
+
+def test_second_submission_on_same_day_keeps_the_first(client):
+    first = client.post('/api/submit', json=_submission(), headers={'Idempotency-Key': 'a'})
+    second = client.post('/api/submit', json=_submission(work=1), headers={'Idempotency-Key': 'b'})
+    other_day = client.post('/api/submit', json=_submission(date='2026-10-06'),
+                            headers={'Idempotency-Key': 'c'})
+    
+    assert second.status_code == 200
+    assert second.headers.get('Idempotent-Replayed') == 'true'
+    assert second.get_json()['review_id'] == first.get_json()['review_id']
+    assert other_day.get_json()['review_id'] != first.get_json()['review_id']
+    assert _count_reviews() == 2
+    assert len(client.confirmations) == 2
+
+
+def test_insert_review_once_per_user_and_day(db_service):
+    def review(work):
+        return Review(work, 5, 5, 5, 'Bom', 'Ruim', user_email='usuario@exemplo.com',
+                      review_date='2026-10-05')
+    
+    first = db_service.insert_review_once(review(8))
+    second = db_service.insert_review_once(review(2))
+    
+    assert first.data['created'] and not second.data['created']
+    assert second.data['review'].id == first.data['review'].id
+    assert second.data['review'].work == 8
+    
+    stats = db_service.get_weekly_stats('2026-10-05', '2026-10-05')
+    assert stats.data.count == 1
+
+
+def test_migration_moves_duplicate_reviews_per_day_to_backup(isolated_settings):
+    conn = sqlite3.connect(isolated_settings.DATABASE_PATH)
+    conn.execute('''
+        CREATE TABLE reviews (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            work INTEGER, training INTEGER, studies INTEGER, mind INTEGER,
+            positive_points TEXT, negative_points TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, user_email TEXT
+        )
+    ''')
+    for work in (3, 9):
+        conn.execute('''
+            INSERT INTO reviews (work, training, studies, mind, positive_points, negative_points,
+                                 created_at, user_email)
+            VALUES (?, 5, 5, 5, 'Bom', 'Ruim', '2026-10-05 21:00:00', 'usuario@exemplo.com')
+        ''', (work,))
+    conn.commit()
+    conn.close()
+    
+    db_service = DatabaseService()
+    assert db_service.create_tables().success
+    
+    reviews = db_service.get_reviews_by_date_range('2026-10-05', '2026-10-05').data
+    assert [review.work for review in reviews] == [9]
+    assert db_service.get_rollup_stats('2026-10-05', '2026-10-05', 'usuario@exemplo.com').data.count == 1
+    
+    conn = sqlite3.connect(isolated_settings.DATABASE_PATH)
+    try:
+        backup = conn.execute('SELECT work, review_date FROM reviews_duplicates_removed').fetchall()
+    finally:
+        conn.close()
+    assert backup == [(3, '2026-10-05')]
+
+
+def test_batch_reports_a_result_per_item(client):
+    client.post('/api/submit', json=_submission(date='2026-10-03'))
+    items = [
+        _submission(date='2026-10-01'),
+        _submission(date='2026-10-02', work=11),
+        {key: value for key, value in _submission().items() if key != 'date'},
+        _submission(date='2026-10-03', work=1),
+        _submission(date='2026-10-04', email='outro@exemplo.com'),
+    ]
+    
+    response = client.post('/api/submit/batch', json=items)
+    body = response.get_json()
+    
+    assert response.status_code == 200
+    assert not body['success']
+    assert (body['saved'], body['duplicates'], body['rejected']) == (2, 1, 2)
+    results = body['results']
+    assert [result['index'] for result in results] == [0, 1, 2, 3, 4]
+    assert results[0]['success'] and not results[0]['duplicate']
+    assert results[1]['errors'][0]['code'] == 'out_of_range'
+    assert results[2]['errors'][0] == {'field': 'date', 'code': 'required',
+                                       'message': 'Campo date é obrigatório'}
+    assert results[3]['duplicate'] and results[3]['average_score'] == 7.5
+    assert _count_reviews() == 2 and _count_reviews('outro@exemplo.com') == 1
+    assert sorted(client.batch_confirmations) == [('outro@exemplo.com', 1), ('usuario@exemplo.com', 1)]
+
+
+def test_batch_accepts_ndjson_and_shared_email(client):
+    lines = '\n'.join(json.dumps(_submission(date=f'2026-10-0{day}')) for day in (1, 2))
+    ndjson = client.post('/api/submit/batch', data=lines + '\n\n', content_type='application/x-ndjson')
+    
+    reviews = [{key: value for key, value in _submission(date=f'2026-10-0{day}').items() if key != 'email'}
+               for day in (3, 4)]
+    wrapped = client.post('/api/submit/batch', json={'email': 'usuario@exemplo.com', 'reviews': reviews})
+    
+    assert ndjson.get_json()['saved'] == 2
+    assert wrapped.get_json()['saved'] == 2
+    assert _count_reviews() == 4
+    assert client.batch_confirmations == [('usuario@exemplo.com', 2), ('usuario@exemplo.com', 2)]
+
+
+def test_batch_is_written_in_one_transaction(client, monkeypatch):
+    original = DatabaseService._insert_once
+    calls = []
+    
+    def failing_insert(self, cursor, review):
+        calls.append(review)
+        if len(calls) == 3:
+            raise sqlite3.OperationalError('disk I/O error')
+        return original(self, cursor, review)
+    
+    monkeypatch.setattr(DatabaseService, '_insert_once', failing_insert)
+    items = [_submission(date=f'2026-10-0{day}') for day in (1, 2, 3, 4)]
+    
+    response = client.post('/api/submit/batch', json=items)
+    
+    assert response.status_code == 500
+    assert _count_reviews() == 0
+    assert client.batch_confirmations == []
+
+
+@pytest.mark.parametrize('body, status', [
+    ([], 400),
+    ({'reviews': 'nada'}, 400),
+    ([_submission(date='2026-10-01')] * 3, 413),
+])
+def test_batch_rejects_empty_or_too_large_bodies(client, isolated_settings, monkeypatch, body, status):
+    monkeypatch.setattr(isolated_settings, 'BATCH_MAX_ITEMS', 2)
+    
+    response = client.post('/api/submit/batch', json=body)
+    
+    assert response.status_code == status
+    assert _count_reviews() == 0
@@ -0,0 +1,98 @@
+"""
+Estatísticas resumidas (get_summary_stats) comparadas com o cálculo direto
+sobre as avaliações.
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.models.review import Review
+from src.services.email_processor_service import EmailProcessorService
+
+USERS = ('ana@exemplo.com', 'bia@exemplo.com', 'caio@exemplo.com')
+
+FIRST_DAY = date(2026, 8, 3)
+
+
+@pytest.fixture
+def reviews(db_service):
+    """Avaliações aleatórias de três usuários ao longo de dez semanas."""
+    generator = random.Random(7)
+    reviews = [
+        Review(*(generator.randint(0, 10) for _ in range(4)), 'Bom', 'Ruim',
+               user_email=email, review_date=(FIRST_DAY + timedelta(days=day)).isoformat())
+        for day in range(70) for email in USERS if generator.random() < 0.8
+    ]
+    assert db_service.insert_reviews(reviews).success
+    return reviews
+
+
+def _expected(reviews, start=None, end=None, user_email=None):
+    selected = [
+        review for review in reviews
+        if (not start or review.review_date >= start) and (not end or review.review_date <= end)
+        and (not user_email or review.user_email == user_email)
+    ]
+    scores = [score for r in selected for score in (r.work, r.training, r.studies, r.mind)]
+    return {
+        'count': len(selected),
+        'last_id': max((r.id for r in selected), default=None),
+        'first_date': min((r.review_date for r in selected), default=None),
+        'last_date': max((r.review_date for r in selected), default=None),
+        'average': sum(scores) / len(scores) if scores else None,
+    }
+
+
+@pytest.mark.parametrize('start, end, user_email', [
+    (None, None, None),
+    (None, None, 'bia@exemplo.com'),
+    ('2026-08-05', '2026-09-20', None),
+    ('2026-08-05', '2026-09-20', 'ana@exemplo.com'),
+    ('2026-09-01', None, None),
+    (None, '2026-08-20', 'caio@exemplo.com'),
+    ('2027-01-01', '2027-01-31', None),
+])
+def test_summary_matches_direct_computation(db_service, reviews, start, end, user_email):
+    result = db_service.get_summary_stats(start, end, user_email)
+    assert result.success, result.get_first_error()
+    
+    summary = {key: value for key, value in result.data.items() if key != 'stats'}
+    assert summary == _expected(reviews, start, end, user_email)
+
+
+def test_stats_by_date_range_keeps_its_format(db_service, reviews):
+    data = db_service.get_stats_by_date_range('2026-08-05', '2026-09-20').data
+    selected = [r for r in reviews if '2026-08-05' <= r.review_date <= '2026-09-20']
+    
+    assert data['total_reviews'] == len(selected)
+    assert data['avg_work'] == round(sum(r.work for r in selected) / len(selected), 2)
+    assert data['overall_average'] == round(_expected(reviews, '2026-08-05', '2026-09-20')['average'], 2)
+    assert (data['first_date'], data['last_date']) == ('2026-08-05', '2026-09-20')
+    
+    empty = db_service.get_stats_by_date_range('2027-01-01', '2027-01-31').data
+    assert empty['total_reviews'] == 0 and empty['overall_average'] is None
+
+
+def test_weekly_average_uses_last_seven_days(db_service):
+    today = date.today()
+    for days_ago, score in ((0, 8), (6, 6), (7, 0)):
+        review = Review(score, score, score, score, 'Bom', 'Ruim', user_email='ana@exemplo.com',
+                        review_date=(today - timedelta(days=days_ago)).isoformat())
+        assert db_service.insert_review(review).success
+    
+    data = db_service.get_weekly_average().data
+    assert data['total_reviews'] == 2
+    assert data['overall_average'] == 7.0
+
+
+def test_processing_stats_average_is_not_rounded(db_service, reviews):
+    data = EmailProcessorService(db_service).get_processing_stats().data
+    expected = _expected(reviews)
+    
+    assert data['total_processed'] == expected['count']
+    assert data['last_processing'] == expected['last_id']
+    assert data['average_score'] == pytest.approx(
+        sum(r.get_average_score() for r in reviews) / len(reviews)
+    )
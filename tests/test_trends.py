@@ -0,0 +1,123 @@
+"""
+Tendências semanais calculadas com funções de janela do SQLite, conferidas
+contra o cálculo direto semana a semana em Python.
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.models.review import Review
+
+USERS = ('ana@exemplo.com', 'bruno@exemplo.com')
+FIRST_MONDAY = date(2026, 3, 2)
+FIELDS = ('work', 'training', 'studies', 'mind')
+
+
+def _random_reviews(seed, weeks=24):
+    rng = random.Random(seed)
+    reviews = []
+    for week in range(weeks):
+        for user_email in USERS:
+            # Algumas semanas sem avaliações quebram as sequências
+            if rng.random() < 0.25:
+                continue
+            for weekday in rng.sample(range(7), rng.randint(1, 7)):
+                day = FIRST_MONDAY + timedelta(weeks=week, days=weekday)
+                reviews.append(Review(*(rng.randint(0, 10) for _ in FIELDS), 'Dia bom', 'Dia ruim',
+                                      user_email=user_email, review_date=day.isoformat()))
+    return reviews
+
+
+def _expected_history(reviews, end_date):
+    """Semanas com avaliações até a semana de end_date, calculadas diretamente."""
+    end = date.fromisoformat(end_date)
+    last_monday = end - timedelta(days=end.weekday())
+    weeks = {}
+    for review in reviews:
+        day = date.fromisoformat(review.review_date)
+        monday = day - timedelta(days=day.weekday())
+        if monday <= last_monday:
+            weeks.setdefault(monday, []).append([getattr(review, field) for field in FIELDS])
+    
+    history = []
+    streak = 0
+    previous = None
+    for monday in sorted(weeks):
+        rows = weeks[monday]
+        week = {'week_start': monday.isoformat(), 'count': len(rows)}
+        for index, field in enumerate(FIELDS):
+            week[field] = sum(row[index] for row in rows) / len(rows)
+        week['overall'] = sum(map(sum, rows)) / (4 * len(rows))
+        consecutive = previous is not None and monday - previous['monday'] == timedelta(weeks=1)
+        streak = streak + 1 if consecutive else 1
+        week['streak'] = streak
+        for field in FIELDS + ('overall',):
+            week[f'{field}_delta'] = week[field] - previous[field] if consecutive else None
+            window = [other[field] for other in history + [week]
+                      if monday - date.fromisoformat(other['week_start']) <= timedelta(weeks=3)]
+            week[f'{field}_ma4'] = sum(window) / len(window)
+        history.append(week)
+        previous = dict(week, monday=monday)
+    return history
+
+
+def _assert_trends(trends, reviews, end_date):
+    expected = _expected_history(reviews, end_date)
+    history = trends['history']
+    
+    assert [week['week_start'] for week in history] == [week['week_start'] for week in expected]
+    for week, expected_week in zip(history, expected):
+        for key, value in expected_week.items():
+            if value is None:
+                assert week[key] is None, (week['week_start'], key)
+            else:
+                assert week[key] == pytest.approx(value, abs=1e-9), (week['week_start'], key)
+    
+    overall = [week['overall'] for week in expected]
+    assert trends['best_week']['overall'] == pytest.approx(max(overall))
+    assert trends['worst_week']['overall'] == pytest.approx(min(overall))
+    assert trends['longest_streak'] == max(week['streak'] for week in expected)
+    assert trends['latest']['week_start'] == expected[-1]['week_start']
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_trends_match_direct_computation(db_service, seed):
+    reviews = _random_reviews(seed)
+    assert db_service.insert_reviews(reviews).success
+    
+    for user_email in USERS + (None,):
+        user_reviews = [review for review in reviews if user_email in (None, review.user_email)]
+        trends = db_service.get_weekly_trends(user_email, end_date='2026-07-15').data
+        _assert_trends(trends, user_reviews, '2026-07-15')
+
+
+def test_current_streak_needs_this_or_last_week(db_service):
+    reviews = [
+        Review(8, 7, 9, 6, 'Dia bom', 'Dia ruim', user_email='ana@exemplo.com',
+               review_date=(FIRST_MONDAY + timedelta(weeks=week)).isoformat())
+        for week in (0, 1, 2, 5, 6)
+    ]
+    assert db_service.insert_reviews(reviews).success
+    
+    def trends(end_date):
+        return db_service.get_weekly_trends('ana@exemplo.com', end_date=end_date).data
+    
+    # Semanas de 02/03, 09/03, 16/03, 06/04 e 13/04
+    assert trends('2026-03-22')['current_streak'] == 3
+    assert trends('2026-04-13')['current_streak'] == 2
+    assert trends('2026-04-20')['current_streak'] == 2
+    assert trends('2026-04-27')['current_streak'] == 0
+    assert trends('2026-04-27')['longest_streak'] == 3
+
+
+def test_trends_by_user_match_single_user_queries(db_service):
+    reviews = _random_reviews(5)
+    assert db_service.insert_reviews(reviews).success
+    
+    grouped = db_service.get_weekly_trends_by_user(list(USERS) + ['sem@exemplo.com'], '2026-06-30').data
+    
+    for user_email in USERS:
+        assert grouped[user_email] == db_service.get_weekly_trends(user_email, '2026-06-30').data
+    assert grouped['sem@exemplo.com'] == {}
@@ -0,0 +1,145 @@
+"""
+Validador compilado das avaliações: normalização, erros estruturados e o
+caminho de leitura do banco (sem validar de novo).
+"""
+
+import pytest
+
+from src.models import review as review_module
+from src.models.review import Review
+from src.models.validation import (
+    BATCH_SUBMISSION_VALIDATOR,
+    IMPORT_VALIDATOR,
+    REVIEW_VALIDATOR,
+    SUBMISSION_VALIDATOR,
+)
+
+
+def _submission(**overrides):
+    data = {
+        'work': 8, 'training': 7, 'studies': 9, 'mind': 6,
+        'positive_points': '  Dia produtivo  ', 'negative_points': 'Dormi pouco',
+        'email': ' Usuario@Exemplo.com ', 'date': '05/10/2026'
+    }
+    data.update(overrides)
+    return data
+
+
+def _codes(result):
+    return {error.field: error.code for error in result.errors}
+
+
+def test_valid_submission_is_normalized():
+    result = SUBMISSION_VALIDATOR.validate(_submission(work='8'))
+    
+    assert result.valid
+    assert result.data['work'] == 8
+    assert result.data['positive_points'] == 'Dia produtivo'
+    assert result.data['email'] == 'usuario@exemplo.com'
+    assert result.data['date'] == '2026-10-05'
+
+
+def test_all_errors_are_collected_at_once():
+    result = SUBMISSION_VALIDATOR.validate(_submission(
+        work=11, training='abc', studies=None, negative_points='   ', email='sem-arroba', date='31/02/2026'
+    ))
+    
+    assert not result.valid
+    assert _codes(result) == {
+        'work': 'out_of_range',
+        'training': 'not_a_number',
+        'studies': 'required',
+        'negative_points': 'empty',
+        'email': 'invalid_email',
+        'date': 'invalid_date',
+    }
+    assert result.errors[0].message == 'Campo work deve ser entre 0 e 10'
+
+
+@pytest.mark.parametrize('value, expected', [(7.0, 7), (7.5, 7), (10.9, 10), (0.0, 0)])
+def test_float_scores_are_truncated_like_before(value, expected):
+    result = SUBMISSION_VALIDATOR.validate(_submission(work=value))
+    
+    assert result.valid
+    assert result.data['work'] == expected
+    assert type(result.data['work']) is int
+
+
+@pytest.mark.parametrize('value, code', [
+    (float('nan'), 'not_a_number'),
+    (float('inf'), 'not_a_number'),
+    (True, 'not_a_number'),
+    (11.0, 'out_of_range'),
+    (-1, 'out_of_range'),
+])
+def test_invalid_scores(value, code):
+    result = SUBMISSION_VALIDATOR.validate(_submission(work=value))
+    
+    assert _codes(result) == {'work': code}
+
+
+def test_non_object_is_rejected():
+    for data in (None, [], 'texto', 7):
+        result = SUBMISSION_VALIDATOR.validate(data)
+        assert [error.code for error in result.errors] == ['not_an_object']
+
+
+def test_date_is_optional_except_in_batches():
+    data = _submission()
+    del data['date']
+    
+    assert SUBMISSION_VALIDATOR.validate(data).valid
+    assert _codes(BATCH_SUBMISSION_VALIDATOR.validate(data)) == {'date': 'required'}
+
+
+def test_import_accepts_created_at():
+    data = _submission(created_at='2026-10-05 21:30:00')
+    data['user_email'] = data.pop('email')
+    data['review_date'] = data.pop('date')
+    
+    result = IMPORT_VALIDATOR.validate(data)
+    
+    assert result.valid
+    assert result.data['created_at'] == '2026-10-05 21:30:00'
+    assert _codes(IMPORT_VALIDATOR.validate({**data, 'created_at': 'ontem'})) == {'created_at': 'invalid_datetime'}
+
+
+def test_model_does_not_coerce_strings():
+    with pytest.raises(ValueError):
+        Review('8', 7, 9, 6, 'Dia produtivo', 'Dormi pouco')
+    
+    review = Review(7.5, 7, 9, 6, 'Dia produtivo', 'Dormi pouco')
+    assert review.work == 7.5
+
+
+def test_rows_read_from_database_are_not_validated_again(db_service, monkeypatch):
+    review = Review(8, 7, 9, 6, 'Dia produtivo', 'Dormi pouco', user_email='usuario@exemplo.com',
+                    review_date='2026-10-05')
+    assert db_service.insert_review(review).success
+    
+    calls = []
+    original = REVIEW_VALIDATOR.validate
+    monkeypatch.setattr(review_module.REVIEW_VALIDATOR, 'validate',
+                        lambda data: calls.append(data) or original(data))
+    
+    result = db_service.get_all_reviews()
+    
+    assert result.success
+    stored = result.data[0]
+    assert (stored.work, stored.user_email, stored.review_date) == (8, 'usuario@exemplo.com', '2026-10-05')
+    assert stored.id is not None
+    assert calls == []
+
+
+def test_submit_without_json_body_returns_structured_error(isolated_settings, monkeypatch):
+    from app.app import create_app
+    
+    monkeypatch.setattr(isolated_settings, 'RATE_LIMIT_ENABLED', False)
+    app = create_app()
+    app.testing = True
+    
+    response = app.test_client().post('/api/submit', data='work=8', content_type='text/plain')
+    
+    assert response.status_code == 400
+    assert response.is_json
+    assert response.get_json()['errors'][0]['code'] == 'not_an_object'
@@ -0,0 +1,150 @@
+"""
+Envio do relatório semanal a todos os usuários: uma execução interrompida
+pode ser repetida e só envia a quem ainda não recebeu.
+"""
+
+from collections import Counter
+
+from src.models.result import Result
+from src.models.review import Review
+from src.services.weekly_report_service import WeeklyReportService
+
+
+# Um dia qualquer da semana ISO de 2026-10-05 (segunda) a 2026-10-11
+WEEK_DAY = '2026-10-07'
+
+USERS = [f'usuario{index}@exemplo.com' for index in range(5)]
+
+
+class FakeEmailService:
+    """Registra os envios; pode falhar para alguns destinatários ou derrubar o lote."""
+    
+    def __init__(self, fail_for=(), crash_after=None):
+        self.fail_for = set(fail_for)
+        self.crash_after = crash_after
+        self.sent = Counter()
+    
+    def send_bulk_emails(self, messages, subtype='plain'):
+        outcomes = {}
+        for to_email, subject, body in messages:
+            if self.crash_after is not None and sum(self.sent.values()) >= self.crash_after:
+                result = Result.error_result('Conexão perdida')
+                result.data = outcomes
+                return result
+            if to_email in self.fail_for:
+                outcomes[to_email] = 'Destinatário recusado'
+                continue
+            self.sent[to_email] += 1
+            outcomes[to_email] = None
+        return Result.success_result(outcomes)
+
+
+def _insert_week(db_service):
+    for index, email in enumerate(USERS):
+        for day in ('2026-10-05', WEEK_DAY):
+            review = Review(5 + index % 5, 6, 7, 8, 'Bom', 'Ruim',
+                            user_email=email, review_date=day)
+            assert db_service.insert_review(review).success
+
+
+def _send(db_service, email_service):
+    service = WeeklyReportService(db_service=db_service, email_service=email_service)
+    return service.send_weekly_reports_to_all_users(WEEK_DAY, workers=2, batch_size=2)
+
+
+def test_interrupted_fan_out_resumes_with_remaining_users(db_service):
+    _insert_week(db_service)
+    
+    crashing = FakeEmailService(crash_after=3)
+    first = _send(db_service, crashing)
+    assert not first.success
+    assert sum(crashing.sent.values()) == 3
+    
+    resumed = FakeEmailService()
+    second = _send(db_service, resumed)
+    assert second.success
+    assert second.data['already_sent'] == 3
+    assert second.data['sent'] == 2
+    
+    assert set(crashing.sent) | set(resumed.sent) == set(USERS)
+    assert not set(crashing.sent) & set(resumed.sent)
+    assert max((crashing.sent + resumed.sent).values()) == 1
+    
+    rerun = FakeEmailService()
+    third = _send(db_service, rerun)
+    assert third.success and third.data['sent'] == 0
+    assert not rerun.sent
+
+
+def test_failed_recipients_are_retried_on_next_run(db_service):
+    _insert_week(db_service)
+    
+    first_service = FakeEmailService(fail_for=[USERS[1]])
+    first = _send(db_service, first_service)
+    assert first.success
+    assert set(first.data['failed']) == {USERS[1]}
+    assert first.data['sent'] == len(USERS) - 1
+    
+    retry_service = FakeEmailService()
+    retry = _send(db_service, retry_service)
+    assert retry.success
+    assert dict(retry_service.sent) == {USERS[1]: 1}
+
+
+def test_grouped_sections_match_single_user_queries(db_service):
+    _insert_week(db_service)
+    for index, email in enumerate(USERS[:3]):
+        for day in ('2026-09-21', '2026-09-28', '2026-09-30'):
+            review = Review(index + 2, 9 - index, 5, 7, 'Treino ótimo e foco', 'Cansado e atrasado',
+                            user_email=email, review_date=day)
+            assert db_service.insert_review(review).success
+    
+    service = WeeklyReportService(db_service=db_service, email_service=FakeEmailService())
+    grouped = service._get_report_sections_by_user(USERS + ['sem.dados@exemplo.com'], '2026-10-05')
+    assert grouped.success, grouped.get_first_error()
+    
+    for email in USERS + ['sem.dados@exemplo.com']:
+        single = service._get_report_sections(email, '2026-10-05')
+        assert grouped.data[email] == single.data
+
+
+def test_send_failure_does_not_render_every_remaining_report(db_service, monkeypatch):
+    _insert_week(db_service)
+    service = WeeklyReportService(db_service=db_service, email_service=FakeEmailService(crash_after=0))
+    
+    rendered = []
+    render_user_report = service._render_user_report
+    
+    def counting_render(email, *args):
+        rendered.append(email)
+        return render_user_report(email, *args)
+    
+    monkeypatch.setattr(service, '_render_user_report', counting_render)
+    result = service.send_weekly_reports_to_all_users(WEEK_DAY, workers=1, batch_size=1)
+    
+    assert not result.success
+    # O lote enviado e, no máximo, o lote seguinte já submetido
+    assert len(rendered) <= 2
+
+
+def _count_fan_out_connections(db_service, users):
+    for index, email in enumerate(users):
+        review = Review(index % 11, 6, 7, 8, 'Bom', 'Ruim', user_email=email, review_date=WEEK_DAY)
+        assert db_service.insert_review(review).success
+    
+    connections = []
+    get_connection = db_service._get_connection
+    db_service._get_connection = lambda: connections.append(1) or get_connection()
+    try:
+        service = WeeklyReportService(db_service=db_service, email_service=FakeEmailService())
+        assert service.send_weekly_reports_to_all_users(WEEK_DAY, workers=2, batch_size=1000).success
+    finally:
+        del db_service._get_connection
+    return len(connections)
+
+
+def test_fan_out_queries_do_not_grow_with_users(db_service):
+    few = _count_fan_out_connections(db_service, [f'a{index}@exemplo.com' for index in range(3)])
+    many = _count_fan_out_connections(db_service, [f'b{index}@exemplo.com' for index in range(30)])
+    
+    assert many == few
@@ -0,0 +1,90 @@
+"""
+Estatísticas da semana em uma única consulta agregada: conferidas contra o
+cálculo direto sobre as avaliações.
+"""
+
+import random
+import statistics
+from datetime import date, timedelta
+
+import pytest
+
+from src.models.review import Review
+
+USERS = ('ana@exemplo.com', 'bruno@exemplo.com', 'carla@exemplo.com')
+
+
+def _random_reviews(seed, days=21):
+    rng = random.Random(seed)
+    first_day = date(2026, 9, 7)
+    reviews = []
+    for offset in range(days):
+        for user_email in USERS:
+            if rng.random() < 0.7:
+                reviews.append(Review(
+                    *(rng.randint(0, 10) for _ in range(4)), 'Dia bom', 'Dia ruim',
+                    user_email=user_email, review_date=(first_day + timedelta(days=offset)).isoformat()
+                ))
+    return reviews
+
+
+def _expected(reviews):
+    scores = [(review.work, review.training, review.studies, review.mind) for review in reviews]
+    all_scores = [score for row in scores for score in row]
+    return {
+        'count': len(scores),
+        'averages': [sum(column) / len(column) for column in zip(*scores)],
+        'consistency': max(0, 10 - statistics.pstdev(all_scores)),
+    }
+
+
+def _assert_matches(stats, reviews):
+    expected = _expected(reviews)
+    assert stats.count == expected['count']
+    assert list(stats.area_averages().values()) == expected['averages']
+    assert stats.consistency_score == pytest.approx(expected['consistency'], abs=1e-9)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_weekly_stats_match_direct_computation(db_service, seed):
+    reviews = _random_reviews(seed)
+    assert db_service.insert_reviews(reviews).success
+    
+    stats = db_service.get_weekly_stats('2026-09-10', '2026-09-16').data
+    
+    _assert_matches(stats, [review for review in reviews if '2026-09-10' <= review.review_date <= '2026-09-16'])
+
+
+def test_weekly_stats_default_to_the_last_seven_days(db_service):
+    reviews = _random_reviews(1)
+    assert db_service.insert_reviews(reviews).success
+    
+    stats = db_service.get_weekly_stats(end_date='2026-09-20', user_email='bruno@exemplo.com').data
+    
+    _assert_matches(stats, [
+        review for review in reviews
+        if review.user_email == 'bruno@exemplo.com' and '2026-09-14' <= review.review_date <= '2026-09-20'
+    ])
+
+
+def test_weekly_stats_by_user_match_direct_computation(db_service):
+    reviews = _random_reviews(2)
+    assert db_service.insert_reviews(reviews).success
+    
+    stats_by_user = db_service.get_weekly_stats_by_user('2026-09-14', '2026-09-20').data
+    
+    assert set(stats_by_user) == set(USERS)
+    for user_email, stats in stats_by_user.items():
+        _assert_matches(stats, [
+            review for review in reviews
+            if review.user_email == user_email and '2026-09-14' <= review.review_date <= '2026-09-20'
+        ])
+
+
+def test_empty_week(db_service):
+    stats = db_service.get_weekly_stats('2026-09-14', '2026-09-20').data
+    
+    assert stats.count == 0
+    assert stats.area_averages() == {}
+    assert stats.consistency_score == 0
+    assert db_service.get_weekly_stats_by_user('2026-09-14', '2026-09-20').data == {}
@@ -1,8 +1,15 @@
 """
 Script para execução automática do relatório semanal.
 Este script será executado pelo GitHub Actions todo sábado.
+
+Uso:
+    python weekly_report.py              # relatório para WEEKLY_REPORT_EMAIL
+    python weekly_report.py --all-users  # relatório de cada usuário com avaliações
+    python weekly_report.py --backfill [--per-user] [--workers N]
+                                         # grava os relatórios de todas as semanas passadas
 """
 
+import argparse
 import os
 import sys
 from datetime import datetime
@@ -10,15 +17,64 @@ from datetime import datetime
 # Adiciona o diretório raiz ao path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from src.services.weekly_report_service import WeeklyReportService
+from src.services.container import get_services
 from src.config.settings import settings
 
 
+def send_all_users():
+    """Envia o relatório da semana a todos os usuários (retoma de onde parou)."""
+    print("📧 Enviando relatórios para todos os usuários")
+    
+    result = get_services().weekly_report.send_weekly_reports_to_all_users()
+    
+    if not result.success:
+        print(f"❌ Erro na execução: {result.get_first_error()}")
+        return 1
+    
+    summary = result.data
+    print(f"✅ {summary['sent']} relatórios enviados "
+          f"({summary['already_sent']} já tinham sido enviados antes)")
+    
+    for email, error in summary['failed'].items():
+        print(f"❌ {email}: {error}")
+    
+    return 1 if summary['failed'] else 0
+
+
+def backfill(per_user: bool, workers: int):
+    """Calcula os relatórios de todas as semanas do histórico."""
+    result = get_services().weekly_report.backfill_weekly_reports(per_user=per_user, workers=workers)
+    
+    if not result.success:
+        print(f"❌ Erro no backfill: {result.get_first_error()}")
+        return 1
+    
+    print(f"✅ {result.data['reports_saved']} relatórios gravados ({result.data['weeks']} semanas)")
+    return 0
+
+
 def main():
     """Função principal para execução automática."""
+    parser = argparse.ArgumentParser(description='Relatório semanal do Diário Inteligente')
+    parser.add_argument('--all-users', action='store_true',
+                        help='Envia o relatório de cada usuário com avaliações na semana')
+    parser.add_argument('--backfill', action='store_true',
+                        help='Calcula e grava os relatórios de todas as semanas passadas (sem enviar)')
+    parser.add_argument('--per-user', action='store_true',
+                        help='No backfill, gera um relatório por usuário e semana')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Processos usados no backfill (padrão: REPORT_BACKFILL_WORKERS)')
+    args = parser.parse_args()
+    
     print(f"🤖 Iniciando execução automática - {datetime.now()}")
     print(f"📱 {settings.APP_NAME} v{settings.APP_VERSION}")
     
+    if args.backfill:
+        return backfill(args.per_user, args.workers)
+    
+    if args.all_users:
+        return send_all_users()
+    
     # Email de destino (você pode configurar via variável de ambiente)
     target_email = os.getenv('WEEKLY_REPORT_EMAIL', 'sapao.vieira@gmail.com')
     
@@ -28,8 +84,8 @@ def main():
     
     print(f"📧 Enviando relatório para: {target_email}")
     
-    # Inicializa o serviço
-    report_service = WeeklyReportService()
+    # Obtém o serviço (criado sob demanda pelo contêiner)
+    report_service = get_services().weekly_report
     
     # Executa o relatório
     result = report_service.schedule_weekly_report(target_email)